@@ -1,12 +1,16 @@
 import os
 import json
 import logging
+import time
 from typing import List
 
 import boto3
+from botocore.config import Config
 from botocore.exceptions import ClientError
 
 from src.seq2seq import Seq2Seq
+from src.streaming import ChatStream
+from src.rate_limiting import TokenBudgetScheduler, estimate_tokens
 
 ENV_KEY_REGION_NAME = os.getenv('SEQ2SEQ_BEDROCK_REGION')
 ENV_KEY_BEDROCK_MODEL_ID = os.getenv('SEQ2SEQ_BEDROCK_MODEL_ID')
@@ -18,31 +22,57 @@ class AwsBedrockSeq2Seq(Seq2Seq):
     """
     bedrock_client: boto3.client
     model_id: str
+    scheduler: TokenBudgetScheduler
 
     def __init__(
             self,
             region: str = None,
             model_id: str = None,
+            scheduler: TokenBudgetScheduler = None,
             ):
         logging.info("Start AzureOpenAI client configuration ...")
 
         region = region if region \
             else os.getenv(ENV_KEY_REGION_NAME)
-        model_id = model_id if model_id \
+        self.model_id = model_id if model_id \
             else os.getenv(ENV_KEY_BEDROCK_MODEL_ID)
 
         # log configuration
         logging.info(f"AWS Bedrock region: {region}")
-        logging.info(f"AWS Bedrock model_id: {model_id}")
+        logging.info(f"AWS Bedrock model_id: {self.model_id}")
 
-        # construct LLM client
+        # construct LLM client,
+        # retries are left to the scheduler, which sees every throttled call
         self.bedrock_client = boto3.client(
             "bedrock-runtime",
-            region_name=region
+            region_name=region,
+            config=Config(retries={'total_max_attempts': 1})
         )
+        # share one scheduler between the clients of the same model
+        self.scheduler = scheduler if scheduler is not None \
+            else TokenBudgetScheduler()
 
         logging.info("Completed AzureOpenAI client configuration.")
 
+    @staticmethod
+    def _conversation(messages: List[dict]) -> List[dict]:
+        """
+        Convert messages to the Converse API format
+        @param messages: list of messages, each with keys 'role' and 'content'
+        @return: conversation
+        """
+        return [{
+            'role': msg['role'],
+            'content': [{'text': msg['content']}]
+        } for msg in messages]
+
+    @staticmethod
+    def _estimate_tokens(messages: List[dict], kwargs: dict) -> int:
+        return estimate_tokens(
+            [msg['content'] for msg in messages],
+            kwargs.get('maxTokens', 0)
+        )
+
     def chat(self, messages: List[dict], **kwargs) -> str:
         """
         chat
@@ -52,19 +82,16 @@ class AwsBedrockSeq2Seq(Seq2Seq):
         logging.info("Start chat method ...")
         logging.info(f"kwargs: {json.dumps(kwargs)}")
 
-        conversation = []
-        for msg in messages:
-            conversation.append({
-                'role': msg['role'],
-                'content': [{'text': msg['content']}]
-            })
+        conversation = self._conversation(messages)
 
         try:
             # Invoke the model with the request.
-            responses = self.bedrock_client.converse(
+            responses = self.scheduler.call(
+                self.bedrock_client.converse,
                 modelId=self.model_id,
                 messages=conversation,
-                inferenceConfig=kwargs
+                inferenceConfig=kwargs,
+                tokens=self._estimate_tokens(messages, kwargs)
             )
         except (ClientError, Exception) as ex:
             print(f"ERROR: Can't invoke '{self.model_id}'. Reason: {ex}")
@@ -75,3 +102,41 @@ class AwsBedrockSeq2Seq(Seq2Seq):
 
         logging.info("Completed chat method.")
         return response_text
+
+    def _iter_deltas(self, stream, usage: dict):
+        try:
+            for event in stream:
+                if 'contentBlockDelta' in event:
+                    text = event['contentBlockDelta']['delta'].get('text')
+                    if text:
+                        yield text
+                elif 'metadata' in event:
+                    usage['completion_tokens'] = \
+                        event['metadata'].get('usage', {}).get('outputTokens')
+        finally:
+            stream.close()
+
+    def chat_stream(self, messages: List[dict], **kwargs) -> ChatStream:
+        """
+        chat, streaming the completion with the ConverseStream API
+        @param messages: list of messages, each with keys 'role' and 'content'
+        @return: iterator over the text deltas, as they arrive
+        """
+        logging.info("Start chat_stream method ...")
+        logging.info(f"kwargs: {json.dumps(kwargs)}")
+
+        start = time.perf_counter()
+        try:
+            response = self.scheduler.call(
+                self.bedrock_client.converse_stream,
+                modelId=self.model_id,
+                messages=self._conversation(messages),
+                inferenceConfig=kwargs,
+                tokens=self._estimate_tokens(messages, kwargs)
+            )
+        except ClientError as ex:
+            logging.exception(f"Can't invoke '{self.model_id}'. Reason: {ex}")
+            raise ex
+        usage = {}
+        return ChatStream(self._iter_deltas(response['stream'], usage),
+                          usage=usage, start=start)
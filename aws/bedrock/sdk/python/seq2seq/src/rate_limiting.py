@@ -0,0 +1,283 @@
+# ref:
+# * https://en.wikipedia.org/wiki/Token_bucket
+# * https://learn.microsoft.com/en-us/azure/ai-services/openai/how-to/quota
+# * https://aws.amazon.com/blogs/architecture/exponential-backoff-and-jitter/
+
+import math
+import time
+import random
+import logging
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Callable, List, Optional, Tuple
+
+# constants
+CHARS_PER_TOKEN = 4  # token estimate of a text
+DEFAULT_BURST_SECONDS = 10.0  # quotas are enforced over ~10 s windows
+DEFAULT_MAX_RETRIES = 6
+DEFAULT_BACKOFF_BASE_SECONDS = 1.0
+DEFAULT_BACKOFF_MAX_SECONDS = 60.0
+RETRY_AFTER_JITTER = 0.1  # fraction added to Retry-After, spreads resumes
+THROTTLING_STATUS_CODES = (429,)
+RETRYABLE_STATUS_CODES = (408, 429, 500, 502, 503, 504)
+THROTTLING_ERROR_CODES = ('ThrottlingException', 'TooManyRequestsException')
+RETRY_AFTER_MS_HEADERS = ('retry-after-ms', 'x-ms-retry-after-ms')
+
+
+@dataclass
+class SchedulerStats:
+    requests: int = 0
+    throttled: int = 0
+    retries: int = 0
+    queue_depth: int = 0
+    max_queue_depth: int = 0
+    total_wait_seconds: float = 0.0
+    max_wait_seconds: float = 0.0
+
+    @property
+    def mean_wait_seconds(self) -> float:
+        return self.total_wait_seconds / self.requests if self.requests else 0.0
+
+
+def estimate_tokens(texts: List[str], max_completion_tokens: int = 0) -> int:
+    """
+    Estimate the tokens a request counts against a tokens-per-minute quota
+    @param texts: prompt texts
+    @param max_completion_tokens: completion budget of the request,
+        counted by the service when the request is admitted
+    @return: estimated tokens
+    """
+    prompt_tokens = sum(math.ceil(len(text) / CHARS_PER_TOKEN) for text in texts)
+    return max(1, prompt_tokens + (max_completion_tokens or 0))
+
+
+def backoff_seconds(
+    attempt: int,
+    base_seconds: float = DEFAULT_BACKOFF_BASE_SECONDS,
+    max_seconds: float = DEFAULT_BACKOFF_MAX_SECONDS
+) -> float:
+    """
+    Exponential backoff with full jitter
+    @param attempt: 0-based retry attempt
+    @param base_seconds: backoff of the first retry
+    @param max_seconds: max backoff
+    @return: seconds to wait
+    """
+    return random.uniform(0, min(max_seconds, base_seconds * 2 ** attempt))
+
+
+def retry_after_seconds(headers) -> Optional[float]:
+    """
+    Delay requested by a throttled response
+    @param headers: response headers
+    @return: seconds, None if the headers request no delay
+    """
+    if not headers:
+        return None
+    headers = {str(k).lower(): v for k, v in dict(headers).items()}
+    for name in RETRY_AFTER_MS_HEADERS:
+        try:
+            return max(0.0, float(headers[name]) / 1000)
+        except (KeyError, TypeError, ValueError):
+            pass
+    value = headers.get('retry-after')
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        # HTTP-date
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+def classify_error(ex: Exception) -> Tuple[bool, bool, Optional[float]]:
+    """
+    Classify a failed call of the openai, azure-core, boto3, requests
+    or httpx clients
+    @param ex: exception raised by the call
+    @return: (throttled, retryable, Retry-After seconds or None)
+    """
+    status = getattr(ex, 'status_code', None)
+    response = getattr(ex, 'response', None)
+    code = None
+    headers = None
+    if isinstance(response, dict):
+        # botocore ClientError
+        metadata = response.get('ResponseMetadata', {})
+        code = response.get('Error', {}).get('Code')
+        status = metadata.get('HTTPStatusCode', status)
+        headers = metadata.get('HTTPHeaders')
+    elif response is not None:
+        status = status if status is not None \
+            else getattr(response, 'status_code', None)
+        headers = getattr(response, 'headers', None)
+    throttled = status in THROTTLING_STATUS_CODES \
+        or code in THROTTLING_ERROR_CODES
+    retryable = throttled or status in RETRYABLE_STATUS_CODES
+    retry_after = retry_after_seconds(headers) if retryable else None
+    return throttled, retryable, retry_after
+
+
+class TokenBucket:
+    """
+    Bucket refilled at a constant rate up to its capacity. A reservation
+    may overdraw the bucket: later reservations queue behind the debt,
+    so that concurrent callers are spaced out in arrival order.
+    Not thread-safe, guarded by its scheduler.
+    """
+
+    def __init__(self, rate_per_second: float, capacity: float):
+        """
+        @param rate_per_second: refill rate
+        @param capacity: max burst
+        """
+        if rate_per_second <= 0 or capacity <= 0:
+            raise ValueError(f"Invalid token bucket: rate_per_second=\
+                {rate_per_second}, capacity={capacity}")
+        self.rate_per_second = rate_per_second
+        self.capacity = capacity
+        self._level = capacity
+        self._updated = None
+
+    def reserve(self, amount: float, now: float) -> float:
+        """
+        Take tokens from the bucket
+        @param amount: tokens
+        @param now: monotonic time
+        @return: seconds until the tokens are available
+        """
+        if self._updated is not None:
+            self._level = min(
+                self.capacity,
+                self._level + (now - self._updated) * self.rate_per_second)
+        self._updated = now
+        self._level -= amount
+        return max(0.0, -self._level / self.rate_per_second)
+
+
+class TokenBudgetScheduler:
+    """
+    Thread-safe client-side scheduler for calls against requests-per-minute
+    and tokens-per-minute quotas. Share one instance between the workers
+    and providers drawing on the same quota: calls wait for their share
+    of both token buckets, throttled calls are retried after Retry-After
+    (pausing every worker) or after a jittered exponential backoff.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: float = None,
+        tokens_per_minute: float = None,
+        burst_seconds: float = DEFAULT_BURST_SECONDS,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        backoff_base_seconds: float = DEFAULT_BACKOFF_BASE_SECONDS,
+        backoff_max_seconds: float = DEFAULT_BACKOFF_MAX_SECONDS
+    ):
+        """
+        @param requests_per_minute: request quota, None is unlimited
+        @param tokens_per_minute: token quota, None is unlimited
+        @param burst_seconds: seconds of quota that may be spent at once
+        @param max_retries: max retries of a throttled call
+        @param backoff_base_seconds: backoff of the first retry
+        @param backoff_max_seconds: max backoff
+        """
+        self._request_bucket = TokenBucket(
+            requests_per_minute / 60,
+            max(1.0, requests_per_minute * burst_seconds / 60)
+        ) if requests_per_minute else None
+        self._token_bucket = TokenBucket(
+            tokens_per_minute / 60,
+            max(1.0, tokens_per_minute * burst_seconds / 60)
+        ) if tokens_per_minute else None
+        self.max_retries = max_retries
+        self.backoff_base_seconds = backoff_base_seconds
+        self.backoff_max_seconds = backoff_max_seconds
+        self.stats = SchedulerStats()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: int = 1) -> float:
+        """
+        Wait for the quota of one request
+        @param tokens: estimated tokens of the request
+        @return: seconds waited
+        """
+        start = time.monotonic()
+        with self._lock:
+            self.stats.queue_depth += 1
+            self.stats.max_queue_depth = max(
+                self.stats.max_queue_depth, self.stats.queue_depth)
+            wait = max(0.0, self._paused_until - start)
+            if self._request_bucket is not None:
+                wait = max(wait, self._request_bucket.reserve(1, start))
+            if self._token_bucket is not None:
+                wait = max(wait, self._token_bucket.reserve(tokens, start))
+        try:
+            if wait > 0:
+                time.sleep(wait)
+        finally:
+            waited = time.monotonic() - start
+            with self._lock:
+                self.stats.queue_depth -= 1
+                self.stats.requests += 1
+                self.stats.total_wait_seconds += waited
+                self.stats.max_wait_seconds = max(
+                    self.stats.max_wait_seconds, waited)
+        return waited
+
+    def pause(self, seconds: float) -> None:
+        """
+        Hold back every call for a while, e.g. after a Retry-After
+        @param seconds: pause duration
+        """
+        with self._lock:
+            self._paused_until = max(
+                self._paused_until, time.monotonic() + seconds)
+
+    def call(self, fn: Callable, *args, tokens: int = 1, **kwargs):
+        """
+        Call fn within the quota, retrying throttled and transient errors
+        @param fn: function sending one request
+        @param args: passed to fn
+        @param tokens: estimated tokens of the request
+        @param kwargs: passed to fn
+        @return: result of fn
+        """
+        attempt = 0
+        while True:
+            self.acquire(tokens)
+            try:
+                return fn(*args, **kwargs)
+            except Exception as ex:
+                throttled, retryable, retry_after = classify_error(ex)
+                if throttled:
+                    with self._lock:
+                        self.stats.throttled += 1
+                if not retryable or attempt >= self.max_retries:
+                    raise
+                if retry_after is not None:
+                    delay = retry_after * (1 + random.uniform(
+                        0, RETRY_AFTER_JITTER))
+                else:
+                    delay = backoff_seconds(
+                        attempt,
+                        self.backoff_base_seconds,
+                        self.backoff_max_seconds
+                    )
+                with self._lock:
+                    self.stats.retries += 1
+                logging.warning(f"Retry {attempt + 1}/{self.max_retries} \
+                    in {delay:.2f}s: {type(ex).__name__}")
+                if throttled:
+                    # the quota is shared: hold back every worker
+                    self.pause(delay)
+                else:
+                    time.sleep(delay)
+                attempt += 1
@@ -23,3 +23,96 @@ def test_chat(messages):
     assert response is not None
     assert isinstance(response, str)
     assert len(response) > 0
+
+
+class FakeEventStream:
+    """
+    ConverseStream event stream
+    """
+
+    def __init__(self, events):
+        self.events = events
+        self.closed = False
+
+    def __iter__(self):
+        return iter(self.events)
+
+    def close(self):
+        self.closed = True
+
+
+def test_chat_stream():
+    from unittest.mock import MagicMock
+    from src.aws_bedrock_seq2seq import AwsBedrockSeq2Seq
+    from src.rate_limiting import TokenBudgetScheduler
+    seq2seq = AwsBedrockSeq2Seq.__new__(AwsBedrockSeq2Seq)
+    seq2seq.model_id = 'stub'
+    seq2seq.scheduler = TokenBudgetScheduler()
+    events = FakeEventStream([
+        {'messageStart': {'role': 'assistant'}},
+        {'contentBlockDelta': {'delta': {'text': 'Hello'}, 'contentBlockIndex': 0}},
+        {'contentBlockDelta': {'delta': {'text': ' world'}, 'contentBlockIndex': 0}},
+        {'contentBlockStop': {'contentBlockIndex': 0}},
+        {'messageStop': {'stopReason': 'end_turn'}},
+        {'metadata': {'usage': {'inputTokens': 1, 'outputTokens': 3}}},
+    ])
+    seq2seq.bedrock_client = MagicMock()
+    seq2seq.bedrock_client.converse_stream.return_value = {'stream': events}
+
+    stream = seq2seq.chat_stream(
+        messages=[{'role': 'user', 'content': 'hi'}], maxTokens=16)
+    assert list(stream) == ['Hello', ' world']
+    assert stream.stats.tokens == 3
+    assert events.closed
+    kwargs = seq2seq.bedrock_client.converse_stream.call_args.kwargs
+    assert kwargs['messages'] == [{'role': 'user', 'content': [{'text': 'hi'}]}]
+    assert kwargs['inferenceConfig'] == {'maxTokens': 16}
+
+
+def test_chat_stream_time_to_first_token():
+    import time
+    from unittest.mock import MagicMock
+    from src.aws_bedrock_seq2seq import AwsBedrockSeq2Seq
+    from src.rate_limiting import TokenBudgetScheduler
+    seq2seq = AwsBedrockSeq2Seq.__new__(AwsBedrockSeq2Seq)
+    seq2seq.model_id = 'stub'
+    seq2seq.scheduler = TokenBudgetScheduler()
+    events = FakeEventStream([
+        {'contentBlockDelta': {'delta': {'text': 'Hello'}, 'contentBlockIndex': 0}},
+        {'messageStop': {'stopReason': 'end_turn'}},
+    ])
+
+    def delayed_converse_stream(**kwargs):
+        time.sleep(0.2)
+        return {'stream': events}
+
+    seq2seq.bedrock_client = MagicMock()
+    seq2seq.bedrock_client.converse_stream.side_effect = delayed_converse_stream
+
+    stream = seq2seq.chat_stream(messages=[{'role': 'user', 'content': 'hi'}])
+    assert list(stream) == ['Hello']
+    # waiting for the response headers counts in the time-to-first-token
+    assert stream.stats.time_to_first_token >= 0.2
+
+
+def test_chat_throttled():
+    from unittest.mock import MagicMock
+    from botocore.exceptions import ClientError
+    from src.aws_bedrock_seq2seq import AwsBedrockSeq2Seq
+    from src.rate_limiting import TokenBudgetScheduler
+    seq2seq = AwsBedrockSeq2Seq.__new__(AwsBedrockSeq2Seq)
+    seq2seq.model_id = 'stub'
+    seq2seq.scheduler = TokenBudgetScheduler(backoff_base_seconds=0.001)
+    throttled = ClientError(
+        {'Error': {'Code': 'ThrottlingException', 'Message': 'slow down'},
+         'ResponseMetadata': {'HTTPStatusCode': 429, 'HTTPHeaders': {}}},
+        'Converse'
+    )
+    seq2seq.bedrock_client = MagicMock()
+    seq2seq.bedrock_client.converse.side_effect = [throttled, {
+        'output': {'message': {'content': [{'text': 'Hello'}]}}}]
+
+    response = seq2seq.chat(messages=[{'role': 'user', 'content': 'hi'}])
+    assert response == 'Hello'
+    assert seq2seq.scheduler.stats.throttled == 1
+    assert seq2seq.bedrock_client.converse.call_count == 2
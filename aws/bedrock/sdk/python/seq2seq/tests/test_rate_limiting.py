@@ -0,0 +1,146 @@
+import time
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+
+def test_importable():
+    import src.rate_limiting  # noqa: F401
+    from src.rate_limiting import TokenBudgetScheduler  # noqa: F401
+
+
+class ThrottledError(Exception):
+    """
+    Error shaped like the openai / azure-core HTTP errors
+    """
+
+    def __init__(self, status_code: int, headers: dict = None):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+        self.response = SimpleNamespace(headers=headers or {})
+
+
+def test_estimate_tokens():
+    from src.rate_limiting import estimate_tokens
+    assert estimate_tokens(['abcd', 'abcdefgh']) == 3
+    assert estimate_tokens(['abcd'], max_completion_tokens=100) == 101
+    assert estimate_tokens([]) == 1
+
+
+def test_backoff_seconds():
+    from src.rate_limiting import backoff_seconds
+    for attempt in range(10):
+        assert 0 <= backoff_seconds(attempt, 1.0, 8.0) <= min(8.0, 2 ** attempt)
+
+
+@pytest.mark.parametrize("headers, expected", [
+    ({}, None),
+    ({'Retry-After': '3'}, 3.0),
+    ({'retry-after-ms': '250'}, 0.25),
+    ({'x-ms-retry-after-ms': '1500', 'Retry-After': '2'}, 1.5),
+    ({'Retry-After': 'Wed, 21 Oct 2015 07:28:00 GMT'}, 0.0),
+    ({'Retry-After': 'soon'}, None),
+])
+def test_retry_after_seconds(headers, expected):
+    from src.rate_limiting import retry_after_seconds
+    assert retry_after_seconds(headers) == expected
+
+
+def test_classify_error():
+    from src.rate_limiting import classify_error
+    assert classify_error(ThrottledError(429, {'Retry-After': '1'})) \
+        == (True, True, 1.0)
+    assert classify_error(ThrottledError(503)) == (False, True, None)
+    assert classify_error(ThrottledError(400)) == (False, False, None)
+    assert classify_error(ValueError()) == (False, False, None)
+
+    # botocore ClientError
+    boto_error = Exception()
+    boto_error.response = {
+        'Error': {'Code': 'ThrottlingException'},
+        'ResponseMetadata': {'HTTPStatusCode': 400, 'HTTPHeaders': {}},
+    }
+    assert classify_error(boto_error) == (True, True, None)
+
+
+def test_token_bucket():
+    from src.rate_limiting import TokenBucket
+    bucket = TokenBucket(rate_per_second=10, capacity=5)
+    # burst within capacity
+    assert bucket.reserve(5, now=0.0) == 0.0
+    # overdraw, then queue behind the debt
+    assert bucket.reserve(1, now=0.0) == pytest.approx(0.1)
+    assert bucket.reserve(1, now=0.0) == pytest.approx(0.2)
+    # refilled, up to capacity
+    assert bucket.reserve(5, now=10.0) == 0.0
+    with pytest.raises(ValueError):
+        TokenBucket(rate_per_second=0, capacity=1)
+
+
+def test_scheduler_requests_per_minute():
+    from src.rate_limiting import TokenBudgetScheduler
+    # 1 request of burst, then 1 every 10 ms
+    scheduler = TokenBudgetScheduler(requests_per_minute=6000,
+                                     burst_seconds=0.01)
+    start = time.monotonic()
+    threads = [threading.Thread(target=scheduler.acquire) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert time.monotonic() - start >= 0.05
+    assert scheduler.stats.requests == 6
+    assert scheduler.stats.queue_depth == 0
+    assert scheduler.stats.max_queue_depth >= 1
+    assert scheduler.stats.max_wait_seconds >= 0.04
+
+
+def test_scheduler_tokens_per_minute():
+    from src.rate_limiting import TokenBudgetScheduler
+    scheduler = TokenBudgetScheduler(tokens_per_minute=60_000,
+                                     burst_seconds=0.1)
+    assert scheduler.acquire(tokens=100) < 0.01
+    # 50 tokens over budget, refilled at 1000 tokens/s
+    assert scheduler.acquire(tokens=50) >= 0.04
+
+
+def test_call_retries_throttled():
+    from src.rate_limiting import TokenBudgetScheduler
+    scheduler = TokenBudgetScheduler()
+    errors = [ThrottledError(429, {'retry-after-ms': '20'})]
+
+    def send():
+        if errors:
+            raise errors.pop()
+        return 'ok'
+
+    start = time.monotonic()
+    assert scheduler.call(send) == 'ok'
+    assert time.monotonic() - start >= 0.02
+    assert scheduler.stats.throttled == 1
+    assert scheduler.stats.retries == 1
+    assert scheduler.stats.requests == 2
+
+
+def test_call_gives_up():
+    from src.rate_limiting import TokenBudgetScheduler
+    scheduler = TokenBudgetScheduler(max_retries=2, backoff_base_seconds=0.001)
+    calls = []
+
+    def send():
+        calls.append(1)
+        raise ThrottledError(503)
+
+    with pytest.raises(ThrottledError):
+        scheduler.call(send)
+    assert len(calls) == 3
+
+    def fail():
+        calls.append(1)
+        raise ValueError()
+
+    calls.clear()
+    with pytest.raises(ValueError):
+        scheduler.call(fail)
+    assert len(calls) == 1
@@ -0,0 +1,168 @@
+import time
+
+import numpy as np
+import pytest
+
+from src.seq2seq import Seq2Seq
+from src.streaming import ChatStream
+
+
+def test_importable():
+    import src.response_cache  # noqa: F401
+    from src.response_cache import CachedSeq2Seq, ResponseCache  # noqa: F401
+
+
+class CountingSeq2Seq(Seq2Seq):
+    """Echoes the last message, counting the calls."""
+    model = 'counting'
+
+    def __init__(self, delay_seconds: float = 0.0):
+        self.delay_seconds = delay_seconds
+        self.calls = 0
+
+    def chat(self, messages, **kwargs):
+        self.calls += 1
+        time.sleep(self.delay_seconds)
+        return messages[-1]['content'].upper()
+
+    def chat_stream(self, messages, **kwargs):
+        return ChatStream(list(self.chat(messages, **kwargs)))
+
+
+class WordEncoder:
+    """Bag-of-words embeddings over a fixed vocabulary."""
+    vocabulary = ['hello', 'world', 'goodbye', 'moon', 'hi']
+
+    def encode_batch(self, texts):
+        return np.asarray([
+            [text.lower().count(word) for word in self.vocabulary]
+            for text in texts
+        ], dtype=np.float32)
+
+
+def messages(content: str) -> list:
+    return [{'role': 'user', 'content': content}]
+
+
+@pytest.fixture
+def cache_path(tmp_path) -> str:
+    return str(tmp_path / 'responses.sqlite')
+
+
+def test_cache_key_normalized():
+    from src.response_cache import cache_key
+    assert cache_key('m', messages('hello  world\n'), {}) \
+        == cache_key('m', messages('hello world'), {})
+    assert cache_key('m', messages('hello'), {'max_tokens': 1}) \
+        != cache_key('m', messages('hello'), {'max_tokens': 2})
+    assert cache_key('m', messages('hello'), {}) \
+        != cache_key('n', messages('hello'), {})
+
+
+def test_exact_hit():
+    from src.response_cache import CachedSeq2Seq
+    seq2seq = CountingSeq2Seq(delay_seconds=0.01)
+    cached = CachedSeq2Seq(seq2seq, cost_per_1k_tokens=1.0)
+    assert cached.chat(messages('hello'), temperature=0) == 'HELLO'
+    assert cached.chat(messages(' hello '), temperature=0) == 'HELLO'
+    assert seq2seq.calls == 1
+    assert cached.stats.exact_hits == 1
+    assert cached.stats.misses == 1
+    assert cached.stats.saved_seconds > 0
+    assert cached.stats.saved_tokens > 0
+    assert cached.stats.saved_cost > 0
+    assert 'hit rate 50.0%' in cached.report()
+
+
+def test_bypass_temperature():
+    from src.response_cache import CachedSeq2Seq
+    seq2seq = CountingSeq2Seq()
+    cached = CachedSeq2Seq(seq2seq)
+    cached.chat(messages('hello'), temperature=0.7)
+    cached.chat(messages('hello'), temperature=0.7)
+    assert seq2seq.calls == 2
+    assert cached.stats.bypassed == 2
+    assert len(cached.cache) == 0
+
+
+def test_semantic_hit():
+    from src.response_cache import CachedSeq2Seq
+    seq2seq = CountingSeq2Seq()
+    cached = CachedSeq2Seq(seq2seq, encoder=WordEncoder(),
+                           similarity_threshold=0.9)
+    assert cached.chat(messages('hello world')) == 'HELLO WORLD'
+    # same words, another request
+    assert cached.chat(messages('world, hello!')) == 'HELLO WORLD'
+    assert cached.chat(messages('goodbye moon')) == 'GOODBYE MOON'
+    # other generation parameters, other scope
+    cached.chat(messages('world hello'), max_tokens=5)
+    assert seq2seq.calls == 3
+    assert cached.stats.semantic_hits == 1
+
+
+def test_ttl():
+    from src.response_cache import CachedSeq2Seq, ResponseCache
+    seq2seq = CountingSeq2Seq()
+    cached = CachedSeq2Seq(seq2seq, cache=ResponseCache(ttl_seconds=0.01))
+    cached.chat(messages('hello'))
+    time.sleep(0.02)
+    cached.chat(messages('hello'))
+    assert seq2seq.calls == 2
+    assert cached.stats.expired == 1
+
+
+def test_lru_eviction():
+    from src.response_cache import CachedSeq2Seq, ResponseCache
+    seq2seq = CountingSeq2Seq()
+    cached = CachedSeq2Seq(seq2seq, cache=ResponseCache(max_entries=2))
+    for content in ['a', 'b', 'a', 'c']:
+        cached.chat(messages(content))
+    assert len(cached.cache) == 2
+    assert cached.stats.evictions == 1
+    # 'b' was the least recently used
+    cached.chat(messages('a'))
+    cached.chat(messages('b'))
+    assert seq2seq.calls == 4
+
+
+def test_disk_persistence(cache_path):
+    from src.response_cache import CachedSeq2Seq, ResponseCache
+    cache = ResponseCache(path=cache_path)
+    CachedSeq2Seq(CountingSeq2Seq(), cache=cache,
+                  encoder=WordEncoder()).chat(messages('hello world'))
+    cache.close()
+
+    seq2seq = CountingSeq2Seq()
+    cached = CachedSeq2Seq(seq2seq, cache=ResponseCache(path=cache_path),
+                           encoder=WordEncoder())
+    assert cached.chat(messages('hello world')) == 'HELLO WORLD'
+    assert cached.chat(messages('world hello')) == 'HELLO WORLD'
+    assert seq2seq.calls == 0
+
+
+def test_chat_stream():
+    from src.response_cache import CachedSeq2Seq
+    seq2seq = CountingSeq2Seq()
+    cached = CachedSeq2Seq(seq2seq)
+    assert ''.join(cached.chat_stream(messages('hello'))) == 'HELLO'
+    stream = cached.chat_stream(messages('hello'))
+    assert list(stream) == ['HELLO']
+    assert seq2seq.calls == 1
+
+    # incomplete streams are not cached
+    stream = cached.chat_stream(messages('bye'))
+    next(stream)
+    stream.close()
+    assert ''.join(cached.chat_stream(messages('bye'))) == 'BYE'
+    assert seq2seq.calls == 3
+
+
+def test_new_with_cache():
+    from src.seq2seq import Seq2SeqProvider
+    from src.response_cache import CachedSeq2Seq, ResponseCache
+    seq2seq = Seq2Seq.new(Seq2SeqProvider.MOCKUP, cache=ResponseCache())
+    assert isinstance(seq2seq, CachedSeq2Seq)
+    assert seq2seq.delay_seconds == 0.0
+    seq2seq.chat(messages('hello'))
+    seq2seq.chat(messages('hello'))
+    assert seq2seq.stats.exact_hits == 1
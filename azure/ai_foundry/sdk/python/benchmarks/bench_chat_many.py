@@ -0,0 +1,128 @@
+# Per-call overhead of a new connection per request (requests.post),
+# a pooled keep-alive session (RequestsSeq2Seq), and concurrent calls
+# over one pooled async client (AsyncRequestsSeq2Seq.chat_many),
+# against a local stub of a chat completions endpoint with simulated
+# latency.
+#
+# usage (from azure/ai_foundry/sdk/python):
+#   python -m benchmarks.bench_chat_many --calls 200 --latency-ms 20
+
+import json
+import math
+import time
+import asyncio
+import logging
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+from src.requests_seq2seq import RequestsSeq2Seq
+from src.async_requests_seq2seq import AsyncRequestsSeq2Seq
+
+
+def make_handler(latency_seconds: float):
+
+    class ChatCompletionsHandler(BaseHTTPRequestHandler):
+        """
+        Stub of a chat completions endpoint, HTTP/1.1 keep-alive
+        """
+        protocol_version = 'HTTP/1.1'
+        # headers and body go out as separate writes
+        disable_nagle_algorithm = True
+
+        def do_POST(self):
+            self.rfile.read(int(self.headers['Content-Length']))
+            time.sleep(latency_seconds)
+            payload = json.dumps({'choices': [{'index': 0, 'message': {
+                'role': 'assistant', 'content': 'stub'}}]}).encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, format, *args):
+            pass
+
+    return ChatCompletionsHandler
+
+
+def report(name: str, calls: int, seconds: float, ideal_seconds: float,
+           baseline_seconds: float = None) -> None:
+    """
+    @param ideal_seconds: wall-clock time of the simulated latency alone
+    """
+    overhead_ms = (seconds - ideal_seconds) / calls * 1000
+    line = f"{name:<34} {calls / seconds:>8.1f} calls/s  " \
+        f"overhead {overhead_ms:>6.2f} ms/call"
+    if baseline_seconds:
+        line += f"  speed-up x{baseline_seconds / seconds:.1f}"
+    print(line)
+
+
+class BenchmarkServer(ThreadingHTTPServer):
+    # accept a burst of concurrent connections
+    request_queue_size = 128
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--calls', type=int, default=200)
+    parser.add_argument('--latency-ms', type=float, default=20.0)
+    parser.add_argument('--max-concurrency', type=int, default=16)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+    latency_seconds = args.latency_ms / 1000
+
+    server = BenchmarkServer(('127.0.0.1', 0), make_handler(latency_seconds))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    endpoint_url = f'http://127.0.0.1:{server.server_port}'
+    messages = [{'role': 'user', 'content': 'hi'}]
+    headers = {'Content-Type': 'application/json',
+               'Authorization': 'Bearer stub'}
+
+    # new connection per call
+    start = time.perf_counter()
+    for _ in range(args.calls):
+        response = requests.post(endpoint_url, headers=headers,
+                                 data=json.dumps({'messages': messages}))
+        response.json()['choices'][0]['message']['content']
+    unpooled_seconds = time.perf_counter() - start
+
+    # one keep-alive session
+    seq2seq = RequestsSeq2Seq(endpoint_url=endpoint_url, api_key='stub')
+    start = time.perf_counter()
+    for _ in range(args.calls):
+        seq2seq.chat(messages)
+    pooled_seconds = time.perf_counter() - start
+    seq2seq.close()
+
+    # concurrent calls over one pooled async client
+    async def run_many():
+        async with AsyncRequestsSeq2Seq(
+                endpoint_url=endpoint_url,
+                api_key='stub',
+                max_concurrency=args.max_concurrency) as async_seq2seq:
+            return await async_seq2seq.chat_many([messages] * args.calls)
+
+    start = time.perf_counter()
+    responses = asyncio.run(run_many())
+    async_seconds = time.perf_counter() - start
+    server.shutdown()
+
+    assert responses == ['stub'] * args.calls
+    sequential_seconds = args.calls * latency_seconds
+    report('requests.post (no session)', args.calls, unpooled_seconds,
+           sequential_seconds)
+    report('RequestsSeq2Seq (session)', args.calls, pooled_seconds,
+           sequential_seconds, unpooled_seconds)
+    # latency overlaps across concurrent calls
+    concurrent_seconds = math.ceil(args.calls / args.max_concurrency) \
+        * latency_seconds
+    report(f'chat_many (concurrency {args.max_concurrency})', args.calls,
+           async_seconds, concurrent_seconds, unpooled_seconds)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,156 @@
+# Simulated pool of endpoints serving the same model: a fast region,
+# a slow region, and a region with a heavy latency tail that also goes
+# down for a while. Compares round-robin with the RouterSeq2Seq
+# strategies, with and without hedging, on latency percentiles and
+# failed requests.
+#
+# usage (from azure/ai_foundry/sdk/python):
+#   python -m benchmarks.bench_router --requests 600 --concurrency 8
+
+import time
+import random
+import logging
+import argparse
+import itertools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+import numpy as np
+
+from src.seq2seq import Seq2Seq
+from src.streaming import ChatStream
+from src.router import RouterSeq2Seq, RoutingStrategy
+
+MESSAGES = [{'role': 'user', 'content': 'hi'}]
+
+
+class SimulatedEndpoint(Seq2Seq):
+    """
+    Endpoint with a lognormal latency, an optional latency tail,
+    and an outage window
+    """
+
+    def __init__(self, name: str, median_seconds: float,
+                 tail_probability: float = 0.0, tail_seconds: float = 0.0,
+                 outage: tuple = None, seed: int = 0):
+        """
+        @param outage: (start, end) seconds since the benchmark start,
+            requests fail fast in this window
+        """
+        self.name = name
+        self.median_seconds = median_seconds
+        self.tail_probability = tail_probability
+        self.tail_seconds = tail_seconds
+        self.outage = outage
+        self.start = time.monotonic()
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def chat(self, messages: List[dict], **kwargs) -> str:
+        with self._lock:
+            latency = self.median_seconds * self._random.lognormvariate(0, 0.25)
+            if self._random.random() < self.tail_probability:
+                latency += self.tail_seconds
+        elapsed = time.monotonic() - self.start
+        if self.outage and self.outage[0] <= elapsed < self.outage[1]:
+            time.sleep(0.002)
+            raise ConnectionError(f"{self.name} is down")
+        time.sleep(latency)
+        return self.name
+
+    def chat_stream(self, messages: List[dict], **kwargs) -> ChatStream:
+        return ChatStream([self.chat(messages, **kwargs)])
+
+
+class RoundRobinSeq2Seq(Seq2Seq):
+    """
+    Baseline: each request to the next endpoint, no failover
+    """
+
+    def __init__(self, endpoints: List[Seq2Seq]):
+        self._endpoints = itertools.cycle(endpoints)
+        self._lock = threading.Lock()
+
+    def chat(self, messages: List[dict], **kwargs) -> str:
+        with self._lock:
+            endpoint = next(self._endpoints)
+        return endpoint.chat(messages, **kwargs)
+
+    def chat_stream(self, messages: List[dict], **kwargs) -> ChatStream:
+        raise NotImplementedError
+
+
+def make_endpoints(args) -> List[Seq2Seq]:
+    scale = args.latency_ms / 1000
+    return [
+        SimulatedEndpoint('fast', scale, seed=1),
+        SimulatedEndpoint('slow', 3 * scale, seed=2),
+        SimulatedEndpoint('tail', scale, tail_probability=0.1,
+                          tail_seconds=10 * scale,
+                          outage=(0.3 * args.duration_hint,
+                                  0.5 * args.duration_hint), seed=3),
+    ]
+
+
+def run(seq2seq: Seq2Seq, args) -> tuple:
+    def timed_chat(_):
+        start = time.perf_counter()
+        try:
+            seq2seq.chat(MESSAGES)
+        except Exception:
+            return None
+        return time.perf_counter() - start
+
+    with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        latencies = list(executor.map(timed_chat, range(args.requests)))
+    failed = sum(latency is None for latency in latencies)
+    latencies = np.asarray([latency for latency in latencies
+                            if latency is not None])
+    return latencies, failed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--requests', type=int, default=600)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--latency-ms', type=float, default=10.0)
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+    # round-robin throughput, to place the outage mid-run
+    args.duration_hint = args.requests / args.concurrency \
+        * 5 * args.latency_ms / 1000 / 3
+
+    names = ['fast', 'slow', 'tail']
+    scenarios = [
+        ('round-robin', lambda endpoints: RoundRobinSeq2Seq(endpoints)),
+        ('least outstanding', lambda endpoints: RouterSeq2Seq(
+            endpoints, names, hedge_percentile=None, reset_seconds=0.1)),
+        ('ewma', lambda endpoints: RouterSeq2Seq(
+            endpoints, names, strategy=RoutingStrategy.EWMA,
+            hedge_percentile=None, reset_seconds=0.1)),
+        ('ewma + hedge p90', lambda endpoints: RouterSeq2Seq(
+            endpoints, names, strategy=RoutingStrategy.EWMA,
+            hedge_percentile=90, reset_seconds=0.1)),
+    ]
+    print(f"{'':<20} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+          f"{'failed':>7} {'seconds':>8}")
+    for name, make_router in scenarios:
+        seq2seq = make_router(make_endpoints(args))
+        start = time.perf_counter()
+        latencies, failed = run(seq2seq, args)
+        seconds = time.perf_counter() - start
+        p50, p95, p99 = np.percentile(latencies, [50, 95, 99]) * 1000
+        print(f"{name:<20} {p50:>8.1f} {p95:>8.1f} {p99:>8.1f} "
+              f"{failed:>7} {seconds:>8.2f}")
+        if isinstance(seq2seq, RouterSeq2Seq):
+            for endpoint in seq2seq.report():
+                print(f"{'':<4}{endpoint['name']:<8} requests "
+                      f"{endpoint['requests']:>4}  wins {endpoint['wins']:>4}  "
+                      f"failures {endpoint['failures']:>3}  "
+                      f"hedges {endpoint['hedges']:>3}")
+            seq2seq.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -20,7 +20,7 @@ class AIInferenceChat:
     """
     Class to generate a text with Azure AI Inference ChatCompletionsClient
     """
-    _chat_client: ChatCompletionsClient
+    _chat_client: ChatCompletionsClient = None
     _endpoint_url: str
     _api_key: str
 
@@ -43,6 +43,9 @@ class AIInferenceChat:
         logging.info("Completed AI Inference ChatCompletionsClient configuration.")
 
     def _init_chat_client(self) -> None:
+        # the client, and its connection pool, is created once and reused
+        if self._chat_client is not None:
+            return
         credential = AzureKeyCredential(self._api_key)
         self._chat_client = ChatCompletionsClient(
             endpoint=self._endpoint_url,
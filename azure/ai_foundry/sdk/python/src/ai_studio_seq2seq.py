@@ -3,6 +3,7 @@
 import os
 import logging
 import json
+import time
 # import urllib.request
 # import ssl
 from typing import List
@@ -11,6 +12,8 @@ from azure.ai.inference import ChatCompletionsClient
 from azure.core.credentials import AzureKeyCredential
 
 from src.seq2seq import Seq2Seq
+from src.streaming import ChatStream
+from src.rate_limiting import TokenBudgetScheduler, estimate_tokens
 from src.encrypt import mask_key
 
 # constants
@@ -22,14 +25,16 @@ class AIStudioSeq2Seq(Seq2Seq):
     """
     Class to generate a text with Azure AI Studio
     """
-    _chat_client: ChatCompletionsClient
+    _chat_client: ChatCompletionsClient = None
     _endpoint_url: str
     _api_key: str
+    scheduler: TokenBudgetScheduler
 
     def __init__(
         self,
         endpoint_url: str = None,
         api_key: str = None,
+        scheduler: TokenBudgetScheduler = None,
     ):
         logging.info("Start AI Studio configuration ...")
 
@@ -37,6 +42,9 @@ class AIStudioSeq2Seq(Seq2Seq):
             else os.getenv(ENV_KEY_SEQ2SEQ_ENDPOINT_URL)
         self._api_key = api_key if api_key \
             else os.getenv(ENV_KEY_SEQ2SEQ_KEY)
+        # share one scheduler between the clients of the same deployment
+        self.scheduler = scheduler if scheduler is not None \
+            else TokenBudgetScheduler()
 
         # log configuration
         logging.info(f"Azure AI Studio azure_endpoint: {self._endpoint_url}")
@@ -45,10 +53,22 @@ class AIStudioSeq2Seq(Seq2Seq):
         logging.info("Completed AI Studio configuration.")
 
     def _init_chat_client(self) -> None:
+        # the client, and its connection pool, is created once and reused
+        if self._chat_client is not None:
+            return
         credential = AzureKeyCredential(self._api_key)
+        # retries are left to the scheduler, which sees every throttled call
         self._chat_client = ChatCompletionsClient(
             endpoint=self._endpoint_url,
-            credential=credential
+            credential=credential,
+            retry_total=0
+        )
+
+    @staticmethod
+    def _estimate_tokens(messages: List[dict], kwargs: dict) -> int:
+        return estimate_tokens(
+            [msg['content'] for msg in messages],
+            kwargs.get('max_tokens', 0)
         )
 
     def chat(self, messages: List[dict], **kwargs) -> str:
@@ -62,12 +82,47 @@ class AIStudioSeq2Seq(Seq2Seq):
 
         self._init_chat_client()
 
-        response = self._chat_client.complete(
+        response = self.scheduler.call(
+            self._chat_client.complete,
             messages=messages,
-            model_extras=kwargs
+            model_extras=kwargs,
+            tokens=self._estimate_tokens(messages, kwargs)
         )
 
         result = response.choices[0].message.content
         logging.info("Completed chatCompletion method.")
 
         return result
+
+    def _iter_deltas(self, response, usage: dict):
+        try:
+            for update in response:
+                if update.usage:
+                    usage['completion_tokens'] = update.usage.completion_tokens
+                if update.choices and update.choices[0].delta.content:
+                    yield update.choices[0].delta.content
+        finally:
+            response.close()
+
+    def chat_stream(self, messages: List[dict], **kwargs) -> ChatStream:
+        """
+        chat, streaming the completion
+        @param messages: list of messages, each with keys 'role' and 'content'
+        @return: iterator over the text deltas, as they arrive
+        """
+        logging.info("Start chat_stream method ...")
+        logging.info(f"kwargs: {json.dumps(kwargs)}")
+
+        self._init_chat_client()
+
+        start = time.perf_counter()
+        response = self.scheduler.call(
+            self._chat_client.complete,
+            stream=True,
+            messages=messages,
+            model_extras=kwargs,
+            tokens=self._estimate_tokens(messages, kwargs)
+        )
+        usage = {}
+        return ChatStream(self._iter_deltas(response, usage), usage=usage,
+                          start=start)
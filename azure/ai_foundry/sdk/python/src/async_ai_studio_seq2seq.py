@@ -0,0 +1,83 @@
+# References:
+# * https://learn.microsoft.com/en-us/python/api/azure-ai-inference/azure.ai.inference.aio.chatcompletionsclient  # noqa E501
+import os
+import logging
+import json
+from typing import List
+
+from azure.ai.inference.aio import ChatCompletionsClient
+from azure.core.credentials import AzureKeyCredential
+
+from src.async_seq2seq import AsyncSeq2Seq, DEFAULT_MAX_CONCURRENCY
+from src.encrypt import mask_key
+
+# constants
+ENV_KEY_SEQ2SEQ_ENDPOINT_URL = "SEQ2SEQ_ENDPOINT_URL"
+ENV_KEY_SEQ2SEQ_KEY = "SEQ2SEQ_KEY"
+
+
+class AsyncAIStudioSeq2Seq(AsyncSeq2Seq):
+    """
+    Class to generate a text with Azure AI Studio, asynchronously,
+    with one long-lived ChatCompletionsClient
+    """
+    _chat_client: ChatCompletionsClient = None
+    _endpoint_url: str
+    _api_key: str
+
+    def __init__(
+        self,
+        endpoint_url: str = None,
+        api_key: str = None,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY
+    ):
+        logging.info("Start async AI Studio configuration ...")
+
+        self._endpoint_url = endpoint_url if endpoint_url \
+            else os.getenv(ENV_KEY_SEQ2SEQ_ENDPOINT_URL)
+        self._api_key = api_key if api_key \
+            else os.getenv(ENV_KEY_SEQ2SEQ_KEY)
+        self.max_concurrency = max_concurrency
+
+        # log configuration
+        logging.info(f"Azure AI Studio azure_endpoint: {self._endpoint_url}")
+        logging.info(f"Azure AI Studio api_key: {mask_key(self._api_key, 2, -2)}")
+
+        logging.info("Completed async AI Studio configuration.")
+
+    def _init_chat_client(self) -> None:
+        # the client, and its connection pool, is created once and reused
+        if self._chat_client is not None:
+            return
+        self._chat_client = ChatCompletionsClient(
+            endpoint=self._endpoint_url,
+            credential=AzureKeyCredential(self._api_key)
+        )
+
+    async def chat(self, messages: List[dict], **kwargs) -> str:
+        """
+        chat
+        @param messages: list of messages, each with keys 'role' and 'content'
+        @return: chat text
+        """
+        logging.info("Start chat method ...")
+        logging.info(f"kwargs: {json.dumps(kwargs)}")
+
+        self._init_chat_client()
+
+        response = await self._chat_client.complete(
+            messages=messages,
+            model_extras=kwargs
+        )
+
+        result = response.choices[0].message.content
+        logging.info("Completed chatCompletion method.")
+        return result
+
+    async def close(self) -> None:
+        """
+        Close the client and its connection pool
+        """
+        if self._chat_client is not None:
+            await self._chat_client.close()
+            self._chat_client = None
@@ -0,0 +1,108 @@
+# ref:
+# * https://www.python-httpx.org/async/
+# * https://www.python-httpx.org/http2/
+import os
+import json
+import logging
+from typing import List
+
+import httpx
+
+from src.async_seq2seq import AsyncSeq2Seq, DEFAULT_MAX_CONCURRENCY
+from src.encrypt import mask_key
+
+# constants
+ENV_KEY_SEQ2SEQ_ENDPOINT_URL = "SEQ2SEQ_ENDPOINT_URL"
+ENV_KEY_SEQ2SEQ_KEY = "SEQ2SEQ_KEY"
+DEFAULT_TIMEOUT_SECONDS = 60.0
+
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:  # optional, HTTP/1.1 keep-alive without it
+    HTTP2_AVAILABLE = False
+
+
+class AsyncRequestsSeq2Seq(AsyncSeq2Seq):
+    """
+    Class to generate a text with an OpenAI-compatible chat endpoint,
+    asynchronously, over one long-lived connection pool
+    """
+    _endpoint_url: str
+    _api_key: str
+    _client: httpx.AsyncClient = None
+
+    def __init__(
+        self,
+        endpoint_url: str = None,
+        api_key: str = None,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        timeout_seconds: float = DEFAULT_TIMEOUT_SECONDS,
+        http2: bool = HTTP2_AVAILABLE
+    ):
+        logging.info("Start AsyncRequestsSeq2Seq configuration ...")
+
+        self._endpoint_url = endpoint_url if endpoint_url \
+            else os.getenv(ENV_KEY_SEQ2SEQ_ENDPOINT_URL)
+        self._api_key = api_key if api_key \
+            else os.getenv(ENV_KEY_SEQ2SEQ_KEY)
+        self.max_concurrency = max_concurrency
+        self._timeout_seconds = timeout_seconds
+        self._http2 = http2
+
+        # log configuration
+        logging.info(f"Azure endpoint: {self._endpoint_url}")
+        logging.info(f"Azure api_key: {mask_key(self._api_key, 2, -2)}")
+        logging.info(f"HTTP/2: {self._http2}")
+
+        logging.info("Completed configuration.")
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """
+        Get (or initialize) the pooled HTTP client
+        @return: client
+        """
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                http2=self._http2,
+                limits=httpx.Limits(
+                    max_connections=self.max_concurrency,
+                    max_keepalive_connections=self.max_concurrency
+                ),
+                timeout=self._timeout_seconds,
+                headers={
+                    'Content-Type': 'application/json',
+                    'Accept': 'application/json',
+                    'Authorization': ('Bearer ' + self._api_key)
+                }
+            )
+        return self._client
+
+    async def chat(self, messages: List[dict], **kwargs) -> str:
+        """
+        chat
+        @param messages: list of messages, with format [{'role': 'user', 'content': 'foo'}]
+        @return: response text
+        """
+        logging.info("Start chat method ...")
+        logging.info(f"kwargs: {json.dumps(kwargs)}")
+
+        response = await self._get_client().post(
+            self._endpoint_url,
+            content=str.encode(json.dumps({"messages": messages, **kwargs}))
+        )
+        if response.is_error:
+            logging.error(f"{response.status_code} {response.text}")
+            response.raise_for_status()
+
+        result = response.json()['choices'][0]['message']['content']
+        logging.info("Completed chat method.")
+        return result
+
+    async def close(self) -> None:
+        """
+        Close the pooled connections
+        """
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
@@ -0,0 +1,68 @@
+import asyncio
+from abc import ABC, abstractmethod
+from typing import List
+
+from src.seq2seq import Seq2SeqProvider
+
+# constants
+DEFAULT_MAX_CONCURRENCY = 16
+
+
+class AsyncSeq2Seq(ABC):
+    """
+    Abstract class for asynchronous text generation
+    """
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY
+
+    @staticmethod
+    def new(provider: Seq2SeqProvider):
+        match provider:
+            case Seq2SeqProvider.MOCKUP:
+                from src.mockup_async_seq2seq import MockupAsyncSeq2Seq
+                return MockupAsyncSeq2Seq()
+            case Seq2SeqProvider.AI_STUDIO:
+                from src.async_ai_studio_seq2seq import AsyncAIStudioSeq2Seq
+                return AsyncAIStudioSeq2Seq()
+            case Seq2SeqProvider.REQUESTS:
+                from src.async_requests_seq2seq import AsyncRequestsSeq2Seq
+                return AsyncRequestsSeq2Seq()
+            case _:
+                raise ValueError(f"Invalid provider: {provider}")
+
+    @abstractmethod
+    async def chat(self, messages: List[dict], **kwargs) -> str:
+        raise NotImplementedError
+
+    async def chat_many(
+        self,
+        conversations: List[List[dict]],
+        max_concurrency: int = None,
+        **kwargs
+    ) -> List[str]:
+        """
+        Run several conversations concurrently
+        @param conversations: list of messages per conversation
+        @param max_concurrency: max conversations in flight,
+            default the instance max_concurrency
+        @param kwargs: passed to chat
+        @return: completions, aligned to the inputs
+        """
+        semaphore = asyncio.Semaphore(
+            max_concurrency if max_concurrency else self.max_concurrency)
+
+        async def bounded_chat(messages: List[dict]) -> str:
+            async with semaphore:
+                return await self.chat(messages, **kwargs)
+
+        # gather returns results in input order
+        return await asyncio.gather(*(
+            bounded_chat(messages) for messages in conversations))
+
+    async def close(self) -> None:
+        pass
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
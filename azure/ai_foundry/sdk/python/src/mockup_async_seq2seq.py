@@ -0,0 +1,27 @@
+import asyncio
+from typing import List
+
+from src.async_seq2seq import AsyncSeq2Seq
+from src.mockup_seq2seq import MOCKUP_COMPLETION
+
+
+class MockupAsyncSeq2Seq(AsyncSeq2Seq):
+    """
+    Class to generate a mockup text, asynchronously
+    """
+
+    def __init__(self, delay_seconds: float = 0.0):
+        """
+        @param delay_seconds: simulated latency of each chat
+        """
+        self.delay_seconds = delay_seconds
+
+    async def chat(self, messages: List[dict], **kwargs) -> str:
+        """
+        mock
+        @param messages: list of messages, each with keys 'role' and 'content'
+        @return: completion
+        """
+        if self.delay_seconds:
+            await asyncio.sleep(self.delay_seconds)
+        return MOCKUP_COMPLETION
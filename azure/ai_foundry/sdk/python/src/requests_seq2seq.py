@@ -1,10 +1,12 @@
 import os
 import logging
 import json
+import time
 import requests
 from typing import List
 
 from src.seq2seq import Seq2Seq
+from src.streaming import ChatStream, iter_sse_data
 from src.encrypt import mask_key
 
 # constants
@@ -17,7 +19,7 @@ class RequestsSeq2Seq(Seq2Seq):
     """
     _endpoint_url: str
     _api_key: str
-
+    _session: requests.Session
 
     def __init__(
         self,
@@ -35,6 +37,9 @@ class RequestsSeq2Seq(Seq2Seq):
         logging.info(f"Azure endpoint: {self._endpoint_url}")
         logging.info(f"Azure api_key: {mask_key(self._api_key, 2, -2)}")
 
+        # one session per instance: keep-alive connections are reused
+        self._session = requests.Session()
+
         logging.info("Completed configuration.")
 
 
@@ -61,7 +66,7 @@ class RequestsSeq2Seq(Seq2Seq):
         }
 
         try:
-            response = requests.post(
+            response = self._session.post(
                 url=self._endpoint_url, # + 'v1/chat/completions'
                 headers=headers,
                 data=str.encode(json.dumps(request_data))
@@ -77,6 +82,52 @@ class RequestsSeq2Seq(Seq2Seq):
             raise ex
 
 
+    def _iter_deltas(self, response: requests.Response, usage: dict):
+        try:
+            for data in iter_sse_data(response.iter_lines()):
+                chunk = json.loads(data)
+                if chunk.get('usage'):
+                    usage['completion_tokens'] = \
+                        chunk['usage'].get('completion_tokens')
+                choices = chunk.get('choices')
+                if choices and choices[0].get('delta', {}).get('content'):
+                    yield choices[0]['delta']['content']
+        finally:
+            response.close()
+
+    def chat_stream(self, messages: List[dict], **kwargs) -> ChatStream:
+        """
+        chat, streaming the completion as server-sent events
+        @param messages: list of messages, with format [{'role': 'user', 'content': 'foo'}]
+        @return: iterator over the text deltas, as they arrive
+        """
+        logging.info("Start chat_stream method ...")
+        logging.info(f"kwargs: {json.dumps(kwargs)}")
+
+        request_data = {
+            "messages": messages,
+            **kwargs,
+            "stream": True
+        }
+
+        headers = {
+            'Content-Type': 'application/json',
+            'Accept': 'text/event-stream',
+            'Authorization': ('Bearer ' + self._api_key)
+        }
+
+        start = time.perf_counter()
+        response = self._session.post(
+            url=self._endpoint_url,
+            headers=headers,
+            data=str.encode(json.dumps(request_data)),
+            stream=True
+        )
+        response.raise_for_status()
+        usage = {}
+        return ChatStream(self._iter_deltas(response, usage), usage=usage, start=start)
+
+
     def completion(self, input_strings: List[str], **kwargs) -> str:
         """
         completion
@@ -100,7 +151,7 @@ class RequestsSeq2Seq(Seq2Seq):
         }
 
         try:
-            response = requests.post(
+            response = self._session.post(
                 url=self._endpoint_url, # + '/score'
                 headers=headers,
                 data=str.encode(json.dumps(request_data))
@@ -140,7 +191,7 @@ class RequestsSeq2Seq(Seq2Seq):
         }
 
         try:
-            response = requests.post(
+            response = self._session.post(
                 url=self._endpoint_url,  # + '/score'
                 headers=headers,
                 data=str.encode(json.dumps(request_data))
@@ -154,3 +205,9 @@ class RequestsSeq2Seq(Seq2Seq):
         except Exception as ex:
             logging.exception(f"{ex.code} {ex.info()} {ex.read().decode('utf8', 'ignore')}")
             raise ex
+
+    def close(self) -> None:
+        """
+        Close the pooled connections
+        """
+        self._session.close()
@@ -0,0 +1,359 @@
+# ref:
+# * https://martinfowler.com/bliki/CircuitBreaker.html
+# * https://research.google/pubs/the-tail-at-scale/ (hedged requests)
+# * https://en.wikipedia.org/wiki/Exponential_smoothing
+
+import time
+import logging
+import threading
+from collections import deque
+from functools import partial
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from enum import Enum
+from typing import List, Optional
+
+import numpy as np
+
+from src.seq2seq import Seq2Seq
+from src.streaming import ChatStream
+
+# constants
+DEFAULT_EWMA_ALPHA = 0.2
+DEFAULT_FAILURE_THRESHOLD = 5  # consecutive failures opening a circuit
+DEFAULT_RESET_SECONDS = 30.0  # open circuit duration before a probe
+DEFAULT_HEDGE_PERCENTILE = 95.0
+DEFAULT_LATENCY_WINDOW = 200  # recent latencies of the hedge percentile
+MIN_HEDGE_SAMPLES = 20
+DEFAULT_MAX_WORKERS = 32
+
+
+class RoutingStrategy(Enum):
+    LEAST_OUTSTANDING = 'least_outstanding'
+    EWMA = 'ewma'
+
+
+class CircuitState(Enum):
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+
+class CircuitBreaker:
+    """
+    Opens after consecutive failures; once reset_seconds have passed,
+    lets a single probe through (half-open), which closes the circuit
+    on success and re-opens it on failure.
+    Not thread-safe, guarded by its router.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+        reset_seconds: float = DEFAULT_RESET_SECONDS
+    ):
+        """
+        @param failure_threshold: consecutive failures opening the circuit
+        @param reset_seconds: open duration before a probe
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.failures = 0
+        self._opened_at = None
+        self._probing = False
+
+    @property
+    def state(self) -> CircuitState:
+        if self._opened_at is None:
+            return CircuitState.CLOSED
+        if time.monotonic() - self._opened_at < self.reset_seconds:
+            return CircuitState.OPEN
+        return CircuitState.HALF_OPEN
+
+    def available(self) -> bool:
+        """
+        @return: True if a request may be sent
+        """
+        state = self.state
+        return state == CircuitState.CLOSED \
+            or (state == CircuitState.HALF_OPEN and not self._probing)
+
+    def acquire(self) -> None:
+        """
+        Take the request slot, the only one when half-open
+        """
+        if self.state == CircuitState.HALF_OPEN:
+            self._probing = True
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self._opened_at = None
+        self._probing = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self._probing or self.failures >= self.failure_threshold:
+            if self._opened_at is None or self._probing:
+                logging.warning(f"Open circuit after {self.failures} failures.")
+            self._opened_at = time.monotonic()
+        self._probing = False
+
+
+@dataclass
+class EndpointStats:
+    requests: int = 0
+    failures: int = 0
+    hedges: int = 0
+    wins: int = 0
+
+
+class Endpoint:
+    """
+    A provider of the pool, with its load and latency
+    """
+
+    def __init__(
+        self,
+        seq2seq: Seq2Seq,
+        name: str,
+        breaker: CircuitBreaker,
+        ewma_alpha: float = DEFAULT_EWMA_ALPHA,
+        latency_window: int = DEFAULT_LATENCY_WINDOW
+    ):
+        self.seq2seq = seq2seq
+        self.name = name
+        self.breaker = breaker
+        self.ewma_alpha = ewma_alpha
+        self.outstanding = 0
+        self.ewma_seconds = None
+        self.latencies = deque(maxlen=latency_window)
+        self.stats = EndpointStats()
+
+    def record_latency(self, seconds: float) -> None:
+        self.latencies.append(seconds)
+        self.ewma_seconds = seconds if self.ewma_seconds is None \
+            else self.ewma_alpha * seconds \
+            + (1 - self.ewma_alpha) * self.ewma_seconds
+
+
+class RouterSeq2Seq(Seq2Seq):
+    """
+    Seq2Seq routing each request to one of a pool of providers serving
+    the same model: picks the least loaded (or fastest) endpoint whose
+    circuit is closed, fails over to the next on error, and hedges a
+    request on another endpoint once it is slower than a percentile
+    of the recent latencies.
+    """
+
+    def __init__(
+        self,
+        endpoints: List[Seq2Seq],
+        names: List[str] = None,
+        strategy: RoutingStrategy = RoutingStrategy.LEAST_OUTSTANDING,
+        hedge_percentile: Optional[float] = DEFAULT_HEDGE_PERCENTILE,
+        failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+        reset_seconds: float = DEFAULT_RESET_SECONDS,
+        ewma_alpha: float = DEFAULT_EWMA_ALPHA,
+        max_workers: int = DEFAULT_MAX_WORKERS
+    ):
+        """
+        @param endpoints: providers of the same model
+        @param names: endpoint names, default the provider class and index
+        @param strategy: endpoint selection
+        @param hedge_percentile: latency percentile after which a request
+            is hedged, None disables hedging
+        @param failure_threshold: consecutive failures opening a circuit
+        @param reset_seconds: open circuit duration before a probe
+        @param ewma_alpha: weight of the latest latency in the EWMA
+        @param max_workers: max concurrent requests, hedges included
+        """
+        if not endpoints:
+            raise ValueError("No endpoint to route to")
+        names = names if names else [
+            f"{type(seq2seq).__name__}-{i}" for i, seq2seq in enumerate(endpoints)]
+        self.endpoints = [
+            Endpoint(seq2seq, name,
+                     CircuitBreaker(failure_threshold, reset_seconds),
+                     ewma_alpha)
+            for seq2seq, name in zip(endpoints, names)
+        ]
+        self.strategy = strategy
+        self.hedge_percentile = hedge_percentile
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+
+    def _score(self, endpoint: Endpoint) -> tuple:
+        # endpoints without latency yet are tried first
+        ewma = endpoint.ewma_seconds if endpoint.ewma_seconds is not None \
+            else 0.0
+        if self.strategy == RoutingStrategy.EWMA:
+            # expected wait behind the requests in flight
+            return ewma * (endpoint.outstanding + 1), endpoint.outstanding
+        return endpoint.outstanding, ewma
+
+    def _select(self, exclude: set) -> Optional[Endpoint]:
+        """
+        Pick an endpoint, and count the request as outstanding
+        @param exclude: endpoints already tried
+        @return: endpoint, None if none is available
+        """
+        with self._lock:
+            candidates = [endpoint for endpoint in self.endpoints
+                          if endpoint not in exclude
+                          and endpoint.breaker.available()]
+            if not candidates:
+                return None
+            endpoint = min(candidates, key=self._score)
+            endpoint.breaker.acquire()
+            endpoint.outstanding += 1
+            endpoint.stats.requests += 1
+            return endpoint
+
+    def _release(self, endpoint: Endpoint, seconds: float,
+                 error: Exception = None, stream: bool = False) -> None:
+        with self._lock:
+            endpoint.outstanding -= 1
+            if error is not None:
+                endpoint.breaker.record_failure()
+                endpoint.stats.failures += 1
+            elif not stream:
+                endpoint.breaker.record_success()
+                endpoint.record_latency(seconds)
+            # an opened stream is not a completion: its latency stays out
+            # of the EWMA and hedge window, and the breaker waits for its end
+
+    def _finish_stream(self, endpoint: Endpoint,
+                       error: Exception = None) -> None:
+        with self._lock:
+            if error is None:
+                endpoint.breaker.record_success()
+            else:
+                logging.warning(
+                    f"Endpoint {endpoint.name} failed mid-stream: {error}")
+                endpoint.breaker.record_failure()
+                endpoint.stats.failures += 1
+
+    def _call(self, endpoint: Endpoint, method: str,
+              messages: List[dict], kwargs: dict):
+        stream = method == 'chat_stream'
+        start = time.perf_counter()
+        try:
+            result = getattr(endpoint.seq2seq, method)(messages, **kwargs)
+        except Exception as ex:
+            logging.warning(f"Endpoint {endpoint.name} failed: {ex}")
+            self._release(endpoint, time.perf_counter() - start, ex, stream)
+            raise
+        self._release(endpoint, time.perf_counter() - start, stream=stream)
+        return result
+
+    def hedge_delay(self) -> Optional[float]:
+        """
+        Latency after which a request is hedged
+        @return: seconds, None until enough latencies are recorded
+        """
+        if self.hedge_percentile is None or len(self.endpoints) < 2:
+            return None
+        with self._lock:
+            latencies = [seconds for endpoint in self.endpoints
+                         for seconds in endpoint.latencies]
+        if len(latencies) < MIN_HEDGE_SAMPLES:
+            return None
+        return float(np.percentile(latencies, self.hedge_percentile))
+
+    def chat(self, messages: List[dict], **kwargs) -> str:
+        """
+        chat on the selected endpoint, failing over and hedging
+        @param messages: list of messages, each with keys 'role' and 'content'
+        @param kwargs: passed to the endpoint chat
+        @return: completion of the first endpoint to succeed
+        """
+        tried = set()
+        pending = {}
+        last_error = None
+
+        def launch(hedge: bool = False) -> bool:
+            endpoint = self._select(tried)
+            if endpoint is None:
+                return False
+            tried.add(endpoint)
+            if hedge:
+                with self._lock:
+                    endpoint.stats.hedges += 1
+            future = self._executor.submit(
+                self._call, endpoint, 'chat', messages, kwargs)
+            pending[future] = endpoint
+            return True
+
+        if not launch():
+            raise RuntimeError("No endpoint available, all circuits are open")
+        hedge_delay = self.hedge_delay()
+        start = time.perf_counter()
+        hedged = hedge_delay is None
+        while pending:
+            timeout = None if hedged \
+                else max(0.0, hedge_delay - (time.perf_counter() - start))
+            done, _ = wait(pending, timeout=timeout,
+                           return_when=FIRST_COMPLETED)
+            if not done:
+                # slower than the percentile: race a second endpoint
+                hedged = True
+                launch(hedge=True)
+                continue
+            for future in done:
+                endpoint = pending.pop(future)
+                try:
+                    result = future.result()
+                except Exception as ex:
+                    last_error = ex
+                    continue
+                with self._lock:
+                    endpoint.stats.wins += 1
+                # a slower hedge still completes, and counts in the stats
+                return result
+            if not pending:
+                launch()
+        raise last_error
+
+    def chat_stream(self, messages: List[dict], **kwargs) -> ChatStream:
+        """
+        chat, streaming the completion from the selected endpoint,
+        failing over while the stream is being opened;
+        the circuit records the stream outcome once it ends, so a
+        half-open circuit waits for the stream to be consumed or closed
+        @param messages: list of messages, each with keys 'role' and 'content'
+        @param kwargs: passed to the endpoint chat_stream
+        @return: iterator over the text deltas, as they arrive
+        """
+        tried = set()
+        last_error = RuntimeError("No endpoint available, all circuits are open")
+        while True:
+            endpoint = self._select(tried)
+            if endpoint is None:
+                raise last_error
+            tried.add(endpoint)
+            try:
+                stream = self._call(endpoint, 'chat_stream', messages, kwargs)
+            except Exception as ex:
+                last_error = ex
+                continue
+            stream.on_finish = partial(self._finish_stream, endpoint)
+            with self._lock:
+                endpoint.stats.wins += 1
+            return stream
+
+    def report(self) -> List[dict]:
+        """
+        State of the endpoints
+        @return: one dict per endpoint
+        """
+        with self._lock:
+            return [{
+                'name': endpoint.name,
+                'circuit': endpoint.breaker.state.value,
+                'outstanding': endpoint.outstanding,
+                'ewma_seconds': endpoint.ewma_seconds,
+                **vars(endpoint.stats),
+            } for endpoint in self.endpoints]
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False)
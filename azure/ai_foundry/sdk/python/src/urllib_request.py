@@ -1,11 +1,13 @@
 import os
 import json
 import logging
+import time
 import urllib.request
 import ssl
 from typing import List, Dict
 
 from src.encrypt import mask_key
+from src.streaming import ChatStream, iter_sse_data
 
 
 # constants
@@ -115,3 +117,54 @@ class UrllibRequest:
         except urllib.error.HTTPError as error:
             logging.exception(f"{error.code} {error.info()} {error.read().decode('utf8', 'ignore')}")
             raise error
+
+    def _iter_deltas(self, response, usage: dict):
+        try:
+            for data in iter_sse_data(response):
+                chunk = json.loads(data)
+                if chunk.get('usage'):
+                    usage['completion_tokens'] = \
+                        chunk['usage'].get('completion_tokens')
+                choices = chunk.get('choices')
+                if choices and choices[0].get('delta', {}).get('content'):
+                    yield choices[0]['delta']['content']
+        finally:
+            response.close()
+
+    def chat_stream(self, messages: List[dict], **kwargs) -> ChatStream:
+        """
+        chat, streaming the completion as server-sent events
+        (chat completions format)
+        @param messages: list of messages, each with keys 'role' and 'content'
+        @return: iterator over the text deltas, as they arrive
+        """
+        logging.info("Start chat_stream method ...")
+        logging.info(f"kwargs: {json.dumps(kwargs)}")
+
+        body = str.encode(json.dumps({
+            "messages": messages,
+            **kwargs,
+            "stream": True
+        }))
+
+        headers = {
+            'Content-Type': 'application/json',
+            'Accept': 'text/event-stream',
+            'Authorization': ('Bearer ' + self._api_key)
+        }
+
+        req = urllib.request.Request(
+            url=self._endpoint_url,
+            data=body,
+            headers=headers
+        )
+
+        start = time.perf_counter()
+        try:
+            # the response is read line by line, as events arrive
+            response = urllib.request.urlopen(req)
+        except urllib.error.HTTPError as error:
+            logging.exception(f"{error.code} {error.info()} {error.read().decode('utf8', 'ignore')}")
+            raise error
+        usage = {}
+        return ChatStream(self._iter_deltas(response, usage), usage=usage, start=start)
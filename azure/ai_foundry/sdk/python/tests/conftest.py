@@ -0,0 +1,138 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+STREAMED_TOKENS = ['Hello', ' world']
+RESPONSE_DELAY = 0.2  # seconds
+
+
+class ChatCompletionsStreamHandler(BaseHTTPRequestHandler):
+    """
+    Stub of a chat completions endpoint streaming STREAMED_TOKENS
+    as server-sent events, with a final usage chunk
+    """
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        assert body['stream'] is True
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.end_headers()
+        chunks = [
+            {'choices': [{'index': 0, 'delta': {'content': token}}]}
+            for token in STREAMED_TOKENS
+        ]
+        chunks.append({'choices': [], 'usage': {
+            'prompt_tokens': 1, 'completion_tokens': 7, 'total_tokens': 8}})
+        for chunk in chunks:
+            chunk.update({'id': '1', 'object': 'chat.completion.chunk',
+                          'created': 0, 'model': 'stub'})
+            self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode())
+            self.wfile.flush()
+        self.wfile.write(b"data: [DONE]\n\n")
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def sse_endpoint():
+    """
+    @return: url of a local chat completions endpoint streaming events
+    """
+    server = ThreadingHTTPServer(('127.0.0.1', 0), ChatCompletionsStreamHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+
+
+class SlowChatCompletionsStreamHandler(ChatCompletionsStreamHandler):
+    """
+    Stub of a chat completions endpoint streaming STREAMED_TOKENS
+    after waiting RESPONSE_DELAY seconds before the response headers
+    """
+
+    def do_POST(self):
+        time.sleep(RESPONSE_DELAY)
+        super().do_POST()
+
+
+@pytest.fixture
+def slow_sse_endpoint():
+    """
+    @return: url of a local chat completions endpoint streaming events late
+    """
+    server = ThreadingHTTPServer(('127.0.0.1', 0), SlowChatCompletionsStreamHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+
+
+class ChatCompletionsHandler(BaseHTTPRequestHandler):
+    """
+    Stub of a chat completions endpoint echoing the last user message,
+    over HTTP/1.1 keep-alive connections
+    """
+    protocol_version = 'HTTP/1.1'
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        payload = json.dumps({
+            'id': '1', 'object': 'chat.completion', 'created': 0,
+            'model': 'stub',
+            'choices': [{'index': 0, 'finish_reason': 'stop', 'message': {
+                'role': 'assistant',
+                'content': body['messages'][-1]['content']}}],
+        }).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def json_endpoint():
+    """
+    @return: url of a local chat completions endpoint echoing the last message
+    """
+    server = ThreadingHTTPServer(('127.0.0.1', 0), ChatCompletionsHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+
+
+class ThrottlingHandler(ChatCompletionsHandler):
+    """
+    Stub of a chat completions endpoint throttling every other request
+    """
+    requests = 0
+
+    def do_POST(self):
+        type(self).requests += 1
+        if type(self).requests % 2:
+            self.rfile.read(int(self.headers['Content-Length']))
+            self.send_response(429)
+            self.send_header('Retry-After-Ms', '10')
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        super().do_POST()
+
+
+@pytest.fixture
+def throttling_endpoint():
+    """
+    @return: url of a local chat completions endpoint answering 429 first
+    """
+    handler = type('Handler', (ThrottlingHandler,), {'requests': 0})
+    server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
@@ -36,3 +36,35 @@ def test_chat(ai_studio_config, messages):
     assert response is not None
     assert isinstance(response, str)
     assert len(response) > 0
+
+
+def test_chat_stream(sse_endpoint):
+    from src.ai_studio_seq2seq import AIStudioSeq2Seq
+    seq2seq = AIStudioSeq2Seq(endpoint_url=sse_endpoint, api_key='stub')
+    stream = seq2seq.chat_stream(messages=[{'role': 'user', 'content': 'hi'}])
+    assert list(stream) == ['Hello', ' world']
+    assert stream.text == 'Hello world'
+    # token count from the usage chunk
+    assert stream.stats.tokens == 7
+    assert stream.stats.time_to_first_token is not None
+
+
+def test_chat_stream_time_to_first_token(slow_sse_endpoint):
+    from src.ai_studio_seq2seq import AIStudioSeq2Seq
+    seq2seq = AIStudioSeq2Seq(endpoint_url=slow_sse_endpoint, api_key='stub')
+    stream = seq2seq.chat_stream(messages=[{'role': 'user', 'content': 'hi'}])
+    assert list(stream) == ['Hello', ' world']
+    # waiting for the response headers counts in the time-to-first-token
+    assert stream.stats.time_to_first_token >= 0.2
+
+
+def test_chat_throttled(throttling_endpoint):
+    from src.ai_studio_seq2seq import AIStudioSeq2Seq
+    from src.rate_limiting import TokenBudgetScheduler
+    scheduler = TokenBudgetScheduler()
+    seq2seq = AIStudioSeq2Seq(endpoint_url=throttling_endpoint,
+                              api_key='stub', scheduler=scheduler)
+    response = seq2seq.chat(messages=[{'role': 'user', 'content': 'hi'}])
+    assert response == 'hi'
+    assert scheduler.stats.throttled == 1
+    assert scheduler.stats.requests == 2
@@ -0,0 +1,78 @@
+import asyncio
+
+import pytest
+
+from src.seq2seq import Seq2SeqProvider
+
+
+def test_importable():
+    import src.async_seq2seq  # noqa: F401
+    from src.async_seq2seq import AsyncSeq2Seq  # noqa: F401
+
+
+def test_new():
+    from src.async_seq2seq import AsyncSeq2Seq
+    from src.mockup_async_seq2seq import MockupAsyncSeq2Seq
+    assert isinstance(AsyncSeq2Seq.new(Seq2SeqProvider.MOCKUP),
+                      MockupAsyncSeq2Seq)
+    with pytest.raises(ValueError):
+        AsyncSeq2Seq.new('foo')
+
+
+def test_chat_many_bounded():
+    from src.async_seq2seq import AsyncSeq2Seq
+
+    class TrackingSeq2Seq(AsyncSeq2Seq):
+        in_flight = 0
+        max_in_flight = 0
+
+        async def chat(self, messages, **kwargs):
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            # later conversations complete first
+            await asyncio.sleep(0.001 * (10 - len(messages[0]['content'])))
+            self.in_flight -= 1
+            return messages[0]['content']
+
+    seq2seq = TrackingSeq2Seq()
+    conversations = [[{'role': 'user', 'content': 'x' * i}] for i in range(10)]
+    responses = asyncio.run(seq2seq.chat_many(conversations, max_concurrency=3))
+    assert responses == ['x' * i for i in range(10)]
+    assert seq2seq.max_in_flight == 3
+
+
+def test_async_requests_chat_many(json_endpoint):
+    from src.async_requests_seq2seq import AsyncRequestsSeq2Seq
+    conversations = [[{'role': 'user', 'content': f'hi {i}'}] for i in range(20)]
+
+    async def run():
+        async with AsyncRequestsSeq2Seq(
+                endpoint_url=json_endpoint,
+                api_key='stub',
+                max_concurrency=4) as seq2seq:
+            responses = await seq2seq.chat_many(conversations)
+            assert seq2seq._client is not None
+        assert seq2seq._client is None
+        return responses
+
+    responses = asyncio.run(run())
+    assert responses == [f'hi {i}' for i in range(20)]
+
+
+def test_async_ai_studio_chat_many(json_endpoint):
+    from src.async_ai_studio_seq2seq import AsyncAIStudioSeq2Seq
+    conversations = [[{'role': 'user', 'content': f'hi {i}'}] for i in range(5)]
+
+    async def run():
+        async with AsyncAIStudioSeq2Seq(
+                endpoint_url=json_endpoint,
+                api_key='stub') as seq2seq:
+            responses = await seq2seq.chat_many(conversations)
+            client = seq2seq._chat_client
+            # one client for all the conversations
+            assert client is not None
+        assert seq2seq._chat_client is None
+        return responses
+
+    responses = asyncio.run(run())
+    assert responses == [f'hi {i}' for i in range(5)]
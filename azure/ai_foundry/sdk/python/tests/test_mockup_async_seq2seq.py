@@ -0,0 +1,28 @@
+import time
+import asyncio
+
+from src.mockup_seq2seq import MOCKUP_COMPLETION
+
+
+def test_importable():
+    import src.mockup_async_seq2seq  # noqa: F401
+    from src.mockup_async_seq2seq import MockupAsyncSeq2Seq  # noqa: F401
+
+
+def test_chat():
+    from src.mockup_async_seq2seq import MockupAsyncSeq2Seq
+    seq2seq = MockupAsyncSeq2Seq()
+    response = asyncio.run(seq2seq.chat([{'role': 'user', 'content': 'hi'}]))
+    assert response == MOCKUP_COMPLETION
+
+
+def test_chat_many_concurrent():
+    from src.mockup_async_seq2seq import MockupAsyncSeq2Seq
+    seq2seq = MockupAsyncSeq2Seq(delay_seconds=0.05)
+    conversations = [[{'role': 'user', 'content': 'hi'}]] * 8
+    start = time.perf_counter()
+    responses = asyncio.run(seq2seq.chat_many(conversations, max_concurrency=8))
+    elapsed = time.perf_counter() - start
+    assert responses == [MOCKUP_COMPLETION] * 8
+    # concurrent: well under 8 sequential delays
+    assert elapsed < 0.05 * 4
@@ -23,3 +23,19 @@ def test_chat(messages):
     assert response is not None
     assert isinstance(response, str)
     assert len(response) > 0
+
+
+@pytest.mark.parametrize("messages", [
+        [{'role': 'user', 'content': 'hi'}],
+])
+def test_chat_stream(messages):
+    from src.mockup_seq2seq import MockupSeq2Seq
+    seq2seq = MockupSeq2Seq(delay_seconds=0.001)
+    stream = seq2seq.chat_stream(messages=messages)
+    deltas = list(stream)
+    assert len(deltas) > 1
+    assert ''.join(deltas) == seq2seq.chat(messages=messages)
+    assert stream.text == ''.join(deltas)
+    assert stream.stats.tokens == len(deltas)
+    assert 0 < stream.stats.time_to_first_token <= stream.stats.elapsed_seconds
+    assert stream.stats.tokens_per_second > 0
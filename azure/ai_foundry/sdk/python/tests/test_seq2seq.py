@@ -13,7 +13,7 @@ class TestSeq2Seq:
 
     def test_structure(self):
         from src.seq2seq import Seq2Seq
-        for method in ['new', 'chat']:
+        for method in ['new', 'chat', 'chat_stream']:
             assert hasattr(Seq2Seq, method)
             assert callable(getattr(Seq2Seq, method))
 
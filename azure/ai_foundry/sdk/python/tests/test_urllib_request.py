@@ -48,3 +48,23 @@ def test_text_classification(request_config, input_data):
     assert response is not None
     assert isinstance(response, list)
     assert len(response) > 0
+
+
+def test_chat_stream(sse_endpoint):
+    from src.urllib_request import UrllibRequest
+    seq2seq = UrllibRequest(endpoint_url=sse_endpoint, api_key='stub')
+    stream = seq2seq.chat_stream(messages=[{'role': 'user', 'content': 'hi'}])
+    assert list(stream) == ['Hello', ' world']
+    assert stream.text == 'Hello world'
+    # token count from the usage chunk
+    assert stream.stats.tokens == 7
+    assert stream.stats.time_to_first_token is not None
+
+
+def test_chat_stream_time_to_first_token(slow_sse_endpoint):
+    from src.urllib_request import UrllibRequest
+    seq2seq = UrllibRequest(endpoint_url=slow_sse_endpoint, api_key='stub')
+    stream = seq2seq.chat_stream(messages=[{'role': 'user', 'content': 'hi'}])
+    assert list(stream) == ['Hello', ' world']
+    # waiting for the response headers counts in the time-to-first-token
+    assert stream.stats.time_to_first_token >= 0.2
@@ -0,0 +1,81 @@
+# Query throughput of the sync engine (sequential and thread pool) vs. the
+# async engine (asyncio.gather) against local mockup clients with simulated
+# request latency.
+#
+# usage (from azure/ai_search/sdk/python):
+#   python -m benchmarks.bench_async_search --queries 200 --latency 0.02
+
+import time
+import asyncio
+import logging
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+
+from src.azure_ai_search_engine import AzureAISearchEngine
+from src.async_azure_ai_search_engine import AsyncAzureAISearchEngine
+from src.mockup_search_client import MockupSearchClient, \
+    MockupAsyncSearchClient
+
+CONFIG = {
+    'service_endpoint': 'https://localhost',
+    'key': '0123456789abcdef',
+    'index_name': 'bench',
+}
+
+
+def make_documents(n: int):
+    return [
+        {'id': str(i), 'content_text': f"lorem ipsum {i % 97} " * 5}
+        for i in range(n)
+    ]
+
+
+def bench_sync(args, queries, max_workers: int) -> float:
+    search_engine = AzureAISearchEngine(**CONFIG)
+    search_engine.search_client = MockupSearchClient(
+        latency_seconds=args.latency)
+    search_engine.search_client.documents = {
+        d['id']: d for d in make_documents(args.documents)}
+    start = time.perf_counter()
+    if max_workers == 1:
+        for query in queries:
+            search_engine._search_text(query, top=args.top)
+    else:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            list(executor.map(
+                lambda q: search_engine._search_text(q, top=args.top),
+                queries))
+    return len(queries) / (time.perf_counter() - start)
+
+
+async def bench_async(args, queries) -> float:
+    store = MockupSearchClient()
+    store.documents = {d['id']: d for d in make_documents(args.documents)}
+    async with AsyncAzureAISearchEngine(**CONFIG) as search_engine:
+        search_engine.search_clients['bench'] = MockupAsyncSearchClient(
+            store, latency_seconds=args.latency)
+        start = time.perf_counter()
+        await asyncio.gather(*(
+            search_engine._search_text(query, top=args.top)
+            for query in queries
+        ))
+        return len(queries) / (time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--documents', type=int, default=1000)
+    parser.add_argument('--top', type=int, default=10)
+    parser.add_argument('--latency', type=float, default=0.02)
+    parser.add_argument('--workers', type=int, default=16)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    queries = [f"lorem {i % 97}" for i in range(args.queries)]
+
+    print(f"sync sequential:       {bench_sync(args, queries, 1):>8.1f} q/s")
+    print(f"sync {args.workers:>2} threads:       \
+{bench_sync(args, queries, args.workers):>8.1f} q/s")
+    print(f"async gather:          \
+{asyncio.run(bench_async(args, queries)):>8.1f} q/s")
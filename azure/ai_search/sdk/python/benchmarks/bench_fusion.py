@@ -0,0 +1,65 @@
+# Client-side fusion cost per query: NumPy ReRanker vs. a dict-based RRF,
+# for growing candidate lists (two rankings with 50% overlap).
+#
+# usage (from azure/ai_search/sdk/python):
+#   python -m benchmarks.bench_fusion --candidates 50 200 1000
+
+import time
+import random
+import argparse
+
+from src.re_ranker import ReRanker, FusionStrategy, DEFAULT_RRF_K
+
+
+def make_rankings(candidates: int, seed: int = 0):
+    rng = random.Random(seed)
+    text_keys = [str(i) for i in range(candidates)]
+    vector_keys = [str(i) for i in range(candidates // 2,
+                                         candidates + candidates // 2)]
+    rng.shuffle(vector_keys)
+    return [
+        [{'id': k, '@search.score': float(candidates - i)}
+         for i, k in enumerate(keys)]
+        for keys in (text_keys, vector_keys)
+    ]
+
+
+def dict_rrf(rankings, top: int, k: float = DEFAULT_RRF_K):
+    scores = {}
+    documents = {}
+    for ranking in rankings:
+        for rank, result in enumerate(ranking, start=1):
+            key = result['id']
+            scores[key] = scores.get(key, 0.0) + 1 / (k + rank)
+            documents.setdefault(key, result)
+    ordered = sorted(scores, key=scores.get, reverse=True)[:top]
+    return [documents[key] for key in ordered]
+
+
+def timeit(fn, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--candidates', type=int, nargs='+',
+                        default=[50, 200, 1000])
+    parser.add_argument('--top', type=int, default=10)
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args()
+
+    rrf = ReRanker()
+    weighted = ReRanker(strategy=FusionStrategy.WEIGHTED_SCORE)
+    print(f"{'candidates':>10} {'dict rrf':>12} {'numpy rrf':>12} \
+{'numpy weighted':>15}  (us/query)")
+    for candidates in args.candidates:
+        rankings = make_rankings(candidates)
+        baseline = timeit(lambda: dict_rrf(rankings, args.top), args.repeat)
+        fused = timeit(lambda: rrf.fuse(rankings, top=args.top), args.repeat)
+        normalized = timeit(
+            lambda: weighted.fuse(rankings, top=args.top), args.repeat)
+        print(f"{candidates:>10} {baseline:>12.1f} {fused:>12.1f} \
+{normalized:>15.1f}")
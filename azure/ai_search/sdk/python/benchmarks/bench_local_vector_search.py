@@ -0,0 +1,77 @@
+# Recall@k and QPS of the local vector backend: exact (blocked matrix
+# multiplication) vs. approximate (IVF) for several n_probe values.
+#
+# usage (from azure/ai_search/sdk/python):
+#   python -m benchmarks.bench_local_vector_search --documents 100000
+
+import time
+import logging
+import argparse
+
+import numpy as np
+
+from src.azure_ai_search_engine import VectorSearchType
+from src.local_vector_search_engine import LocalVectorSearchEngine
+
+
+def make_vectors(n: int, dimensions: int, clusters: int, seed: int = 0):
+    # mixture of gaussians, closer to real embeddings than uniform noise
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(clusters, dimensions))
+    labels = rng.integers(0, clusters, size=n)
+    noise = 0.3 * rng.normal(size=(n, dimensions))
+    return (centers[labels] + noise).astype(np.float32)
+
+
+def run(search_engine, queries, top, vector_search_type):
+    start = time.perf_counter()
+    results = [
+        [r['id'] for r in search_engine._search_vector(
+            query.tolist(), vector_search_type=vector_search_type, top=top)]
+        for query in queries
+    ]
+    return results, len(queries) / (time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--documents', type=int, default=100000)
+    parser.add_argument('--dimensions', type=int, default=128)
+    parser.add_argument('--clusters', type=int, default=256)
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--top', type=int, default=10)
+    parser.add_argument('--n-probe', type=int, nargs='+',
+                        default=[1, 4, 8, 16, 32])
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    vectors = make_vectors(args.documents, args.dimensions, args.clusters)
+    queries = make_vectors(args.queries, args.dimensions, args.clusters,
+                           seed=1)
+
+    search_engine = LocalVectorSearchEngine(index_name='bench')
+    search_engine.create_index('bench', {
+        'id': {'data_type': 'string', 'key': True},
+        'content_vector': {
+            'data_type': 'vector',
+            'vector_search_dimensions': args.dimensions,
+        },
+    })
+    start = time.perf_counter()
+    search_engine.upload_documents('bench', [
+        {'id': str(i), 'content_vector': v} for i, v in enumerate(vectors)])
+    print(f"upload: {time.perf_counter() - start:.2f}s")
+    start = time.perf_counter()
+    search_engine.build_ivf('bench')
+    print(f"build ivf: {time.perf_counter() - start:.2f}s")
+
+    exact, qps = run(search_engine, queries, args.top, VectorSearchType.EXACT)
+    print(f"exact:          recall@{args.top} 1.000  {qps:>9.1f} q/s")
+    for n_probe in args.n_probe:
+        search_engine._n_probe = n_probe
+        approx, qps = run(search_engine, queries, args.top,
+                          VectorSearchType.APPROXIMATE)
+        recall = np.mean([len(set(a) & set(e)) / len(e)
+                          for a, e in zip(approx, exact)])
+        print(f"ivf n_probe={n_probe:<3} recall@{args.top} {recall:.3f}  \
+{qps:>9.1f} q/s")
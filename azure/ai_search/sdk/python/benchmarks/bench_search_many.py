@@ -0,0 +1,89 @@
+# Sequential _search_vector calls vs. search_many, for the local backend
+# (one matrix multiplication) and the Azure engine against a mockup client
+# with simulated latency (bounded thread pool).
+#
+# usage (from azure/ai_search/sdk/python):
+#   python -m benchmarks.bench_search_many --queries 1000
+
+import time
+import logging
+import argparse
+
+import numpy as np
+
+from src.azure_ai_search_engine import AzureAISearchEngine, VectorSearchType
+from src.local_vector_search_engine import LocalVectorSearchEngine
+from src.mockup_search_client import MockupSearchClient
+
+
+def print_report(name: str, report) -> None:
+    percentiles = report.latency_percentiles()
+    print(f"{name:<28} {report.queries_per_second:>9.1f} q/s  " + "  ".join(
+        f"p{p}={v * 1000:.1f}ms" for p, v in percentiles.items()))
+
+
+def bench_local(args, vectors, queries) -> None:
+    search_engine = LocalVectorSearchEngine(index_name='bench')
+    search_engine.create_index('bench', {
+        'id': {'data_type': 'string', 'key': True},
+        'content_vector': {
+            'data_type': 'vector',
+            'vector_search_dimensions': args.dimensions,
+        },
+    })
+    search_engine.upload_documents('bench', [
+        {'id': str(i), 'content_vector': v} for i, v in enumerate(vectors)])
+
+    start = time.perf_counter()
+    for query in queries:
+        search_engine._search_vector(
+            query, vector_search_type=VectorSearchType.EXACT, top=args.top)
+    qps = len(queries) / (time.perf_counter() - start)
+    print(f"{'local, sequential':<28} {qps:>9.1f} q/s")
+    print_report('local, search_many', search_engine.search_many(
+        vectors=queries, top=args.top,
+        vector_search_type=VectorSearchType.EXACT))
+
+
+def bench_azure(args, vectors, queries) -> None:
+    search_engine = AzureAISearchEngine(
+        service_endpoint='https://localhost',
+        key='0123456789abcdef',
+        index_name='bench'
+    )
+    search_engine.search_client = MockupSearchClient(
+        latency_seconds=args.latency)
+    search_engine.search_client.documents = {
+        str(i): {'id': str(i), 'content_vector': v.tolist()}
+        for i, v in enumerate(vectors[:args.remote_documents])}
+    queries = queries[:args.remote_queries]
+
+    start = time.perf_counter()
+    for query in queries:
+        search_engine._search_vector(query.tolist(), top=args.top)
+    qps = len(queries) / (time.perf_counter() - start)
+    print(f"{'mockup azure, sequential':<28} {qps:>9.1f} q/s")
+    print_report('mockup azure, search_many', search_engine.search_many(
+        vectors=queries, top=args.top, max_workers=args.workers))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--documents', type=int, default=50000)
+    parser.add_argument('--dimensions', type=int, default=128)
+    parser.add_argument('--queries', type=int, default=1000)
+    parser.add_argument('--top', type=int, default=10)
+    parser.add_argument('--latency', type=float, default=0.02)
+    parser.add_argument('--workers', type=int, default=8)
+    parser.add_argument('--remote-documents', type=int, default=200)
+    parser.add_argument('--remote-queries', type=int, default=100)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    rng = np.random.default_rng(0)
+    vectors = rng.normal(size=(args.documents, args.dimensions)) \
+        .astype(np.float32)
+    queries = rng.normal(size=(args.queries, args.dimensions)) \
+        .astype(np.float32)
+    bench_local(args, vectors, queries)
+    bench_azure(args, vectors, queries)
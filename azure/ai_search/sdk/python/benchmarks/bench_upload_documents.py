@@ -0,0 +1,67 @@
+# Throughput of sequential vs. concurrent batched uploads
+# against a local MockupSearchClient with simulated request latency.
+#
+# usage (from azure/ai_search/sdk/python):
+#   python -m benchmarks.bench_upload_documents --documents 20000 --latency 0.05
+
+import time
+import logging
+import argparse
+
+from src.bulk_indexer import BulkIndexer, iter_batches
+from src.mockup_search_client import MockupSearchClient
+
+
+def generate_documents(n: int, dimensions: int):
+    for i in range(n):
+        yield {
+            'id': str(i),
+            'content_text': f"chunk {i} " * 20,
+            'content_vector': [0.001 * (i % 1000)] * dimensions,
+        }
+
+
+def bench_sequential(args) -> float:
+    client = MockupSearchClient(latency_seconds=args.latency)
+    start = time.perf_counter()
+    for batch in iter_batches(
+        generate_documents(args.documents, args.dimensions),
+        max_documents=args.batch_size
+    ):
+        client.upload_documents(documents=batch)
+    return args.documents / (time.perf_counter() - start)
+
+
+def bench_bulk(args, max_workers: int) -> float:
+    client = MockupSearchClient(
+        latency_seconds=args.latency,
+        throttle_rate=args.throttle_rate
+    )
+    indexer = BulkIndexer(
+        client,
+        max_documents=args.batch_size,
+        max_workers=max_workers,
+        backoff_base_seconds=args.latency
+    )
+    report = indexer.upload(
+        generate_documents(args.documents, args.dimensions))
+    assert report.succeeded_count == args.documents
+    return report.documents_per_second
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--documents', type=int, default=20000)
+    parser.add_argument('--dimensions', type=int, default=1536)
+    parser.add_argument('--batch-size', type=int, default=500)
+    parser.add_argument('--latency', type=float, default=0.05)
+    parser.add_argument('--throttle-rate', type=float, default=0.0)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 4, 8])
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+
+    print(f"sequential batches: {bench_sequential(args):>10.1f} docs/s")
+    for max_workers in args.workers:
+        throughput = bench_bulk(args, max_workers)
+        print(f"bulk, {max_workers:>2} workers:  {throughput:>10.1f} docs/s")
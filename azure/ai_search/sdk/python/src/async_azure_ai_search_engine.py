@@ -0,0 +1,326 @@
+# ref:
+# * https://learn.microsoft.com/en-us/python/api/azure-search-documents/azure.search.documents.aio.searchclient  # noqa: E501
+# * https://learn.microsoft.com/en-us/azure/developer/python/sdk/azure-sdk-library-usage-patterns#asynchronous-programming  # noqa: E501
+# * https://docs.aiohttp.org/en/stable/client_advanced.html#limiting-connection-pool-size  # noqa: E501
+
+import heapq
+import asyncio
+import logging
+from collections.abc import Iterable, AsyncIterator
+from typing import List, Dict
+
+from azure.core.credentials import AzureKeyCredential
+from azure.search.documents.aio import SearchClient
+
+from src.async_search_engine import AsyncSearchEngine
+from src.encrypt import mask_key
+from src.azure_ai_search_engine import (
+    ENV_KEY_SEARCH_ENGINE_AISEARCH_ENDPOINT,
+    ENV_KEY_SEARCH_ENGINE_AISEARCH_KEY,
+    ENV_KEY_SEARCH_ENGINE_AISEARCH_INDEX_NAME,
+    NUMBER_OF_NEIGHBORS_FOR_TEXT_SEARCH,
+    NUMBER_OF_NEIGHBORS_FOR_VECTOR_SEARCH,
+    DEFAULT_PAGE_SIZE,
+    SELECT_FIELDS,
+    VECTOR_FIELDS,
+    TextSearchType, VectorSearchType,
+    TextRankingStrategy, VectorRankingStrategy, ReRankingStrategy,
+    text_search_kwargs, vector_query, semantic_score
+)
+
+# constants
+DEFAULT_MAX_CONNECTIONS = 100  # shared across all indexes
+
+
+class AsyncAzureAISearchEngine(AsyncSearchEngine):
+    """
+    Class to search a text with Azure AI Search, asynchronously.
+    One SearchClient per index, all sharing one HTTP connection pool.
+    """
+    _service_endpoint: str
+    _key: str
+    _index_name: str
+    _semantic_search_config_name: str = None
+    _max_connections: int
+
+    def __init__(
+        self,
+        service_endpoint: str = None,
+        key: str = None,
+        index_name: str = None,
+        semantic_search_config_name: str = None,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS
+    ):
+        logging.info("Start AsyncAzureAISearch configuration ...")
+
+        self._service_endpoint = service_endpoint if service_endpoint \
+            else ENV_KEY_SEARCH_ENGINE_AISEARCH_ENDPOINT
+        self._key = key if key \
+            else ENV_KEY_SEARCH_ENGINE_AISEARCH_KEY
+        self._index_name = index_name if index_name \
+            else ENV_KEY_SEARCH_ENGINE_AISEARCH_INDEX_NAME
+        self._semantic_search_config_name = semantic_search_config_name
+        self._max_connections = max_connections
+        self._session = None
+        self._transport = None
+        self.search_clients: Dict[str, SearchClient] = {}
+
+        # log configuration
+        logging.info(f"Azure AI Search service_endpoint: \
+            {self._service_endpoint}")
+        logging.info(f"Azure AI Search key: {mask_key(self._key, 2, -2)}")
+        logging.info(f"Azure AI Search index_name: {self._index_name}")
+
+        logging.info("Completed AsyncAzureAISearch configuration.")
+
+    def _init_transport(self) -> None:
+        """
+        Initialize the connection pool shared by all search clients
+        """
+        if self._transport is not None:
+            return
+        logging.info("Initialize shared transport...")
+        # imported here, aiohttp is only needed for live clients
+        import aiohttp
+        from azure.core.pipeline.transport import AioHttpTransport
+        self._session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=self._max_connections)
+        )
+        self._transport = AioHttpTransport(
+            session=self._session,
+            session_owner=False
+        )
+
+    def _get_search_client(self, index_name: str = None) -> SearchClient:
+        """
+        Get (or initialize) the search client of an index
+        @param index_name: index name, default the configured index
+        @return: search client
+        """
+        index_name = index_name if index_name else self._index_name
+        search_client = self.search_clients.get(index_name)
+        if search_client is None:
+            logging.info(f"Initialize search client of '{index_name}'...")
+            self._init_transport()
+            search_client = SearchClient(
+                self._service_endpoint,
+                index_name,
+                AzureKeyCredential(self._key),
+                transport=self._transport
+            )
+            self.search_clients[index_name] = search_client
+        return search_client
+
+    async def _aiter_pages(
+        self,
+        search_client: SearchClient,
+        kwargs: dict,
+        top: int,
+        skip: int = 0,
+        page_size: int = DEFAULT_PAGE_SIZE
+    ) -> AsyncIterator[dict]:
+        """
+        Lazily request results page by page (top/skip paging)
+        @param search_client: search client
+        @param kwargs: search kwargs (without top/skip)
+        @param top: total number of results to return
+        @param skip: number of results to skip
+        @param page_size: number of results per request
+        @return: results in service order
+        """
+        if top < 0 or skip < 0 or page_size < 1:
+            raise ValueError(f"Invalid paging: top={top}, skip={skip}, \
+                page_size={page_size}")
+
+        remaining = top
+        offset = skip
+        while remaining > 0:
+            requested = min(page_size, remaining)
+            page = await search_client.search(
+                top=requested, skip=offset, **kwargs)
+            received = 0
+            async for result in page:
+                received += 1
+                yield result
+                if received >= requested:
+                    break
+            if received < requested:
+                # no more results
+                return
+            remaining -= received
+            offset += received
+
+    async def _collect(
+        self,
+        kwargs: dict,
+        top: int,
+        skip: int,
+        index_name: str = None
+    ) -> list:
+        search_client = self._get_search_client(index_name)
+        return [r async for r in self._aiter_pages(
+            search_client, kwargs, top=top, skip=skip,
+            page_size=max(top, 1))]
+
+    async def search(self, text: str) -> Iterable:
+        """
+        Search text
+        @param text: search text
+        @return: search results
+        """
+        logging.info("Start search text...")
+        search_client = self._get_search_client()
+        results = await search_client.search(search_text=text)
+        response_list = [r async for r in results]
+        logging.info(f"Completed search text. \
+            Sorted results has {len(response_list)}")
+        return response_list
+
+    async def _search_text(
+        self,
+        text: str,
+        text_search_type: TextSearchType = TextSearchType.SIMPLE,
+        text_ranking_strategy: TextRankingStrategy = TextRankingStrategy.BM25,
+        top: int = NUMBER_OF_NEIGHBORS_FOR_TEXT_SEARCH,
+        skip: int = 0,
+        index_name: str = None
+    ) -> list:
+        """
+        Search text, same results as AzureAISearchEngine._search_text
+        @param text: search text
+        @param text_search_type: search type
+        @param text_ranking_strategy: ranking strategy
+        @param top: max number of results
+        @param skip: number of results to skip
+        @param index_name: index name, default the configured index
+        @return: search results
+        """
+        kwargs = text_search_kwargs(
+            text,
+            text_search_type=text_search_type,
+            text_ranking_strategy=text_ranking_strategy,
+            semantic_search_config_name=self._semantic_search_config_name
+        )
+        results = await self._collect(kwargs, top, skip, index_name)
+
+        match text_ranking_strategy:
+            case TextRankingStrategy.BM25:
+                # service returns results ordered by '@search.score'
+                pass
+            case TextRankingStrategy.SEMANTIC:
+                results = heapq.nlargest(top, results, key=semantic_score)
+        return results
+
+    async def _search_vector(
+        self,
+        vector: list,
+        vector_fields: str = VECTOR_FIELDS,
+        vector_search_type: VectorSearchType = VectorSearchType.APPROXIMATE,
+        vector_ranking_strategy: VectorRankingStrategy = VectorRankingStrategy.COSINE,  # noqa: E501
+        top: int = NUMBER_OF_NEIGHBORS_FOR_VECTOR_SEARCH,
+        skip: int = 0,
+        index_name: str = None
+    ) -> list:
+        """
+        Search vector, same results as AzureAISearchEngine._search_vector
+        @param vector: vector input
+        @param vector_fields: fields to search
+        @param vector_search_type: search type
+        @param vector_ranking_strategy: ranking strategy
+        @param top: max number of results
+        @param skip: number of results to skip
+        @param index_name: index name, default the configured index
+        @return: search results
+        """
+        kwargs = {
+            'search_text': None,
+            'select': SELECT_FIELDS,
+            'vector_queries': [vector_query(
+                vector,
+                k=skip + top,
+                vector_fields=vector_fields,
+                vector_search_type=vector_search_type
+            )],
+        }
+        # service returns results ordered by '@search.score'
+        return await self._collect(kwargs, top, skip, index_name)
+
+    async def _search_hybrid(
+        self,
+        text: str,
+        vector: list,
+        vector_fields: str = VECTOR_FIELDS,
+        text_search_type: TextSearchType = TextSearchType.SIMPLE,
+        text_ranking_strategy: TextRankingStrategy = TextRankingStrategy.BM25,
+        vector_search_type: VectorSearchType = VectorSearchType.APPROXIMATE,
+        vector_ranking_strategy: VectorRankingStrategy = VectorRankingStrategy.COSINE,  # noqa: E501
+        re_ranking_strategy: ReRankingStrategy = ReRankingStrategy.RRF,
+        top: int = NUMBER_OF_NEIGHBORS_FOR_TEXT_SEARCH,
+        skip: int = 0,
+        index_name: str = None
+    ) -> list:
+        """
+        Hybrid search, same results as AzureAISearchEngine._search_hybrid
+        @param text: search text
+        @param vector: vector input
+        @param re_ranking_strategy: re-ranking strategy
+        @param top: max number of results
+        @param skip: number of results to skip
+        @param index_name: index name, default the configured index
+        @return: search results
+        """
+        kwargs = text_search_kwargs(
+            text,
+            text_search_type=text_search_type,
+            text_ranking_strategy=text_ranking_strategy,
+            semantic_search_config_name=self._semantic_search_config_name
+        )
+        kwargs['vector_queries'] = [vector_query(
+            vector,
+            k=skip + top,
+            vector_fields=vector_fields,
+            vector_search_type=vector_search_type
+        )]
+        results = await self._collect(kwargs, top, skip, index_name)
+
+        match re_ranking_strategy:
+            case None | ReRankingStrategy.RRF:
+                # service returns results ordered by fused '@search.score'
+                pass
+            case ReRankingStrategy.SEMANTIC:
+                results = heapq.nlargest(top, results, key=semantic_score)
+            case _:
+                raise ValueError(f"Invalid re-ranking strategy: \
+                    {re_ranking_strategy}")
+        return results
+
+    async def search_indexes(
+        self,
+        text: str,
+        index_names: List[str],
+        **kwargs
+    ) -> Dict[str, list]:
+        """
+        Fan a text search out across several indexes concurrently
+        @param text: search text
+        @param index_names: index names
+        @param kwargs: see _search_text
+        @return: search results per index name
+        """
+        results = await asyncio.gather(*(
+            self._search_text(text, index_name=index_name, **kwargs)
+            for index_name in index_names
+        ))
+        return dict(zip(index_names, results))
+
+    async def close(self) -> None:
+        """
+        Close all search clients and the shared connection pool
+        """
+        for search_client in self.search_clients.values():
+            await search_client.close()
+        self.search_clients.clear()
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+            self._transport = None
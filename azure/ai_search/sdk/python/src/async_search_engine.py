@@ -0,0 +1,47 @@
+import asyncio
+from abc import ABC, abstractmethod
+from collections.abc import Iterable
+from typing import List
+
+from src.search_engine import SearchEngineProvider
+
+
+class AsyncSearchEngine(ABC):
+    """
+    Abstract class for asynchronous search engine
+    """
+
+    @staticmethod
+    def new(provider: SearchEngineProvider):
+        match provider:
+            case SearchEngineProvider.MOCKUP:
+                from src.mockup_async_search_engine import \
+                    MockupAsyncSearchEngine
+                return MockupAsyncSearchEngine()
+            case SearchEngineProvider.AZURE_AI_SEARCH:
+                from src.async_azure_ai_search_engine import \
+                    AsyncAzureAISearchEngine
+                return AsyncAzureAISearchEngine()
+            case _:
+                raise ValueError(f"Invalid provider: {provider}")
+
+    @abstractmethod
+    async def search(self, text: str) -> Iterable:
+        raise NotImplementedError
+
+    async def search_texts(self, texts: List[str]) -> List[Iterable]:
+        """
+        Run several searches concurrently
+        @param texts: search texts
+        @return: search results, aligned to the inputs
+        """
+        return await asyncio.gather(*(self.search(text) for text in texts))
+
+    async def close(self) -> None:
+        pass
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
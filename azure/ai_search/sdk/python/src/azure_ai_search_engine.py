@@ -4,8 +4,10 @@
 # * https://learn.microsoft.com/en-us/azure/search/hybrid-search-overview
 
 import os
+import heapq
 import logging
-from collections.abc import Iterable
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict
 from enum import Enum
 
@@ -22,6 +24,16 @@ from azure.search.documents.indexes.models import (
 
 from src.search_engine import SearchEngine
 from src.encrypt import mask_key
+from src.bulk_indexer import (
+    BulkIndexer, BulkIndexingReport,
+    MAX_BATCH_DOCUMENTS, MAX_BATCH_BYTES,
+    DEFAULT_KEY_FIELD, DEFAULT_MAX_WORKERS, DEFAULT_MAX_RETRIES
+)
+from src.re_ranker import ReRanker
+from src.batch_search import (
+    BatchSearchReport, DEFAULT_MAX_WORKERS as DEFAULT_BATCH_MAX_WORKERS,
+    align_queries, run_batch
+)
 
 # constants
 ENV_KEY_SEARCH_ENGINE_AISEARCH_ENDPOINT = os.getenv(
@@ -47,6 +59,9 @@ NUMBER_OF_NEIGHBORS = 999  # number of neighbors to return
 NUMBER_OF_NEIGHBORS_FOR_TEXT_SEARCH = NUMBER_OF_NEIGHBORS
 NUMBER_OF_NEIGHBORS_FOR_VECTOR_SEARCH = NUMBER_OF_NEIGHBORS
 DEFAULT_SEMANTIC_SCORE_VALUE = 0.0  # to avoid NoneType error
+DEFAULT_PAGE_SIZE = 50  # number of results per request when iterating
+DEFAULT_FUSION_CANDIDATES = 50  # results per query fused client-side
+DEFAULT_FUSION_TOP = 10  # results returned after client-side fusion
 SEARCH_FIELDS = ['content_text']
 VECTOR_FIELDS = 'content_vector'
 QUERY_LANGUAGE = 'en-us'
@@ -79,6 +94,90 @@ class ReRankingStrategy(Enum):
     SEMANTIC = 'semantic'
 
 
+def semantic_score(result: dict) -> float:
+    score = result.get('@search.reranker_score')
+    return score if score is not None else DEFAULT_SEMANTIC_SCORE_VALUE
+
+
+def text_search_kwargs(
+    text: str,
+    text_search_type: TextSearchType = TextSearchType.SIMPLE,
+    text_ranking_strategy: TextRankingStrategy = TextRankingStrategy.BM25,
+    semantic_search_config_name: str = None
+) -> dict:
+    """
+    Build text search parameters (without top/skip)
+    @param text: search text
+    @param text_search_type: search type
+    @param text_ranking_strategy: ranking strategy
+    @param semantic_search_config_name: semantic configuration
+    @return: search kwargs
+    """
+    # common parameters
+    kwargs = {
+        'search_text': text,
+        'search_fields': SEARCH_FIELDS,
+        'select': SELECT_FIELDS,
+        # 'include_total_count': True
+    }
+
+    # search type specific parameters
+    match text_search_type:
+        case TextSearchType.SIMPLE:
+            kwargs['query_type'] = 'simple'
+        case TextSearchType.FULL:
+            kwargs['query_type'] = 'full'
+            kwargs['search_mode'] = 'any'
+        case _:
+            raise ValueError(f"Invalid search type: {text_search_type}")
+
+    # ranking strategy specific parameters
+    match text_ranking_strategy:
+        case TextRankingStrategy.BM25:
+            pass
+        case TextRankingStrategy.SEMANTIC:
+            kwargs['query_type'] = 'semantic'
+            # kwargs['query_language'] = QUERY_LANGUAGE
+            kwargs['semantic_configuration_name'] = \
+                semantic_search_config_name
+        case _:
+            raise ValueError(f"Invalid ranking strategy: \
+                {text_ranking_strategy}")
+
+    return kwargs
+
+
+def vector_query(
+    vector: list,
+    k: int,
+    vector_fields: str = VECTOR_FIELDS,
+    vector_search_type: VectorSearchType = VectorSearchType.APPROXIMATE
+) -> VectorizedQuery:
+    """
+    Build vector query
+    @param vector: vector input
+    @param k: number of nearest neighbors
+    @param vector_fields: fields to search
+    @param vector_search_type: search type
+    @return: vector query
+    """
+    is_exhaustive: bool = None
+    match vector_search_type:
+        case VectorSearchType.APPROXIMATE:
+            is_exhaustive = False
+        case VectorSearchType.EXACT:
+            is_exhaustive = True
+        case _:
+            raise ValueError(f"Invalid search type: {vector_search_type}")
+
+    return VectorizedQuery(
+        vector=vector,
+        k_nearest_neighbors=k,
+        fields=vector_fields,
+        exhaustive=is_exhaustive
+    )
+
+
 class AzureAISearchEngine(SearchEngine):
     """
     Class to search a text with Azure AI Search
@@ -176,76 +275,187 @@ class AzureAISearchEngine(SearchEngine):
             Sorted results has {len(response_list)}")
         return response_list
 
-    def _search_text(
+    def _iter_pages(
+        self,
+        kwargs: dict,
+        top: int,
+        skip: int = 0,
+        page_size: int = DEFAULT_PAGE_SIZE
+    ) -> Iterator[dict]:
+        """
+        Lazily request results page by page (top/skip paging),
+        the next page is only requested when the previous one is consumed
+        @param kwargs: search kwargs (without top/skip)
+        @param top: total number of results to return
+        @param skip: number of results to skip
+        @param page_size: number of results per request
+        @return: results in service order
+        """
+        if top < 0 or skip < 0 or page_size < 1:
+            raise ValueError(f"Invalid paging: top={top}, skip={skip}, \
+                page_size={page_size}")
+
+        remaining = top
+        offset = skip
+        while remaining > 0:
+            requested = min(page_size, remaining)
+            logging.info(f"Start search page ...: \
+                skip={offset}, top={requested}")
+            page = self.search_client.search(
+                top=requested, skip=offset, **kwargs)
+            received = 0
+            for result in page:
+                received += 1
+                yield result
+                if received >= requested:
+                    break
+            if received < requested:
+                # no more results
+                return
+            remaining -= received
+            offset += received
+
+    def iter_search_text(
         self,
         text: str,
+        top: int = NUMBER_OF_NEIGHBORS_FOR_TEXT_SEARCH,
+        skip: int = 0,
+        page_size: int = DEFAULT_PAGE_SIZE,
         text_search_type: TextSearchType = TextSearchType.SIMPLE,
         text_ranking_strategy: TextRankingStrategy = TextRankingStrategy.BM25
-    ) -> Iterable:
-        logging.info("Start text search ...")
+    ) -> Iterator[dict]:
+        """
+        Lazy text search, results are yielded in service (score) order
+        @param text: search text
+        @param top: max number of results
+        @param skip: number of results to skip
+        @param page_size: number of results per request
+        @param text_search_type: search type
+        @param text_ranking_strategy: ranking strategy
+        @return: result iterator
+        """
+        # initialize search client if not initialized already
+        self._init_search_client()
+
+        kwargs = text_search_kwargs(
+            text,
+            text_search_type=text_search_type,
+            text_ranking_strategy=text_ranking_strategy,
+            semantic_search_config_name=self._semantic_search_config_name
+        )
+        return self._iter_pages(kwargs, top=top, skip=skip,
+                                page_size=page_size)
 
+    def iter_search_vector(
+        self,
+        vector: list,
+        top: int = NUMBER_OF_NEIGHBORS_FOR_VECTOR_SEARCH,
+        skip: int = 0,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        vector_fields: str = VECTOR_FIELDS,
+        vector_search_type: VectorSearchType = VectorSearchType.APPROXIMATE,
+        vector_ranking_strategy: VectorRankingStrategy = VectorRankingStrategy.COSINE  # noqa: E501
+    ) -> Iterator[dict]:
+        """
+        Lazy vector search, results are yielded in service (score) order
+        @param vector: vector input
+        @param top: max number of results
+        @param skip: number of results to skip
+        @param page_size: number of results per request
+        @param vector_fields: fields to search
+        @param vector_search_type: search type
+        @param vector_ranking_strategy: ranking strategy
+        @return: result iterator
+        """
         # initialize search client if not initialized already
-        self.__init_search_client()
+        self._init_search_client()
 
-        # common parameters
         kwargs = {
-            'search_text': text,
-            'search_fields': SEARCH_FIELDS,
+            'search_text': None,
             'select': SELECT_FIELDS,
-            'top': NUMBER_OF_NEIGHBORS_FOR_TEXT_SEARCH,
-            # 'include_total_count': True
+            # nearest neighbors must cover all requested pages
+            'vector_queries': [vector_query(
+                vector,
+                k=skip + top,
+                vector_fields=vector_fields,
+                vector_search_type=vector_search_type
+            )],
         }
+        return self._iter_pages(kwargs, top=top, skip=skip,
+                                page_size=page_size)
 
-        # search type specific parameters
-        match text_search_type:
-            case TextSearchType.SIMPLE:
-                kwargs['query_type'] = 'simple'
-            case TextSearchType.FULL:
-                kwargs['query_type'] = 'full'
-                kwargs['search_mode'] = 'any'
-            case _:
-                raise ValueError(f"Invalid search type: {text_search_type}")
+    def iter_search_hybrid(
+        self,
+        text: str,
+        vector: list,
+        top: int = NUMBER_OF_NEIGHBORS_FOR_TEXT_SEARCH,
+        skip: int = 0,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        vector_fields: str = VECTOR_FIELDS,
+        text_search_type: TextSearchType = TextSearchType.SIMPLE,
+        text_ranking_strategy: TextRankingStrategy = TextRankingStrategy.BM25,
+        vector_search_type: VectorSearchType = VectorSearchType.APPROXIMATE,
+        vector_ranking_strategy: VectorRankingStrategy = VectorRankingStrategy.COSINE  # noqa: E501
+    ) -> Iterator[dict]:
+        """
+        Lazy hybrid search, results are yielded in service (RRF) order
+        @param text: search text
+        @param vector: vector input
+        @param top: max number of results
+        @param skip: number of results to skip
+        @param page_size: number of results per request
+        @param vector_fields: fields to search
+        @param text_search_type: search type
+        @param text_ranking_strategy: ranking strategy
+        @param vector_search_type: search type
+        @param vector_ranking_strategy: ranking strategy
+        @return: result iterator
+        """
+        # initialize search client if not initialized already
+        self._init_search_client()
 
-        # ranking strategy specific parameters
-        match text_ranking_strategy:
-            case TextRankingStrategy.BM25:
-                pass
-            case TextRankingStrategy.SEMANTIC:
-                kwargs['query_type'] = 'semantic'
-                # kwargs['query_language'] = QUERY_LANGUAGE
-                kwargs['semantic_configuration_name'] = \
-                    self._semantic_search_config_name
-
-        # search
-        logging.info(f"Start search ...: {kwargs}")
-        search_results = self.search_client.search(**kwargs)
-
-        # log total count if requested
-        if kwargs.get('include_total_count'):
-            try:
-                logging.info(f"Search results has approx. \
-                    {search_results.get_count()} items.")
-            except Exception as err:
-                logging.error("Error getting count: ", err)
+        kwargs = text_search_kwargs(
+            text,
+            text_search_type=text_search_type,
+            text_ranking_strategy=text_ranking_strategy,
+            semantic_search_config_name=self._semantic_search_config_name
+        )
+        kwargs['vector_queries'] = [vector_query(
+            vector,
+            k=skip + top,
+            vector_fields=vector_fields,
+            vector_search_type=vector_search_type
+        )]
+        return self._iter_pages(kwargs, top=top, skip=skip,
+                                page_size=page_size)
+
+    def _search_text(
+        self,
+        text: str,
+        text_search_type: TextSearchType = TextSearchType.SIMPLE,
+        text_ranking_strategy: TextRankingStrategy = TextRankingStrategy.BM25,
+        top: int = NUMBER_OF_NEIGHBORS_FOR_TEXT_SEARCH,
+        skip: int = 0
+    ) -> Iterable:
+        logging.info("Start text search ...")
+
+        search_results = self.iter_search_text(
+            text,
+            top=top,
+            skip=skip,
+            page_size=max(top, 1),
+            text_search_type=text_search_type,
+            text_ranking_strategy=text_ranking_strategy
+        )
 
         # rank search results
         match text_ranking_strategy:
             case TextRankingStrategy.BM25:
-                response_list = [r for r in search_results]
-                results = sorted(
-                    [r for r in response_list],
-                    key=lambda r: r['@search.score'],
-                    reverse=True
-                )
+                # service returns results ordered by '@search.score'
+                results = list(search_results)
             case TextRankingStrategy.SEMANTIC:
-                response_list = [r for r in search_results]
-                results = sorted(
-                    [r for r in response_list],
-                    key=lambda r: r['@search.reranker_score']
-                    if r['@search.reranker_score'] is not None
-                    else DEFAULT_SEMANTIC_SCORE_VALUE,
-                    reverse=True
-                )
+                results = heapq.nlargest(
+                    top, search_results, key=semantic_score)
             case _:
                 raise ValueError(f"Invalid ranking strategy: \
                     {text_ranking_strategy}")
@@ -259,7 +469,9 @@ class AzureAISearchEngine(SearchEngine):
         vector: list,
         vector_fields: str = VECTOR_FIELDS,
         vector_search_type: VectorSearchType = VectorSearchType.APPROXIMATE,
-        vector_ranking_strategy: VectorRankingStrategy = VectorRankingStrategy.COSINE  # noqa: E501
+        vector_ranking_strategy: VectorRankingStrategy = VectorRankingStrategy.COSINE,  # noqa: E501
+        top: int = NUMBER_OF_NEIGHBORS_FOR_VECTOR_SEARCH,
+        skip: int = 0
     ) -> list:
         """
         Search vector
@@ -267,59 +479,22 @@ class AzureAISearchEngine(SearchEngine):
         @param vector_fields: fields to search
         @param search_type: search type
         @param vector_ranking_strategy: ranking strategy
+        @param top: max number of results
+        @param skip: number of results to skip
         @return: search results
         """
         logging.info("Start search vector ...")
 
-        # initialize search client if not initialized already
-        self.__init_search_client()
-
-        kwargs = {
-            'search_text': None,
-            # 'vector': vector,
-            # 'vector_fields': vector_fields,
-            # 'top_k': NUMBER_OF_NEIGHBORS_FOR_VECTOR_SEARCH,
-            'select': SELECT_FIELDS,
-            # 'include_total_count': True
-        }
-
-        is_exhaustive: bool = None
-        match vector_search_type:
-            case VectorSearchType.APPROXIMATE:
-                is_exhaustive = False
-            case VectorSearchType.EXACT:
-                is_exhaustive = True
-            case _:
-                raise ValueError(f"Invalid search type: {vector_search_type}")
-
-        vector_query = VectorizedQuery(
-            vector=vector,
-            k=NUMBER_OF_NEIGHBORS_FOR_VECTOR_SEARCH,
-            fields=vector_fields,
-            exhaustive=is_exhaustive
-        )
-        kwargs['vector_queries'] = [vector_query]
-
-        # search
-        logging.info(f"Start search ...: {kwargs}")
-        search_results = self.search_client.search(**kwargs)
-
-        # log total count if requested
-        if kwargs.get('include_total_count'):
-            try:
-                logging.info(f"Search results has approx. \
-                    {search_results.get_count()} items.")
-            except Exception as err:
-                logging.error("Error getting count: ", err)
-
-        # rank search_results
-        # TODO
-        response_list = [r for r in search_results]
-        results = sorted(
-            [r for r in response_list],
-            key=lambda r: r['@search.score'],
-            reverse=True
-        )
+        # service returns results ordered by '@search.score'
+        results = list(self.iter_search_vector(
+            vector,
+            top=top,
+            skip=skip,
+            page_size=max(top, 1),
+            vector_fields=vector_fields,
+            vector_search_type=vector_search_type,
+            vector_ranking_strategy=vector_ranking_strategy
+        ))
 
         logging.info(f"Completed search vector. \
             Sorted results has {len(results)} items.")
@@ -334,7 +509,9 @@ class AzureAISearchEngine(SearchEngine):
         text_ranking_strategy: TextRankingStrategy = TextRankingStrategy.BM25,
         vector_search_type: VectorSearchType = VectorSearchType.APPROXIMATE,
         vector_ranking_strategy: VectorRankingStrategy = VectorRankingStrategy.COSINE,  # noqa: E501
-        re_ranking_strategy: ReRankingStrategy = ReRankingStrategy.RRF
+        re_ranking_strategy: ReRankingStrategy = ReRankingStrategy.RRF,
+        top: int = NUMBER_OF_NEIGHBORS_FOR_TEXT_SEARCH,
+        skip: int = 0
     ) -> list:
         """
         Search text
@@ -342,84 +519,33 @@ class AzureAISearchEngine(SearchEngine):
         @param vector: vector input
         @param search_type: search type, default is SearchType.APPROXIMATE
         @param ranking_strategy: ranking strategy, default is BM25
+        @param top: max number of results
+        @param skip: number of results to skip
         @return: search results
         """
         logging.info("Start search text ...")
 
-        # initialize search client if not initialized already
-        self.__init_search_client()
-
-        vector_query = VectorizedQuery(
-            vector=vector,
-            k=NUMBER_OF_NEIGHBORS_FOR_VECTOR_SEARCH,
-            fields=vector_fields
+        search_results = self.iter_search_hybrid(
+            text,
+            vector,
+            top=top,
+            skip=skip,
+            page_size=max(top, 1),
+            vector_fields=vector_fields,
+            text_search_type=text_search_type,
+            text_ranking_strategy=text_ranking_strategy,
+            vector_search_type=vector_search_type,
+            vector_ranking_strategy=vector_ranking_strategy
         )
 
-        # common parameters
-        kwargs = {
-            'search_text': text,
-            'search_fields': SEARCH_FIELDS,
-            'top': NUMBER_OF_NEIGHBORS_FOR_TEXT_SEARCH,
-            'vector_queries': [vector_query],
-            # 'vector': vector,
-            # 'vector_fields': vector_fields,
-            # 'top_k': NUMBER_OF_NEIGHBORS_FOR_VECTOR_SEARCH,
-            'select': SELECT_FIELDS,
-            # 'include_total_count': True
-        }
-
-        # search type specific parameters
-        match text_search_type:
-            case TextSearchType.SIMPLE:
-                kwargs['query_type'] = 'simple'
-            case TextSearchType.FULL:
-                kwargs['query_type'] = 'full'
-                kwargs['search_mode'] = 'any'
-            case _:
-                raise ValueError(f"Invalid search type: {text_search_type}")
-
-        # ranking strategy specific parameters
-        match text_ranking_strategy:
-            case TextRankingStrategy.BM25:
-                pass
-            case TextRankingStrategy.SEMANTIC:
-                kwargs['query_type'] = 'semantic'
-                # kwargs['query_language'] = QUERY_LANGUAGE
-                kwargs['semantic_configuration_name'] = \
-                    self.semantic_search_config_name
-
-        # search
-        logging.info(f"Start search ...: {kwargs}")
-        search_results = self.search_client.search(**kwargs)
-
-        # log total count if requested
-        if kwargs.get('include_total_count'):
-            try:
-                logging.info(f"Search results has approx. \
-                    {search_results.get_count()} items.")
-            except Exception as err:
-                logging.error("Error getting count: ", err)
-
         # re-rank search results
         match re_ranking_strategy:
-            case None:
-                results = [r for r in search_results]
-            case ReRankingStrategy.RRF:
-                response_list = [r for r in search_results]
-                results = sorted(
-                    [r for r in response_list],
-                    key=lambda r: r['@search.score'],
-                    reverse=True
-                )
+            case None | ReRankingStrategy.RRF:
+                # service returns results ordered by fused '@search.score'
+                results = list(search_results)
             case ReRankingStrategy.SEMANTIC:
-                response_list = [r for r in search_results]
-                results = sorted(
-                    [r for r in response_list],
-                    key=lambda r: r['@search.reranker_score']
-                    if r['@search.reranker_score'] is not None
-                    else DEFAULT_SEMANTIC_SCORE_VALUE,
-                    reverse=True
-                )
+                results = heapq.nlargest(
+                    top, search_results, key=semantic_score)
             case _:
                 raise ValueError(f"Invalid re-ranking strategy: \
                     {re_ranking_strategy}")
@@ -428,6 +554,117 @@ class AzureAISearchEngine(SearchEngine):
             Sorted results has {len(results)} items.")
         return results
 
+    def search_hybrid_fused(
+        self,
+        text: str,
+        vector: list,
+        top: int = DEFAULT_FUSION_TOP,
+        candidates: int = DEFAULT_FUSION_CANDIDATES,
+        re_ranker: ReRanker = None,
+        vector_fields: str = VECTOR_FIELDS,
+        text_search_type: TextSearchType = TextSearchType.SIMPLE,
+        vector_search_type: VectorSearchType = VectorSearchType.APPROXIMATE
+    ) -> list:
+        """
+        Hybrid search fused client-side: the text and the vector queries
+        run concurrently, their candidates are fused by the re-ranker
+        @param text: search text
+        @param vector: vector input
+        @param top: max number of results
+        @param candidates: number of candidates per query
+        @param re_ranker: fusion configuration, default RRF with k=60
+        @param vector_fields: fields to search
+        @param text_search_type: search type
+        @param vector_search_type: search type
+        @return: search results ordered by fused (or cross-encoder) score
+        """
+        logging.info("Start fused hybrid search ...")
+
+        # initialize search client if not initialized already
+        self._init_search_client()
+
+        re_ranker = re_ranker if re_ranker else ReRanker()
+        # the key is needed to match results across queries
+        select = SELECT_FIELDS if re_ranker.key_field in SELECT_FIELDS \
+            else SELECT_FIELDS + [re_ranker.key_field]
+
+        text_kwargs = text_search_kwargs(
+            text, text_search_type=text_search_type)
+        text_kwargs['select'] = select
+        vector_kwargs = {
+            'search_text': None,
+            'select': select,
+            'vector_queries': [vector_query(
+                vector,
+                k=candidates,
+                vector_fields=vector_fields,
+                vector_search_type=vector_search_type
+            )],
+        }
+
+        def run(kwargs: dict) -> list:
+            return list(self._iter_pages(
+                kwargs, top=candidates, page_size=candidates))
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            text_future = executor.submit(run, text_kwargs)
+            vector_future = executor.submit(run, vector_kwargs)
+            rankings = [text_future.result(), vector_future.result()]
+
+        results = re_ranker.rerank(text, rankings, top=top)
+
+        logging.info(f"Completed fused hybrid search. \
+            Fused {sum(len(r) for r in rankings)} candidates \
+            into {len(results)} items.")
+        return results
+
+    def search_many(
+        self,
+        vectors=None,
+        texts: List[str] = None,
+        top: int = DEFAULT_FUSION_TOP,
+        max_workers: int = DEFAULT_BATCH_MAX_WORKERS,
+        vector_fields: str = VECTOR_FIELDS,
+        vector_search_type: VectorSearchType = VectorSearchType.APPROXIMATE
+    ) -> BatchSearchReport:
+        """
+        Run many queries with bounded concurrency: vector search for
+        vectors only, text search for texts only, hybrid search for both
+        @param vectors: (m x dimensions) matrix or list of query vectors
+        @param texts: m query texts
+        @param top: max number of results per query
+        @param max_workers: max concurrent requests
+        @param vector_fields: fields to search
+        @param vector_search_type: search type
+        @return: results aligned to the inputs, with per-query latencies
+        """
+        n_queries = align_queries(vectors, texts)
+
+        # initialize search client once, before fanning out
+        self._init_search_client()
+
+        def search(i: int) -> list:
+            vector = None if vectors is None \
+                else [float(x) for x in vectors[i]]
+            if texts is None:
+                return self._search_vector(
+                    vector,
+                    vector_fields=vector_fields,
+                    vector_search_type=vector_search_type,
+                    top=top
+                )
+            if vectors is None:
+                return self._search_text(texts[i], top=top)
+            return self._search_hybrid(
+                texts[i],
+                vector,
+                vector_fields=vector_fields,
+                vector_search_type=vector_search_type,
+                top=top
+            )
+
+        return run_batch(search, n_queries, max_workers=max_workers)
+
     def create_index(self, index_name: str, schema: dict) -> SearchIndex:
         """
         Create empty index
@@ -520,3 +757,43 @@ class AzureAISearchEngine(SearchEngine):
 
         logging.info(f"result {result}")
         return result
+
+    def upload_documents_bulk(
+        self,
+        index_name: str,
+        documents: Iterable[Dict],
+        key_field: str = DEFAULT_KEY_FIELD,
+        max_documents: int = MAX_BATCH_DOCUMENTS,
+        max_bytes: int = MAX_BATCH_BYTES,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        max_retries: int = DEFAULT_MAX_RETRIES
+    ) -> BulkIndexingReport:
+        """
+        Upload a (possibly unbounded) document stream in concurrent batches
+        @param index_name: index name
+        @param documents: document iterable, consumed lazily
+        @param key_field: name of the document key field
+        @param max_documents: max number of documents per batch
+        @param max_bytes: max serialized payload size per batch
+        @param max_workers: number of concurrent upload requests
+        @param max_retries: max retries of a throttled batch
+        @return: per-document report
+        """
+        logging.info(f"Start bulk adding documents to index '{index_name}'...")
+
+        # initialize search client (if not already initialized)
+        self._init_search_client(index_name=index_name)
+
+        indexer = BulkIndexer(
+            self.search_client,
+            key_field=key_field,
+            max_documents=max_documents,
+            max_bytes=max_bytes,
+            max_workers=max_workers,
+            max_retries=max_retries
+        )
+        report = indexer.upload(documents)
+
+        logging.info(f"Completed bulk adding {report.succeeded_count} \
+            of {report.document_count} documents to index '{index_name}'.")
+        return report
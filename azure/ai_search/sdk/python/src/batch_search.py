@@ -0,0 +1,88 @@
+import time
+import logging
+from collections.abc import Callable, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import List
+
+import numpy as np
+
+# constants
+DEFAULT_MAX_WORKERS = 8
+PERCENTILES = (50, 90, 95, 99)
+
+
+@dataclass
+class BatchSearchReport:
+    results: List[list] = field(default_factory=list)  # aligned to inputs
+    latencies: List[float] = field(default_factory=list)  # seconds
+    elapsed_seconds: float = 0.0
+
+    @property
+    def queries_per_second(self) -> float:
+        if self.elapsed_seconds <= 0:
+            return 0.0
+        return len(self.results) / self.elapsed_seconds
+
+    def latency_percentiles(
+        self,
+        percentiles: Sequence[float] = PERCENTILES
+    ) -> dict:
+        """
+        Per-query latency percentiles
+        @param percentiles: percentiles in [0, 100]
+        @return: {percentile: seconds}
+        """
+        if not self.latencies:
+            return {p: 0.0 for p in percentiles}
+        values = np.percentile(self.latencies, percentiles)
+        return dict(zip(percentiles, values.tolist()))
+
+
+def align_queries(vectors=None, texts: Sequence[str] = None) -> int:
+    """
+    Validate batch inputs
+    @param vectors: (m x dimensions) matrix or list of vectors
+    @param texts: m query texts
+    @return: number of queries m
+    """
+    if vectors is None and texts is None:
+        raise ValueError("Expected vectors and/or texts")
+    if vectors is not None and texts is not None \
+            and len(vectors) != len(texts):
+        raise ValueError(f"Got {len(vectors)} vectors \
+            and {len(texts)} texts")
+    return len(vectors) if vectors is not None else len(texts)
+
+
+def run_batch(
+    search: Callable[[int], list],
+    n_queries: int,
+    max_workers: int = DEFAULT_MAX_WORKERS
+) -> BatchSearchReport:
+    """
+    Run search(i) for every query i with bounded concurrency
+    @param search: function of the query position
+    @param n_queries: number of queries
+    @param max_workers: max concurrent searches
+    @return: results aligned to the query positions, with latencies
+    """
+    def timed(i: int) -> tuple:
+        start = time.perf_counter()
+        results = search(i)
+        return results, time.perf_counter() - start
+
+    logging.info(f"Start batch of {n_queries} searches \
+        with {max_workers} workers...")
+    report = BatchSearchReport()
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # map preserves the input order
+        for results, latency in executor.map(timed, range(n_queries)):
+            report.results.append(results)
+            report.latencies.append(latency)
+    report.elapsed_seconds = time.perf_counter() - start
+    logging.info(f"Completed batch of {n_queries} searches: \
+        {report.queries_per_second:.1f} q/s, \
+        p50={report.latency_percentiles((50,))[50] * 1000:.1f}ms.")
+    return report
@@ -0,0 +1,274 @@
+# ref:
+# * https://learn.microsoft.com/en-us/azure/search/search-how-to-load-search-index
+# * https://learn.microsoft.com/en-us/azure/search/search-limits-quotas-capacity#api-request-limits  # noqa: E501
+# * https://learn.microsoft.com/en-us/azure/search/search-performance-tips
+
+import json
+import time
+import random
+import logging
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor, Future, wait, FIRST_COMPLETED
+from dataclasses import dataclass, field
+from typing import List, Dict, Tuple
+
+from azure.core.exceptions import HttpResponseError
+
+# constants
+# service limits: 1000 documents and 16 MB per indexing request
+MAX_BATCH_DOCUMENTS = 1000
+MAX_BATCH_BYTES = 16 * 1000 * 1000
+DEFAULT_KEY_FIELD = 'id'
+DEFAULT_MAX_WORKERS = 4
+DEFAULT_MAX_RETRIES = 5
+DEFAULT_BACKOFF_BASE_SECONDS = 0.5
+DEFAULT_BACKOFF_MAX_SECONDS = 30.0
+RETRYABLE_STATUS_CODES = {429, 503}
+PAYLOAD_TOO_LARGE_STATUS_CODE = 413
+
+
+@dataclass
+class DocumentStatus:
+    key: str
+    succeeded: bool
+    status_code: int = None
+    error_message: str = None
+
+
+@dataclass
+class BulkIndexingReport:
+    statuses: List[DocumentStatus] = field(default_factory=list)
+    batch_count: int = 0
+    request_count: int = 0
+    retry_count: int = 0
+    elapsed_seconds: float = 0.0
+
+    @property
+    def document_count(self) -> int:
+        return len(self.statuses)
+
+    @property
+    def succeeded_count(self) -> int:
+        return sum(1 for s in self.statuses if s.succeeded)
+
+    @property
+    def failed_count(self) -> int:
+        return self.document_count - self.succeeded_count
+
+    @property
+    def failed(self) -> List[DocumentStatus]:
+        return [s for s in self.statuses if not s.succeeded]
+
+    @property
+    def documents_per_second(self) -> float:
+        if self.elapsed_seconds <= 0:
+            return 0.0
+        return self.document_count / self.elapsed_seconds
+
+
+def document_size(document: Dict) -> int:
+    """
+    Approximate serialized size of a document in the request body
+    @param document: document
+    @return: size in bytes
+    """
+    return len(json.dumps(document, separators=(',', ':')).encode('utf-8'))
+
+
+def iter_batches(
+    documents: Iterable[Dict],
+    max_documents: int = MAX_BATCH_DOCUMENTS,
+    max_bytes: int = MAX_BATCH_BYTES
+) -> Iterator[List[Dict]]:
+    """
+    Lazily split a document stream into size- and byte-bounded batches
+    @param documents: document iterable (consumed once)
+    @param max_documents: max number of documents per batch
+    @param max_bytes: max serialized payload size per batch
+    @return: iterator of batches
+    """
+    if max_documents < 1:
+        raise ValueError(f"Invalid max_documents: {max_documents}")
+
+    batch: List[Dict] = []
+    batch_bytes = 0
+    for document in documents:
+        size = document_size(document)
+        if batch and (len(batch) >= max_documents
+                      or batch_bytes + size > max_bytes):
+            yield batch
+            batch = []
+            batch_bytes = 0
+        # a single oversized document is sent alone, the service reports it
+        batch.append(document)
+        batch_bytes += size
+    if batch:
+        yield batch
+
+
+class BulkIndexer:
+    """
+    Upload a document stream to a search index with a bounded worker pool.
+    Throttled batches are retried with exponential backoff and jitter,
+    the outcome is reported per document.
+    """
+
+    def __init__(
+        self,
+        search_client,
+        key_field: str = DEFAULT_KEY_FIELD,
+        max_documents: int = MAX_BATCH_DOCUMENTS,
+        max_bytes: int = MAX_BATCH_BYTES,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        backoff_base_seconds: float = DEFAULT_BACKOFF_BASE_SECONDS,
+        backoff_max_seconds: float = DEFAULT_BACKOFF_MAX_SECONDS
+    ):
+        """
+        @param search_client: client exposing upload_documents(documents=...)
+        @param key_field: name of the document key field
+        @param max_documents: max number of documents per batch
+        @param max_bytes: max serialized payload size per batch
+        @param max_workers: number of concurrent upload requests
+        @param max_retries: max retries of a throttled batch
+        @param backoff_base_seconds: first backoff delay
+        @param backoff_max_seconds: backoff delay cap
+        """
+        if max_workers < 1:
+            raise ValueError(f"Invalid max_workers: {max_workers}")
+        self.search_client = search_client
+        self.key_field = key_field
+        self.max_documents = max_documents
+        self.max_bytes = max_bytes
+        self.max_workers = max_workers
+        self.max_retries = max_retries
+        self.backoff_base_seconds = backoff_base_seconds
+        self.backoff_max_seconds = backoff_max_seconds
+
+    def _backoff(self, attempt: int) -> float:
+        delay = min(
+            self.backoff_max_seconds,
+            self.backoff_base_seconds * (2 ** attempt)
+        )
+        # full jitter
+        return random.uniform(0, delay)
+
+    def _upload_batch(
+        self,
+        batch: List[Dict]
+    ) -> Tuple[List[DocumentStatus], int, int]:
+        """
+        Upload one batch, retrying throttled documents
+        @param batch: documents
+        @return: (statuses, request count, retry count)
+        """
+        statuses: List[DocumentStatus] = []
+        request_count = 0
+        retry_count = 0
+        pending = batch
+        attempt = 0
+        while pending:
+            request_count += 1
+            try:
+                results = self.search_client.upload_documents(
+                    documents=pending)
+            except HttpResponseError as err:
+                if err.status_code == PAYLOAD_TOO_LARGE_STATUS_CODE \
+                        and len(pending) > 1:
+                    # split the payload and upload both halves
+                    middle = len(pending) // 2
+                    for half in (pending[:middle], pending[middle:]):
+                        sub_statuses, sub_requests, sub_retries = \
+                            self._upload_batch(half)
+                        statuses.extend(sub_statuses)
+                        request_count += sub_requests
+                        retry_count += sub_retries
+                    return statuses, request_count, retry_count
+                if err.status_code in RETRYABLE_STATUS_CODES \
+                        and attempt < self.max_retries:
+                    delay = self._backoff(attempt)
+                    logging.warning(f"Batch of {len(pending)} documents \
+                        throttled ({err.status_code}), retry in {delay:.2f}s")
+                    time.sleep(delay)
+                    attempt += 1
+                    retry_count += 1
+                    continue
+                logging.error(f"Batch of {len(pending)} documents \
+                    failed: {err}")
+                statuses.extend(
+                    DocumentStatus(
+                        key=d.get(self.key_field),
+                        succeeded=False,
+                        status_code=err.status_code,
+                        error_message=str(err)
+                    )
+                    for d in pending
+                )
+                return statuses, request_count, retry_count
+
+            # results are returned in request order
+            throttled = []
+            for document, result in zip(pending, results):
+                if not result.succeeded \
+                        and result.status_code in RETRYABLE_STATUS_CODES \
+                        and attempt < self.max_retries:
+                    throttled.append(document)
+                    continue
+                statuses.append(DocumentStatus(
+                    key=result.key,
+                    succeeded=result.succeeded,
+                    status_code=result.status_code,
+                    error_message=result.error_message
+                ))
+            if throttled:
+                delay = self._backoff(attempt)
+                logging.warning(f"{len(throttled)} documents throttled, \
+                    retry in {delay:.2f}s")
+                time.sleep(delay)
+                attempt += 1
+                retry_count += 1
+            pending = throttled
+        return statuses, request_count, retry_count
+
+    def upload(self, documents: Iterable[Dict]) -> BulkIndexingReport:
+        """
+        Upload documents
+        @param documents: document iterable, consumed lazily
+        @return: per-document report
+        """
+        logging.info(f"Start bulk upload with {self.max_workers} workers...")
+        report = BulkIndexingReport()
+        start = time.perf_counter()
+
+        def collect(done: Iterable[Future]) -> None:
+            for future in done:
+                statuses, request_count, retry_count = future.result()
+                report.statuses.extend(statuses)
+                report.request_count += request_count
+                report.retry_count += retry_count
+
+        # bound the number of in-flight batches so that the input
+        # iterator is only consumed as fast as the workers upload
+        max_in_flight = 2 * self.max_workers
+        in_flight = set()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for batch in iter_batches(
+                documents,
+                max_documents=self.max_documents,
+                max_bytes=self.max_bytes
+            ):
+                if len(in_flight) >= max_in_flight:
+                    done, in_flight = wait(
+                        in_flight, return_when=FIRST_COMPLETED)
+                    collect(done)
+                in_flight.add(executor.submit(self._upload_batch, batch))
+                report.batch_count += 1
+            done, _ = wait(in_flight)
+            collect(done)
+
+        report.elapsed_seconds = time.perf_counter() - start
+        logging.info(f"Completed bulk upload of {report.document_count} \
+            documents in {report.batch_count} batches: \
+            {report.succeeded_count} succeeded, {report.failed_count} failed, \
+            {report.documents_per_second:.1f} docs/s.")
+        return report
@@ -0,0 +1,598 @@
+# ref:
+# * https://numpy.org/doc/stable/reference/generated/numpy.memmap.html
+# * https://github.com/facebookresearch/faiss/wiki/Faiss-indexes#cell-probe-methods-indexivf-indexes  # noqa: E501
+# * https://learn.microsoft.com/en-us/azure/search/vector-search-ranking
+
+import os
+import json
+import time
+import logging
+import threading
+from collections.abc import Iterable
+from typing import List, Dict, Tuple
+
+import numpy as np
+
+from src.search_engine import SearchEngine
+from src.bulk_indexer import DocumentStatus
+from src.batch_search import BatchSearchReport, align_queries
+from src.re_ranker import ReRanker
+from src.azure_ai_search_engine import (
+    NUMBER_OF_NEIGHBORS_FOR_VECTOR_SEARCH,
+    VECTOR_FIELDS,
+    VectorSearchType, VectorRankingStrategy
+)
+
+# constants
+DEFAULT_INDEX_NAME = 'default'
+INITIAL_CAPACITY = 1024
+MAX_SCORE_ELEMENTS = 16 * 1024 * 1024  # bound of the (queries x rows) block
+IVF_MIN_DOCUMENTS = 1024  # below this, approximate search is exact
+IVF_DEFAULT_NPROBE = 8
+IVF_KMEANS_ITERATIONS = 10
+IVF_KMEANS_SAMPLE = 64 * 1024
+SCHEMA_FILE = 'schema.json'
+DOCUMENTS_FILE = 'documents.jsonl'
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    """
+    L2-normalize rows, so that a dot product is a cosine similarity
+    """
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def _top_k(scores: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Row-wise top-k of a (queries x candidates) score matrix
+    @return: (column indices, scores), both ordered by descending score
+    """
+    n = scores.shape[1]
+    k = min(k, n)
+    if k == 0:
+        empty = np.empty((scores.shape[0], 0))
+        return empty.astype(np.intp), empty
+    if k < n:
+        columns = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    else:
+        columns = np.broadcast_to(np.arange(n), scores.shape)
+    selected = np.take_along_axis(scores, columns, axis=1)
+    order = np.argsort(-selected, axis=1, kind='stable')
+    return (np.take_along_axis(columns, order, axis=1),
+            np.take_along_axis(selected, order, axis=1))
+
+
+class VectorStore:
+    """
+    Contiguous float32 matrix of L2-normalized vectors of one field,
+    with an optional inverted-file (IVF) index for approximate search
+    """
+
+    def __init__(self, dimensions: int, vectors: np.ndarray = None):
+        self.dimensions = dimensions
+        if vectors is None:
+            self.vectors = np.zeros(
+                (INITIAL_CAPACITY, dimensions), dtype=np.float32)
+            self.size = 0
+        else:
+            # may be a read-only memory map, copied on first write
+            self.vectors = vectors
+            self.size = len(vectors)
+        self.valid = np.ones(self.size, dtype=bool) if vectors is not None \
+            else np.zeros(INITIAL_CAPACITY, dtype=bool)
+        self.centroids: np.ndarray = None
+        self.assignments: np.ndarray = None  # row -> centroid
+        self._lists: List[np.ndarray] = None  # centroid -> rows
+
+    def _reserve(self, size: int) -> None:
+        capacity = len(self.vectors)
+        writable = isinstance(self.vectors, np.ndarray) \
+            and not isinstance(self.vectors, np.memmap)
+        if size <= capacity and writable:
+            return
+        capacity = max(capacity, INITIAL_CAPACITY)
+        while capacity < size:
+            capacity *= 2
+        vectors = np.zeros((capacity, self.dimensions), dtype=np.float32)
+        vectors[:self.size] = self.vectors[:self.size]
+        valid = np.zeros(capacity, dtype=bool)
+        valid[:self.size] = self.valid[:self.size]
+        self.vectors, self.valid = vectors, valid
+
+    def set_rows(self, rows: np.ndarray, vectors: np.ndarray) -> None:
+        """
+        Write (normalized) vectors at rows, growing the matrix if needed
+        @param rows: row indices
+        @param vectors: (len(rows) x dimensions) matrix
+        """
+        if len(rows) == 0:
+            return
+        self._reserve(int(rows.max()) + 1)
+        self.vectors[rows] = _normalize(
+            np.asarray(vectors, dtype=np.float32))
+        self.valid[rows] = True
+        self.size = max(self.size, int(rows.max()) + 1)
+        if self.centroids is not None:
+            # keep the IVF index current by assigning to the nearest cell
+            self._grow_assignments()
+            self.assignments[rows] = np.argmax(
+                self.vectors[rows] @ self.centroids.T, axis=1)
+            self._lists = None
+
+    def grow(self, size: int) -> None:
+        """
+        Extend to size rows (rows without vector are not valid)
+        """
+        self._reserve(size)
+        self.size = max(self.size, size)
+
+    def _grow_assignments(self) -> None:
+        if len(self.assignments) < self.size:
+            assignments = np.zeros(self.size, dtype=np.intp)
+            assignments[:len(self.assignments)] = self.assignments
+            self.assignments = assignments
+
+    def matrix(self) -> np.ndarray:
+        return self.vectors[:self.size]
+
+    def search_exact(
+        self,
+        queries: np.ndarray,
+        k: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Exact cosine top-k by blocked matrix multiplication
+        @param queries: (m x dimensions) normalized queries
+        @param k: number of neighbors
+        @return: (rows, scores), each (m x k')
+        """
+        matrix = self.matrix()
+        invalid = ~self.valid[:self.size]
+        block = max(1, MAX_SCORE_ELEMENTS // max(1, self.size))
+        all_rows, all_scores = [], []
+        for start in range(0, len(queries), block):
+            scores = queries[start:start + block] @ matrix.T
+            scores[:, invalid] = -np.inf
+            rows, top_scores = _top_k(scores, k)
+            all_rows.append(rows)
+            all_scores.append(top_scores)
+        if not all_rows:
+            empty = np.empty((0, 0))
+            return empty.astype(np.intp), empty
+        return np.vstack(all_rows), np.vstack(all_scores)
+
+    def build_ivf(self, n_lists: int = None, seed: int = 0) -> None:
+        """
+        Cluster vectors with spherical k-means, one inverted list per cell
+        @param n_lists: number of cells, default sqrt(size)
+        @param seed: random seed
+        """
+        valid_rows = np.flatnonzero(self.valid[:self.size])
+        n_lists = n_lists if n_lists else \
+            max(1, int(np.sqrt(len(valid_rows))))
+        logging.info(f"Start building IVF with {n_lists} cells \
+            over {len(valid_rows)} vectors...")
+        rng = np.random.default_rng(seed)
+        sample_rows = valid_rows if len(valid_rows) <= IVF_KMEANS_SAMPLE \
+            else rng.choice(valid_rows, IVF_KMEANS_SAMPLE, replace=False)
+        sample = self.vectors[sample_rows]
+        centroids = sample[
+            rng.choice(len(sample), min(n_lists, len(sample)), replace=False)]
+        for _ in range(IVF_KMEANS_ITERATIONS):
+            labels = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, labels, sample)
+            empty = ~np.bincount(labels, minlength=len(centroids)).astype(bool)
+            # keep previous centroid for empty cells
+            sums[empty] = centroids[empty]
+            centroids = _normalize(sums)
+        self.centroids = centroids.astype(np.float32)
+
+        matrix = self.matrix()
+        self.assignments = np.zeros(self.size, dtype=np.intp)
+        block = max(1, MAX_SCORE_ELEMENTS // len(self.centroids))
+        for start in range(0, self.size, block):
+            self.assignments[start:start + block] = np.argmax(
+                matrix[start:start + block] @ self.centroids.T, axis=1)
+        self._lists = None
+        logging.info("Completed building IVF.")
+
+    def _inverted_lists(self) -> List[np.ndarray]:
+        if self._lists is None:
+            valid_rows = np.flatnonzero(self.valid[:self.size])
+            cells = self.assignments[valid_rows]
+            order = np.argsort(cells, kind='stable')
+            bounds = np.searchsorted(
+                cells[order], np.arange(len(self.centroids) + 1))
+            sorted_rows = valid_rows[order]
+            self._lists = [
+                sorted_rows[bounds[i]:bounds[i + 1]]
+                for i in range(len(self.centroids))
+            ]
+        return self._lists
+
+    def search_ivf(
+        self,
+        queries: np.ndarray,
+        k: int,
+        n_probe: int = IVF_DEFAULT_NPROBE
+    ) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Approximate cosine top-k over the n_probe nearest cells
+        @param queries: (m x dimensions) normalized queries
+        @param k: number of neighbors
+        @param n_probe: number of cells to scan per query
+        @return: per query (rows, scores)
+        """
+        if self.centroids is None:
+            self.build_ivf()
+        lists = self._inverted_lists()
+        n_probe = min(n_probe, len(self.centroids))
+        cells = _top_k(queries @ self.centroids.T, n_probe)[0]
+        results = []
+        for query, query_cells in zip(queries, cells):
+            candidates = np.concatenate([lists[c] for c in query_cells])
+            scores = self.vectors[candidates] @ query
+            columns, top_scores = _top_k(scores[np.newaxis, :], k)
+            results.append((candidates[columns[0]], top_scores[0]))
+        return results
+
+
+class LocalVectorIndex:
+    """
+    In-process index: documents plus one VectorStore per vector field
+    """
+
+    def __init__(self, name: str, schema: dict):
+        self.name = name
+        self.schema = schema
+        self.key_field = next(
+            (k for k, v in schema.items() if v.get('key')), None)
+        if self.key_field is None:
+            raise ValueError(f"Index '{name}' schema has no key field")
+        self.vector_stores: Dict[str, VectorStore] = {
+            field_name: VectorStore(field['vector_search_dimensions'])
+            for field_name, field in schema.items()
+            if field.get('data_type') == 'vector'
+        }
+        self.searchable_fields = [
+            field_name for field_name, field in schema.items()
+            if field.get('searchable') and field.get('data_type') != 'vector'
+        ]
+        self.documents: List[Dict] = []  # without vector fields
+        self.rows: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def upload(self, documents: Iterable[Dict]) -> List[DocumentStatus]:
+        """
+        Merge documents by key (upload semantics: replace if present)
+        @param documents: documents
+        @return: per-document status
+        """
+        statuses = []
+        vectors: Dict[str, Tuple[List[int], List]] = {
+            field_name: ([], []) for field_name in self.vector_stores}
+        with self._lock:
+            for document in documents:
+                key = document.get(self.key_field)
+                if key is None:
+                    statuses.append(DocumentStatus(
+                        key=None,
+                        succeeded=False,
+                        status_code=400,
+                        error_message=f"Missing key field '{self.key_field}'"
+                    ))
+                    continue
+                row = self.rows.get(key)
+                is_new = row is None
+                content = {k: v for k, v in document.items()
+                           if k not in self.vector_stores}
+                if is_new:
+                    row = self.rows[key] = len(self.documents)
+                    self.documents.append(content)
+                else:
+                    self.documents[row] = content
+                for field_name in self.vector_stores:
+                    value = document.get(field_name)
+                    if value is not None:
+                        vectors[field_name][0].append(row)
+                        vectors[field_name][1].append(value)
+                statuses.append(DocumentStatus(
+                    key=key, succeeded=True,
+                    status_code=201 if is_new else 200))
+
+            for field_name, (rows, values) in vectors.items():
+                store = self.vector_stores[field_name]
+                store.grow(len(self.documents))
+                store.set_rows(np.asarray(rows, dtype=np.intp),
+                               np.asarray(values, dtype=np.float32))
+        return statuses
+
+    def save(self, path: str) -> None:
+        """
+        Persist schema, documents and raw vector matrices
+        @param path: index directory
+        """
+        os.makedirs(path, exist_ok=True)
+        with open(os.path.join(path, SCHEMA_FILE), 'w') as f:
+            json.dump(self.schema, f)
+        with open(os.path.join(path, DOCUMENTS_FILE), 'w') as f:
+            for document in self.documents:
+                f.write(json.dumps(document) + '\n')
+        for field_name, store in self.vector_stores.items():
+            matrix = np.zeros(
+                (len(self.documents), store.dimensions), dtype=np.float32)
+            matrix[:store.size] = store.matrix()
+            # rows without vector are saved as zero vectors
+            np.save(os.path.join(path, f"{field_name}.npy"), matrix)
+
+    @staticmethod
+    def load(name: str, path: str, mmap: bool = True) -> 'LocalVectorIndex':
+        """
+        Load a persisted index
+        @param name: index name
+        @param path: index directory
+        @param mmap: memory-map the vector matrices instead of reading them
+        @return: index
+        """
+        with open(os.path.join(path, SCHEMA_FILE)) as f:
+            index = LocalVectorIndex(name, json.load(f))
+        with open(os.path.join(path, DOCUMENTS_FILE)) as f:
+            index.documents = [json.loads(line) for line in f]
+        index.rows = {d[index.key_field]: i
+                      for i, d in enumerate(index.documents)}
+        for field_name in index.vector_stores:
+            matrix = np.load(os.path.join(path, f"{field_name}.npy"),
+                             mmap_mode='r' if mmap else None)
+            store = VectorStore(matrix.shape[1], vectors=matrix)
+            store.valid = np.any(matrix != 0, axis=1)
+            index.vector_stores[field_name] = store
+        return index
+
+
+class LocalVectorSearchEngine(SearchEngine):
+    """
+    Class to search in-process, without network: vectors are held in
+    contiguous float32 NumPy matrices, optionally memory-mapped from disk.
+    Accepts the same create_index schema and upload_documents payloads
+    as AzureAISearchEngine.
+    """
+
+    def __init__(
+        self,
+        index_name: str = None,
+        path: str = None,
+        mmap: bool = True,
+        n_probe: int = IVF_DEFAULT_NPROBE
+    ):
+        """
+        @param index_name: default index name
+        @param path: optional directory to persist / load indexes
+        @param mmap: memory-map persisted vector matrices
+        @param n_probe: number of IVF cells scanned by approximate search
+        """
+        logging.info("Start LocalVectorSearch configuration ...")
+        self._index_name = index_name if index_name else DEFAULT_INDEX_NAME
+        self._path = path
+        self._n_probe = n_probe
+        self.indexes: Dict[str, LocalVectorIndex] = {}
+        if path and os.path.isdir(path):
+            for name in sorted(os.listdir(path)):
+                index_path = os.path.join(path, name)
+                if os.path.isfile(os.path.join(index_path, SCHEMA_FILE)):
+                    self.indexes[name] = LocalVectorIndex.load(
+                        name, index_path, mmap=mmap)
+        logging.info(f"Completed LocalVectorSearch configuration \
+            with {len(self.indexes)} indexes.")
+
+    def _get_index(self, index_name: str = None) -> LocalVectorIndex:
+        index_name = index_name if index_name else self._index_name
+        index = self.indexes.get(index_name)
+        if index is None:
+            raise ValueError(f"Index not found: {index_name}")
+        return index
+
+    def create_index(self, index_name: str, schema: dict) -> LocalVectorIndex:
+        """
+        Create empty index
+        @param index_name: index name
+        @param schema: same schema dict as AzureAISearchEngine.create_index
+        @return: index
+        """
+        logging.info(f"Start creating index '{index_name}'...")
+        index = LocalVectorIndex(index_name, schema)
+        self.indexes[index_name] = index
+        logging.info(f"Completed creating index '{index_name}' \
+            with {len(schema)} fields.")
+        return index
+
+    def upload_documents(
+        self,
+        index_name: str,
+        documents: List[Dict]
+    ) -> List[DocumentStatus]:
+        logging.info(f"Start adding {len(documents)} documents \
+            to index '{index_name}'...")
+        result = self._get_index(index_name).upload(documents)
+        logging.info(f"Completed adding {len(documents)} documents \
+            to index '{index_name}'.")
+        return result
+
+    def save(self, index_name: str = None) -> None:
+        """
+        Persist an index (all indexes if index_name is None) to path
+        """
+        if not self._path:
+            raise ValueError("No path configured")
+        names = [index_name] if index_name else list(self.indexes)
+        for name in names:
+            self._get_index(name).save(os.path.join(self._path, name))
+
+    def build_ivf(
+        self,
+        index_name: str = None,
+        vector_fields: str = VECTOR_FIELDS,
+        n_lists: int = None
+    ) -> None:
+        """
+        (Re)build the approximate index of a vector field
+        """
+        self._get_index(index_name).vector_stores[vector_fields].build_ivf(
+            n_lists=n_lists)
+
+    @staticmethod
+    def _text_results(index: LocalVectorIndex, text: str) -> list:
+        terms = text.lower().split()
+        results = []
+        for document in index.documents:
+            score = 0
+            for field_name in index.searchable_fields:
+                value = document.get(field_name)
+                if isinstance(value, str):
+                    tokens = value.lower().split()
+                    score += sum(tokens.count(term) for term in terms)
+            if score > 0:
+                result = dict(document)
+                result['@search.score'] = float(score)
+                results.append(result)
+        results.sort(key=lambda r: r['@search.score'], reverse=True)
+        return results
+
+    def search(self, text: str) -> Iterable:
+        """
+        Search text: term frequency over the searchable fields
+        @param text: search text
+        @return: search results
+        """
+        return self._text_results(self._get_index(), text)
+
+    def _vector_results(
+        self,
+        index: LocalVectorIndex,
+        vector_fields: str,
+        queries: np.ndarray,
+        top: int,
+        skip: int,
+        vector_search_type: VectorSearchType
+    ) -> List[list]:
+        store = index.vector_stores.get(vector_fields)
+        if store is None:
+            raise ValueError(f"Invalid vector field: {vector_fields}")
+        queries = _normalize(np.atleast_2d(
+            np.asarray(queries, dtype=np.float32)))
+        k = skip + top
+
+        match vector_search_type:
+            case VectorSearchType.EXACT:
+                neighbors = zip(*store.search_exact(queries, k))
+            case VectorSearchType.APPROXIMATE:
+                if store.size < IVF_MIN_DOCUMENTS:
+                    neighbors = zip(*store.search_exact(queries, k))
+                else:
+                    neighbors = store.search_ivf(
+                        queries, k, n_probe=self._n_probe)
+            case _:
+                raise ValueError(f"Invalid search type: {vector_search_type}")
+
+        results = []
+        for rows, scores in neighbors:
+            query_results = []
+            for row, score in zip(rows[skip:], scores[skip:]):
+                if not np.isfinite(score):
+                    break
+                result = dict(index.documents[row])
+                result['@search.score'] = float(score)
+                query_results.append(result)
+            results.append(query_results)
+        return results
+
+    def _search_vector(
+        self,
+        vector: list,
+        vector_fields: str = VECTOR_FIELDS,
+        vector_search_type: VectorSearchType = VectorSearchType.APPROXIMATE,
+        vector_ranking_strategy: VectorRankingStrategy = VectorRankingStrategy.COSINE,  # noqa: E501
+        top: int = NUMBER_OF_NEIGHBORS_FOR_VECTOR_SEARCH,
+        skip: int = 0,
+        index_name: str = None
+    ) -> list:
+        """
+        Search vector
+        @param vector: vector input
+        @param vector_fields: field to search
+        @param vector_search_type: EXACT (matrix product) or APPROXIMATE (IVF)
+        @param vector_ranking_strategy: ranking strategy
+        @param top: max number of results
+        @param skip: number of results to skip
+        @param index_name: index name, default the configured index
+        @return: search results ordered by cosine similarity
+        """
+        logging.info("Start search vector ...")
+        if vector_ranking_strategy != VectorRankingStrategy.COSINE:
+            raise ValueError(f"Invalid ranking strategy: \
+                {vector_ranking_strategy}")
+        results = self._vector_results(
+            self._get_index(index_name),
+            vector_fields,
+            vector,
+            top=top,
+            skip=skip,
+            vector_search_type=vector_search_type
+        )[0]
+        logging.info(f"Completed search vector. \
+            Sorted results has {len(results)} items.")
+        return results
+
+    def search_many(
+        self,
+        vectors=None,
+        texts: List[str] = None,
+        top: int = 10,
+        vector_fields: str = VECTOR_FIELDS,
+        vector_search_type: VectorSearchType = VectorSearchType.APPROXIMATE,
+        index_name: str = None
+    ) -> BatchSearchReport:
+        """
+        Run many queries: all vectors are scored in one blocked matrix
+        multiplication, texts are searched one by one,
+        for both vectors and texts the two rankings are fused with RRF
+        @param vectors: (m x dimensions) matrix or list of query vectors
+        @param texts: m query texts
+        @param top: max number of results per query
+        @param vector_fields: field to search
+        @param vector_search_type: EXACT or APPROXIMATE
+        @param index_name: index name, default the configured index
+        @return: results aligned to the inputs, with per-query latencies
+        """
+        n_queries = align_queries(vectors, texts)
+        index = self._get_index(index_name)
+        report = BatchSearchReport()
+        start = time.perf_counter()
+        if vectors is not None:
+            report.results = self._vector_results(
+                index,
+                vector_fields,
+                vectors,
+                top=top,
+                skip=0,
+                vector_search_type=vector_search_type
+            )
+            # every query of the batch is answered when the batch completes
+            report.latencies = [time.perf_counter() - start] * n_queries
+        if texts is not None:
+            re_ranker = ReRanker(key_field=index.key_field)
+            for i, text in enumerate(texts):
+                query_start = time.perf_counter()
+                text_results = self._text_results(index, text)[:top]
+                if vectors is None:
+                    report.results.append(text_results)
+                    report.latencies.append(
+                        time.perf_counter() - query_start)
+                else:
+                    report.results[i] = re_ranker.fuse(
+                        [text_results, report.results[i]], top=top)
+                    report.latencies[i] += time.perf_counter() - query_start
+        report.elapsed_seconds = time.perf_counter() - start
+        return report
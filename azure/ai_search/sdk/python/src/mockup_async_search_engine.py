@@ -0,0 +1,19 @@
+from collections.abc import Iterable
+
+from src.async_search_engine import AsyncSearchEngine
+
+
+class MockupAsyncSearchEngine(AsyncSearchEngine):
+    """
+    Mockup class for asynchronous search.
+    """
+
+    async def search(self, text: str) -> Iterable:
+        """
+        Search text
+        @param text: search text
+        @return: search results
+        """
+
+        record = {"foo": "bar"}
+        return [record]
@@ -0,0 +1,247 @@
+import math
+import time
+import asyncio
+import random
+import threading
+from collections.abc import Iterator, AsyncIterator
+from typing import List, Dict
+
+from azure.core.exceptions import HttpResponseError
+
+# constants
+DEFAULT_TOP = 50  # service default when top is not set
+RRF_K = 60  # rank constant used by the service for hybrid fusion
+
+
+class MockupIndexingResult:
+    """
+    Mockup of azure.search.documents.models.IndexingResult
+    (the SDK model has read-only attributes and cannot be built locally)
+    """
+
+    def __init__(
+        self,
+        key: str,
+        succeeded: bool,
+        status_code: int,
+        error_message: str = None
+    ):
+        self.key = key
+        self.succeeded = succeeded
+        self.status_code = status_code
+        self.error_message = error_message
+
+    def __repr__(self) -> str:
+        return f"MockupIndexingResult(key={self.key!r}, \
+succeeded={self.succeeded}, status_code={self.status_code})"
+
+
+def _text_score(document: Dict, terms: List[str], fields: List[str]) -> float:
+    score = 0.0
+    for field_name in fields:
+        value = document.get(field_name)
+        if isinstance(value, str):
+            tokens = value.lower().split()
+            score += sum(tokens.count(term) for term in terms)
+    return score
+
+
+def _cosine(a: List[float], b: List[float]) -> float:
+    dot = sum(x * y for x, y in zip(a, b))
+    norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+    return dot / norm if norm else 0.0
+
+
+class MockupSearchClient:
+    """
+    Local, in-memory stand-in for azure.search.documents.SearchClient.
+    Simulates per-request latency and service throttling (HTTP 503).
+    """
+
+    def __init__(
+        self,
+        key_field: str = 'id',
+        latency_seconds: float = 0.0,
+        throttle_rate: float = 0.0,
+        seed: int = None
+    ):
+        """
+        @param key_field: name of the document key field
+        @param latency_seconds: simulated round trip per request
+        @param throttle_rate: probability [0, 1] a request is throttled
+        @param seed: random seed for reproducible throttling
+        """
+        self.key_field = key_field
+        self.latency_seconds = latency_seconds
+        self.throttle_rate = throttle_rate
+        self.documents: Dict[str, Dict] = {}
+        self.request_count = 0
+        self.throttled_count = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def _simulate_request(self) -> None:
+        with self._lock:
+            self.request_count += 1
+            throttled = self._random.random() < self.throttle_rate
+            if throttled:
+                self.throttled_count += 1
+        if self.latency_seconds:
+            time.sleep(self.latency_seconds)
+        if throttled:
+            err = HttpResponseError(message="Service Unavailable (mockup)")
+            err.status_code = 503
+            raise err
+
+    def upload_documents(
+        self,
+        documents: List[Dict],
+        **kwargs
+    ) -> List[MockupIndexingResult]:
+        self._simulate_request()
+        results = []
+        with self._lock:
+            for document in documents:
+                key = document.get(self.key_field)
+                if key is None:
+                    results.append(MockupIndexingResult(
+                        key=None,
+                        succeeded=False,
+                        status_code=400,
+                        error_message=f"Missing key field '{self.key_field}'"
+                    ))
+                    continue
+                is_new = key not in self.documents
+                self.documents[key] = dict(document)
+                results.append(MockupIndexingResult(
+                    key=key,
+                    succeeded=True,
+                    status_code=201 if is_new else 200
+                ))
+        return results
+
+    def _rank_text(
+        self,
+        search_text: str,
+        search_fields: List[str] = None
+    ) -> List[tuple]:
+        terms = search_text.lower().split()
+        ranked = []
+        for key, document in self.documents.items():
+            fields = search_fields or [
+                k for k, v in document.items() if isinstance(v, str)]
+            score = _text_score(document, terms, fields)
+            if score > 0:
+                ranked.append((score, key))
+        ranked.sort(key=lambda r: r[0], reverse=True)
+        return ranked
+
+    def _rank_vector(self, vector_query) -> List[tuple]:
+        ranked = []
+        for key, document in self.documents.items():
+            value = document.get(vector_query.fields)
+            if value is not None:
+                ranked.append((_cosine(vector_query.vector, value), key))
+        ranked.sort(key=lambda r: r[0], reverse=True)
+        return ranked[:vector_query.k_nearest_neighbors]
+
+    def search(
+        self,
+        search_text: str = None,
+        search_fields: List[str] = None,
+        select: List[str] = None,
+        top: int = None,
+        skip: int = None,
+        vector_queries: list = None,
+        **kwargs
+    ) -> Iterator[Dict]:
+        """
+        Score documents like the service: term frequency for text,
+        cosine similarity for vectors, RRF to fuse several rankings
+        """
+        self._simulate_request()
+        with self._lock:
+            rankings = []
+            if search_text and search_text != '*':
+                rankings.append(self._rank_text(search_text, search_fields))
+            for vector_query in vector_queries or []:
+                rankings.append(self._rank_vector(vector_query))
+            if not rankings:
+                rankings.append([(1.0, key) for key in self.documents])
+
+            if len(rankings) == 1:
+                ranked = rankings[0]
+            else:
+                fused: Dict[str, float] = {}
+                for ranking in rankings:
+                    for rank, (_, key) in enumerate(ranking, start=1):
+                        fused[key] = fused.get(key, 0.0) + 1 / (RRF_K + rank)
+                ranked = sorted(
+                    ((score, key) for key, score in fused.items()),
+                    key=lambda r: r[0],
+                    reverse=True
+                )
+
+            skip = skip or 0
+            top = top if top is not None else DEFAULT_TOP
+            page = []
+            for score, key in ranked[skip:skip + top]:
+                document = self.documents[key]
+                if select:
+                    document = {
+                        k: v for k, v in document.items() if k in select}
+                result = dict(document)
+                result['@search.score'] = score
+                result['@search.reranker_score'] = None
+                page.append(result)
+        return iter(page)
+
+    def close(self) -> None:
+        pass
+
+
+class MockupAsyncSearchClient:
+    """
+    Local stand-in for azure.search.documents.aio.SearchClient, backed by a
+    MockupSearchClient. Latency is simulated without blocking the loop.
+    """
+
+    def __init__(
+        self,
+        search_client: MockupSearchClient = None,
+        latency_seconds: float = 0.0
+    ):
+        """
+        @param search_client: document store, default an empty one
+        @param latency_seconds: simulated round trip per request
+        """
+        self.search_client = search_client if search_client is not None \
+            else MockupSearchClient()
+        self.latency_seconds = latency_seconds
+        self.request_count = 0
+        self.closed = False
+
+    async def _simulate_request(self) -> None:
+        self.request_count += 1
+        if self.latency_seconds:
+            await asyncio.sleep(self.latency_seconds)
+
+    async def upload_documents(
+        self,
+        documents: List[Dict],
+        **kwargs
+    ) -> List[MockupIndexingResult]:
+        await self._simulate_request()
+        return self.search_client.upload_documents(documents, **kwargs)
+
+    async def search(self, **kwargs) -> AsyncIterator[Dict]:
+        await self._simulate_request()
+        results = list(self.search_client.search(**kwargs))
+
+        async def pager():
+            for result in results:
+                yield result
+        return pager()
+
+    async def close(self) -> None:
+        self.closed = True
@@ -0,0 +1,220 @@
+# ref:
+# * https://plg.uwaterloo.ca/~gvcormac/cormacksigir09-rrf.pdf
+# * https://learn.microsoft.com/en-us/azure/search/hybrid-search-ranking
+# * https://www.sbert.net/examples/applications/cross-encoder/README.html
+
+import logging
+from collections.abc import Callable, Sequence
+from enum import Enum
+from typing import List, Dict
+
+import numpy as np
+
+# constants
+DEFAULT_RRF_K = 60  # rank constant, same as the service
+DEFAULT_KEY_FIELD = 'id'
+SCORE_FIELD = '@search.score'
+FUSED_SCORE_FIELD = '@search.fused_score'
+CROSS_ENCODER_SCORE_FIELD = '@search.cross_encoder_score'
+
+# (query, candidates) -> one relevance score per candidate
+CrossEncoder = Callable[[str, List[Dict]], Sequence[float]]
+
+
+class FusionStrategy(Enum):
+    RRF = 'rrf'  # Reciprocal Rank Fusion
+    WEIGHTED_SCORE = 'weighted_score'  # min-max normalized weighted sum
+
+
+def _index_rankings(
+    rankings: List[List[Dict]],
+    key_field: str
+) -> tuple:
+    """
+    Map every result to a column of the (rankings x candidates) matrices
+    @param rankings: result lists, each ordered by descending score
+    @param key_field: name of the document key field
+    @return: (candidates, list of column index arrays)
+    """
+    columns: Dict[str, int] = {}
+    candidates: List[Dict] = []
+    positions = []
+    for ranking in rankings:
+        position = np.empty(len(ranking), dtype=np.intp)
+        for i, result in enumerate(ranking):
+            key = result[key_field]
+            column = columns.get(key)
+            if column is None:
+                column = columns[key] = len(candidates)
+                candidates.append(result)
+            position[i] = column
+        positions.append(position)
+    return candidates, positions
+
+
+def rrf_scores(
+    positions: List[np.ndarray],
+    n_candidates: int,
+    k: float = DEFAULT_RRF_K,
+    weights: Sequence[float] = None
+) -> np.ndarray:
+    """
+    Reciprocal Rank Fusion: sum_i w_i / (k + rank_i), missing ranks add 0
+    @param positions: per ranking, candidate column of each rank
+    @param n_candidates: number of distinct candidates
+    @param k: rank constant
+    @param weights: weight per ranking, default 1.0
+    @return: fused score per candidate
+    """
+    weights = np.ones(len(positions)) if weights is None \
+        else np.asarray(weights, dtype=np.float64)
+    scores = np.zeros(n_candidates, dtype=np.float64)
+    for weight, position in zip(weights, positions):
+        ranks = np.arange(1, len(position) + 1, dtype=np.float64)
+        # keys are unique within a ranking, so fancy-index add is safe
+        scores[position] += weight / (k + ranks)
+    return scores
+
+
+def weighted_scores(
+    positions: List[np.ndarray],
+    raw_scores: List[np.ndarray],
+    n_candidates: int,
+    weights: Sequence[float] = None
+) -> np.ndarray:
+    """
+    Min-max normalize each ranking's scores to [0, 1], then weighted sum
+    @param positions: per ranking, candidate column of each rank
+    @param raw_scores: per ranking, service score of each rank
+    @param n_candidates: number of distinct candidates
+    @param weights: weight per ranking, default 1.0
+    @return: fused score per candidate
+    """
+    weights = np.ones(len(positions)) if weights is None \
+        else np.asarray(weights, dtype=np.float64)
+    scores = np.zeros(n_candidates, dtype=np.float64)
+    for weight, position, raw in zip(weights, positions, raw_scores):
+        if len(raw) == 0:
+            continue
+        low, high = raw.min(), raw.max()
+        normalized = (raw - low) / (high - low) if high > low \
+            else np.ones_like(raw)
+        scores[position] += weight * normalized
+    return scores
+
+
+class ReRanker:
+    """
+    Client-side fusion of several ranked result lists
+    (e.g. text and vector queries) with an optional cross-encoder pass
+    """
+
+    def __init__(
+        self,
+        strategy: FusionStrategy = FusionStrategy.RRF,
+        k: float = DEFAULT_RRF_K,
+        weights: Sequence[float] = None,
+        key_field: str = DEFAULT_KEY_FIELD,
+        cross_encoder: CrossEncoder = None
+    ):
+        """
+        @param strategy: fusion strategy
+        @param k: RRF rank constant
+        @param weights: weight per ranking, default 1.0
+        @param key_field: name of the document key field
+        @param cross_encoder: optional (query, candidates) -> scores hook
+        """
+        self.strategy = strategy
+        self.k = k
+        self.weights = weights
+        self.key_field = key_field
+        self.cross_encoder = cross_encoder
+
+    def fuse(
+        self,
+        rankings: List[List[Dict]],
+        top: int = None
+    ) -> List[Dict]:
+        """
+        Fuse result lists into one list ordered by fused score
+        @param rankings: result lists, each ordered by descending score
+        @param top: max number of results, default all candidates
+        @return: results with FUSED_SCORE_FIELD
+        """
+        if self.weights is not None and len(self.weights) != len(rankings):
+            raise ValueError(f"Expected {len(rankings)} weights, \
+                got {len(self.weights)}")
+
+        candidates, positions = _index_rankings(rankings, self.key_field)
+        n_candidates = len(candidates)
+        match self.strategy:
+            case FusionStrategy.RRF:
+                scores = rrf_scores(
+                    positions, n_candidates, k=self.k, weights=self.weights)
+            case FusionStrategy.WEIGHTED_SCORE:
+                raw_scores = [
+                    np.fromiter(
+                        (r[SCORE_FIELD] or 0.0 for r in ranking),
+                        dtype=np.float64,
+                        count=len(ranking)
+                    )
+                    for ranking in rankings
+                ]
+                scores = weighted_scores(
+                    positions, raw_scores, n_candidates, weights=self.weights)
+            case _:
+                raise ValueError(f"Invalid fusion strategy: {self.strategy}")
+
+        top = n_candidates if top is None else min(top, n_candidates)
+        if top < n_candidates:
+            # partial top-k selection, then sort only the selection
+            selection = np.argpartition(-scores, top - 1)[:top]
+        else:
+            selection = np.arange(n_candidates)
+        order = selection[np.argsort(-scores[selection], kind='stable')]
+
+        results = []
+        for column in order:
+            result = dict(candidates[column])
+            result[FUSED_SCORE_FIELD] = float(scores[column])
+            results.append(result)
+        return results
+
+    def rerank(
+        self,
+        query: str,
+        rankings: List[List[Dict]],
+        top: int = None
+    ) -> List[Dict]:
+        """
+        Fuse result lists, then re-score the fused list with the
+        cross-encoder (if configured)
+        @param query: query text, passed to the cross-encoder
+        @param rankings: result lists, each ordered by descending score
+        @param top: max number of results
+        @return: re-ranked results
+        """
+        if self.cross_encoder is None:
+            return self.fuse(rankings, top=top)
+
+        fused = self.fuse(rankings)
+        if not fused:
+            return fused
+
+        logging.info(f"Start cross-encoder re-ranking of \
+            {len(fused)} candidates...")
+        scores = np.asarray(self.cross_encoder(query, fused),
+                            dtype=np.float64)
+        if scores.shape != (len(fused),):
+            raise ValueError(f"Cross-encoder returned {scores.shape} scores \
+                for {len(fused)} candidates")
+        order = np.argsort(-scores, kind='stable')
+        if top is not None:
+            order = order[:top]
+        results = []
+        for i in order:
+            result = fused[i]
+            result[CROSS_ENCODER_SCORE_FIELD] = float(scores[i])
+            results.append(result)
+        logging.info("Completed cross-encoder re-ranking.")
+        return results
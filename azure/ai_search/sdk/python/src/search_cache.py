@@ -0,0 +1,310 @@
+# ref:
+# * https://docs.python.org/3/library/sqlite3.html
+# * https://learn.microsoft.com/en-us/azure/search/search-performance-tips
+
+import json
+import time
+import hashlib
+import inspect
+import logging
+import sqlite3
+import threading
+from collections import OrderedDict
+from collections.abc import Iterable
+from dataclasses import dataclass
+from enum import Enum
+from typing import List, Dict
+
+import numpy as np
+
+from src.search_engine import SearchEngine
+
+# constants
+DEFAULT_MAX_ENTRIES = 1024
+DEFAULT_TTL_SECONDS = 300.0
+
+
+@dataclass
+class SearchCacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+    hit_seconds: float = 0.0
+    miss_seconds: float = 0.0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    @property
+    def avg_hit_latency(self) -> float:
+        return self.hit_seconds / self.hits if self.hits else 0.0
+
+    @property
+    def avg_miss_latency(self) -> float:
+        return self.miss_seconds / self.misses if self.misses else 0.0
+
+
+def _canonical(value):
+    """
+    Convert a search argument to a JSON-serializable, stable form;
+    vectors are replaced by a hash of their float32 representation
+    """
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, np.ndarray) or (
+        isinstance(value, (list, tuple)) and value
+        and all(isinstance(v, (int, float)) for v in value)
+    ):
+        vector = np.ascontiguousarray(value, dtype=np.float32)
+        return 'vector:' + hashlib.sha256(vector.tobytes()).hexdigest()
+    if isinstance(value, (list, tuple)):
+        return [_canonical(v) for v in value]
+    if isinstance(value, dict):
+        return {str(k): _canonical(v) for k, v in sorted(value.items())}
+    return value
+
+
+def make_cache_key(index_name: str, method: str, arguments: dict) -> str:
+    """
+    Cache key over index name, method and all (bound) search arguments
+    @param index_name: index name
+    @param method: search method name
+    @param arguments: search arguments, including defaults
+    @return: hex digest
+    """
+    payload = json.dumps(
+        [index_name, method, _canonical(arguments)],
+        sort_keys=True,
+        default=str
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class SearchCache:
+    """
+    LRU cache of search results with time-to-live, optionally
+    backed by an on-disk SQLite store that survives restarts
+    """
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        path: str = None
+    ):
+        """
+        @param max_entries: max number of in-memory entries
+        @param ttl_seconds: entry time-to-live, None never expires
+        @param path: optional SQLite file for the on-disk tier
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.path = path
+        self.stats = SearchCacheStats()
+        # key -> (index name, expires at, results)
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        if path:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS search_cache ("
+                "key TEXT PRIMARY KEY, index_name TEXT, "
+                "expires_at REAL, results TEXT)"
+            )
+            self._db.execute(
+                "CREATE INDEX IF NOT EXISTS search_cache_index_name "
+                "ON search_cache (index_name)"
+            )
+            self._db.commit()
+
+    def _expires_at(self) -> float:
+        if self.ttl_seconds is None:
+            return float('inf')
+        return time.time() + self.ttl_seconds
+
+    def _put_memory(self, key: str, entry: tuple) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
+
+    def get(self, key: str) -> List[Dict]:
+        """
+        Get results
+        @param key: cache key
+        @return: results or None if missing or expired
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[1] > now:
+                    self._entries.move_to_end(key)
+                    return entry[2]
+                del self._entries[key]
+            if self._db is None:
+                return None
+            row = self._db.execute(
+                "SELECT index_name, expires_at, results FROM search_cache "
+                "WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if row[1] <= now:
+                self._db.execute(
+                    "DELETE FROM search_cache WHERE key = ?", (key,))
+                self._db.commit()
+                return None
+            results = json.loads(row[2])
+            self._put_memory(key, (row[0], row[1], results))
+            return results
+
+    def put(self, key: str, index_name: str, results: List[Dict]) -> None:
+        """
+        Store results
+        @param key: cache key
+        @param index_name: index the results come from
+        @param results: search results
+        """
+        expires_at = self._expires_at()
+        with self._lock:
+            self._put_memory(key, (index_name, expires_at, results))
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO search_cache "
+                    "(key, index_name, expires_at, results) "
+                    "VALUES (?, ?, ?, ?)",
+                    (key, index_name, expires_at,
+                     json.dumps(results, default=str))
+                )
+                self._db.commit()
+
+    def invalidate_index(self, index_name: str) -> int:
+        """
+        Drop every entry of an index
+        @param index_name: index name
+        @return: number of in-memory entries dropped
+        """
+        with self._lock:
+            keys = [k for k, v in self._entries.items() if v[0] == index_name]
+            for key in keys:
+                del self._entries[key]
+            if self._db is not None:
+                self._db.execute(
+                    "DELETE FROM search_cache WHERE index_name = ?",
+                    (index_name,)
+                )
+                self._db.commit()
+            self.stats.invalidations += 1
+        logging.info(f"Invalidated {len(keys)} cached searches \
+            of index '{index_name}'.")
+        return len(keys)
+
+    def record(self, hit: bool, seconds: float) -> None:
+        """
+        Record a lookup outcome and its latency
+        @param hit: whether results came from the cache
+        @param seconds: lookup latency, including the search on a miss
+        """
+        with self._lock:
+            if hit:
+                self.stats.hits += 1
+                self.stats.hit_seconds += seconds
+            else:
+                self.stats.misses += 1
+                self.stats.miss_seconds += seconds
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM search_cache")
+                self._db.commit()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def close(self) -> None:
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+
+class CachedSearchEngine(SearchEngine):
+    """
+    Opt-in caching layer in front of any SearchEngine: search results are
+    cached per index, writes to an index invalidate its entries.
+    Other attributes are delegated to the wrapped engine.
+    """
+
+    def __init__(self, search_engine: SearchEngine, cache: SearchCache = None):
+        """
+        @param search_engine: engine to wrap
+        @param cache: result cache, default in-memory LRU with TTL
+        """
+        self.search_engine = search_engine
+        self.cache = cache if cache is not None else SearchCache()
+
+    def _index_name(self) -> str:
+        return getattr(self.search_engine, '_index_name', None)
+
+    def _cached_call(self, method_name: str, *args, **kwargs):
+        start = time.perf_counter()
+        method = getattr(self.search_engine, method_name)
+        arguments = inspect.signature(method).bind(*args, **kwargs)
+        arguments.apply_defaults()
+        # the index the call searches, default the engine's index
+        index_name = arguments.arguments.get('index_name') \
+            or self._index_name()
+        key = make_cache_key(index_name, method_name, arguments.arguments)
+
+        results = self.cache.get(key)
+        if results is not None:
+            self.cache.record(True, time.perf_counter() - start)
+            logging.info(f"Cache hit for {method_name} \
+                on index '{index_name}'.")
+            # copy, so that callers cannot alter the cached entry
+            return [dict(r) for r in results]
+
+        results = [dict(r) for r in method(*args, **kwargs)]
+        self.cache.put(key, index_name, results)
+        self.cache.record(False, time.perf_counter() - start)
+        return [dict(r) for r in results]
+
+    def _invalidating_call(self, method_name: str, index_name: str,
+                           *args, **kwargs):
+        try:
+            return getattr(self.search_engine, method_name)(
+                index_name, *args, **kwargs)
+        finally:
+            # also on partial failure, some documents may have been written
+            self.cache.invalidate_index(index_name)
+
+    def search(self, text: str) -> Iterable:
+        return self._cached_call('search', text)
+
+    def _search_text(self, *args, **kwargs) -> Iterable:
+        return self._cached_call('_search_text', *args, **kwargs)
+
+    def _search_vector(self, *args, **kwargs) -> list:
+        return self._cached_call('_search_vector', *args, **kwargs)
+
+    def _search_hybrid(self, *args, **kwargs) -> list:
+        return self._cached_call('_search_hybrid', *args, **kwargs)
+
+    def upload_documents(self, index_name: str, *args, **kwargs):
+        return self._invalidating_call(
+            'upload_documents', index_name, *args, **kwargs)
+
+    def upload_documents_bulk(self, index_name: str, *args, **kwargs):
+        return self._invalidating_call(
+            'upload_documents_bulk', index_name, *args, **kwargs)
+
+    def __getattr__(self, name: str):
+        # only called for attributes not defined on the wrapper
+        return getattr(self.search_engine, name)
@@ -6,6 +6,7 @@ from collections.abc import Iterable
 class SearchEngineProvider(Enum):
     MOCKUP = "mockup"
     AZURE_AI_SEARCH = "azure_ai_search"
+    LOCAL_VECTOR = "local_vector"
 
 
 class SearchEngine(ABC):
@@ -14,17 +15,32 @@ class SearchEngine(ABC):
     """
 
     @staticmethod
-    def new(provider: SearchEngineProvider):
+    def new(provider: SearchEngineProvider, cache=None):
+        """
+        Create a search engine
+        @param provider: search engine provider
+        @param cache: optional src.search_cache.SearchCache to cache results
+        @return: search engine
+        """
         match provider:
             case SearchEngineProvider.MOCKUP:
                 from src.mockup_search_engine import MockupSearchEngine
-                return MockupSearchEngine()
+                search_engine = MockupSearchEngine()
             case SearchEngineProvider.AZURE_AI_SEARCH:
                 from src.azure_ai_search_engine import AzureAISearchEngine
-                return AzureAISearchEngine()
+                search_engine = AzureAISearchEngine()
+            case SearchEngineProvider.LOCAL_VECTOR:
+                from src.local_vector_search_engine import \
+                    LocalVectorSearchEngine
+                search_engine = LocalVectorSearchEngine()
             case _:
                 raise ValueError(f"Invalid provider: {provider}")
 
+        if cache is not None:
+            from src.search_cache import CachedSearchEngine
+            return CachedSearchEngine(search_engine, cache=cache)
+        return search_engine
+
     @abstractmethod
     def search(self, text: str) -> Iterable:
         raise NotImplementedError
@@ -1,7 +1,7 @@
 import os
 import json
 from datetime import datetime
-from collections.abc import Iterable
+from collections.abc import Iterable, Iterator
 
 import pytest
 
@@ -112,3 +112,106 @@ def test_upload_documents(azure_ai_search_config, index_name, schema, docs):
     )
     search_engine.upload_documents(index_name=index_name, documents=docs)
     search_engine.search_index_client.delete_index(search_index.name)
+
+
+@pytest.fixture
+def mockup_client_search_engine():
+    from src.azure_ai_search_engine import AzureAISearchEngine
+    from src.mockup_search_client import MockupSearchClient
+    search_engine = AzureAISearchEngine(
+        service_endpoint='https://localhost',
+        key='0123456789abcdef',
+        index_name='foo'
+    )
+    search_engine.search_client = MockupSearchClient()
+    search_engine.search_client.upload_documents(documents=[
+        {
+            'id': str(i),
+            'foo': i,
+            'content_text': 'lorem ' * (i + 1),
+            'content_vector': [1.0, 0.1 * i],
+        }
+        for i in range(120)
+    ])
+    return search_engine
+
+
+@pytest.mark.parametrize("top, skip, page_size", [
+    (10, 0, 3),
+    (10, 5, 50),
+    (200, 0, 50),
+    (0, 0, 50),
+])
+def test_iter_search_text(mockup_client_search_engine, top, skip, page_size):
+    search_engine = mockup_client_search_engine
+    expected = list(range(119, -1, -1))[skip:skip + top]
+    results = search_engine.iter_search_text(
+        'lorem', top=top, skip=skip, page_size=page_size)
+    assert isinstance(results, Iterator)
+    assert [r['foo'] for r in results] == expected
+
+
+def test_iter_search_text_early_stop(mockup_client_search_engine):
+    search_engine = mockup_client_search_engine
+    results = search_engine.iter_search_text('lorem', page_size=5)
+    first = next(results)
+    assert first['foo'] == 119
+    assert search_engine.search_client.request_count == 2  # upload + 1 page
+    results.close()
+
+
+def test_iter_search_vector(mockup_client_search_engine):
+    search_engine = mockup_client_search_engine
+    results = list(search_engine.iter_search_vector(
+        [0.0, 1.0], top=7, skip=2, page_size=3))
+    assert [r['foo'] for r in results] == list(range(117, 110, -1))
+    scores = [r['@search.score'] for r in results]
+    assert scores == sorted(scores, reverse=True)
+
+
+def test_search_text_top(mockup_client_search_engine):
+    search_engine = mockup_client_search_engine
+    results = search_engine._search_text('lorem', top=5)
+    assert [r['foo'] for r in results] == [119, 118, 117, 116, 115]
+
+
+def test_search_hybrid_top(mockup_client_search_engine):
+    search_engine = mockup_client_search_engine
+    results = search_engine._search_hybrid('lorem', [0.0, 1.0], top=5)
+    assert len(results) == 5
+    assert results[0]['foo'] == 119
+
+
+def test_search_top_zero(mockup_client_search_engine):
+    search_engine = mockup_client_search_engine
+    assert search_engine._search_text('lorem', top=0) == []
+    assert search_engine._search_vector([0.0, 1.0], top=0) == []
+    assert search_engine._search_hybrid('lorem', [0.0, 1.0], top=0) == []
+
+
+def test_search_hybrid_fused(mockup_client_search_engine):
+    from src.re_ranker import ReRanker, FUSED_SCORE_FIELD
+    search_engine = mockup_client_search_engine
+    results = search_engine.search_hybrid_fused(
+        'lorem', [0.0, 1.0], top=5, candidates=20,
+        re_ranker=ReRanker(k=10, weights=[1.0, 0.5])
+    )
+    assert [r['foo'] for r in results] == [119, 118, 117, 116, 115]
+    assert all(FUSED_SCORE_FIELD in r for r in results)
+
+
+def test_search_many(mockup_client_search_engine):
+    import numpy as np
+    search_engine = mockup_client_search_engine
+    vectors = np.array([[0.0, 1.0], [1.0, 0.0]], dtype=np.float32)
+    report = search_engine.search_many(vectors=vectors, top=3)
+    assert len(report.results) == 2
+    assert [r['foo'] for r in report.results[0]] == [119, 118, 117]
+    expected = search_engine._search_vector([1.0, 0.0], top=3)
+    assert report.results[1] == expected
+
+    report = search_engine.search_many(texts=['lorem', 'missing'], top=2)
+    assert [len(r) for r in report.results] == [2, 0]
+    report = search_engine.search_many(
+        vectors=vectors, texts=['lorem', 'lorem'], top=2)
+    assert [len(r) for r in report.results] == [2, 2]
@@ -0,0 +1,80 @@
+import asyncio
+
+import pytest
+
+
+def test_importable():
+    import src.async_azure_ai_search_engine  # noqa: F401
+    from src.async_azure_ai_search_engine import \
+        AsyncAzureAISearchEngine  # noqa: F401
+
+
+@pytest.fixture
+def documents() -> list:
+    return [
+        {
+            'id': str(i),
+            'foo': i,
+            'content_text': 'lorem ' * (i % 17 + 1) + 'ipsum ' * (i % 5),
+            'content_vector': [1.0, 0.1 * i],
+        }
+        for i in range(60)
+    ]
+
+
+@pytest.fixture
+def search_engines(documents):
+    from src.azure_ai_search_engine import AzureAISearchEngine
+    from src.async_azure_ai_search_engine import AsyncAzureAISearchEngine
+    from src.mockup_search_client import (
+        MockupSearchClient, MockupAsyncSearchClient)
+    config = {
+        'service_endpoint': 'https://localhost',
+        'key': '0123456789abcdef',
+        'index_name': 'foo',
+    }
+    client = MockupSearchClient()
+    client.upload_documents(documents=documents)
+    search_engine = AzureAISearchEngine(**config)
+    search_engine.search_client = client
+    async_search_engine = AsyncAzureAISearchEngine(**config)
+    async_search_engine.search_clients['foo'] = \
+        MockupAsyncSearchClient(client)
+    return search_engine, async_search_engine
+
+
+@pytest.mark.parametrize("method, args, kwargs", [
+    ('_search_text', ['lorem'], {'top': 10}),
+    ('_search_text', ['ipsum'], {'top': 5, 'skip': 3}),
+    ('_search_vector', [[0.0, 1.0]], {'top': 8}),
+    ('_search_hybrid', ['ipsum', [0.0, 1.0]], {'top': 10}),
+    ('_search_text', ['lorem'], {'top': 0}),
+    ('_search_vector', [[0.0, 1.0]], {'top': 0}),
+    ('_search_hybrid', ['ipsum', [0.0, 1.0]], {'top': 0}),
+])
+def test_same_results_as_sync(search_engines, method, args, kwargs):
+    search_engine, async_search_engine = search_engines
+    expected = getattr(search_engine, method)(*args, **kwargs)
+    results = asyncio.run(
+        getattr(async_search_engine, method)(*args, **kwargs))
+    assert results == expected
+    assert len(results) > 0 or kwargs['top'] == 0
+
+
+def test_search_indexes(search_engines, documents):
+    from src.mockup_search_client import MockupAsyncSearchClient
+    _, async_search_engine = search_engines
+    other = MockupAsyncSearchClient()
+    other.search_client.upload_documents(documents=documents[:3])
+    async_search_engine.search_clients['bar'] = other
+
+    async def run():
+        async with async_search_engine:
+            return await async_search_engine.search_indexes(
+                'lorem', ['foo', 'bar'], top=5)
+
+    results = asyncio.run(run())
+    assert len(results['foo']) == 5
+    assert len(results['bar']) == 3
+    assert other.closed
+    assert async_search_engine.search_clients == {}
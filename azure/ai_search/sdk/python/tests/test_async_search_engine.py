@@ -0,0 +1,49 @@
+import asyncio
+
+import pytest
+
+
+def test_importable():
+    import src.async_search_engine  # noqa: F401
+    from src.async_search_engine import AsyncSearchEngine  # noqa: F401
+
+
+class TestAsyncSearchEngine:
+
+    from src.search_engine import SearchEngineProvider
+
+    def test_structure(self):
+        from src.async_search_engine import AsyncSearchEngine
+        for method in ['new', 'search', 'search_texts', 'close']:
+            assert hasattr(AsyncSearchEngine, method)
+            assert callable(getattr(AsyncSearchEngine, method))
+
+    @pytest.mark.parametrize("provider", [
+        SearchEngineProvider.MOCKUP,
+        SearchEngineProvider.AZURE_AI_SEARCH,
+    ])
+    def test_new(self, provider):
+        from src.async_search_engine import AsyncSearchEngine
+        search_engine = AsyncSearchEngine.new(provider=provider)
+        assert search_engine is not None
+
+    @pytest.mark.xfail(reason='unkonw provider')
+    @pytest.mark.parametrize("provider", [
+        'foo'
+    ])
+    def test_new_fail(self, provider):
+        from src.async_search_engine import AsyncSearchEngine
+        search_engine = AsyncSearchEngine.new(provider=provider)
+        assert search_engine is not None
+
+    def test_search_texts(self):
+        from src.async_search_engine import AsyncSearchEngine
+
+        async def run():
+            async with AsyncSearchEngine.new(
+                provider=self.SearchEngineProvider.MOCKUP
+            ) as search_engine:
+                return await search_engine.search_texts(['foo', 'bar'])
+
+        responses = asyncio.run(run())
+        assert len(responses) == 2
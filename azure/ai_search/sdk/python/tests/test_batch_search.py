@@ -0,0 +1,33 @@
+import time
+
+import pytest
+
+
+def test_importable():
+    import src.batch_search  # noqa: F401
+    from src.batch_search import BatchSearchReport  # noqa: F401
+    from src.batch_search import run_batch  # noqa: F401
+
+
+def test_run_batch_aligned():
+    from src.batch_search import run_batch
+
+    def search(i):
+        time.sleep(0.001 * (10 - i))
+        return [i]
+
+    report = run_batch(search, 10, max_workers=4)
+    assert report.results == [[i] for i in range(10)]
+    assert len(report.latencies) == 10
+    percentiles = report.latency_percentiles()
+    assert percentiles[50] <= percentiles[99]
+
+
+@pytest.mark.parametrize("vectors, texts", [
+    (None, None),
+    ([[0.0]], ['foo', 'bar']),
+])
+def test_align_queries_fail(vectors, texts):
+    from src.batch_search import align_queries
+    with pytest.raises(ValueError):
+        align_queries(vectors, texts)
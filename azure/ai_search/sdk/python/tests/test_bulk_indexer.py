@@ -0,0 +1,118 @@
+import pytest
+
+
+def test_importable():
+    import src.bulk_indexer  # noqa: F401
+    from src.bulk_indexer import BulkIndexer  # noqa: F401
+    from src.bulk_indexer import BulkIndexingReport  # noqa: F401
+    from src.bulk_indexer import iter_batches  # noqa: F401
+
+
+@pytest.mark.parametrize("n, max_documents, expected_sizes", [
+    (0, 3, []),
+    (5, 3, [3, 2]),
+    (6, 3, [3, 3]),
+    (1, 1, [1]),
+])
+def test_iter_batches_count(n, max_documents, expected_sizes):
+    from src.bulk_indexer import iter_batches
+    documents = ({'id': str(i)} for i in range(n))
+    batches = list(iter_batches(documents, max_documents=max_documents))
+    assert [len(b) for b in batches] == expected_sizes
+
+
+def test_iter_batches_bytes():
+    from src.bulk_indexer import iter_batches, document_size
+    documents = [{'id': str(i), 'content_text': 'x' * 100} for i in range(10)]
+    max_bytes = 3 * document_size(documents[0])
+    batches = list(iter_batches(documents, max_documents=1000,
+                                max_bytes=max_bytes))
+    assert all(sum(document_size(d) for d in b) <= max_bytes
+               for b in batches)
+    assert [d for b in batches for d in b] == documents
+
+
+def test_iter_batches_oversized_document():
+    from src.bulk_indexer import iter_batches
+    documents = [{'id': '1', 'content_text': 'x' * 100}, {'id': '2'}]
+    batches = list(iter_batches(documents, max_bytes=10))
+    assert [len(b) for b in batches] == [1, 1]
+
+
+@pytest.mark.parametrize("n, max_workers", [
+    (0, 1),
+    (10, 1),
+    (2500, 4),
+])
+def test_upload(n, max_workers):
+    from src.bulk_indexer import BulkIndexer
+    from src.mockup_search_client import MockupSearchClient
+    client = MockupSearchClient()
+    indexer = BulkIndexer(client, max_documents=100, max_workers=max_workers)
+    report = indexer.upload({'id': str(i)} for i in range(n))
+    assert report.document_count == n
+    assert report.succeeded_count == n
+    assert report.failed_count == 0
+    assert report.batch_count == -(-n // 100)
+    assert len(client.documents) == n
+
+
+def test_upload_retries_throttled_batches():
+    from src.bulk_indexer import BulkIndexer
+    from src.mockup_search_client import MockupSearchClient
+    client = MockupSearchClient(throttle_rate=0.3, seed=42)
+    indexer = BulkIndexer(
+        client,
+        max_documents=10,
+        max_retries=20,
+        backoff_base_seconds=0.0
+    )
+    report = indexer.upload({'id': str(i)} for i in range(200))
+    assert report.succeeded_count == 200
+    assert report.retry_count == client.throttled_count > 0
+    assert len(client.documents) == 200
+
+
+def test_upload_reports_failures():
+    from src.bulk_indexer import BulkIndexer
+    from src.mockup_search_client import MockupSearchClient
+    client = MockupSearchClient(throttle_rate=1.0)
+    indexer = BulkIndexer(
+        client,
+        max_documents=10,
+        max_retries=2,
+        backoff_base_seconds=0.0
+    )
+    documents = [{'id': str(i)} for i in range(15)] + [{'foo': 'bar'}]
+    report = indexer.upload(documents)
+    assert report.document_count == 16
+    assert report.failed_count == 16
+    assert all(s.status_code == 503 for s in report.failed)
+    assert report.request_count == 2 * 3
+
+
+def test_upload_reports_invalid_documents():
+    from src.bulk_indexer import BulkIndexer
+    from src.mockup_search_client import MockupSearchClient
+    indexer = BulkIndexer(MockupSearchClient())
+    report = indexer.upload([{'id': '1'}, {'foo': 'bar'}])
+    assert report.succeeded_count == 1
+    assert report.failed[0].status_code == 400
+
+
+def test_upload_documents_bulk():
+    from src.azure_ai_search_engine import AzureAISearchEngine
+    from src.mockup_search_client import MockupSearchClient
+    search_engine = AzureAISearchEngine(
+        service_endpoint='https://localhost',
+        key='0123456789abcdef',
+        index_name='foo'
+    )
+    search_engine.search_client = MockupSearchClient()
+    report = search_engine.upload_documents_bulk(
+        index_name='foo',
+        documents=({'id': str(i)} for i in range(50)),
+        max_documents=7
+    )
+    assert report.succeeded_count == 50
+    assert report.batch_count == 8
@@ -0,0 +1,162 @@
+import numpy as np
+import pytest
+
+
+SCHEMA = {
+    'id': {'field_type': 'simple', 'data_type': 'string', 'key': True},
+    'content_text': {
+        'field_type': 'searchable', 'data_type': 'string', 'searchable': True},
+    'content_vector': {
+        'field_type': 'search',
+        'data_type': 'vector',
+        'searchable': True,
+        'vector_search_dimensions': 8,
+    },
+}
+
+
+def test_importable():
+    import src.local_vector_search_engine  # noqa: F401
+    from src.local_vector_search_engine import \
+        LocalVectorSearchEngine  # noqa: F401
+
+
+@pytest.fixture
+def vectors() -> np.ndarray:
+    return np.random.default_rng(0).normal(size=(3000, 8)).astype(np.float32)
+
+
+@pytest.fixture
+def search_engine(vectors):
+    from src.local_vector_search_engine import LocalVectorSearchEngine
+    search_engine = LocalVectorSearchEngine(index_name='foo')
+    search_engine.create_index('foo', SCHEMA)
+    search_engine.upload_documents('foo', [
+        {
+            'id': str(i),
+            'content_text': f"doc {i}",
+            'content_vector': v.tolist(),
+        }
+        for i, v in enumerate(vectors)
+    ])
+    return search_engine
+
+
+def _expected(vectors, query, top):
+    normalized = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    scores = normalized @ (query / np.linalg.norm(query))
+    return [str(i) for i in np.argsort(-scores)[:top]]
+
+
+def test_search_vector_exact(search_engine, vectors):
+    from src.azure_ai_search_engine import VectorSearchType
+    query = vectors[42] + 0.01
+    results = search_engine._search_vector(
+        query.tolist(), vector_search_type=VectorSearchType.EXACT, top=10)
+    assert [r['id'] for r in results] == _expected(vectors, query, 10)
+    assert results[0]['@search.score'] == pytest.approx(1.0, abs=1e-3)
+    assert 'content_vector' not in results[0]
+
+
+def test_search_vector_skip(search_engine, vectors):
+    from src.azure_ai_search_engine import VectorSearchType
+    results = search_engine._search_vector(
+        vectors[0].tolist(), vector_search_type=VectorSearchType.EXACT,
+        top=5, skip=5)
+    assert [r['id'] for r in results] == _expected(vectors, vectors[0], 10)[5:]
+
+
+def test_search_vector_approximate_recall(search_engine, vectors):
+    from src.azure_ai_search_engine import VectorSearchType
+    search_engine._n_probe = 16
+    hits = 0
+    for query in vectors[:20]:
+        results = search_engine._search_vector(
+            query.tolist(),
+            vector_search_type=VectorSearchType.APPROXIMATE,
+            top=10
+        )
+        expected = set(_expected(vectors, query, 10))
+        hits += len(expected & {r['id'] for r in results})
+    assert hits / 200 >= 0.8
+
+
+def test_upload_replaces_and_reports(search_engine):
+    from src.azure_ai_search_engine import VectorSearchType
+    statuses = search_engine.upload_documents('foo', [
+        {'id': '0', 'content_text': 'replaced', 'content_vector': [1.0] * 8},
+        {'content_text': 'no key'},
+        {'id': 'new', 'content_text': 'no vector'},
+    ])
+    assert [s.status_code for s in statuses] == [200, 400, 201]
+    results = search_engine._search_vector(
+        [1.0] * 8, vector_search_type=VectorSearchType.EXACT, top=1)
+    assert results[0]['content_text'] == 'replaced'
+    results = search_engine._search_vector(
+        [1.0] * 8, vector_search_type=VectorSearchType.EXACT, top=5000)
+    assert len(results) == 3000
+
+
+def test_search_text(search_engine):
+    results = search_engine.search('42')
+    assert [r['id'] for r in results] == ['42']
+
+
+@pytest.mark.parametrize("mmap", [True, False])
+def test_save_load(search_engine, vectors, tmp_path, mmap):
+    from src.azure_ai_search_engine import VectorSearchType
+    from src.local_vector_search_engine import LocalVectorSearchEngine
+    search_engine._path = str(tmp_path)
+    search_engine.save()
+    loaded = LocalVectorSearchEngine(
+        index_name='foo', path=str(tmp_path), mmap=mmap)
+    query = vectors[7].tolist()
+    expected = search_engine._search_vector(
+        query, vector_search_type=VectorSearchType.EXACT, top=5)
+    results = loaded._search_vector(
+        query, vector_search_type=VectorSearchType.EXACT, top=5)
+    assert [r['id'] for r in results] == [r['id'] for r in expected]
+    loaded.upload_documents('foo', [{'id': 'x', 'content_vector': query}])
+    assert loaded._search_vector(
+        query, vector_search_type=VectorSearchType.EXACT, top=2
+    )[1]['id'] in ('x', '7')
+
+
+@pytest.mark.parametrize("vector_search_type_name", ['EXACT', 'APPROXIMATE'])
+def test_search_many(search_engine, vectors, vector_search_type_name):
+    from src.azure_ai_search_engine import VectorSearchType
+    vector_search_type = VectorSearchType[vector_search_type_name]
+    queries = vectors[:5] + 0.01
+    report = search_engine.search_many(
+        vectors=queries, top=3, vector_search_type=vector_search_type)
+    assert len(report.results) == 5
+    for query, results in zip(queries, report.results):
+        expected = search_engine._search_vector(
+            query.tolist(), vector_search_type=vector_search_type, top=3)
+        assert [r['id'] for r in results] == [r['id'] for r in expected]
+        assert [r['@search.score'] for r in results] == pytest.approx(
+            [r['@search.score'] for r in expected], abs=1e-5)
+    assert len(report.latencies) == 5
+
+
+def test_search_many_texts(search_engine):
+    report = search_engine.search_many(texts=['1', '2', 'missing'], top=1)
+    assert [[r['id'] for r in results] for results in report.results] == \
+        [['1'], ['2'], []]
+
+
+def test_search_many_hybrid(search_engine, vectors):
+    from src.azure_ai_search_engine import VectorSearchType
+    from src.re_ranker import FUSED_SCORE_FIELD
+    queries = vectors[:2] + 0.01
+    report = search_engine.search_many(
+        vectors=queries, texts=['1', 'missing'], top=3,
+        vector_search_type=VectorSearchType.EXACT)
+    assert [len(results) for results in report.results] == [3, 3]
+    # '1' ranks first in the text ranking, '0' first in the vector ranking
+    assert {r['id'] for r in report.results[0][:2]} == {'0', '1'}
+    assert all(FUSED_SCORE_FIELD in r for r in report.results[0])
+    # no text match: the vector ranking alone
+    assert [r['id'] for r in report.results[1]] == _expected(
+        vectors, queries[1], 3)
+    assert len(report.latencies) == 2
@@ -0,0 +1,24 @@
+import asyncio
+from collections.abc import Iterable
+
+import pytest
+
+
+def test_importable():
+    import src.mockup_async_search_engine  # noqa: F401
+    from src.mockup_async_search_engine import \
+        MockupAsyncSearchEngine  # noqa: F401
+
+
+@pytest.mark.parametrize("text", [
+    ('foo'),
+    ('bar')
+])
+def test_search(text):
+    from src.mockup_async_search_engine import MockupAsyncSearchEngine
+    search_engine = MockupAsyncSearchEngine()
+    responses = asyncio.run(search_engine.search(text=text))
+    assert responses is not None
+    assert isinstance(responses, Iterable)
+    for response in responses:
+        assert isinstance(response, dict)
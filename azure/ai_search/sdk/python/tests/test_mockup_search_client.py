@@ -0,0 +1,37 @@
+import pytest
+
+
+def test_importable():
+    import src.mockup_search_client  # noqa: F401
+    from src.mockup_search_client import MockupSearchClient  # noqa: F401
+
+
+def test_upload_documents():
+    from src.mockup_search_client import MockupSearchClient
+    client = MockupSearchClient()
+    results = client.upload_documents(documents=[{'id': '1'}, {'id': '1'}])
+    assert [r.status_code for r in results] == [201, 200]
+    assert len(client.documents) == 1
+
+
+def test_throttle():
+    from azure.core.exceptions import HttpResponseError
+    from src.mockup_search_client import MockupSearchClient
+    client = MockupSearchClient(throttle_rate=1.0)
+    with pytest.raises(HttpResponseError):
+        client.upload_documents(documents=[{'id': '1'}])
+    assert client.throttled_count == 1
+
+
+@pytest.mark.parametrize("search_text, top, skip, expected", [
+    ('foo', None, None, ['3', '2', '1']),
+    ('foo', 2, 1, ['2', '1']),
+    ('missing', None, None, []),
+])
+def test_search_text(search_text, top, skip, expected):
+    from src.mockup_search_client import MockupSearchClient
+    client = MockupSearchClient()
+    client.upload_documents(documents=[
+        {'id': str(i), 'content_text': 'foo ' * i} for i in range(1, 4)])
+    results = client.search(search_text=search_text, top=top, skip=skip)
+    assert [r['id'] for r in results] == expected
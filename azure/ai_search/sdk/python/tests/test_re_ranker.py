@@ -0,0 +1,82 @@
+import pytest
+
+
+def test_importable():
+    import src.re_ranker  # noqa: F401
+    from src.re_ranker import ReRanker  # noqa: F401
+    from src.re_ranker import FusionStrategy  # noqa: F401
+
+
+def _ranking(keys, scores=None):
+    scores = scores or [float(len(keys) - i) for i in range(len(keys))]
+    return [{'id': k, '@search.score': s} for k, s in zip(keys, scores)]
+
+
+def _reference_rrf(rankings, k, weights):
+    scores = {}
+    for weight, ranking in zip(weights, rankings):
+        for rank, result in enumerate(ranking, start=1):
+            scores[result['id']] = \
+                scores.get(result['id'], 0.0) + weight / (k + rank)
+    return scores
+
+
+@pytest.mark.parametrize("k, weights", [
+    (60, None),
+    (1, None),
+    (60, [2.0, 0.5]),
+])
+def test_fuse_rrf(k, weights):
+    from src.re_ranker import ReRanker, FUSED_SCORE_FIELD
+    rankings = [_ranking(['a', 'b', 'c', 'd']), _ranking(['c', 'e', 'a'])]
+    re_ranker = ReRanker(k=k, weights=weights)
+    results = re_ranker.fuse(rankings)
+    expected = _reference_rrf(rankings, k, weights or [1.0, 1.0])
+    assert {r['id'] for r in results} == set(expected)
+    for result in results:
+        assert result[FUSED_SCORE_FIELD] == pytest.approx(expected[result['id']])
+    scores = [r[FUSED_SCORE_FIELD] for r in results]
+    assert scores == sorted(scores, reverse=True)
+
+
+def test_fuse_top():
+    from src.re_ranker import ReRanker
+    rankings = [_ranking(['a', 'b', 'c', 'd']), _ranking(['c', 'e', 'a'])]
+    results = ReRanker().fuse(rankings, top=2)
+    assert [r['id'] for r in results] == ['a', 'c']
+
+
+def test_fuse_weighted_score():
+    from src.re_ranker import ReRanker, FusionStrategy, FUSED_SCORE_FIELD
+    rankings = [
+        _ranking(['a', 'b', 'c'], [10.0, 5.0, 0.0]),
+        _ranking(['c', 'b'], [0.9, 0.1]),
+    ]
+    re_ranker = ReRanker(strategy=FusionStrategy.WEIGHTED_SCORE)
+    results = {r['id']: r[FUSED_SCORE_FIELD] for r in re_ranker.fuse(rankings)}
+    assert results == pytest.approx({'a': 1.0, 'b': 0.5, 'c': 1.0})
+
+
+def test_fuse_empty():
+    from src.re_ranker import ReRanker
+    assert ReRanker().fuse([[], []]) == []
+
+
+def test_fuse_invalid_weights():
+    from src.re_ranker import ReRanker
+    with pytest.raises(ValueError):
+        ReRanker(weights=[1.0]).fuse([_ranking(['a']), _ranking(['b'])])
+
+
+def test_rerank_cross_encoder():
+    from src.re_ranker import ReRanker, CROSS_ENCODER_SCORE_FIELD
+
+    def cross_encoder(query, candidates):
+        return [1.0 if c['id'] == query else 0.0 for c in candidates]
+
+    re_ranker = ReRanker(cross_encoder=cross_encoder)
+    rankings = [_ranking(['a', 'b', 'c']), _ranking(['b', 'a'])]
+    results = re_ranker.rerank('c', rankings, top=2)
+    assert results[0]['id'] == 'c'
+    assert results[0][CROSS_ENCODER_SCORE_FIELD] == 1.0
+    assert len(results) == 2
@@ -0,0 +1,127 @@
+import time
+
+import pytest
+
+
+def test_importable():
+    import src.search_cache  # noqa: F401
+    from src.search_cache import SearchCache  # noqa: F401
+    from src.search_cache import CachedSearchEngine  # noqa: F401
+
+
+@pytest.mark.parametrize("a, b, same", [
+    ({'text': 'foo'}, {'text': 'foo'}, True),
+    ({'text': 'foo'}, {'text': 'bar'}, False),
+    ({'vector': [0.1, 0.2]}, {'vector': [0.1, 0.2]}, True),
+    ({'vector': [0.1, 0.2]}, {'vector': [0.1, 0.3]}, False),
+])
+def test_make_cache_key(a, b, same):
+    from src.search_cache import make_cache_key
+    key_a = make_cache_key('index', '_search_vector', a)
+    key_b = make_cache_key('index', '_search_vector', b)
+    assert (key_a == key_b) == same
+    assert make_cache_key('other', '_search_vector', a) != key_a
+
+
+def test_lru_eviction():
+    from src.search_cache import SearchCache
+    cache = SearchCache(max_entries=2)
+    cache.put('a', 'i', [{'n': 1}])
+    cache.put('b', 'i', [{'n': 2}])
+    assert cache.get('a') is not None
+    cache.put('c', 'i', [{'n': 3}])
+    assert cache.get('b') is None
+    assert cache.get('a') is not None
+    assert cache.stats.evictions == 1
+
+
+def test_ttl():
+    from src.search_cache import SearchCache
+    cache = SearchCache(ttl_seconds=0.01)
+    cache.put('a', 'i', [{'n': 1}])
+    time.sleep(0.02)
+    assert cache.get('a') is None
+
+
+def test_disk(tmp_path):
+    from src.search_cache import SearchCache
+    path = str(tmp_path / 'cache.sqlite')
+    cache = SearchCache(path=path)
+    cache.put('a', 'i', [{'n': 1}])
+    cache.close()
+    cache = SearchCache(path=path)
+    assert cache.get('a') == [{'n': 1}]
+    cache.invalidate_index('i')
+    assert cache.get('a') is None
+    cache.close()
+
+
+def test_cached_search_engine():
+    from src.search_engine import SearchEngine, SearchEngineProvider
+    from src.search_cache import SearchCache
+    search_engine = SearchEngine.new(
+        provider=SearchEngineProvider.MOCKUP, cache=SearchCache())
+    first = search_engine.search(text='foo')
+    first[0]['foo'] = 'changed'
+    second = search_engine.search('foo')
+    assert second == [{'foo': 'bar'}]
+    search_engine.search(text='bar')
+    assert search_engine.cache.stats.hits == 1
+    assert search_engine.cache.stats.misses == 2
+
+
+def test_cached_search_engine_invalidation():
+    from src.azure_ai_search_engine import AzureAISearchEngine
+    from src.mockup_search_client import MockupSearchClient
+    from src.search_cache import CachedSearchEngine
+    azure_search_engine = AzureAISearchEngine(
+        service_endpoint='https://localhost',
+        key='0123456789abcdef',
+        index_name='foo'
+    )
+    azure_search_engine.search_client = MockupSearchClient()
+    search_engine = CachedSearchEngine(azure_search_engine)
+    search_engine.upload_documents(
+        'foo', [{'id': '1', 'foo': 1, 'content_text': 'lorem'}])
+    assert len(search_engine._search_text('lorem', top=5)) == 1
+    assert len(search_engine._search_text(text='lorem', top=5)) == 1
+    assert search_engine.cache.stats.hits == 1
+    request_count = azure_search_engine.search_client.request_count
+
+    search_engine.upload_documents_bulk(
+        index_name='foo',
+        documents=[{'id': '2', 'foo': 2, 'content_text': 'lorem'}])
+    assert len(search_engine._search_text('lorem', top=5)) == 2
+    assert azure_search_engine.search_client.request_count == \
+        request_count + 2  # upload + search
+
+
+def test_cached_search_engine_index_name_argument():
+    from src.local_vector_search_engine import LocalVectorSearchEngine
+    from src.search_cache import CachedSearchEngine
+    schema = {
+        'id': {'field_type': 'simple', 'data_type': 'string', 'key': True},
+        'content_vector': {
+            'field_type': 'search',
+            'data_type': 'vector',
+            'searchable': True,
+            'vector_search_dimensions': 2,
+        },
+    }
+    local_search_engine = LocalVectorSearchEngine(index_name='foo')
+    search_engine = CachedSearchEngine(local_search_engine)
+    for index_name in ['foo', 'other']:
+        search_engine.create_index(index_name, schema)
+    search_engine.upload_documents(
+        'other', [{'id': '1', 'content_vector': [1.0, 0.0]}])
+    results = search_engine._search_vector(
+        [1.0, 0.0], top=5, index_name='other')
+    assert [r['id'] for r in results] == ['1']
+
+    # writes to 'other' invalidate the searches of 'other'
+    search_engine.upload_documents(
+        'other', [{'id': '2', 'content_vector': [0.9, 0.1]}])
+    results = search_engine._search_vector(
+        [1.0, 0.0], top=5, index_name='other')
+    assert [r['id'] for r in results] == ['1', '2']
+    assert search_engine.cache.stats.hits == 0
@@ -20,6 +20,7 @@ class TestSearchEngine:
     @pytest.mark.parametrize("provider", [
         SearchEngineProvider.MOCKUP,
         SearchEngineProvider.AZURE_AI_SEARCH,
+        SearchEngineProvider.LOCAL_VECTOR,
     ])
     def test_new(self, provider):
         from src.search_engine import SearchEngine
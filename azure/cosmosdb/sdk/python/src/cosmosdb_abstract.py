@@ -1,7 +1,16 @@
+from __future__ import annotations
+
 from abc import ABC, abstractmethod
 from dataclasses import asdict, dataclass
 from enum import Enum
-from typing import Optional
+from typing import TYPE_CHECKING, Any, ClassVar, Optional
+
+from src.cosmosdb_handles import HANDLE_CACHE, HandleCache
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from src.cosmosdb_bulk import BulkWriteSummary
 
 
 class CosmosDBProvider(Enum):
@@ -18,6 +27,8 @@ class CosmosDBConfig:
 class CosmosDBAbstract(ABC):
     """Abstract class for data store."""
 
+    handle_cache: ClassVar[HandleCache] = HANDLE_CACHE
+
     @staticmethod
     def new(
         provider: CosmosDBProvider,
@@ -42,6 +53,9 @@ class CosmosDBAbstract(ABC):
         msg = f"Invalid provider: {provider}"
         raise ValueError(msg)
 
+    def warm_up(self) -> None:
+        """Initialize the database handles ahead of the first request."""
+
     @abstractmethod
     def list_databases(self) -> list:
         """List databases."""
@@ -57,6 +71,11 @@ class CosmosDBAbstract(ABC):
         """Insert many payloads."""
         raise NotImplementedError
 
+    @abstractmethod
+    def bulk_insert(self, payloads: Iterable[dict], **kwargs: Any) -> BulkWriteSummary:
+        """Insert a payload stream in bulk."""
+        raise NotImplementedError
+
     @abstractmethod
     def find(self, filter: Optional[dict]) -> list:
         """Find items."""
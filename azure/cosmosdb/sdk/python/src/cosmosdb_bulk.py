@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import logging
+import random
+import re
+import time
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Optional
+
+# Transactional batch limits of CosmosDB NoSQL: 100 operations per partition key,
+# 2 MB of payload (kept below, the request has some envelope too)
+NOSQL_MAX_BATCH_SIZE = 100
+NOSQL_MAX_BATCH_BYTES = 1_900_000
+MONGODB_DEFAULT_BATCH_SIZE = 1000
+DEFAULT_MAX_WORKERS = 8
+DEFAULT_MAX_RETRIES = 9
+DEFAULT_BACKOFF_BASE_SECONDS = 0.1
+DEFAULT_BACKOFF_MAX_SECONDS = 30.0
+THROTTLED_STATUS_CODE = 429
+REQUEST_TOO_LARGE_STATUS_CODE = 413
+MONGODB_THROTTLED_ERROR_CODE = 16500
+RETRY_AFTER_MS_HEADER = "x-ms-retry-after-ms"
+REQUEST_CHARGE_HEADER = "x-ms-request-charge"
+RETRY_AFTER_MS_PATTERN = re.compile(r"RetryAfterMs=(\d+)")
+
+
+@dataclass
+class BulkWriteSummary:
+    """Summary of a bulk write."""
+
+    submitted: int = 0
+    succeeded: int = 0
+    failed: int = 0
+    batches: int = 0
+    retries: int = 0
+    request_charge: float = 0.0
+    elapsed_seconds: float = 0.0
+    errors: list[dict] = field(default_factory=list)
+
+    @property
+    def items_per_second(self) -> float:
+        """Throughput of the bulk write."""
+        if self.elapsed_seconds <= 0:
+            return 0.0
+        return self.submitted / self.elapsed_seconds
+
+    def merge(self, other: BulkWriteSummary) -> None:
+        """Add the counters of a batch summary."""
+        self.submitted += other.submitted
+        self.succeeded += other.succeeded
+        self.failed += other.failed
+        self.batches += other.batches
+        self.retries += other.retries
+        self.request_charge += other.request_charge
+        self.errors.extend(other.errors)
+
+
+def iter_chunks(items: Iterable, size: int) -> Iterator[list]:
+    """Lazily split a stream into lists of at most size items."""
+    if size < 1:
+        msg = f"Invalid chunk size: {size}"
+        raise ValueError(msg)
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def backoff_seconds(
+        attempt: int,
+        retry_after_ms: Optional[float] = None,
+        base_seconds: float = DEFAULT_BACKOFF_BASE_SECONDS,
+        max_seconds: float = DEFAULT_BACKOFF_MAX_SECONDS,
+) -> float:
+    """Delay before a retry: the server hint if any, else jittered exponential."""
+    if retry_after_ms is not None:
+        return min(max_seconds, float(retry_after_ms) / 1000)
+    return random.uniform(0, min(max_seconds, base_seconds * (2 ** attempt)))
+
+
+def retry_after_ms_from_headers(headers: Optional[dict]) -> Optional[float]:
+    """Read the retry-after hint of a throttled NoSQL response."""
+    if not headers:
+        return None
+    value = headers.get(RETRY_AFTER_MS_HEADER)
+    return float(value) if value is not None else None
+
+
+def retry_after_ms_from_message(message: str) -> Optional[float]:
+    """Read the retry-after hint of a throttled MongoDB write error."""
+    match = RETRY_AFTER_MS_PATTERN.search(message or "")
+    return float(match.group(1)) if match else None
+
+
+def run_batches(
+        batches: Iterable,
+        write_batch: Callable[..., BulkWriteSummary],
+        max_workers: int = DEFAULT_MAX_WORKERS,
+) -> BulkWriteSummary:
+    """Write batches concurrently, consuming the input as workers free up."""
+    if max_workers < 1:
+        msg = f"Invalid max_workers: {max_workers}"
+        raise ValueError(msg)
+    summary = BulkWriteSummary()
+    start = time.perf_counter()
+
+    def collect(done: Iterable[Future]) -> None:
+        for future in done:
+            summary.merge(future.result())
+
+    max_in_flight = 2 * max_workers
+    in_flight = set()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for batch in batches:
+            if len(in_flight) >= max_in_flight:
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                collect(done)
+            args = batch if isinstance(batch, tuple) else (batch,)
+            in_flight.add(executor.submit(write_batch, *args))
+        done, _ = wait(in_flight)
+        collect(done)
+
+    summary.elapsed_seconds = time.perf_counter() - start
+    logging.info(
+        "Bulk write: %d submitted, %d succeeded, %d failed, %d retries, "
+        "%.1f RU, %.1f items/s",
+        summary.submitted, summary.succeeded, summary.failed,
+        summary.retries, summary.request_charge, summary.items_per_second,
+    )
+    return summary
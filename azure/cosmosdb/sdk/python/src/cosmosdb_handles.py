@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import threading
+from collections.abc import Callable, Hashable
+from dataclasses import dataclass
+from typing import Any
+
+
+@dataclass
+class HandleCacheStats:
+    """Counters of a handle cache."""
+
+    initializations: int = 0
+    hits: int = 0
+    metadata_calls: int = 0
+    metadata_calls_avoided: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """Share of handle lookups served without metadata calls."""
+        total = self.hits + self.initializations
+        return self.hits / total if total else 0.0
+
+
+class HandleCache:
+    """Thread-safe, initialize-once cache of database/container handles.
+
+    Keys are (provider, endpoint, database, container, credential) tuples.
+    A factory returns (handle, number of metadata calls it made); it runs at
+    most once per key, concurrent callers of the same key wait for it.
+    """
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self.stats = HandleCacheStats()
+        self._handles: dict[Hashable, Any] = {}
+        self._metadata_calls: dict[Hashable, int] = {}
+        self._key_locks: dict[Hashable, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def _hit(self, key: Hashable) -> Any:
+        """Return a cached handle and count the metadata calls it saved."""
+        with self._lock:
+            self.stats.hits += 1
+            self.stats.metadata_calls_avoided += self._metadata_calls.get(key, 0)
+            return self._handles[key]
+
+    def get_or_create(
+            self,
+            key: Hashable,
+            factory: Callable[[], tuple[Any, int]],
+            refresh: bool = False,
+    ) -> Any:
+        """Get the handle of a key, initializing it on first use.
+
+        refresh=True re-runs the factory even if the key is cached.
+        """
+        if not refresh and key in self._handles:
+            return self._hit(key)
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        with key_lock:
+            if not refresh and key in self._handles:
+                return self._hit(key)
+            handle, metadata_calls = factory()
+            with self._lock:
+                self._handles[key] = handle
+                self._metadata_calls[key] = metadata_calls
+                self.stats.initializations += 1
+                self.stats.metadata_calls += metadata_calls
+            return handle
+
+    def record_reuse(self, key: Hashable) -> None:
+        """Count a handle reused by an instance without a cache lookup."""
+        with self._lock:
+            self.stats.hits += 1
+            self.stats.metadata_calls_avoided += self._metadata_calls.get(key, 0)
+
+    def invalidate(self, *key_prefix: Hashable) -> int:
+        """Drop the handles whose key starts with key_prefix."""
+        size = len(key_prefix)
+        with self._lock:
+            keys = [k for k in self._handles if k[:size] == key_prefix]
+            for key in keys:
+                del self._handles[key]
+                del self._metadata_calls[key]
+        return len(keys)
+
+    def clear(self) -> None:
+        """Drop all handles and reset the counters."""
+        with self._lock:
+            self._handles.clear()
+            self._metadata_calls.clear()
+            self.stats = HandleCacheStats()
+
+    def __len__(self) -> int:
+        """Number of cached handles."""
+        return len(self._handles)
+
+
+# shared by all CosmosDBAbstract implementations
+HANDLE_CACHE = HandleCache()
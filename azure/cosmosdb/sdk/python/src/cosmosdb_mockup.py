@@ -1,8 +1,12 @@
 from __future__ import annotations
 
-from typing import ClassVar, Optional
+from typing import TYPE_CHECKING, Any, ClassVar, Optional
 
 from src.cosmosdb_abstract import CosmosDBAbstract
+from src.cosmosdb_bulk import BulkWriteSummary
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
 
 
 class CosmosDBMockup(CosmosDBAbstract):
@@ -26,6 +30,15 @@ class CosmosDBMockup(CosmosDBAbstract):
         """Insert many payloads."""
         return [self.insert(payload) for payload in payloads]
 
+    def bulk_insert(self, payloads: Iterable[dict], **kwargs: Any) -> BulkWriteSummary:
+        """Insert a payload stream in bulk."""
+        summary = BulkWriteSummary(batches=1)
+        for payload in payloads:
+            self.insert(payload)
+            summary.submitted += 1
+            summary.succeeded += 1
+        return summary
+
     def find(self, filter: Optional[dict]) -> list:
         """Find items."""
         return self.mockup_items
@@ -1,13 +1,30 @@
 from __future__ import annotations
 
+import hashlib
 import time
 from dataclasses import dataclass
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
 import pymongo
-from pymongo import MongoClient, ReturnDocument, database
+from pymongo import MongoClient, ReturnDocument, UpdateOne, database
+from pymongo.errors import BulkWriteError
 
 from src.cosmosdb_abstract import CosmosDBAbstract, CosmosDBConfig
+from src.cosmosdb_bulk import (
+    DEFAULT_MAX_RETRIES,
+    DEFAULT_MAX_WORKERS,
+    MONGODB_DEFAULT_BATCH_SIZE,
+    MONGODB_THROTTLED_ERROR_CODE,
+    BulkWriteSummary,
+    backoff_seconds,
+    iter_chunks,
+    retry_after_ms_from_message,
+    run_batches,
+)
+from src.cosmosdb_paging import DEFAULT_PAGE_SIZE, ItemPage
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
 
 DEFAULT_SELECT_FIELDS = ["id", "key", "definition"]
 DEFAULT_PARTITION_KEY = "/partition_key"
@@ -45,30 +62,60 @@ class CosmosDBMongoDB(CosmosDBAbstract):
         self.collection_name = collection_name
         self.index_name = index_name
 
+        # the endpoint is hashed, the connection string contains credentials
+        self.endpoint = hashlib.sha256(connection_string.encode()).hexdigest()
         self.client = MongoClient(connection_string)
+        self.db = None
+        self.collection = None
 
     def create_collection(
             self,
             drop_old_database: bool = False,
             drop_old_collection: bool = False,
     ) -> database.Collection:
-        """Create a collection."""
+        """Create a collection, once per (endpoint, database, collection)."""
         if self.client is None:
             msg = "MongoDB client not found"
             raise ValueError(msg)
-        if self.db is None:
+        key = self._handle_key()
+        if self.collection is not None and not (drop_old_database or drop_old_collection):
+            self.handle_cache.record_reuse(key)
+            return self.collection
+        if drop_old_database:
+            self.handle_cache.invalidate(*key[:3])
+
+        def init_handles() -> tuple[tuple, int]:
+            metadata_calls = 0
             if drop_old_database:
                 self.client.drop_database(self.db_name)
-            self.db = self.client[self.db_name]
-        if self.collection is None:
-            collection_names = self.db.list_collection_names()
+                metadata_calls += 1
+            db = self.client[self.db_name]
+            collection_names = db.list_collection_names()
+            metadata_calls += 1
             if drop_old_collection and self.collection_name in collection_names:
-                self.db.drop_collection(self.collection_name)
-            if self.collection_name not in self.db.list_collection_names():
-                self.db.create_collection(self.collection_name)
-            self.collection = self.db[self.collection_name]
+                db.drop_collection(self.collection_name)
+                collection_names.remove(self.collection_name)
+                metadata_calls += 1
+            if self.collection_name not in collection_names:
+                db.create_collection(self.collection_name)
+                metadata_calls += 1
+            return (db, db[self.collection_name]), metadata_calls
+
+        self.db, self.collection = self.handle_cache.get_or_create(
+            key,
+            init_handles,
+            refresh=drop_old_database or drop_old_collection,
+        )
         return self.collection
 
+    def _handle_key(self) -> tuple:
+        """Key of the database and collection handles in the shared cache."""
+        return ("cosmosdb_mongodb", self.endpoint, self.db_name, self.collection_name)
+
+    def warm_up(self) -> None:
+        """Initialize the database and collection handles ahead of the first request."""
+        self.create_collection()
+
     def list_databases(self) -> list:
         """List databases."""
         return self.client.list_databases()
@@ -183,6 +230,74 @@ class CosmosDBMongoDB(CosmosDBAbstract):
             updated_docs.append(updated_doc)
         return updated_docs
 
+    def _write_batch(
+            self,
+            batch: list[dict],
+            max_retries: int = DEFAULT_MAX_RETRIES,
+    ) -> BulkWriteSummary:
+        """Upsert one batch with an unordered bulk write, retrying throttled operations."""
+        summary = BulkWriteSummary(submitted=len(batch), batches=1)
+        pending = batch
+        attempt = 0
+        while pending:
+            requests = []
+            for payload in pending:
+                filter = {"_id": payload["_id"]} if "_id" in payload else payload
+                requests.append(UpdateOne(filter, {"$set": payload}, upsert=True))
+            try:
+                self.collection.bulk_write(requests, ordered=False)
+            except BulkWriteError as ex:
+                throttled = []
+                retry_after_ms = None
+                for error in ex.details.get("writeErrors", []):
+                    if error.get("code") == MONGODB_THROTTLED_ERROR_CODE:
+                        throttled.append(pending[error["index"]])
+                        retry_after_ms = retry_after_ms_from_message(error.get("errmsg"))
+                        continue
+                    summary.failed += 1
+                    summary.errors.append({
+                        "code": error.get("code"),
+                        "message": error.get("errmsg"),
+                        "index": error.get("index"),
+                    })
+                failed = len(ex.details.get("writeErrors", [])) - len(throttled)
+                summary.succeeded += len(pending) - len(throttled) - failed
+                if throttled and attempt >= max_retries:
+                    summary.failed += len(throttled)
+                    summary.errors.append({
+                        "code": MONGODB_THROTTLED_ERROR_CODE,
+                        "message": "Retries exhausted on throttled writes.",
+                        "count": len(throttled),
+                    })
+                    throttled = []
+                if throttled:
+                    time.sleep(backoff_seconds(attempt, retry_after_ms))
+                    attempt += 1
+                    summary.retries += 1
+                pending = throttled
+                continue
+            summary.succeeded += len(pending)
+            pending = []
+        return summary
+
+    def bulk_insert(
+            self,
+            payloads: Iterable[dict],
+            batch_size: int = MONGODB_DEFAULT_BATCH_SIZE,
+            max_workers: int = DEFAULT_MAX_WORKERS,
+            max_retries: int = DEFAULT_MAX_RETRIES,
+    ) -> BulkWriteSummary:
+        """Upsert a payload stream as concurrent, unordered bulk writes."""
+        self.create_collection()
+        if self.collection is None:
+            msg = "Collection not found"
+            raise ValueError(msg)
+        return run_batches(
+            iter_chunks(payloads, batch_size),
+            lambda batch: self._write_batch(batch, max_retries=max_retries),
+            max_workers=max_workers,
+        )
+
     def find(
         self,
         filter: Optional[dict] = None,
@@ -194,6 +309,58 @@ class CosmosDBMongoDB(CosmosDBAbstract):
             raise ValueError(msg)
         return self.collection.find(filter=filter)
 
+    def find_pages(
+        self,
+        filter: Optional[dict] = None,
+        projection: Optional[list | dict] = None,
+        batch_size: int = DEFAULT_PAGE_SIZE,
+        continuation_token: Optional[object] = None,
+    ) -> Iterator[ItemPage]:
+        """Find items, one cursor batch per page.
+
+        Pages are ordered by _id; the continuation token is the last _id of a page.
+        """
+        self.create_collection()
+        if self.collection is None:
+            msg = "Collection not found"
+            raise ValueError(msg)
+        if batch_size < 1:
+            msg = f"Invalid batch_size: {batch_size}"
+            raise ValueError(msg)
+        if isinstance(projection, dict) and not projection.get("_id", True):
+            msg = "The projection must include _id, it is the continuation token"
+            raise ValueError(msg)
+        filter = dict(filter or {})
+        if continuation_token is not None:
+            filter = {"$and": [filter, {"_id": {"$gt": continuation_token}}]}
+        cursor = self.collection.find(
+            filter=filter,
+            projection=projection,
+            sort=[("_id", pymongo.ASCENDING)],
+            batch_size=batch_size,
+        )
+        try:
+            page_number = 0
+            items = []
+            for item in cursor:
+                items.append(item)
+                if len(items) >= batch_size:
+                    yield ItemPage(
+                        items=items,
+                        continuation_token=items[-1]["_id"],
+                        page_number=page_number,
+                    )
+                    page_number += 1
+                    items = []
+            if items:
+                yield ItemPage(
+                    items=items,
+                    continuation_token=items[-1]["_id"],
+                    page_number=page_number,
+                )
+        finally:
+            cursor.close()
+
     def vector_search(
         self,
         vector_field_name: str,
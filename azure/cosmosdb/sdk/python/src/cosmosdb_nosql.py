@@ -1,7 +1,10 @@
 from __future__ import annotations
 
+import hashlib
+import json
+import time
 from dataclasses import dataclass
-from typing import TYPE_CHECKING, Optional
+from typing import TYPE_CHECKING, Any, Optional
 
 from azure.cosmos import exceptions
 from azure.cosmos.cosmos_client import CosmosClient
@@ -9,8 +12,25 @@ from azure.cosmos.partition_key import PartitionKey
 from azure.identity import DefaultAzureCredential
 
 from src.cosmosdb_abstract import CosmosDBAbstract, CosmosDBConfig
+from src.cosmosdb_bulk import (
+    DEFAULT_MAX_RETRIES,
+    DEFAULT_MAX_WORKERS,
+    NOSQL_MAX_BATCH_BYTES,
+    NOSQL_MAX_BATCH_SIZE,
+    REQUEST_CHARGE_HEADER,
+    REQUEST_TOO_LARGE_STATUS_CODE,
+    THROTTLED_STATUS_CODE,
+    BulkWriteSummary,
+    backoff_seconds,
+    retry_after_ms_from_headers,
+    run_batches,
+)
+from src.cosmosdb_paging import DEFAULT_PAGE_SIZE, ItemPage, ResponseHeadersHook
 
 if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
+    from azure.core.paging import ItemPaged
     from azure.cosmos.container import ContainerProxy
     from azure.cosmos.database import DatabaseProxy
 
@@ -50,9 +70,12 @@ class CosmosDBNoSQL(CosmosDBAbstract):
     ) -> None:
         """Initialize."""
         # Configure
+        self.host = host
         self.database_id = database_id
         self.container_id = container_id
         self.partition_key = partition_key if partition_key else DEFAULT_PARTITION_KEY
+        # handles are shared per credential, the key itself is not kept in the cache key
+        self.credential_id = hashlib.sha256((key or "").encode()).hexdigest()
 
         # Initialize the client
         if False:
@@ -78,6 +101,8 @@ class CosmosDBNoSQL(CosmosDBAbstract):
                 user_agent="CosmosDBPython",
                 user_agent_overwrite=True,
             )
+        self.db = None
+        self.container = None
 
     def create_container(
             self,
@@ -87,22 +112,36 @@ class CosmosDBNoSQL(CosmosDBAbstract):
             drop_old_database: bool = False,
             drop_old_container: bool = False,
     ) -> ContainerProxy:
-        """Create a container."""
+        """Create a container, once per (host, database, container, credential).
+
+        The options of the first call of a key apply, later instances reuse its handles.
+        """
         if self.client is None:
             msg = "CosmosDB client not found"
             raise ValueError(msg)
-        if self.db is None:
+        key = self._handle_key()
+        if self.container is not None and not (drop_old_database or drop_old_container):
+            self.handle_cache.record_reuse(key)
+            return self.container
+        if drop_old_database:
+            self.handle_cache.invalidate(*key[:3])
+
+        def init_handles() -> tuple[tuple, int]:
+            metadata_calls = 0
             if drop_old_database:
                 self.client.delete_database(id=self.database_id)
+                metadata_calls += 1
             try:
-                self.db = self.client.create_database(id=self.database_id)
+                metadata_calls += 1
+                db = self.client.create_database(id=self.database_id)
             except exceptions.CosmosResourceExistsError:
-                self.db = self.client.get_database_client(database=self.database_id)
-        if self.container is None:
+                db = self.client.get_database_client(database=self.database_id)
             if drop_old_container:
-                self.db.delete_container(id=self.container_id)
+                db.delete_container(id=self.container_id)
+                metadata_calls += 1
             try:
-                self.container = self.db.create_container(
+                metadata_calls += 1
+                container = db.create_container(
                     id=self.container_id,
                     partition_key=PartitionKey(path=self.partition_key),
                     indexing_policy=indexing_policy,
@@ -110,11 +149,26 @@ class CosmosDBNoSQL(CosmosDBAbstract):
                     offer_throughput=offer_throughput,
                 )
             except exceptions.CosmosResourceExistsError:
-                self.container = self.db.get_container_client(
-                    container=self.container_id,
-                )
+                container = db.get_container_client(container=self.container_id)
+            return (db, container), metadata_calls
+
+        self.db, self.container = self.handle_cache.get_or_create(
+            key,
+            init_handles,
+            refresh=drop_old_database or drop_old_container,
+        )
         return self.container
 
+    def _handle_key(self) -> tuple:
+        """Key of the database and container handles in the shared cache."""
+        return (
+            "cosmosdb_nosql", self.host, self.database_id, self.container_id, self.credential_id,
+        )
+
+    def warm_up(self) -> None:
+        """Initialize the database and container handles ahead of the first request."""
+        self.create_container()
+
     def list_databases(self) -> list:
         """List databases."""
         self.create_container()
@@ -133,6 +187,148 @@ class CosmosDBNoSQL(CosmosDBAbstract):
         self.create_container()
         return [self.insert(payload) for payload in payloads]
 
+    def _partition_key_value(self, payload: dict) -> Any:
+        """Read the partition key value of a payload."""
+        value = payload
+        for part in self.partition_key.strip("/").split("/"):
+            value = value.get(part) if isinstance(value, dict) else None
+        return value
+
+    def _iter_partition_batches(
+            self,
+            payloads: Iterable[dict],
+            batch_size: int,
+            max_buffered: int,
+            rejected: list[dict],
+            max_batch_bytes: int = NOSQL_MAX_BATCH_BYTES,
+    ) -> Iterator[tuple]:
+        """Group a payload stream into (partition key value, batch) pairs.
+
+        A batch is emitted when it is full, by count or by serialized size
+        (e.g. a few dozen items with large embeddings), or, when more than
+        max_buffered payloads are waiting, the largest partition buffer is
+        emitted early.
+        """
+        buffers: dict = {}
+        buffer_bytes: dict = {}
+        buffered = 0
+        for payload in payloads:
+            if "id" not in payload:
+                rejected.append(payload)
+                continue
+            partition_key_value = self._partition_key_value(payload)
+            size = len(json.dumps(payload).encode("utf-8"))
+            if buffer_bytes.get(partition_key_value, 0) + size > max_batch_bytes \
+                    and buffers.get(partition_key_value):
+                buffered -= len(buffers[partition_key_value])
+                del buffer_bytes[partition_key_value]
+                yield partition_key_value, buffers.pop(partition_key_value)
+            buffer = buffers.setdefault(partition_key_value, [])
+            buffer.append(payload)
+            buffer_bytes[partition_key_value] = buffer_bytes.get(partition_key_value, 0) + size
+            buffered += 1
+            if len(buffer) >= batch_size:
+                buffered -= len(buffer)
+                del buffer_bytes[partition_key_value]
+                yield partition_key_value, buffers.pop(partition_key_value)
+            elif buffered > max_buffered:
+                largest = max(buffers, key=lambda k: len(buffers[k]))
+                buffered -= len(buffers[largest])
+                del buffer_bytes[largest]
+                yield largest, buffers.pop(largest)
+        for partition_key_value, buffer in buffers.items():
+            yield partition_key_value, buffer
+
+    def _write_partition_batch(
+            self,
+            partition_key_value: Any,
+            batch: list[dict],
+            max_retries: int = DEFAULT_MAX_RETRIES,
+    ) -> BulkWriteSummary:
+        """Upsert one partition's batch as a transactional batch.
+
+        A batch rejected as too large is split in half, and each half written.
+        """
+        summary = BulkWriteSummary(submitted=len(batch), batches=1)
+        operations = [("upsert", (payload,)) for payload in batch]
+        attempt = 0
+        while True:
+            try:
+                results = self.container.execute_item_batch(
+                    batch_operations=operations,
+                    partition_key=partition_key_value,
+                )
+            except (
+                exceptions.CosmosHttpResponseError,
+                exceptions.CosmosBatchOperationError,
+            ) as ex:
+                if ex.status_code == THROTTLED_STATUS_CODE and attempt < max_retries:
+                    time.sleep(backoff_seconds(
+                        attempt, retry_after_ms_from_headers(ex.headers),
+                    ))
+                    attempt += 1
+                    summary.retries += 1
+                    continue
+                if ex.status_code == REQUEST_TOO_LARGE_STATUS_CODE and len(batch) > 1:
+                    half = len(batch) // 2
+                    split_summary = BulkWriteSummary(retries=summary.retries + 1)
+                    for part in (batch[:half], batch[half:]):
+                        split_summary.merge(self._write_partition_batch(
+                            partition_key_value, part, max_retries=max_retries,
+                        ))
+                    return split_summary
+                summary.failed += len(batch)
+                summary.errors.append({
+                    "partition_key": partition_key_value,
+                    "status_code": ex.status_code,
+                    "message": str(ex),
+                    "ids": [payload["id"] for payload in batch],
+                })
+                return summary
+            summary.succeeded += len(batch)
+            get_response_headers = getattr(results, "get_response_headers", None)
+            if get_response_headers:
+                headers = get_response_headers() or {}
+                summary.request_charge += float(headers.get(REQUEST_CHARGE_HEADER, 0))
+            return summary
+
+    def bulk_insert(
+            self,
+            payloads: Iterable[dict],
+            batch_size: int = NOSQL_MAX_BATCH_SIZE,
+            max_workers: int = DEFAULT_MAX_WORKERS,
+            max_retries: int = DEFAULT_MAX_RETRIES,
+            max_batch_bytes: int = NOSQL_MAX_BATCH_BYTES,
+    ) -> BulkWriteSummary:
+        """Upsert a payload stream as concurrent, partition-key-grouped transactional batches."""
+        self.create_container()
+        if not 0 < batch_size <= NOSQL_MAX_BATCH_SIZE:
+            msg = f"batch_size must be in [1, {NOSQL_MAX_BATCH_SIZE}]"
+            raise ValueError(msg)
+        rejected: list[dict] = []
+        summary = run_batches(
+            self._iter_partition_batches(
+                payloads,
+                batch_size=batch_size,
+                max_buffered=4 * batch_size * max_workers,
+                rejected=rejected,
+                max_batch_bytes=max_batch_bytes,
+            ),
+            lambda partition_key_value, batch: self._write_partition_batch(
+                partition_key_value, batch, max_retries=max_retries,
+            ),
+            max_workers=max_workers,
+        )
+        if rejected:
+            summary.submitted += len(rejected)
+            summary.failed += len(rejected)
+            summary.errors.append({
+                "status_code": None,
+                "message": "The field 'id' is required in record.",
+                "count": len(rejected),
+            })
+        return summary
+
     def read_all_items(self, max_item_count: Optional[int]) -> list:
         """Read all records."""
         self.create_container()
@@ -142,6 +338,20 @@ class CosmosDBNoSQL(CosmosDBAbstract):
         # as this that might result in a 429 (throttled request)
         return list(self.container.read_all_items(max_item_count=max_item_count))
 
+    def read_all_item_pages(
+            self,
+            max_item_count: int = DEFAULT_PAGE_SIZE,
+            continuation_token: Optional[str] = None,
+    ) -> Iterator[ItemPage]:
+        """Read all records, page by page."""
+        self.create_container()
+        response_hook = ResponseHeadersHook()
+        item_paged = self.container.read_all_items(
+            max_item_count=max_item_count,
+            response_hook=response_hook,
+        )
+        return self._iter_pages(item_paged, response_hook, continuation_token)
+
     def query_items(
             self,
             query: str,
@@ -156,13 +366,60 @@ class CosmosDBNoSQL(CosmosDBAbstract):
             enable_cross_partition_query=enable_cross_partition_query,
         ))
 
+    def query_item_pages(
+            self,
+            query: str,
+            parameters: Optional[list] = None,
+            enable_cross_partition_query: bool = True,
+            max_item_count: int = DEFAULT_PAGE_SIZE,
+            continuation_token: Optional[str] = None,
+            continuation_token_limit: Optional[int] = None,
+    ) -> Iterator[ItemPage]:
+        """Query items, page by page.
+
+        continuation_token_limit caps the token size in KB.
+        """
+        self.create_container()
+        response_hook = ResponseHeadersHook()
+        item_paged = self.container.query_items(
+            query=query,
+            parameters=parameters,
+            enable_cross_partition_query=enable_cross_partition_query,
+            max_item_count=max_item_count,
+            continuation_token_limit=continuation_token_limit,
+            response_hook=response_hook,
+        )
+        return self._iter_pages(item_paged, response_hook, continuation_token)
+
+    @staticmethod
+    def _iter_pages(
+            item_paged: ItemPaged,
+            response_hook: ResponseHeadersHook,
+            continuation_token: Optional[str] = None,
+    ) -> Iterator[ItemPage]:
+        """Yield the non-empty pages of a feed with their continuation token and RU charge."""
+        pages = item_paged.by_page(continuation_token)
+        page_number = 0
+        for page in pages:
+            # the page is fetched by the time the iterator returns it
+            items = list(page)
+            if not items:
+                continue
+            yield ItemPage(
+                items=items,
+                continuation_token=pages.continuation_token,
+                request_charge=response_hook.request_charge(),
+                page_number=page_number,
+            )
+            page_number += 1
+
     def get_item(self, id: str, partition_key: str):
         """Get specific item"""
         return self.container.read_item(id, partition_key=partition_key)
 
-    def find(self, filter: Optional[dict]) -> list:
-        """Find items."""
-        self.create_container()
+    @staticmethod
+    def _find_query(filter: Optional[dict]) -> tuple[str, list]:
+        """Build the parameterized query of a find."""
         validated_fields = ", ".join("c." + f for f in ALLOWED_SELECT_FIELDS)
         query = "SELECT " + validated_fields + " FROM c"
         parameters = []
@@ -175,8 +432,29 @@ class CosmosDBNoSQL(CosmosDBAbstract):
                     parameters.append({"name": param_name, "value": v})
             if conditions:
                 query += " WHERE " + " AND ".join(conditions)
+        return query, parameters
+
+    def find(self, filter: Optional[dict]) -> list:
+        """Find items."""
+        self.create_container()
+        query, parameters = self._find_query(filter)
         return list(self.container.query_items(
             query=query,
             parameters=parameters,
             enable_cross_partition_query=True,
         ))
+
+    def find_pages(
+            self,
+            filter: Optional[dict],
+            max_item_count: int = DEFAULT_PAGE_SIZE,
+            continuation_token: Optional[str] = None,
+    ) -> Iterator[ItemPage]:
+        """Find items, page by page."""
+        query, parameters = self._find_query(filter)
+        return self.query_item_pages(
+            query=query,
+            parameters=parameters,
+            max_item_count=max_item_count,
+            continuation_token=continuation_token,
+        )
@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+DEFAULT_PAGE_SIZE = 100
+REQUEST_CHARGE_HEADER = "x-ms-request-charge"
+
+
+@dataclass
+class ItemPage:
+    """One page of a streamed read.
+
+    Pass continuation_token back to the read to resume after this page.
+    """
+
+    items: list[dict] = field(default_factory=list)
+    continuation_token: Optional[Any] = None
+    request_charge: Optional[float] = None
+    page_number: int = 0
+
+    def __len__(self) -> int:
+        """Number of items in the page."""
+        return len(self.items)
+
+    def __iter__(self):
+        """Iterate the items of the page."""
+        return iter(self.items)
+
+
+class ResponseHeadersHook:
+    """Response hook keeping the headers of the last server round trip."""
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self.headers: dict = {}
+
+    def __call__(self, headers: Optional[dict], *args: Any) -> None:
+        """Store the response headers."""
+        self.headers = dict(headers or {})
+
+    def request_charge(self) -> Optional[float]:
+        """Read the RU charge of the last round trip."""
+        value = self.headers.get(REQUEST_CHARGE_HEADER)
+        return float(value) if value is not None else None
@@ -6,6 +6,7 @@ import pymongo
 
 from cosmosdb_mongodb import CosmosDBMongoDB, CosmosDBMongoDBConfig
 from cosmosdb_nosql import CosmosDBNoSQL, CosmosDBNoSQLConfig
+from ngram_hashing import ngram_hash_embeddings
 
 dotenv.load_dotenv()
 
@@ -16,7 +17,7 @@ COSMOSDB_CONTAINER_NAME = os.getenv("COSMOSDB_CONTAINER_NAME", "")
 
 
 class MockupEmbedding:
-    """Mockup embedding function for testing."""
+    """Mockup embedding function for testing (hashed character n-grams)."""
 
     dimensions = 384
     distance_function = "cosine"
@@ -32,11 +33,11 @@ class MockupEmbedding:
 
     def _get_text_embedding(self, text: str) -> list[float]:
         """Get text embedding."""
-        return [1.0 * x * len(text) for x in range(self.dimensions)]
+        return self.embed_documents([text])[0]
 
     def embed_documents(self, documents: list[str]) -> list[list[float]]:
         """Embed documents."""
-        return [self._get_text_embedding(doc) for doc in documents]
+        return ngram_hash_embeddings(documents, dimensions=self.dimensions).tolist()
 
     def __call__(self, input: list[str]) -> list[list[float]]:
         """Embed documents."""
@@ -0,0 +1,245 @@
+import json
+
+import pytest
+from azure.cosmos import exceptions
+from pymongo.errors import BulkWriteError
+
+from src.cosmosdb_bulk import (
+    MONGODB_THROTTLED_ERROR_CODE,
+    REQUEST_CHARGE_HEADER,
+    BulkWriteSummary,
+    backoff_seconds,
+    iter_chunks,
+    retry_after_ms_from_message,
+    run_batches,
+)
+
+
+class FakeCosmosList(list):
+    """Batch results with response headers."""
+
+    def __init__(self, items: list, headers: dict) -> None:
+        super().__init__(items)
+        self._headers = headers
+
+    def get_response_headers(self) -> dict:
+        return self._headers
+
+
+class FakeContainer:
+    """Container that throttles the first `throttle` batch calls, rejects batches over max_bytes."""
+
+    def __init__(self, throttle: int = 0, max_bytes: int = 0) -> None:
+        self.throttle = throttle
+        self.max_bytes = max_bytes
+        self.calls = []
+
+    def execute_item_batch(self, batch_operations: list, partition_key: object) -> FakeCosmosList:
+        self.calls.append((partition_key, batch_operations))
+        size = sum(len(json.dumps(op[1][0])) for op in batch_operations)
+        if self.max_bytes and size > self.max_bytes:
+            raise exceptions.CosmosHttpResponseError(
+                status_code=413,
+                message="Request size is too large",
+                response=None,
+            )
+        if self.throttle > 0:
+            self.throttle -= 1
+            raise exceptions.CosmosHttpResponseError(
+                status_code=429,
+                message="Request rate is large",
+                response=None,
+            )
+        return FakeCosmosList(
+            [op[1][0] for op in batch_operations],
+            {REQUEST_CHARGE_HEADER: "10.5"},
+        )
+
+
+class FakeCollection:
+    """Collection that throttles the first operation of the first `throttle` calls."""
+
+    def __init__(self, throttle: int = 0, fail_index: int = -1) -> None:
+        self.throttle = throttle
+        self.fail_index = fail_index
+        self.calls = []
+
+    def bulk_write(self, requests: list, ordered: bool = True) -> None:
+        self.calls.append((len(requests), ordered))
+        errors = []
+        if self.throttle > 0:
+            self.throttle -= 1
+            errors.append({
+                "index": 0,
+                "code": MONGODB_THROTTLED_ERROR_CODE,
+                "errmsg": "Request rate is large. RetryAfterMs=1, Details='...'",
+            })
+        if 0 <= self.fail_index < len(requests):
+            errors.append({"index": self.fail_index, "code": 11000, "errmsg": "duplicate key"})
+            self.fail_index = -1
+        if errors:
+            raise BulkWriteError({"writeErrors": errors})
+
+
+@pytest.fixture
+def nosql_data_store():
+    from src.cosmosdb_nosql import CosmosDBNoSQL
+    data_store = CosmosDBNoSQL.__new__(CosmosDBNoSQL)
+    data_store.host = "https://localhost:8081"
+    data_store.database_id = "test_db"
+    data_store.container_id = "test_container"
+    data_store.credential_id = "test_credential"
+    data_store.partition_key = "/partition_key"
+    data_store.client = object()
+    data_store.db = object()
+    data_store.container = FakeContainer()
+    return data_store
+
+
+@pytest.fixture
+def mongodb_data_store():
+    from src.cosmosdb_mongodb import CosmosDBMongoDB
+    data_store = CosmosDBMongoDB.__new__(CosmosDBMongoDB)
+    data_store.endpoint = "localhost"
+    data_store.db_name = "test_db"
+    data_store.collection_name = "test_collection"
+    data_store.client = object()
+    data_store.db = object()
+    data_store.collection = FakeCollection()
+    return data_store
+
+
+def test_iter_chunks():
+    assert list(iter_chunks(iter(range(5)), 2)) == [[0, 1], [2, 3], [4]]
+    with pytest.raises(ValueError):
+        list(iter_chunks([1], 0))
+
+
+def test_backoff_seconds():
+    assert backoff_seconds(3, retry_after_ms=250) == 0.25
+    assert 0 <= backoff_seconds(2, base_seconds=0.1) <= 0.4
+    assert backoff_seconds(50, max_seconds=1.0) <= 1.0
+
+
+def test_retry_after_ms_from_message():
+    assert retry_after_ms_from_message("Error=16500, RetryAfterMs=120, Details") == 120
+    assert retry_after_ms_from_message("duplicate key") is None
+
+
+def test_run_batches():
+    def write_batch(batch: list) -> BulkWriteSummary:
+        return BulkWriteSummary(submitted=len(batch), succeeded=len(batch), batches=1)
+
+    summary = run_batches(iter_chunks(range(25), 10), write_batch, max_workers=2)
+    assert summary.submitted == 25
+    assert summary.succeeded == 25
+    assert summary.batches == 3
+    assert summary.elapsed_seconds > 0
+
+
+def test_nosql_bulk_insert_groups_by_partition_key(nosql_data_store):
+    payloads = (
+        {"id": str(i), "partition_key": f"pk{i % 3}"}
+        for i in range(30)
+    )
+    summary = nosql_data_store.bulk_insert(payloads, batch_size=4, max_workers=3)
+    assert summary.submitted == 30
+    assert summary.succeeded == 30
+    assert summary.failed == 0
+    calls = nosql_data_store.container.calls
+    for partition_key, operations in calls:
+        assert len(operations) <= 4
+        assert all(op[0] == "upsert" for op in operations)
+        assert all(op[1][0]["partition_key"] == partition_key for op in operations)
+    assert summary.request_charge == pytest.approx(10.5 * len(calls))
+
+
+def test_nosql_bulk_insert_retries_throttled(nosql_data_store):
+    nosql_data_store.container = FakeContainer(throttle=2)
+    payloads = [{"id": str(i), "partition_key": "pk"} for i in range(5)]
+    summary = nosql_data_store.bulk_insert(payloads, max_workers=1)
+    assert summary.succeeded == 5
+    assert summary.retries == 2
+
+
+def test_nosql_bulk_insert_caps_batch_bytes(nosql_data_store):
+    # ~10 KB per item: 100 items would exceed the byte cap
+    payloads = [
+        {"id": str(i), "partition_key": "pk", "vector": [0.123456789] * 800}
+        for i in range(100)
+    ]
+    item_bytes = len(json.dumps(payloads[0]))
+    summary = nosql_data_store.bulk_insert(
+        payloads, max_workers=1, max_batch_bytes=30 * item_bytes,
+    )
+    assert summary.succeeded == 100
+    calls = nosql_data_store.container.calls
+    assert all(len(operations) <= 30 for _, operations in calls)
+    assert sum(len(operations) for _, operations in calls) == 100
+
+
+def test_nosql_bulk_insert_splits_too_large(nosql_data_store):
+    payloads = [
+        {"id": str(i), "partition_key": "pk", "vector": [0.5] * 100}
+        for i in range(10)
+    ]
+    item_bytes = len(json.dumps(payloads[0]))
+    nosql_data_store.container = FakeContainer(max_bytes=3 * item_bytes)
+    summary = nosql_data_store.bulk_insert(payloads, max_workers=1)
+    assert (summary.submitted, summary.succeeded, summary.failed) == (10, 10, 0)
+    # 10 -> 5 + 5 -> 2 + 3 each
+    assert summary.batches == 4
+    written = [
+        op[1][0]["id"]
+        for _, operations in nosql_data_store.container.calls
+        if len(operations) <= 3
+        for op in operations
+    ]
+    assert sorted(written, key=int) == [str(i) for i in range(10)]
+
+
+def test_nosql_bulk_insert_too_large_item(nosql_data_store):
+    nosql_data_store.container = FakeContainer(max_bytes=10)
+    summary = nosql_data_store.bulk_insert([{"id": "1", "partition_key": "pk"}], max_workers=1)
+    assert summary.failed == 1
+    assert summary.errors[0]["status_code"] == 413
+
+
+def test_nosql_bulk_insert_rejects_missing_id(nosql_data_store):
+    payloads = [{"id": "1", "partition_key": "pk"}, {"partition_key": "pk"}]
+    summary = nosql_data_store.bulk_insert(payloads)
+    assert summary.submitted == 2
+    assert summary.succeeded == 1
+    assert summary.failed == 1
+
+
+def test_nosql_bulk_insert_invalid_batch_size(nosql_data_store):
+    with pytest.raises(ValueError):
+        nosql_data_store.bulk_insert([], batch_size=101)
+
+
+def test_mongodb_bulk_insert(mongodb_data_store):
+    payloads = ({"_id": i} for i in range(25))
+    summary = mongodb_data_store.bulk_insert(payloads, batch_size=10, max_workers=2)
+    assert summary.submitted == 25
+    assert summary.succeeded == 25
+    assert summary.batches == 3
+    assert all(not ordered for _, ordered in mongodb_data_store.collection.calls)
+
+
+def test_mongodb_bulk_insert_retries_throttled(mongodb_data_store):
+    mongodb_data_store.collection = FakeCollection(throttle=1, fail_index=2)
+    payloads = [{"_id": i} for i in range(5)]
+    summary = mongodb_data_store.bulk_insert(payloads, max_workers=1)
+    assert summary.submitted == 5
+    assert summary.succeeded == 4
+    assert summary.failed == 1
+    assert summary.retries == 1
+    # second call only retries the throttled operation
+    assert mongodb_data_store.collection.calls == [(5, False), (1, False)]
+
+
+def test_mockup_bulk_insert():
+    from src.cosmosdb_mockup import CosmosDBMockup
+    summary = CosmosDBMockup().bulk_insert([{"id": "1"}, {"id": "2"}])
+    assert summary.succeeded == 2
@@ -0,0 +1,177 @@
+import threading
+import time
+
+import pytest
+from azure.cosmos import exceptions
+
+from src.cosmosdb_abstract import CosmosDBAbstract
+from src.cosmosdb_handles import HandleCache
+
+
+class FakeDatabase:
+    """NoSQL database proxy counting metadata calls."""
+
+    def __init__(self, client: "FakeCosmosClient") -> None:
+        self.client = client
+
+    def create_container(self, id: str, **kwargs) -> str:
+        self.client.calls.append("create_container")
+        raise exceptions.CosmosResourceExistsError(message="exists")
+
+    def get_container_client(self, container: str) -> str:
+        return f"container:{container}"
+
+
+class FakeCosmosClient:
+    """NoSQL client counting metadata calls."""
+
+    def __init__(self) -> None:
+        self.calls = []
+
+    def create_database(self, id: str) -> FakeDatabase:
+        self.calls.append("create_database")
+        return FakeDatabase(self)
+
+
+class FakeMongoDatabase:
+    """MongoDB database counting metadata calls."""
+
+    def __init__(self, client: "FakeMongoClient") -> None:
+        self.client = client
+
+    def list_collection_names(self) -> list:
+        self.client.calls.append("list_collection_names")
+        return list(self.client.collection_names)
+
+    def create_collection(self, name: str) -> None:
+        self.client.calls.append("create_collection")
+        self.client.collection_names.append(name)
+
+    def __getitem__(self, name: str) -> str:
+        return f"collection:{name}"
+
+
+class FakeMongoClient:
+    """MongoDB client counting metadata calls."""
+
+    def __init__(self) -> None:
+        self.calls = []
+        self.collection_names = []
+
+    def __getitem__(self, name: str) -> FakeMongoDatabase:
+        return FakeMongoDatabase(self)
+
+
+@pytest.fixture
+def handle_cache(monkeypatch) -> HandleCache:
+    handle_cache = HandleCache()
+    monkeypatch.setattr(CosmosDBAbstract, "handle_cache", handle_cache)
+    return handle_cache
+
+
+def nosql_data_store(client: FakeCosmosClient):
+    from src.cosmosdb_nosql import CosmosDBNoSQL
+    data_store = CosmosDBNoSQL.__new__(CosmosDBNoSQL)
+    data_store.host = "https://localhost:8081"
+    data_store.database_id = "test_db"
+    data_store.container_id = "test_container"
+    data_store.credential_id = "test_credential"
+    data_store.partition_key = "/partition_key"
+    data_store.client = client
+    data_store.db = None
+    data_store.container = None
+    return data_store
+
+
+def mongodb_data_store(client: FakeMongoClient):
+    from src.cosmosdb_mongodb import CosmosDBMongoDB
+    data_store = CosmosDBMongoDB("mongodb://localhost:27017", "test_db", "test_collection", "test_index")
+    data_store.client = client
+    return data_store
+
+
+def test_get_or_create_initializes_once():
+    handle_cache = HandleCache()
+    calls = []
+
+    def factory() -> tuple:
+        calls.append(1)
+        time.sleep(0.01)
+        return "handle", 2
+
+    threads = [
+        threading.Thread(target=handle_cache.get_or_create, args=(("k",), factory))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(calls) == 1
+    assert handle_cache.stats.initializations == 1
+    assert handle_cache.stats.hits == 7
+    assert handle_cache.stats.metadata_calls == 2
+    assert handle_cache.stats.metadata_calls_avoided == 14
+
+
+def test_get_or_create_refresh():
+    handle_cache = HandleCache()
+    handle_cache.get_or_create(("k",), lambda: ("old", 1))
+    assert handle_cache.get_or_create(("k",), lambda: ("new", 1), refresh=True) == "new"
+    assert handle_cache.stats.initializations == 2
+
+
+def test_invalidate():
+    handle_cache = HandleCache()
+    handle_cache.get_or_create(("p", "e", "db", "a"), lambda: ("a", 1))
+    handle_cache.get_or_create(("p", "e", "db", "b"), lambda: ("b", 1))
+    handle_cache.get_or_create(("p", "e", "other", "c"), lambda: ("c", 1))
+    assert handle_cache.invalidate("p", "e", "db") == 2
+    assert len(handle_cache) == 1
+
+
+def test_nosql_handles_shared_across_instances(handle_cache):
+    client = FakeCosmosClient()
+    first = nosql_data_store(client)
+    second = nosql_data_store(client)
+    first.warm_up()
+    assert client.calls == ["create_database", "create_container"]
+    assert second.create_container() == "container:test_container"
+    second.create_container()
+    assert client.calls == ["create_database", "create_container"]
+    assert handle_cache.stats.initializations == 1
+    assert handle_cache.stats.hits == 2
+    assert handle_cache.stats.metadata_calls_avoided == 4
+
+
+def test_nosql_handles_per_credential(handle_cache, monkeypatch):
+    from src import cosmosdb_nosql
+    monkeypatch.setattr(cosmosdb_nosql, "CosmosClient", lambda **kwargs: FakeCosmosClient())
+
+    def data_store(key: str):
+        return cosmosdb_nosql.CosmosDBNoSQL(
+            "https://localhost:8081", key, "test_db", "test_container", "/partition_key",
+        )
+
+    read_write, read_only = data_store("read-write-key"), data_store("read-only-key")
+    read_write.warm_up()
+    read_only.warm_up()
+    # each instance initializes handles with its own client
+    assert read_write.client.calls == ["create_database", "create_container"]
+    assert read_only.client.calls == ["create_database", "create_container"]
+    assert handle_cache.stats.initializations == 2
+    assert read_write._handle_key() != read_only._handle_key()
+
+    data_store("read-only-key").warm_up()
+    assert handle_cache.stats.initializations == 2
+    assert "read-only-key" not in repr(read_only._handle_key())
+
+
+def test_mongodb_create_collection_lists_collections_once(handle_cache):
+    client = FakeMongoClient()
+    data_store = mongodb_data_store(client)
+    assert data_store.create_collection() == "collection:test_collection"
+    assert client.calls == ["list_collection_names", "create_collection"]
+    mongodb_data_store(client).warm_up()
+    assert client.calls == ["list_collection_names", "create_collection"]
+    assert handle_cache.stats.metadata_calls_avoided == 2
@@ -0,0 +1,151 @@
+import pytest
+from azure.core.paging import ItemPaged
+
+from src.cosmosdb_paging import REQUEST_CHARGE_HEADER, ItemPage, ResponseHeadersHook
+
+
+def fake_item_paged(items: list, page_size: int, response_hook: ResponseHeadersHook) -> ItemPaged:
+    """Feed paged by integer offset tokens, charging 1 RU per item."""
+    def get_next(continuation_token):
+        start = int(continuation_token or 0)
+        page = items[start:start + page_size]
+        response_hook({REQUEST_CHARGE_HEADER: str(float(len(page)))}, page)
+        end = start + page_size
+        return page, (str(end) if end < len(items) else None)
+
+    def extract_data(response):
+        page, token = response
+        return token, page
+
+    return ItemPaged(get_next, extract_data)
+
+
+class FakeContainer:
+    """Container serving paged feeds."""
+
+    def __init__(self, items: list) -> None:
+        self.items = items
+        self.query_kwargs = {}
+
+    def read_all_items(self, max_item_count: int, response_hook: ResponseHeadersHook) -> ItemPaged:
+        return fake_item_paged(self.items, max_item_count, response_hook)
+
+    def query_items(self, max_item_count: int, response_hook: ResponseHeadersHook, **kwargs) -> ItemPaged:
+        self.query_kwargs = kwargs
+        return fake_item_paged(self.items, max_item_count, response_hook)
+
+
+class FakeCursor:
+    """Cursor over a list."""
+
+    def __init__(self, items: list) -> None:
+        self.items = items
+        self.closed = False
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class FakeCollection:
+    """Collection supporting sorted find with an _id lower bound."""
+
+    def __init__(self, items: list) -> None:
+        self.items = items
+        self.cursors = []
+        self.find_kwargs = {}
+
+    def find(self, filter: dict, **kwargs) -> FakeCursor:
+        self.find_kwargs = kwargs
+        items = self.items
+        if "$and" in filter:
+            after = filter["$and"][1]["_id"]["$gt"]
+            items = [item for item in items if item["_id"] > after]
+        cursor = FakeCursor(items)
+        self.cursors.append(cursor)
+        return cursor
+
+
+@pytest.fixture
+def items() -> list:
+    return [{"id": str(i), "_id": i} for i in range(25)]
+
+
+@pytest.fixture
+def nosql_data_store(items):
+    from src.cosmosdb_nosql import CosmosDBNoSQL
+    data_store = CosmosDBNoSQL.__new__(CosmosDBNoSQL)
+    data_store.host = "https://localhost:8081"
+    data_store.database_id = "test_db"
+    data_store.container_id = "test_container"
+    data_store.credential_id = "test_credential"
+    data_store.client = object()
+    data_store.db = object()
+    data_store.container = FakeContainer(items)
+    return data_store
+
+
+@pytest.fixture
+def mongodb_data_store(items):
+    from src.cosmosdb_mongodb import CosmosDBMongoDB
+    data_store = CosmosDBMongoDB.__new__(CosmosDBMongoDB)
+    data_store.endpoint = "localhost"
+    data_store.db_name = "test_db"
+    data_store.collection_name = "test_collection"
+    data_store.client = object()
+    data_store.db = object()
+    data_store.collection = FakeCollection(items)
+    return data_store
+
+
+def test_item_page():
+    page = ItemPage(items=[{"id": "1"}], continuation_token="t")
+    assert len(page) == 1
+    assert list(page) == [{"id": "1"}]
+
+
+def test_nosql_read_all_item_pages(nosql_data_store, items):
+    pages = list(nosql_data_store.read_all_item_pages(max_item_count=10))
+    assert [len(page) for page in pages] == [10, 10, 5]
+    assert [page.request_charge for page in pages] == [10.0, 10.0, 5.0]
+    assert [page.continuation_token for page in pages] == ["10", "20", None]
+    assert [item for page in pages for item in page] == items
+
+
+def test_nosql_read_all_item_pages_resume(nosql_data_store, items):
+    pages = nosql_data_store.read_all_item_pages(max_item_count=10)
+    first = next(pages)
+    resumed = list(nosql_data_store.read_all_item_pages(
+        max_item_count=10,
+        continuation_token=first.continuation_token,
+    ))
+    assert [item for page in resumed for item in page] == items[10:]
+
+
+def test_nosql_find_pages(nosql_data_store):
+    pages = list(nosql_data_store.find_pages({"key": "FOO"}, max_item_count=20))
+    assert [len(page) for page in pages] == [20, 5]
+    query_kwargs = nosql_data_store.container.query_kwargs
+    assert query_kwargs["query"].endswith("WHERE c.key = @key")
+    assert query_kwargs["parameters"] == [{"name": "@key", "value": "FOO"}]
+
+
+def test_mongodb_find_pages(mongodb_data_store, items):
+    pages = list(mongodb_data_store.find_pages(projection=["id"], batch_size=10))
+    assert [len(page) for page in pages] == [10, 10, 5]
+    assert [page.continuation_token for page in pages] == [9, 19, 24]
+    assert mongodb_data_store.collection.find_kwargs["batch_size"] == 10
+    assert mongodb_data_store.collection.find_kwargs["projection"] == ["id"]
+    assert all(cursor.closed for cursor in mongodb_data_store.collection.cursors)
+
+
+def test_mongodb_find_pages_resume(mongodb_data_store, items):
+    pages = list(mongodb_data_store.find_pages(batch_size=10, continuation_token=19))
+    assert [item for page in pages for item in page] == items[20:]
+
+
+def test_mongodb_find_pages_projection_requires_id(mongodb_data_store):
+    with pytest.raises(ValueError):
+        next(mongodb_data_store.find_pages(projection={"_id": 0}))
@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+
+
+def test_importable():
+    import src.ngram_hashing  # noqa: F401
+    from src.ngram_hashing import ngram_hash_embeddings  # noqa: F401
+
+
+def test_batch_matches_single():
+    from src.ngram_hashing import ngram_hash_embeddings
+    texts = ["abc", "abcd", "", "x", "héllo wörld"]
+    batch = ngram_hash_embeddings(texts, dimensions=32)
+    for text, embedding in zip(texts, batch):
+        assert np.array_equal(embedding, ngram_hash_embeddings([text], dimensions=32)[0])
+
+
+def test_ngrams_do_not_span_texts():
+    from src.ngram_hashing import ngram_hash_embeddings
+    joined = ngram_hash_embeddings(["ab"], ngram_range=(2, 2))
+    split = ngram_hash_embeddings(["a", "b"], ngram_range=(2, 2))
+    assert np.linalg.norm(joined[0]) == pytest.approx(1.0)
+    assert not split.any()
+
+
+def test_lowercase():
+    from src.ngram_hashing import ngram_hash_embeddings
+    upper, lower = ngram_hash_embeddings(["ABC", "abc"])
+    assert np.array_equal(upper, lower)
+    upper, lower = ngram_hash_embeddings(["ABC", "abc"], lowercase=False)
+    assert not np.array_equal(upper, lower)
+
+
+@pytest.mark.parametrize("dimensions, ngram_range", [
+    (0, (1, 3)),
+    (8, (0, 3)),
+    (8, (3, 1)),
+])
+def test_invalid(dimensions, ngram_range):
+    from src.ngram_hashing import ngram_hash_embeddings
+    with pytest.raises(ValueError):
+        ngram_hash_embeddings(["a"], dimensions=dimensions, ngram_range=ngram_range)
@@ -1,8 +1,13 @@
-# azure-core==1.35.0
-# azure-ai-documentintelligence==1.0.0b4
+# azure-core==1.32.0
+# azure-ai-documentintelligence==1.0.1
+# pypdf (optional, page count of PDFs split into page-range sub-requests)
 import json
 import os
+import io
 import logging
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing_extensions import Literal
 
@@ -10,11 +15,109 @@ from azure.core.credentials import AzureKeyCredential
 from azure.ai.documentintelligence import DocumentIntelligenceClient, AnalyzeDocumentLROPoller
 from azure.ai.documentintelligence.models import AnalyzeResult
 
+try:
+    import pypdf
+except ImportError:  # optional, documents are analyzed in one request without it
+    pypdf = None
+
 logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
 ENDPOINT="https://*******.cognitiveservices.azure.com"
 API_KEY="*****************"
+DOCX_CONTENT_TYPE = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+DEFAULT_PAGES_PER_REQUEST = 50
+DEFAULT_MAX_WORKERS = 4
+
+
+@dataclass
+class Block:
+    """Structured unit of an analyzed document"""
+    kind: Literal["paragraph", "table", "key_value"]
+    content: str
+    page_number: int | None = None
+    role: str | None = None
+    rows: list[list[str]] = field(default_factory=list)
+
+
+def count_pdf_pages(path: str | Path) -> int | None:
+    """Count the pages of a PDF, None if unknown (not a PDF, or pypdf is not installed)"""
+    if pypdf is None or Path(path).suffix.lower() != ".pdf":
+        return None
+    try:
+        return len(pypdf.PdfReader(path).pages)
+    except Exception as e:
+        logger.warning(f"Cannot count the pages of {path}: {e}")
+        return None
+
+
+def page_ranges(page_count: int, pages_per_request: int) -> list[str]:
+    """Split pages 1..page_count into ranges like '1-50', in page order"""
+    return [
+        f"{first}-{min(first + pages_per_request - 1, page_count)}"
+        for first in range(1, page_count + 1, pages_per_request)
+    ]
+
+
+def _page_number(element) -> int | None:
+    regions = element.bounding_regions
+    return regions[0].page_number if regions else None
+
+
+def iter_blocks(results: Iterable[AnalyzeResult]) -> Iterator[Block]:
+    """Paragraphs, tables and key-value pairs of analyzed documents, in order"""
+    for result in results:
+        for paragraph in result.paragraphs or []:
+            yield Block("paragraph", paragraph.content, _page_number(paragraph), paragraph.role)
+        for table in result.tables or []:
+            rows = [[""] * table.column_count for _ in range(table.row_count)]
+            for cell in table.cells:
+                rows[cell.row_index][cell.column_index] = cell.content
+            yield Block(
+                "table",
+                "\n".join("\t".join(row) for row in rows),
+                _page_number(table),
+                rows=rows,
+            )
+        for kv_pair in result.key_value_pairs or []:
+            key = kv_pair.key.content if kv_pair.key else ""
+            value = kv_pair.value.content if kv_pair.value else ""
+            yield Block("key_value", f"{key}: {value}", _page_number(kv_pair.key) if kv_pair.key else None)
+
+
+def assemble_text(
+        results: Iterable[AnalyzeResult],
+        model_id: Literal["prebuilt-read", "prebuilt-layout"],
+    ) -> str:
+    """Text of analyzed documents, built in linear time"""
+    text = io.StringIO()
+    match model_id:
+        case "prebuilt-read":
+            for result in results:
+                for paragraph in result.paragraphs or []:
+                    text.write(paragraph.content)
+                    text.write("\n")
+        case "prebuilt-layout":
+            for result in results:
+                for page in result.pages or []:
+                    logger.info(f"Processing page {page.page_number} with {len(page.words or [])} words")
+                    for word in page.words or []:
+                        text.write(word.content)
+                        text.write(" ")
+                for paragraph_idx, paragraph in enumerate(result.paragraphs or []):
+                    logger.debug(f"Processing paragraph {paragraph_idx}")
+                    text.write(paragraph.content)
+                    text.write("\n")
+                for table_idx, table in enumerate(result.tables or []):
+                    logger.info(f"Processing table {table_idx} with {len(table.cells)} cells")
+                    for cell in table.cells:
+                        text.write(cell.content)
+                        text.write("\n")
+        case _:
+            logger.error(f"Unsupported model_id: {model_id}")
+            return ""
+    return text.getvalue().strip()
+
 
 class DocIntelligenceExtractor:
     """Client for Document Intelligence API"""
@@ -35,6 +138,59 @@ class DocIntelligenceExtractor:
             api_version=api_version,
         )
 
+    def _analyze_pages(
+            self,
+            path: str | Path,
+            model_id: str,
+            pages: str | None = None,
+            content_type: str | None = None,
+        ) -> AnalyzeResult:
+        """Analyze a document, or a page range of it, streaming the file body"""
+        kwargs = {"content_type": content_type} if content_type else {}
+        with Path(path).open("rb") as f:
+            poller: AnalyzeDocumentLROPoller = self.client.begin_analyze_document(
+                model_id=model_id,
+                body=f,
+                pages=pages,
+                **kwargs,
+            )
+            logger.debug(f"Poller status: {poller.status()}")
+        # Wait for the analysis to complete
+        return poller.result()
+
+    def iter_results(
+            self,
+            path: str | Path,
+            model_id: str = "prebuilt-layout",
+            content_type: str | None = None,
+            page_count: int | None = None,
+            pages_per_request: int = DEFAULT_PAGES_PER_REQUEST,
+            max_workers: int = DEFAULT_MAX_WORKERS,
+        ) -> Iterator[AnalyzeResult]:
+        """Analyze a document, large ones as page-range sub-requests in parallel, yielding results in page order"""
+        page_count = page_count if page_count is not None else count_pdf_pages(path)
+        if not page_count or page_count <= pages_per_request:
+            yield self._analyze_pages(path, model_id, content_type=content_type)
+            return
+        ranges = page_ranges(page_count, pages_per_request)
+        logger.info(f"Analyze {path} ({page_count} pages) in {len(ranges)} sub-requests")
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(self._analyze_pages, path, model_id, pages, content_type)
+                for pages in ranges
+            ]
+            for future in futures:
+                yield future.result()
+
+    def iter_blocks(
+            self,
+            path: str | Path,
+            model_id: Literal["prebuilt-read", "prebuilt-layout"] = "prebuilt-layout",
+            **kwargs,
+        ) -> Iterator[Block]:
+        """Stream the paragraphs, tables and key-value pairs of a document, for downstream chunkers"""
+        yield from iter_blocks(self.iter_results(path, model_id, **kwargs))
+
     def extract_from_docx(
             self, 
             docx_path: str, 
@@ -43,50 +199,19 @@ class DocIntelligenceExtractor:
         ) -> str:
         """Extract text from a DOCX file using the specified model_id"""
         try:
-            with Path(docx_path).open("rb") as docx_file:
-                # Read the DOCX file content
-                docx_bytes = docx_file.read()
-                
-                # Create the AnalyzeDocumentRequest
-                poller : AnalyzeDocumentLROPoller = self.client.begin_analyze_document(
-                    model_id=model_id,
-                    analyze_request=docx_bytes,
-                    content_type="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-                )
-                logger.debug(f"Poller status: {poller.status()}")
-
-                # Wait for the analysis to complete
-                result: AnalyzeResult = poller.result()
-
-                # Optionally save the poller state
-                if result_filepath:
-                    with Path(result_filepath).open("w") as rf:
-                        result_dict = result.as_dict()
-                        json.dump(result_dict, rf, indent=2)
-
-                match model_id:
-                    case "prebuilt-read":
-                        extracted_content = ""
-                        for paragraph in result.paragraphs:
-                            extracted_content += paragraph.content + "\n"
-                        return extracted_content.strip()
-                    case "prebuilt-layout":
-                        extracted_content = ""
-                        for page in result.pages:
-                            logger.info(f"Processing page {page.page_number} with {len(page.words)} words")
-                            for word in page.words:
-                                extracted_content += word.content + " "
-                        for paragraph_idx, paragraph in enumerate(result.paragraphs):
-                            logger.info(f"Processing paragraph {paragraph_idx}")
-                            extracted_content += paragraph.content + "\n"
-                        for table_idx, table in enumerate(result.tables):
-                            logger.info(f"Processing table {table_idx} with {len(table.cells)} cells")
-                            for cell in table.cells:
-                                extracted_content += cell.content + "\n"
-                        return extracted_content.strip()
-                    case _:
-                        logger.error(f"Unsupported model_id: {model_id}")
-                        return ""
+            results = list(self.iter_results(
+                docx_path,
+                model_id=model_id,
+                content_type=DOCX_CONTENT_TYPE,
+            ))
+
+            # Optionally save the analysis results
+            if result_filepath:
+                with Path(result_filepath).open("w") as rf:
+                    result_dicts = [result.as_dict() for result in results]
+                    json.dump(result_dicts[0] if len(result_dicts) == 1 else result_dicts, rf, indent=2)
+
+            return assemble_text(results, model_id)
         except Exception as e:
             msg = f"Failed to extract text from {docx_path} using model_id {model_id}: {e}"
             logger.exception(msg)
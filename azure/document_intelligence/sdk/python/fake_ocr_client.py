@@ -0,0 +1,104 @@
+import threading
+from typing import IO, Any
+
+from azure.ai.documentintelligence.models import AnalyzeResult
+
+
+class FakePoller:
+    """Stand-in for AnalyzeDocumentLROPoller, done after a delay."""
+
+    def __init__(self, result: AnalyzeResult | None, error: Exception | None, latency_seconds: float) -> None:
+        self._result = result
+        self._error = error
+        self._done = threading.Event()
+        # like LROPoller, the operation completes in the background
+        self._timer = threading.Timer(latency_seconds, self._done.set)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def done(self) -> bool:
+        return self._done.is_set()
+
+    def status(self) -> str:
+        if not self.done():
+            return "InProgress"
+        return "Failed" if self._error else "Succeeded"
+
+    def result(self, timeout: float | None = None) -> AnalyzeResult:
+        self._done.wait(timeout)
+        if self._error is not None:
+            raise self._error
+        return self._result
+
+
+def _fake_result(model_id: str, text: str, pages: str | None) -> AnalyzeResult:
+    """Analysis of a text document: pages separated by form feeds, one paragraph per line."""
+    page_texts = text.split("\f")
+    first, last = 1, len(page_texts)
+    if pages:
+        first, _, last = pages.partition("-")
+        first, last = int(first), int(last or first)
+    content = []
+    result_pages = []
+    paragraphs = []
+    offset = 0
+    for page_number in range(first, min(last, len(page_texts)) + 1):
+        page_text = page_texts[page_number - 1]
+        words = []
+        for line in page_text.splitlines():
+            paragraphs.append({
+                "content": line,
+                "boundingRegions": [{"pageNumber": page_number, "polygon": []}],
+                "spans": [{"offset": offset, "length": len(line)}],
+            })
+            for word in line.split():
+                words.append({"content": word, "confidence": 1.0, "span": {"offset": offset, "length": len(word)}})
+            offset += len(line) + 1
+        content.append(page_text)
+        result_pages.append({
+            "pageNumber": page_number, "width": 8.5, "height": 11, "unit": "inch",
+            "words": words,
+            "spans": [{"offset": offset - len(page_text), "length": len(page_text)}],
+        })
+    return AnalyzeResult({
+        "apiVersion": "2024-11-30",
+        "modelId": model_id,
+        "content": "\n".join(content),
+        "pages": result_pages,
+        "paragraphs": paragraphs,
+    })
+
+
+class FakeDocumentIntelligenceClient:
+    """Local stand-in for DocumentIntelligenceClient analyzing text documents, see _fake_result."""
+
+    def __init__(self, latency_seconds: float = 0.0, fail_contents: tuple[bytes, ...] = ()) -> None:
+        self.latency_seconds = latency_seconds
+        self.fail_contents = fail_contents
+        self.requests = 0
+        self.requested_pages: list[str | None] = []
+        self.max_in_flight = 0
+        self._pollers: list[FakePoller] = []
+        self._lock = threading.Lock()
+
+    def begin_analyze_document(
+            self, model_id: str, body: IO[bytes], pages: str | None = None, **kwargs: Any,
+    ) -> FakePoller:
+        content = body.read()
+        with self._lock:
+            self.requests += 1
+            self.requested_pages.append(pages)
+            self.max_in_flight = max(
+                self.max_in_flight,
+                1 + sum(not poller.done() for poller in self._pollers),
+            )
+        error = None
+        result = None
+        if content in self.fail_contents:
+            error = RuntimeError("InvalidContent")
+        else:
+            result = _fake_result(model_id, content.decode("utf-8", "replace"), pages)
+        poller = FakePoller(result, error, self.latency_seconds)
+        with self._lock:
+            self._pollers.append(poller)
+        return poller
@@ -0,0 +1,178 @@
+import hashlib
+import json
+import logging
+import os
+import time
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODEL_ID = "prebuilt-layout"
+DEFAULT_MAX_CONCURRENCY = 8
+DEFAULT_POLL_INTERVAL_SECONDS = 0.5
+HASH_CHUNK_BYTES = 1 << 20
+
+
+@dataclass
+class PipelineSummary:
+    """Outcome of a pipeline run."""
+
+    submitted: int = 0
+    skipped: int = 0
+    completed: int = 0
+    failed: int = 0
+    seconds: float = 0.0
+
+    @property
+    def files_per_second(self) -> float:
+        return self.completed / self.seconds if self.seconds else 0.0
+
+
+def file_sha256(path: Path) -> str:
+    """Hash a file by content, so that renamed or moved files are still recognized."""
+    digest = hashlib.sha256()
+    with Path(path).open("rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_BYTES), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class CheckpointManifest:
+    """Append-only JSONL record of the files already analyzed, keyed by content hash."""
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self.entries: dict[str, dict] = {}
+        if self.path.exists():
+            with self.path.open() as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        # torn last line of an interrupted run
+                        logger.warning("Skip corrupt manifest line: %r", line)
+                        continue
+                    self.entries[entry["sha256"]] = entry
+
+    def __contains__(self, sha256: str) -> bool:
+        return sha256 in self.entries
+
+    def add(self, sha256: str, file: str, **fields: Any) -> None:
+        """Record a finished file, durably before returning."""
+        entry = {"sha256": sha256, "file": file, **fields}
+        with self.path.open("a") as f:
+            f.write(json.dumps(entry) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self.entries[sha256] = entry
+
+
+def iter_analyze_files(
+        paths: Iterable[Path],
+        ocr_client: Any,
+        model_id: str = DEFAULT_MODEL_ID,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        poll_interval_seconds: float = DEFAULT_POLL_INTERVAL_SECONDS,
+        **analyze_kwargs: Any,
+) -> Iterator[tuple[Path, Any, Exception | None]]:
+    """Run up to max_concurrency analyze LROs at once, yielding (path, result, error) as each finishes."""
+    queue = list(paths)
+    in_flight = {}
+    while queue or in_flight:
+        # top up the in-flight operations
+        while queue and len(in_flight) < max_concurrency:
+            path = queue.pop(0)
+            try:
+                with Path(path).open("rb") as f:
+                    # the document is uploaded by the initial request
+                    in_flight[path] = ocr_client.begin_analyze_document(
+                        model_id=model_id,
+                        body=f,
+                        **analyze_kwargs,
+                    )
+            except Exception as e:  # noqa: BLE001
+                yield path, None, e
+
+        # collect the finished operations, the pollers poll in the background
+        finished = [path for path, poller in in_flight.items() if poller.done()]
+        for path in finished:
+            poller = in_flight.pop(path)
+            try:
+                yield path, poller.result(), None
+            except Exception as e:  # noqa: BLE001
+                yield path, None, e
+        if in_flight and not finished:
+            time.sleep(poll_interval_seconds)
+
+
+def run_pipeline(
+        paths: Iterable[Path],
+        ocr_client: Any,
+        output_path: str | Path,
+        manifest_path: str | Path,
+        model_id: str = DEFAULT_MODEL_ID,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        poll_interval_seconds: float = DEFAULT_POLL_INTERVAL_SECONDS,
+        on_result: Callable[[Path, Any], None] | None = None,
+) -> PipelineSummary:
+    """Analyze files concurrently, appending each result to a JSONL output as it completes.
+
+    Files whose hash is in the manifest are skipped, so a rerun resumes where the last one stopped.
+    A result is written before its manifest entry: after a crash in between, the file is analyzed
+    again and its output line duplicated, never lost.
+    """
+    start = time.perf_counter()
+    summary = PipelineSummary()
+    manifest = CheckpointManifest(manifest_path)
+
+    hashes = {}
+    seen = set()
+    for path in paths:
+        sha256 = file_sha256(path)
+        if sha256 in manifest or sha256 in seen:
+            logger.info("Skip %s, already analyzed", path)
+            summary.skipped += 1
+            continue
+        hashes[path] = sha256
+        seen.add(sha256)
+    summary.submitted = len(hashes)
+    logger.info("Analyze %d files, %d skipped", summary.submitted, summary.skipped)
+
+    with Path(output_path).open("a") as output:
+        for path, result, error in iter_analyze_files(
+                hashes,
+                ocr_client,
+                model_id=model_id,
+                max_concurrency=max_concurrency,
+                poll_interval_seconds=poll_interval_seconds,
+        ):
+            if error is not None:
+                logger.error("Failed to analyze %s: %s", path, error)
+                summary.failed += 1
+                continue
+            output.write(json.dumps({
+                "file": Path(path).name,
+                "sha256": hashes[path],
+                "model_id": model_id,
+                "result": result.as_dict(),
+            }) + "\n")
+            output.flush()
+            os.fsync(output.fileno())
+            manifest.add(hashes[path], Path(path).name, model_id=model_id)
+            summary.completed += 1
+            logger.info("Analyzed %s (%d/%d)", path, summary.completed, summary.submitted)
+            if on_result is not None:
+                on_result(Path(path), result)
+
+    summary.seconds = time.perf_counter() - start
+    logger.info(
+        "Completed %d, failed %d, skipped %d in %.1fs (%.2f files/s)",
+        summary.completed, summary.failed, summary.skipped,
+        summary.seconds, summary.files_per_second,
+    )
+    return summary
@@ -0,0 +1,79 @@
+from pathlib import Path
+
+import pytest
+from azure.ai.documentintelligence.models import AnalyzeResult
+
+from docx_content import DocIntelligenceExtractor, assemble_text, iter_blocks, page_ranges
+from fake_ocr_client import FakeDocumentIntelligenceClient
+
+
+@pytest.fixture
+def extractor() -> DocIntelligenceExtractor:
+    extractor = DocIntelligenceExtractor.__new__(DocIntelligenceExtractor)
+    extractor.client = FakeDocumentIntelligenceClient()
+    return extractor
+
+
+@pytest.fixture
+def manual(tmp_path: Path) -> Path:
+    path = tmp_path / "manual.docx"
+    path.write_text("\f".join(f"page {i} title\npage {i} body text" for i in range(1, 8)))
+    return path
+
+
+def test_page_ranges() -> None:
+    assert page_ranges(7, 3) == ["1-3", "4-6", "7-7"]
+    assert page_ranges(6, 3) == ["1-3", "4-6"]
+
+
+def test_assemble_text_layout() -> None:
+    result = AnalyzeResult({
+        "pages": [{"pageNumber": 1, "words": [
+            {"content": "a", "span": {"offset": 0, "length": 1}},
+            {"content": "b", "span": {"offset": 2, "length": 1}},
+        ]}],
+        "paragraphs": [{"content": "a b"}],
+        "tables": [{"rowCount": 1, "columnCount": 2, "cells": [
+            {"rowIndex": 0, "columnIndex": 0, "content": "c"},
+            {"rowIndex": 0, "columnIndex": 1, "content": "d"},
+        ]}],
+    })
+    assert assemble_text([result], "prebuilt-layout") == "a b a b\nc\nd"
+    assert assemble_text([result], "prebuilt-read") == "a b"
+    assert assemble_text([result], "foo") == ""
+
+
+def test_extract_from_docx(extractor: DocIntelligenceExtractor, manual: Path) -> None:
+    content = extractor.extract_from_docx(str(manual), model_id="prebuilt-read")
+    assert content.splitlines()[:2] == ["page 1 title", "page 1 body text"]
+    assert extractor.client.requested_pages == [None]
+
+
+def test_page_range_sub_requests(extractor: DocIntelligenceExtractor, manual: Path) -> None:
+    results = list(extractor.iter_results(manual, page_count=7, pages_per_request=3))
+    assert sorted(extractor.client.requested_pages) == ["1-3", "4-6", "7-7"]
+    # results in page order, whatever the completion order
+    assert [page.page_number for result in results for page in result.pages] == list(range(1, 8))
+    whole = DocIntelligenceExtractor.__new__(DocIntelligenceExtractor)
+    whole.client = FakeDocumentIntelligenceClient()
+    assert assemble_text(results, "prebuilt-read") \
+        == assemble_text(whole.iter_results(manual), "prebuilt-read")
+
+
+def test_iter_blocks(extractor: DocIntelligenceExtractor, manual: Path) -> None:
+    blocks = list(extractor.iter_blocks(manual, page_count=7, pages_per_request=2))
+    assert len(blocks) == 14
+    assert blocks[0].kind == "paragraph"
+    assert (blocks[-1].content, blocks[-1].page_number) == ("page 7 body text", 7)
+
+    result = AnalyzeResult({
+        "tables": [{"rowCount": 2, "columnCount": 2, "cells": [
+            {"rowIndex": 0, "columnIndex": 0, "content": "k"},
+            {"rowIndex": 1, "columnIndex": 1, "content": "v"},
+        ], "boundingRegions": [{"pageNumber": 3, "polygon": []}]}],
+        "keyValuePairs": [{"key": {"content": "name"}, "value": {"content": "foo"}}],
+    })
+    table, kv_pair = iter_blocks([result])
+    assert (table.kind, table.rows, table.page_number) == ("table", [["k", ""], ["", "v"]], 3)
+    assert table.content == "k\t\n\tv"
+    assert (kv_pair.kind, kv_pair.content) == ("key_value", "name: foo")
@@ -0,0 +1,73 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from fake_ocr_client import FakeDocumentIntelligenceClient
+from ocr_pipeline import CheckpointManifest, file_sha256, run_pipeline
+
+
+@pytest.fixture
+def pdf_dir(tmp_path: Path) -> Path:
+    path = tmp_path / "pdfs"
+    path.mkdir()
+    for i in range(6):
+        (path / f"doc_{i}.pdf").write_bytes(f"document {i}".encode())
+    return path
+
+
+def read_jsonl(path: Path) -> list[dict]:
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+def test_file_sha256(tmp_path: Path) -> None:
+    (tmp_path / "a.pdf").write_bytes(b"same")
+    (tmp_path / "b.pdf").write_bytes(b"same")
+    assert file_sha256(tmp_path / "a.pdf") == file_sha256(tmp_path / "b.pdf")
+
+
+def test_manifest_ignores_torn_line(tmp_path: Path) -> None:
+    path = tmp_path / "manifest.jsonl"
+    manifest = CheckpointManifest(path)
+    manifest.add("abc", "a.pdf")
+    with path.open("a") as f:
+        f.write('{"sha256": "de')
+    assert "abc" in CheckpointManifest(path)
+
+
+def test_run_pipeline_concurrent(pdf_dir: Path, tmp_path: Path) -> None:
+    client = FakeDocumentIntelligenceClient(latency_seconds=0.1)
+    summary = run_pipeline(
+        sorted(pdf_dir.iterdir()),
+        client,
+        output_path=tmp_path / "out.jsonl",
+        manifest_path=tmp_path / "manifest.jsonl",
+        max_concurrency=3,
+        poll_interval_seconds=0.01,
+    )
+    # 6 files, 3 at a time
+    assert client.max_in_flight == 3
+    assert summary.completed == 6
+    records = read_jsonl(tmp_path / "out.jsonl")
+    assert sorted(record["result"]["content"] for record in records) == [f"document {i}" for i in range(6)]
+
+
+def test_run_pipeline_resumes(pdf_dir: Path, tmp_path: Path) -> None:
+    kwargs = {
+        "output_path": tmp_path / "out.jsonl",
+        "manifest_path": tmp_path / "manifest.jsonl",
+        "poll_interval_seconds": 0.01,
+    }
+    failing = FakeDocumentIntelligenceClient(fail_contents=(b"document 2",))
+    summary = run_pipeline(sorted(pdf_dir.iterdir()), failing, **kwargs)
+    assert (summary.completed, summary.failed) == (5, 1)
+
+    # a copy of an analyzed file is skipped too
+    (pdf_dir / "copy.pdf").write_bytes(b"document 0")
+    client = FakeDocumentIntelligenceClient()
+    summary = run_pipeline(sorted(pdf_dir.iterdir()), client, **kwargs)
+    assert (summary.skipped, summary.completed) == (6, 1)
+    assert client.requests == 1
+    records = read_jsonl(tmp_path / "out.jsonl")
+    assert len(records) == 6
+    assert records[-1]["file"] == "doc_2.pdf"
@@ -0,0 +1,115 @@
+# One request per text (encode) vs. de-duplicated, packed and concurrent
+# requests (encode_batch), against a local stub of the Azure OpenAI
+# embeddings endpoint with simulated per-request latency.
+#
+# usage (from azure/open_ai/sdk/python/encoding):
+#   python -m benchmarks.bench_encode_batch --texts 2000 --latency-ms 20
+
+import time
+import json
+import base64
+import logging
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+from src.azure_openai_encoder import AzureOpenAIEncoder
+
+API_VERSION = '2024-05-01-preview'
+
+
+def make_handler(latency_seconds: float, dimensions: int):
+
+    class EmbeddingsHandler(BaseHTTPRequestHandler):
+        """
+        Stub of POST /openai/deployments/{model}/embeddings
+        """
+
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+            texts = body['input']
+            texts = [texts] if isinstance(texts, str) else texts
+            time.sleep(latency_seconds)
+
+            data = []
+            for i, text in enumerate(texts):
+                rng = np.random.default_rng(abs(hash(text)) % (2 ** 32))
+                vector = rng.standard_normal(dimensions).astype(np.float32)
+                if body.get('encoding_format') == 'base64':
+                    embedding = base64.b64encode(vector.tobytes()).decode()
+                else:
+                    embedding = vector.tolist()
+                data.append({'object': 'embedding', 'index': i,
+                             'embedding': embedding})
+            payload = json.dumps({
+                'object': 'list',
+                'data': data,
+                'model': body.get('model'),
+                'usage': {'prompt_tokens': 0, 'total_tokens': 0},
+            }).encode()
+
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, format, *args):
+            pass
+
+    return EmbeddingsHandler
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--texts', type=int, default=2000)
+    parser.add_argument('--duplicate-rate', type=float, default=0.2)
+    parser.add_argument('--dimensions', type=int, default=1536)
+    parser.add_argument('--latency-ms', type=float, default=20.0)
+    parser.add_argument('--max-batch-inputs', type=int, default=256)
+    parser.add_argument('--max-workers', type=int, default=4)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), make_handler(
+        args.latency_ms / 1000, args.dimensions))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    encoder = AzureOpenAIEncoder(
+        azure_endpoint=f'http://127.0.0.1:{server.server_port}',
+        api_key='stub',
+        api_version=API_VERSION,
+        model='stub',
+    )
+
+    rng = np.random.default_rng(0)
+    n_unique = max(1, int(args.texts * (1 - args.duplicate_rate)))
+    corpus = [f'chunk {i} ' + 'lorem ipsum ' * int(rng.integers(5, 50))
+              for i in range(n_unique)]
+    texts = [corpus[i] for i in rng.integers(0, n_unique, args.texts)]
+
+    start = time.perf_counter()
+    sequential = np.asarray([encoder.encode(t) for t in texts],
+                            dtype=np.float32)
+    sequential_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batched = encoder.encode_batch(
+        texts,
+        max_batch_inputs=args.max_batch_inputs,
+        max_workers=args.max_workers
+    )
+    batched_seconds = time.perf_counter() - start
+    server.shutdown()
+
+    assert np.allclose(sequential, batched)
+    print(f"{'encode (one request/text)':<28} "
+          f"{args.texts / sequential_seconds:>9.1f} texts/s")
+    print(f"{'encode_batch':<28} "
+          f"{args.texts / batched_seconds:>9.1f} texts/s  "
+          f"speed-up x{sequential_seconds / batched_seconds:.1f}")
+
+
+if __name__ == '__main__':
+    main()
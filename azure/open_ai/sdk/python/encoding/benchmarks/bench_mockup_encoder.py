@@ -0,0 +1,58 @@
+# Per-text character counting (previous mockup) vs. one vectorized pass
+# of hashed character n-grams over the whole batch (MockupEmbeddingGenerator).
+#
+# usage (from azure/open_ai/sdk/python/encoding):
+#   python -m benchmarks.bench_mockup_encoder --texts 10000
+
+import time
+import string
+import logging
+import argparse
+
+import numpy as np
+
+from src.mockup_encoder import MockupEmbeddingGenerator
+
+
+def encode_char_counts(text: str) -> list:
+    # previous MockupEmbeddingGenerator.encode
+    embeddings = dict()
+    for char in string.printable + string.whitespace:
+        embeddings[char] = 0
+    for char in text:
+        embeddings[char] = embeddings.get(char, 0) + 1
+    return list(embeddings.values())
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--texts', type=int, default=10000)
+    parser.add_argument('--words', type=int, default=200)
+    parser.add_argument('--dimensions', type=int, default=384)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    rng = np.random.default_rng(0)
+    vocabulary = np.array(['lorem', 'ipsum', 'dolor', 'sit', 'amet',
+                           'consectetur', 'adipiscing', 'elit', 'sed', 'do'])
+    texts = [' '.join(rng.choice(vocabulary, args.words))
+             for _ in range(args.texts)]
+    n_chars = sum(map(len, texts))
+    encoder = MockupEmbeddingGenerator(dimensions=args.dimensions)
+
+    start = time.perf_counter()
+    np.asarray([encode_char_counts(t) for t in texts], dtype=np.float32)
+    baseline_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    encoder.encode_batch(texts)
+    batch_seconds = time.perf_counter() - start
+
+    for name, seconds in [('char counts (per text)', baseline_seconds),
+                          ('n-gram hashing (batch)', batch_seconds)]:
+        print(f"{name:<26} {args.texts / seconds:>10.1f} texts/s "
+              f"{n_chars / seconds / 1e6:>7.2f} Mchars/s")
+
+
+if __name__ == '__main__':
+    main()
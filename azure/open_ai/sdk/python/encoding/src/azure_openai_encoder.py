@@ -1,17 +1,29 @@
 import os
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from typing import List
 
+import numpy as np
 from openai import AzureOpenAI
 
 from src.encoder import Encoder
 from src.encrypt import mask_key
+from src.batching import (
+    DEFAULT_MAX_BATCH_INPUTS,
+    DEFAULT_MAX_BATCH_TOKENS,
+    RateLimiter,
+    count_tokens,
+    deduplicate,
+    pack_batches
+)
+from src.rate_limiting import TokenBudgetScheduler
 
 # constants
 ENV_KEY_ENCODER_OPENAI_ENDPOINT = "ENCODER_OPENAI_ENDPOINT"
 ENV_KEY_ENCODER_OPENAI_KEY = "ENCODER_OPENAI_KEY"
 ENV_KEY_ENCODER_OPENAI_DEPLOYMENT_NAME = "ENCODER_OPENAI_DEPLOYMENT_NAME"
 ENV_KEY_ENCODER_OPENAI_API_VERSION = "ENCODER_OPENAI_API_VERSION"
+DEFAULT_MAX_WORKERS = 4
 
 
 class AzureOpenAIEncoder(Encoder):
@@ -20,6 +32,7 @@ class AzureOpenAIEncoder(Encoder):
     """
     openai_client: AzureOpenAI
     model: str
+    scheduler: TokenBudgetScheduler
 
     def __init__(
         self,
@@ -27,6 +40,7 @@ class AzureOpenAIEncoder(Encoder):
         api_key: str = None,
         api_version: str = None,
         model: str = None,
+        scheduler: TokenBudgetScheduler = None,
     ):
         logging.info("Start AzureOpenAI client configuration ...")
 
@@ -45,12 +59,16 @@ class AzureOpenAIEncoder(Encoder):
         logging.info(f"Azure OpenAI api_version: {api_version}")
         logging.info(f"Azure OpenAI model: {self.model}")
 
-        # construct LLM client
+        # construct LLM client,
+        # retries are left to the scheduler, which sees every throttled call
         self.openai_client = AzureOpenAI(
             azure_endpoint=azure_endpoint,
             api_key=api_key,
             api_version=api_version,
+            max_retries=0,
         )
+        self.scheduler = scheduler if scheduler is not None \
+            else TokenBudgetScheduler()
 
         logging.info("Completed AzureOpenAI client configuration.")
 
@@ -63,9 +81,11 @@ class AzureOpenAIEncoder(Encoder):
         logging.info("Start encode method ...")
 
         try:
-            response = self.openai_client.embeddings.create(
+            response = self.scheduler.call(
+                self.openai_client.embeddings.create,
                 input=text,
-                model=self.model
+                model=self.model,
+                tokens=count_tokens([text])[0]
             )
         except Exception as ex:
             msg = f"Error({type(ex).__name}) in embeddings: {str(ex)}"
@@ -76,3 +96,79 @@ class AzureOpenAIEncoder(Encoder):
         
         logging.info("Completed encode method.")
         return embeddings
+
+    def _encode_request(
+        self,
+        texts: List[str],
+        tokens: int,
+        rate_limiter: RateLimiter
+    ) -> np.ndarray:
+        """
+        Generate embeddings of one batch in a single request
+        @param texts: texts of the batch
+        @param tokens: token count of the batch
+        @param rate_limiter: limiter shared by concurrent requests
+        @return: float32 array of shape (len(texts), dimensions)
+        """
+        rate_limiter.acquire()
+        response = self.scheduler.call(
+            self.openai_client.embeddings.create,
+            input=texts,
+            model=self.model,
+            tokens=tokens
+        )
+        # data is not guaranteed to be in input order
+        data = sorted(response.data, key=lambda d: d.index)
+        return np.asarray([d.embedding for d in data], dtype=np.float32)
+
+    def encode_batch(
+        self,
+        texts: List[str],
+        max_batch_tokens: int = DEFAULT_MAX_BATCH_TOKENS,
+        max_batch_inputs: int = DEFAULT_MAX_BATCH_INPUTS,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        requests_per_second: float = None
+    ) -> np.ndarray:
+        """
+        Generate embeddings of many texts: identical texts are encoded once,
+        the rest is packed into token-bounded requests sent concurrently
+        @param texts: texts to generate embeddings
+        @param max_batch_tokens: max tokens per request
+        @param max_batch_inputs: max inputs per request
+        @param max_workers: max concurrent requests
+        @param requests_per_second: max request rate, None is unlimited
+        @return: float32 array of shape (len(texts), dimensions)
+        """
+        logging.info("Start encode_batch method ...")
+
+        unique_texts, inverse = deduplicate(texts)
+        if not unique_texts:
+            return np.empty((0, 0), dtype=np.float32)
+        token_counts = count_tokens(unique_texts)
+        batches = pack_batches(
+            token_counts,
+            max_batch_tokens=max_batch_tokens,
+            max_batch_inputs=max_batch_inputs
+        )
+        logging.info(f"Encode {len(texts)} texts ({len(unique_texts)} unique) \
+            in {len(batches)} requests.")
+
+        rate_limiter = RateLimiter(requests_per_second)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(
+                lambda batch: self._encode_request(
+                    [unique_texts[i] for i in batch],
+                    sum(token_counts[i] for i in batch),
+                    rate_limiter
+                ),
+                batches
+            ))
+
+        embeddings = np.empty(
+            (len(unique_texts), results[0].shape[1]), dtype=np.float32)
+        for batch, result in zip(batches, results):
+            embeddings[batch] = result
+
+        logging.info("Completed encode_batch method.")
+        # fancy indexing returns a new, contiguous array
+        return embeddings[inverse]
@@ -0,0 +1,132 @@
+# ref:
+# * https://learn.microsoft.com/en-us/azure/ai-services/openai/reference#embeddings
+# * https://github.com/openai/tiktoken
+
+import math
+import time
+import logging
+import threading
+from functools import lru_cache
+from typing import List, Tuple
+
+import numpy as np
+
+# constants
+DEFAULT_MAX_BATCH_INPUTS = 2048  # max inputs per embeddings request
+DEFAULT_MAX_BATCH_TOKENS = 100_000
+DEFAULT_TOKEN_ENCODING = 'cl100k_base'
+CHARS_PER_TOKEN = 4  # estimate when tiktoken is not installed
+
+try:
+    import tiktoken
+except ImportError:  # optional, token counts are estimated without it
+    tiktoken = None
+
+
+@lru_cache(maxsize=None)
+def _get_encoding(encoding_name: str):
+    """
+    Load a tiktoken encoding once
+    @param encoding_name: tiktoken encoding
+    @return: encoding, None if tiktoken or the encoding is unavailable
+    """
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.get_encoding(encoding_name)
+    except Exception as ex:
+        # e.g. the encoding file cannot be downloaded
+        logging.warning(f"Estimate token counts, tiktoken encoding \
+            '{encoding_name}' is unavailable: {ex}")
+        return None
+
+
+def count_tokens(
+    texts: List[str],
+    encoding_name: str = DEFAULT_TOKEN_ENCODING
+) -> List[int]:
+    """
+    Count the tokens of each text
+    @param texts: texts
+    @param encoding_name: tiktoken encoding
+    @return: token count per text, estimated without tiktoken
+    """
+    encoding = _get_encoding(encoding_name)
+    if encoding is None:
+        return [max(1, math.ceil(len(text) / CHARS_PER_TOKEN))
+                for text in texts]
+    return [len(tokens) for tokens in encoding.encode_ordinary_batch(texts)]
+
+
+def deduplicate(texts: List[str]) -> Tuple[List[str], np.ndarray]:
+    """
+    De-duplicate texts, keeping first-seen order
+    @param texts: texts
+    @return: (unique texts, index of each input in the unique texts)
+    """
+    positions = {}
+    inverse = np.empty(len(texts), dtype=np.intp)
+    for i, text in enumerate(texts):
+        inverse[i] = positions.setdefault(text, len(positions))
+    return list(positions), inverse
+
+
+def pack_batches(
+    token_counts: List[int],
+    max_batch_tokens: int = DEFAULT_MAX_BATCH_TOKENS,
+    max_batch_inputs: int = DEFAULT_MAX_BATCH_INPUTS
+) -> List[List[int]]:
+    """
+    Greedily pack consecutive inputs into token-bounded batches;
+    an input over the token budget gets a batch of its own
+    @param token_counts: token count per input
+    @param max_batch_tokens: max tokens per batch
+    @param max_batch_inputs: max inputs per batch
+    @return: input indices per batch
+    """
+    if max_batch_tokens < 1 or max_batch_inputs < 1:
+        raise ValueError(f"Invalid batch limits: max_batch_tokens=\
+            {max_batch_tokens}, max_batch_inputs={max_batch_inputs}")
+    batches = []
+    batch = []
+    batch_tokens = 0
+    for i, tokens in enumerate(token_counts):
+        if batch and (batch_tokens + tokens > max_batch_tokens
+                      or len(batch) >= max_batch_inputs):
+            batches.append(batch)
+            batch = []
+            batch_tokens = 0
+        batch.append(i)
+        batch_tokens += tokens
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+class RateLimiter:
+    """
+    Thread-safe limiter spacing requests at most
+    requests_per_second apart
+    """
+
+    def __init__(self, requests_per_second: float = None):
+        """
+        @param requests_per_second: max request rate, None is unlimited
+        """
+        self.interval = 1.0 / requests_per_second \
+            if requests_per_second else 0.0
+        self._next_time = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """
+        Wait for the next request slot
+        """
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            wait = self._next_time - now
+            self._next_time = max(now, self._next_time) + self.interval
+        if wait > 0:
+            time.sleep(wait)
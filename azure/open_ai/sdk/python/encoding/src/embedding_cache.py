@@ -0,0 +1,290 @@
+# ref:
+# * https://docs.python.org/3/library/sqlite3.html
+# * https://www.sqlite.org/wal.html
+
+import time
+import hashlib
+import logging
+import sqlite3
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List
+
+import numpy as np
+
+from src.encoder import Encoder
+
+# constants
+DEFAULT_MAX_MEMORY_ENTRIES = 10_000
+DEFAULT_MAX_DISK_BYTES = 1 << 30  # 1 GiB of vectors
+EVICTION_FRACTION = 0.1  # share of disk entries dropped per eviction
+SQLITE_MAX_VARIABLES = 900
+
+
+@dataclass
+class EmbeddingCacheStats:
+    memory_hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    memory_evictions: int = 0
+    disk_evictions: int = 0
+
+    @property
+    def hits(self) -> int:
+        return self.memory_hits + self.disk_hits
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+def text_hash(text: str) -> bytes:
+    """
+    Content address of a text
+    @param text: text
+    @return: sha256 digest
+    """
+    return hashlib.sha256(text.encode('utf-8')).digest()
+
+
+class EmbeddingCache:
+    """
+    Content-addressed embedding store keyed by (model, text hash):
+    an in-memory LRU tier in front of an optional SQLite file holding
+    vectors as raw float32 bytes, evicted least-recently-used first
+    """
+
+    def __init__(
+        self,
+        path: str = None,
+        max_memory_entries: int = DEFAULT_MAX_MEMORY_ENTRIES,
+        max_disk_bytes: int = DEFAULT_MAX_DISK_BYTES
+    ):
+        """
+        @param path: optional SQLite file for the on-disk tier
+        @param max_memory_entries: max number of in-memory vectors
+        @param max_disk_bytes: max bytes of vectors on disk
+        """
+        self.path = path
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_bytes = max_disk_bytes
+        self.stats = EmbeddingCacheStats()
+        # (model, text hash) -> float32 vector
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        self._disk_bytes = 0
+        if path:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS embedding_cache ("
+                "model TEXT, text_hash BLOB, vector BLOB, last_access REAL, "
+                "PRIMARY KEY (model, text_hash)) WITHOUT ROWID"
+            )
+            self._db.execute(
+                "CREATE INDEX IF NOT EXISTS embedding_cache_last_access "
+                "ON embedding_cache (last_access)"
+            )
+            self._db.commit()
+            self._disk_bytes = self._db.execute(
+                "SELECT COALESCE(SUM(LENGTH(vector)), 0) FROM embedding_cache"
+            ).fetchone()[0]
+
+    def _put_memory(self, key: tuple, vector: np.ndarray) -> None:
+        self._entries[key] = vector
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_memory_entries:
+            self._entries.popitem(last=False)
+            self.stats.memory_evictions += 1
+
+    def _get_disk(self, model: str, hashes: List[bytes]) -> Dict[bytes, bytes]:
+        found = {}
+        for start in range(0, len(hashes), SQLITE_MAX_VARIABLES):
+            chunk = hashes[start:start + SQLITE_MAX_VARIABLES]
+            placeholders = ', '.join('?' * len(chunk))
+            found.update(self._db.execute(
+                "SELECT text_hash, vector FROM embedding_cache "
+                f"WHERE model = ? AND text_hash IN ({placeholders})",
+                (model, *chunk)
+            ).fetchall())
+        if found:
+            now = time.time()
+            self._db.executemany(
+                "UPDATE embedding_cache SET last_access = ? "
+                "WHERE model = ? AND text_hash = ?",
+                [(now, model, h) for h in found]
+            )
+            self._db.commit()
+        return found
+
+    def get_many(self, model: str, texts: List[str]) -> Dict[int, np.ndarray]:
+        """
+        Get cached vectors
+        @param model: embedding model
+        @param texts: texts
+        @return: vector per position of a cached text
+        """
+        hashes = [text_hash(text) for text in texts]
+        results = {}
+        missing = {}
+        with self._lock:
+            for i, h in enumerate(hashes):
+                vector = self._entries.get((model, h))
+                if vector is not None:
+                    self._entries.move_to_end((model, h))
+                    results[i] = vector
+                    self.stats.memory_hits += 1
+                else:
+                    missing.setdefault(h, []).append(i)
+            if missing and self._db is not None:
+                for h, blob in self._get_disk(model, list(missing)).items():
+                    vector = np.frombuffer(blob, dtype=np.float32)
+                    self._put_memory((model, h), vector)
+                    for i in missing.pop(h):
+                        results[i] = vector
+                        self.stats.disk_hits += 1
+            self.stats.misses += sum(len(v) for v in missing.values())
+        return results
+
+    def put_many(
+        self,
+        model: str,
+        texts: List[str],
+        vectors: np.ndarray
+    ) -> None:
+        """
+        Store vectors
+        @param model: embedding model
+        @param texts: texts
+        @param vectors: array of shape (len(texts), dimensions)
+        """
+        vectors = np.asarray(vectors, dtype=np.float32)
+        rows = []
+        with self._lock:
+            for text, vector in zip(texts, vectors):
+                h = text_hash(text)
+                # own copy, so that callers cannot alter the cached vector
+                vector = vector.copy()
+                vector.flags.writeable = False
+                self._put_memory((model, h), vector)
+                rows.append((model, h, vector.tobytes()))
+            if self._db is not None and rows:
+                now = time.time()
+                inserted = self._db.total_changes
+                self._db.executemany(
+                    "INSERT OR IGNORE INTO embedding_cache "
+                    "(model, text_hash, vector, last_access) "
+                    "VALUES (?, ?, ?, ?)",
+                    [(m, h, blob, now) for m, h, blob in rows]
+                )
+                inserted = self._db.total_changes - inserted
+                # content-addressed: ignored rows hold the same vector
+                self._disk_bytes += inserted * len(rows[0][2])
+                self._db.commit()
+                if self._disk_bytes > self.max_disk_bytes:
+                    self._evict_disk()
+
+    def _evict_disk(self) -> None:
+        while self._disk_bytes > self.max_disk_bytes:
+            count = self._db.execute(
+                "SELECT COUNT(*) FROM embedding_cache").fetchone()[0]
+            if count == 0:
+                break
+            n = max(1, int(count * EVICTION_FRACTION))
+            self._db.execute(
+                "DELETE FROM embedding_cache WHERE (model, text_hash) IN ("
+                "SELECT model, text_hash FROM embedding_cache "
+                "ORDER BY last_access LIMIT ?)", (n,)
+            )
+            self._db.commit()
+            self._disk_bytes = self._db.execute(
+                "SELECT COALESCE(SUM(LENGTH(vector)), 0) FROM embedding_cache"
+            ).fetchone()[0]
+            self.stats.disk_evictions += n
+        logging.info(f"Evicted embeddings, {self._disk_bytes} bytes on disk.")
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM embedding_cache")
+                self._db.commit()
+                self._disk_bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def close(self) -> None:
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+
+class CachedEncoder(Encoder):
+    """
+    Caching layer in front of any Encoder: only texts never
+    embedded with the same model are sent to the wrapped encoder.
+    Other attributes are delegated to the wrapped encoder.
+    """
+
+    def __init__(self, encoder: Encoder, cache: EmbeddingCache = None):
+        """
+        @param encoder: encoder to wrap
+        @param cache: embedding cache, default in-memory LRU
+        """
+        self.encoder = encoder
+        self.cache = cache if cache is not None else EmbeddingCache()
+
+    @property
+    def model(self) -> str:
+        return self.encoder.model
+
+    def encode(self, text: str) -> List[float]:
+        """
+        Generate embeddings
+        @param text: text to generate embeddings
+        @return: embeddings
+        """
+        cached = self.cache.get_many(self.model, [text])
+        if cached:
+            return cached[0].tolist()
+        embeddings = self.encoder.encode(text)
+        self.cache.put_many(self.model, [text], [embeddings])
+        return embeddings
+
+    def encode_batch(self, texts: List[str], **kwargs) -> np.ndarray:
+        """
+        Generate embeddings of many texts, encoding cache misses only
+        @param texts: texts to generate embeddings
+        @param kwargs: passed to the wrapped encode_batch
+        @return: float32 array of shape (len(texts), dimensions)
+        """
+        cached = self.cache.get_many(self.model, texts)
+        misses = [i for i in range(len(texts)) if i not in cached]
+        logging.info(f"Embedding cache: {len(cached)} hits, \
+            {len(misses)} misses.")
+
+        encoded = None
+        if misses:
+            encoded = self.encoder.encode_batch(
+                [texts[i] for i in misses], **kwargs)
+            self.cache.put_many(
+                self.model, [texts[i] for i in misses], encoded)
+        if not texts:
+            return np.empty((0, 0), dtype=np.float32)
+
+        dimensions = encoded.shape[1] if encoded is not None \
+            else len(next(iter(cached.values())))
+        embeddings = np.empty((len(texts), dimensions), dtype=np.float32)
+        for i, vector in cached.items():
+            embeddings[i] = vector
+        if misses:
+            embeddings[misses] = encoded
+        return embeddings
+
+    def __getattr__(self, name: str):
+        # only called for attributes not defined on the wrapper
+        return getattr(self.encoder, name)
@@ -2,6 +2,8 @@ from abc import ABC, abstractmethod
 from enum import Enum
 from typing import List
 
+import numpy as np
+
 
 class EncoderProvider(Enum):
     """
@@ -17,17 +19,37 @@ class Encoder(ABC):
     """
 
     @staticmethod
-    def new(provider: EncoderProvider):
+    def new(provider: EncoderProvider, cache=None):
+        """
+        Create an encoder
+        @param provider: encoder provider
+        @param cache: optional EmbeddingCache, wraps the encoder in a
+            CachedEncoder
+        @return: encoder
+        """
         match provider:
             case EncoderProvider.MOCKUP:
                 from src.mockup_encoder import MockupEmbeddingGenerator
-                return MockupEmbeddingGenerator()
+                encoder = MockupEmbeddingGenerator()
             case EncoderProvider.OPENAI:
                 from src.azure_openai_encoder import AzureOpenAIEncoder
-                return AzureOpenAIEncoder()
+                encoder = AzureOpenAIEncoder()
             case _:
                 raise ValueError(f"Invalid provider: {provider}")
+        if cache is not None:
+            from src.embedding_cache import CachedEncoder
+            encoder = CachedEncoder(encoder, cache)
+        return encoder
 
     @abstractmethod
     def encode(self, text: str) -> List[float]:
         raise NotImplementedError
+
+    @abstractmethod
+    def encode_batch(self, texts: List[str]) -> np.ndarray:
+        """
+        Generate embeddings of many texts
+        @param texts: texts to generate embeddings
+        @return: float32 array of shape (len(texts), dimensions)
+        """
+        raise NotImplementedError
@@ -1,19 +1,35 @@
-import string
 import logging
-from typing import List
+from typing import List, Tuple
+
+import numpy as np
 
 from src.encoder import Encoder
+from src.ngram_hashing import (
+    DEFAULT_DIMENSIONS,
+    DEFAULT_NGRAM_RANGE,
+    ngram_hash_embeddings
+)
 
 
 class MockupEmbeddingGenerator(Encoder):
     """
-    Class for generate embeddings
+    Class for generate embeddings: deterministic, hashed
+    character n-grams (similar texts get similar embeddings)
     """
-    model: str = 'mockup'
+    model: str
 
-    def __init__(self):
+    def __init__(
+        self,
+        dimensions: int = DEFAULT_DIMENSIONS,
+        ngram_range: Tuple[int, int] = DEFAULT_NGRAM_RANGE
+    ):
         logging.info("Start MockUp base configuration ...")
 
+        self.dimensions = dimensions
+        self.ngram_range = ngram_range
+        # embeddings differ per parameters, e.g. in a shared EmbeddingCache
+        self.model = f"mockup-{dimensions}-{ngram_range[0]}-{ngram_range[1]}"
+
         logging.info("Completed MockUp base configuration.")
 
     def encode(self, text: str) -> List[float]:
@@ -22,12 +38,16 @@ class MockupEmbeddingGenerator(Encoder):
         @param text: text to generate embeddings
         @return: embeddings
         """
+        return self.encode_batch([text])[0].tolist()
 
-        embeddings = dict()
-        for char in string.printable + string.whitespace:
-            embeddings[char] = 0
-
-        for char in text:
-            embeddings[char] = embeddings.get(char, 0) + 1
-
-        return list(embeddings.values())
+    def encode_batch(self, texts: List[str]) -> np.ndarray:
+        """
+        Generate embeddings of many texts in one vectorized pass
+        @param texts: texts to generate embeddings
+        @return: float32 array of shape (len(texts), dimensions)
+        """
+        return ngram_hash_embeddings(
+            texts,
+            dimensions=self.dimensions,
+            ngram_range=self.ngram_range
+        )
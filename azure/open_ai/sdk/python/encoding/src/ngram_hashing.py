@@ -0,0 +1,99 @@
+# ref:
+# * https://en.wikipedia.org/wiki/Feature_hashing
+# * https://arxiv.org/abs/0902.2206 (Weinberger et al., signed hashing)
+
+from typing import List, Tuple
+
+import numpy as np
+
+# constants
+DEFAULT_DIMENSIONS = 384
+DEFAULT_NGRAM_RANGE = (1, 3)
+MAX_DIMENSIONS = 1 << 15
+CHUNK_SIZE = 256  # texts per pass, keeps the bucket counts cache-resident
+_MULTIPLIER = np.uint32(0x01000193)  # FNV-1a 32-bit prime
+_GOLDEN = 0x9E3779B9
+_MIX = np.uint32(0x85EBCA6B)  # murmur3 finalizer constant
+
+
+def _ngram_counts(
+    texts: List[str],
+    dimensions: int,
+    ngram_range: Tuple[int, int]
+) -> np.ndarray:
+    """
+    Signed n-gram counts of a chunk of texts
+    @param texts: texts
+    @param dimensions: embedding dimensions
+    @param ngram_range: (min n, max n) of the character n-grams
+    @return: float32 array of shape (len(texts), dimensions)
+    """
+    min_n, max_n = ngram_range
+    n_texts = len(texts)
+    # code points of all texts, back to back
+    codes = np.frombuffer(''.join(texts).encode('utf-32-le'), dtype=np.uint32)
+    lengths = np.fromiter(map(len, texts), dtype=np.intp, count=n_texts)
+    text_ids = np.repeat(np.arange(n_texts, dtype=np.intp), lengths)
+    # 2 slots (+1, -1) per bucket, and a last slot for dropped windows
+    n_slots = 2 * dimensions
+    offsets = text_ids * n_slots
+    dropped = n_texts * n_slots
+
+    slot_counts = np.zeros(dropped + 1, dtype=np.intp)
+    hashes = np.zeros(len(codes), dtype=np.uint32)
+    for n in range(1, max_n + 1):
+        n_windows = len(codes) - n + 1
+        if n_windows <= 0:
+            break
+        # rolling polynomial hash: extend the (n-1)-grams by one character
+        hashes = hashes[:n_windows] * _MULTIPLIER + codes[n - 1:]
+        if n < min_n:
+            continue
+        # seed by n, so that n-grams of different n hash apart
+        seed = np.uint32(_GOLDEN * n & 0xFFFFFFFF)
+        mixed = (hashes ^ seed) * _MIX
+        mixed ^= mixed >> np.uint32(15)
+        # multiply-shift maps the high 16 bits to [0, n_slots)
+        slots = ((mixed >> np.uint32(16)) * np.uint32(n_slots)
+                 >> np.uint32(16)).astype(np.intp)
+        slots += offsets[:n_windows]
+        # drop windows spanning two texts
+        slots[text_ids[:n_windows] != text_ids[n - 1:]] = dropped
+        slot_counts += np.bincount(slots, minlength=dropped + 1)
+
+    signed = slot_counts[:dropped].reshape(n_texts, dimensions, 2)
+    return (signed[:, :, 0] - signed[:, :, 1]).astype(np.float32)
+
+
+def ngram_hash_embeddings(
+    texts: List[str],
+    dimensions: int = DEFAULT_DIMENSIONS,
+    ngram_range: Tuple[int, int] = DEFAULT_NGRAM_RANGE,
+    lowercase: bool = True
+) -> np.ndarray:
+    """
+    Deterministic embeddings: the character n-grams of each text are
+    hashed (signed) into a fixed number of buckets, then L2-normalized.
+    Texts sharing n-grams get a high cosine similarity.
+    Texts are processed in vectorized passes over chunks of the batch.
+    @param texts: texts
+    @param dimensions: embedding dimensions, at most MAX_DIMENSIONS
+    @param ngram_range: (min n, max n) of the character n-grams
+    @param lowercase: whether to lowercase texts first
+    @return: float32 array of shape (len(texts), dimensions),
+        all-zero rows for empty texts
+    """
+    min_n, max_n = ngram_range
+    if not 0 < dimensions <= MAX_DIMENSIONS or min_n < 1 or max_n < min_n:
+        raise ValueError(f"Invalid dimensions={dimensions} \
+            or ngram_range={ngram_range}")
+    if lowercase:
+        texts = [text.lower() for text in texts]
+
+    embeddings = np.empty((len(texts), dimensions), dtype=np.float32)
+    for start in range(0, len(texts), CHUNK_SIZE):
+        embeddings[start:start + CHUNK_SIZE] = _ngram_counts(
+            texts[start:start + CHUNK_SIZE], dimensions, ngram_range)
+    norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+    np.divide(embeddings, norms, out=embeddings, where=norms > 0)
+    return embeddings
@@ -57,3 +57,76 @@ def test_encode(openai_config, text, str_startswith):
     assert isinstance(response, list)
     assert len(response) == embedding_shape(encoder.model)[0]
     assert str(response).startswith(str_startswith)
+
+
+class FakeEmbeddings:
+    """Embeddings endpoint returning [len(text), index] in reverse order."""
+
+    def __init__(self):
+        self.requests = []
+
+    def create(self, input, model):
+        from types import SimpleNamespace
+        self.requests.append(list(input))
+        data = [
+            SimpleNamespace(index=i, embedding=[float(len(text)), float(i)])
+            for i, text in enumerate(input)
+        ]
+        return SimpleNamespace(data=data[::-1])
+
+
+def test_encode_batch():
+    import numpy as np
+    from types import SimpleNamespace
+    from src.azure_openai_encoder import AzureOpenAIEncoder
+    from src.rate_limiting import TokenBudgetScheduler
+    encoder = AzureOpenAIEncoder.__new__(AzureOpenAIEncoder)
+    encoder.model = "foo"
+    encoder.scheduler = TokenBudgetScheduler()
+    embeddings = FakeEmbeddings()
+    encoder.openai_client = SimpleNamespace(embeddings=embeddings)
+
+    texts = ["a", "bb", "a", "ccc", "dddd", "bb"]
+    response = encoder.encode_batch(texts, max_batch_inputs=2, max_workers=2)
+    assert response.dtype == np.float32
+    assert response.flags['C_CONTIGUOUS']
+    assert response[:, 0].tolist() == [1, 2, 1, 3, 4, 2]
+    # duplicates are sent once, in batches of at most 2 inputs
+    sent = [text for request in embeddings.requests for text in request]
+    assert sorted(sent) == ["a", "bb", "ccc", "dddd"]
+    assert all(len(request) <= 2 for request in embeddings.requests)
+
+
+def test_encode_batch_empty():
+    from src.azure_openai_encoder import AzureOpenAIEncoder
+    encoder = AzureOpenAIEncoder.__new__(AzureOpenAIEncoder)
+    assert encoder.encode_batch([]).shape == (0, 0)
+
+
+class ThrottledEmbeddings(FakeEmbeddings):
+    """Embeddings endpoint throttling its first request."""
+
+    def create(self, input, model):
+        from types import SimpleNamespace
+        if not self.requests:
+            self.requests.append(None)
+            error = Exception("429 Too Many Requests")
+            error.status_code = 429
+            error.response = SimpleNamespace(headers={'retry-after-ms': '10'})
+            raise error
+        return super().create(input, model)
+
+
+def test_encode_batch_throttled():
+    from types import SimpleNamespace
+    from src.azure_openai_encoder import AzureOpenAIEncoder
+    from src.rate_limiting import TokenBudgetScheduler
+    encoder = AzureOpenAIEncoder.__new__(AzureOpenAIEncoder)
+    encoder.model = "foo"
+    encoder.scheduler = TokenBudgetScheduler(tokens_per_minute=1_000_000)
+    encoder.openai_client = SimpleNamespace(embeddings=ThrottledEmbeddings())
+
+    response = encoder.encode_batch(["a", "bb", "ccc"], max_batch_inputs=1)
+    assert response[:, 0].tolist() == [1, 2, 3]
+    assert encoder.scheduler.stats.throttled == 1
+    assert encoder.scheduler.stats.requests == 4
@@ -0,0 +1,58 @@
+import time
+
+import numpy as np
+import pytest
+
+
+def test_importable():
+    import src.batching  # noqa: F401
+    from src.batching import pack_batches  # noqa: F401
+
+
+def test_count_tokens():
+    from src.batching import count_tokens
+    counts = count_tokens(["Hello, world!", ""])
+    assert len(counts) == 2
+    assert counts[0] > 0
+
+
+def test_deduplicate():
+    from src.batching import deduplicate
+    unique_texts, inverse = deduplicate(["a", "b", "a", "c", "b"])
+    assert unique_texts == ["a", "b", "c"]
+    assert inverse.tolist() == [0, 1, 0, 2, 1]
+
+
+@pytest.mark.parametrize("token_counts, max_batch_tokens, max_batch_inputs, expected", [
+    ([1, 1, 1, 1], 10, 2, [[0, 1], [2, 3]]),
+    ([4, 4, 4], 8, 10, [[0, 1], [2]]),
+    ([20, 1, 1], 8, 10, [[0], [1, 2]]),
+    ([], 8, 10, []),
+])
+def test_pack_batches(token_counts, max_batch_tokens, max_batch_inputs, expected):
+    from src.batching import pack_batches
+    assert pack_batches(token_counts, max_batch_tokens, max_batch_inputs) == expected
+
+
+def test_pack_batches_invalid():
+    from src.batching import pack_batches
+    with pytest.raises(ValueError):
+        pack_batches([1], max_batch_tokens=0)
+
+
+def test_rate_limiter():
+    from src.batching import RateLimiter
+    rate_limiter = RateLimiter(requests_per_second=100)
+    start = time.monotonic()
+    for _ in range(5):
+        rate_limiter.acquire()
+    assert time.monotonic() - start >= 0.035
+
+
+def test_rate_limiter_unlimited():
+    from src.batching import RateLimiter
+    rate_limiter = RateLimiter()
+    start = time.monotonic()
+    for _ in range(1000):
+        rate_limiter.acquire()
+    assert time.monotonic() - start < 0.1
@@ -0,0 +1,126 @@
+import numpy as np
+import pytest
+
+
+def test_importable():
+    import src.embedding_cache  # noqa: F401
+    from src.embedding_cache import CachedEncoder, EmbeddingCache  # noqa: F401
+
+
+class CountingEncoder:
+    """Encoder recording the texts it is asked to encode."""
+    model = 'counting'
+
+    def __init__(self):
+        self.encoded = []
+
+    def encode(self, text):
+        self.encoded.append(text)
+        return [float(len(text)), 1.0]
+
+    def encode_batch(self, texts):
+        self.encoded.extend(texts)
+        return np.asarray([[len(t), 1.0] for t in texts], dtype=np.float32)
+
+
+@pytest.fixture
+def cache_path(tmp_path) -> str:
+    return str(tmp_path / 'embeddings.sqlite')
+
+
+def test_get_many_put_many():
+    from src.embedding_cache import EmbeddingCache
+    cache = EmbeddingCache()
+    assert cache.get_many('m', ['a', 'b']) == {}
+    cache.put_many('m', ['a', 'b'], np.array([[1, 2], [3, 4]]))
+    cached = cache.get_many('m', ['b', 'c', 'a'])
+    assert sorted(cached) == [0, 2]
+    assert cached[0].tolist() == [3, 4]
+    assert cached[0].dtype == np.float32
+    # keyed by model
+    assert cache.get_many('other', ['a']) == {}
+    assert cache.stats.hits == 2
+    assert cache.stats.misses == 4
+
+
+def test_memory_lru_eviction():
+    from src.embedding_cache import EmbeddingCache
+    cache = EmbeddingCache(max_memory_entries=2)
+    cache.put_many('m', ['a', 'b', 'c'], np.ones((3, 2)))
+    assert len(cache) == 2
+    assert cache.get_many('m', ['a']) == {}
+    assert cache.stats.memory_evictions == 1
+
+
+def test_disk_tier_survives_restart(cache_path):
+    from src.embedding_cache import EmbeddingCache
+    cache = EmbeddingCache(path=cache_path)
+    cache.put_many('m', ['a'], np.array([[1.5, 2.5]]))
+    cache.close()
+
+    cache = EmbeddingCache(path=cache_path)
+    cached = cache.get_many('m', ['a'])
+    assert cached[0].tolist() == [1.5, 2.5]
+    assert cache.stats.disk_hits == 1
+
+
+def test_disk_size_bounded_eviction(cache_path):
+    from src.embedding_cache import EmbeddingCache
+    # 8 bytes per vector, room for 5
+    cache = EmbeddingCache(path=cache_path, max_memory_entries=1,
+                           max_disk_bytes=40)
+    texts = [str(i) for i in range(10)]
+    for text in texts:
+        cache.put_many('m', [text], np.ones((1, 2)))
+    assert cache._disk_bytes <= 40
+    assert cache.stats.disk_evictions > 0
+    # most recently written vectors are kept
+    assert cache.get_many('m', ['9'])
+    assert cache.get_many('m', ['0']) == {}
+
+
+def test_cached_encoder_encode_batch(cache_path):
+    from src.embedding_cache import CachedEncoder, EmbeddingCache
+    encoder = CountingEncoder()
+    cached_encoder = CachedEncoder(encoder, EmbeddingCache(path=cache_path))
+
+    first = cached_encoder.encode_batch(['a', 'bb'])
+    second = cached_encoder.encode_batch(['bb', 'ccc', 'a'])
+    assert encoder.encoded == ['a', 'bb', 'ccc']
+    assert first[:, 0].tolist() == [1, 2]
+    assert second[:, 0].tolist() == [2, 3, 1]
+    assert second.dtype == np.float32
+    assert cached_encoder.cache.stats.hit_rate == pytest.approx(2 / 5)
+
+
+def test_cached_encoder_encode():
+    from src.embedding_cache import CachedEncoder
+    encoder = CountingEncoder()
+    cached_encoder = CachedEncoder(encoder)
+    assert cached_encoder.encode('abc') == [3.0, 1.0]
+    assert cached_encoder.encode('abc') == [3.0, 1.0]
+    assert encoder.encoded == ['abc']
+    assert cached_encoder.model == 'counting'
+
+
+def test_cached_mockup_encoders_share_cache():
+    from src.embedding_cache import CachedEncoder, EmbeddingCache
+    from src.mockup_encoder import MockupEmbeddingGenerator
+    cache = EmbeddingCache()
+    for dimensions, ngram_range in [(64, (2, 4)), (32, (2, 4)), (32, (3, 3))]:
+        encoder = MockupEmbeddingGenerator(
+            dimensions=dimensions, ngram_range=ngram_range)
+        cached_encoder = CachedEncoder(encoder, cache)
+        response = cached_encoder.encode_batch(['foo', 'bar'])
+        assert response.shape == (2, dimensions)
+        np.testing.assert_array_equal(
+            response, encoder.encode_batch(['foo', 'bar']))
+    assert cache.stats.hits == 0
+
+
+def test_new_with_cache():
+    from src.encoder import Encoder, EncoderProvider
+    from src.embedding_cache import CachedEncoder, EmbeddingCache
+    encoder = Encoder.new(EncoderProvider.MOCKUP, cache=EmbeddingCache())
+    assert isinstance(encoder, CachedEncoder)
+    assert encoder.encode_batch(['foo', 'foo']).shape[0] == 2
@@ -13,7 +13,7 @@ class TestEncoder:
 
     def test_structure(self):
         from src.encoder import Encoder
-        for method in ['new', 'encode']:
+        for method in ['new', 'encode', 'encode_batch']:
             assert hasattr(Encoder, method)
             assert callable(getattr(Encoder, method))
 
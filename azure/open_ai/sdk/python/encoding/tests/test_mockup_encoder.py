@@ -1,3 +1,4 @@
+import numpy as np
 import pytest
 
 
@@ -12,13 +13,48 @@ def test_init():
     assert embedding_generator is not None
 
 
-@pytest.mark.parametrize("text, str_startswith", [
-    ("Hello, world!", "[0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1, 1, 0, 0, 0")
+@pytest.mark.parametrize("text, dimensions", [
+    ("Hello, world!", 384),
+    ("Hello, world!", 16),
 ])
-def test_encode(text, str_startswith):
+def test_encode(text, dimensions):
     from src.mockup_encoder import MockupEmbeddingGenerator
-    embedding_generator = MockupEmbeddingGenerator()
+    embedding_generator = MockupEmbeddingGenerator(dimensions=dimensions)
     response = embedding_generator.encode(text)
     assert response is not None
     assert isinstance(response, list)
-    assert str(response).startswith(str_startswith)
+    assert len(response) == dimensions
+    assert np.linalg.norm(response) == pytest.approx(1.0, abs=1e-6)
+    # deterministic
+    assert response == MockupEmbeddingGenerator(dimensions=dimensions).encode(text)
+
+
+def test_encode_batch():
+    from src.mockup_encoder import MockupEmbeddingGenerator
+    embedding_generator = MockupEmbeddingGenerator()
+    texts = ["Hello, world!", "foo", "Hello, world!"]
+    response = embedding_generator.encode_batch(texts)
+    assert response.dtype == np.float32
+    assert response.flags['C_CONTIGUOUS']
+    assert response.shape == (3, 384)
+    for text, embedding in zip(texts, response):
+        assert embedding.tolist() == pytest.approx(embedding_generator.encode(text))
+
+
+def test_encode_batch_similarity():
+    from src.mockup_encoder import MockupEmbeddingGenerator
+    embedding_generator = MockupEmbeddingGenerator()
+    query, similar, other = embedding_generator.encode_batch([
+        "Paris is the capital of France.",
+        "paris is the capital city of france",
+        "Bananas are rich in potassium.",
+    ])
+    assert query @ similar > query @ other
+
+
+def test_encode_batch_empty_text():
+    from src.mockup_encoder import MockupEmbeddingGenerator
+    embedding_generator = MockupEmbeddingGenerator(dimensions=8)
+    response = embedding_generator.encode_batch(["", "a"])
+    assert response[0].tolist() == [0.0] * 8
+    assert embedding_generator.encode_batch([]).shape == (0, 8)
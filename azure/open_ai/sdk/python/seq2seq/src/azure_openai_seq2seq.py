@@ -1,11 +1,14 @@
 import os
 import logging
 import json
+import time
 from typing import List
 
 from openai import AzureOpenAI
 
 from src.seq2seq import Seq2Seq
+from src.streaming import ChatStream
+from src.rate_limiting import TokenBudgetScheduler, estimate_tokens
 from src.encrypt import mask_key
 
 # constants
@@ -21,6 +24,7 @@ class AzureOpenAISeq2Seq(Seq2Seq):
     """
     openai_client: AzureOpenAI
     model: str
+    scheduler: TokenBudgetScheduler
 
     def __init__(
             self,
@@ -28,6 +32,7 @@ class AzureOpenAISeq2Seq(Seq2Seq):
             api_key: str = None,
             api_version: str = None,
             model: str = None,
+            scheduler: TokenBudgetScheduler = None,
             ):
         logging.info("Start AzureOpenAI client configuration ...")
 
@@ -46,15 +51,27 @@ class AzureOpenAISeq2Seq(Seq2Seq):
         logging.info(f"Azure OpenAI api_version: {api_version}")
         logging.info(f"Azure OpenAI model: {self.model}")
 
-        # construct LLM client
+        # construct LLM client,
+        # retries are left to the scheduler, which sees every throttled call
         self.openai_client = AzureOpenAI(
             azure_endpoint=azure_endpoint,
             api_key=api_key,
             api_version=api_version,
+            max_retries=0,
         )
+        # share one scheduler between the clients of the same deployment
+        self.scheduler = scheduler if scheduler is not None \
+            else TokenBudgetScheduler()
 
         logging.info("Completed AzureOpenAI client configuration.")
 
+    @staticmethod
+    def _estimate_tokens(messages: List[dict], kwargs: dict) -> int:
+        return estimate_tokens(
+            [msg['content'] for msg in messages],
+            kwargs.get('max_tokens', 0)
+        )
+
     def chat(self, messages: List[dict], **kwargs) -> str:
         """
         chat
@@ -65,9 +82,11 @@ class AzureOpenAISeq2Seq(Seq2Seq):
         logging.info(f"kwargs: {json.dumps(kwargs)}")
 
         try:
-            responses = self.openai_client.chat.completions.create(
+            responses = self.scheduler.call(
+                self.openai_client.chat.completions.create,
                 model=self.model,
                 messages=messages,
+                tokens=self._estimate_tokens(messages, kwargs),
                 **kwargs,
             )
         except Exception as ex:
@@ -82,3 +101,32 @@ class AzureOpenAISeq2Seq(Seq2Seq):
         logging.info("Completed chat method.")
 
         return response
+
+    def _iter_deltas(self, responses):
+        try:
+            for chunk in responses:
+                # Azure sends prompt filter results in chunks without choices
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+        finally:
+            responses.close()
+
+    def chat_stream(self, messages: List[dict], **kwargs) -> ChatStream:
+        """
+        chat, streaming the completion
+        @param messages: list of messages, each with keys 'role' and 'content'
+        @return: iterator over the text deltas, as they arrive
+        """
+        logging.info("Start chat_stream method ...")
+        logging.info(f"kwargs: {json.dumps(kwargs)}")
+
+        start = time.perf_counter()
+        responses = self.scheduler.call(
+            self.openai_client.chat.completions.create,
+            model=self.model,
+            messages=messages,
+            stream=True,
+            tokens=self._estimate_tokens(messages, kwargs),
+            **kwargs,
+        )
+        return ChatStream(self._iter_deltas(responses), start=start)
@@ -1,16 +1,42 @@
-from src.seq2seq import Seq2Seq
+import time
 from typing import List
 
+from src.seq2seq import Seq2Seq
+from src.streaming import ChatStream
+
+# constants
+MOCKUP_COMPLETION = 'mockup'
+
 
 class MockupSeq2Seq(Seq2Seq):
     """
     Class to generate a mockup text
     """
 
+    def __init__(self, delay_seconds: float = 0.0):
+        """
+        @param delay_seconds: delay before each streamed delta
+        """
+        self.delay_seconds = delay_seconds
+
     def chat(self, messages: List[dict], **kwargs) -> str:
         """
         mock
         @param messages: list of messages, each with keys 'role' and 'content'
         @return: completion
         """
-        return 'mockup'
+        return MOCKUP_COMPLETION
+
+    def _iter_deltas(self, completion: str):
+        for char in completion:
+            if self.delay_seconds:
+                time.sleep(self.delay_seconds)
+            yield char
+
+    def chat_stream(self, messages: List[dict], **kwargs) -> ChatStream:
+        """
+        mock, streaming the completion one character at a time
+        @param messages: list of messages, each with keys 'role' and 'content'
+        @return: iterator over the text deltas
+        """
+        return ChatStream(self._iter_deltas(self.chat(messages, **kwargs)))
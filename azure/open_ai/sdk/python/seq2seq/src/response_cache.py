@@ -0,0 +1,454 @@
+# ref:
+# * https://docs.python.org/3/library/sqlite3.html
+# * https://platform.openai.com/docs/guides/prompt-caching
+
+import re
+import json
+import time
+import hashlib
+import logging
+import sqlite3
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from src.seq2seq import Seq2Seq
+from src.streaming import ChatStream
+from src.rate_limiting import estimate_tokens
+
+# constants
+DEFAULT_MAX_ENTRIES = 10_000
+DEFAULT_TTL_SECONDS = 24 * 60 * 60
+DEFAULT_SIMILARITY_THRESHOLD = 0.95
+_WHITESPACE = re.compile(r'\s+')
+
+
+@dataclass
+class ResponseCacheStats:
+    exact_hits: int = 0
+    semantic_hits: int = 0
+    misses: int = 0
+    bypassed: int = 0
+    expired: int = 0
+    evictions: int = 0
+    saved_seconds: float = 0.0
+    saved_tokens: int = 0
+    saved_cost: float = 0.0
+
+    @property
+    def hits(self) -> int:
+        return self.exact_hits + self.semantic_hits
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+@dataclass
+class CachedResponse:
+    completion: str
+    scope: str
+    created: float
+    latency_seconds: float
+    tokens: int
+    vector: Optional[np.ndarray] = None
+
+
+def normalize_messages(messages: List[dict]) -> List[dict]:
+    """
+    Messages with collapsed whitespace, so that formatting-only
+    differences share a cache entry
+    @param messages: list of messages, each with keys 'role' and 'content'
+    @return: normalized messages
+    """
+    return [{
+        **msg,
+        'content': _WHITESPACE.sub(' ', msg['content']).strip()
+        if isinstance(msg.get('content'), str) else msg.get('content')
+    } for msg in messages]
+
+
+def _digest(value) -> str:
+    payload = json.dumps(value, sort_keys=True, separators=(',', ':'),
+                         ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def cache_key(model: str, messages: List[dict], kwargs: dict) -> str:
+    """
+    Exact-match key of a chat request
+    @param model: model or deployment
+    @param messages: list of messages
+    @param kwargs: generation parameters
+    @return: sha256 hex digest
+    """
+    return _digest([model, normalize_messages(messages), kwargs])
+
+
+def cache_scope(model: str, kwargs: dict) -> str:
+    """
+    Semantic-match scope: only requests with the same model and
+    generation parameters may share a completion
+    @param model: model or deployment
+    @param kwargs: generation parameters
+    @return: sha256 hex digest
+    """
+    return _digest([model, kwargs])
+
+
+def is_cacheable(kwargs: dict) -> bool:
+    """
+    Whether a request is deterministic enough to cache:
+    temperature unset or not above 0
+    @param kwargs: generation parameters
+    @return: True if cacheable
+    """
+    temperature = kwargs.get('temperature')
+    return temperature is None or temperature <= 0
+
+
+class ResponseCache:
+    """
+    Chat completion store keyed by exact request key: an LRU with
+    time-to-live, optionally persisted to a SQLite file. Entries with
+    a vector also take part in semantic lookups, a cosine similarity
+    search over a matrix of the vectors of the same scope.
+    """
+
+    def __init__(
+        self,
+        path: str = None,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS
+    ):
+        """
+        @param path: optional SQLite file, entries survive restarts
+        @param max_entries: max number of entries
+        @param ttl_seconds: entry lifetime, None never expires
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.stats = ResponseCacheStats()
+        # key -> CachedResponse, least recently used first
+        self._entries: OrderedDict = OrderedDict()
+        # scope -> (keys, L2-normalized vectors), rebuilt lazily
+        self._matrices: Dict[str, tuple] = {}
+        self._lock = threading.RLock()
+        self._db = None
+        if path:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS response_cache ("
+                "key TEXT PRIMARY KEY, scope TEXT, completion TEXT, "
+                "created REAL, latency_seconds REAL, tokens INTEGER, "
+                "vector BLOB, last_access REAL)"
+            )
+            self._db.commit()
+            self._load()
+
+    def _load(self) -> None:
+        rows = self._db.execute(
+            "SELECT key, scope, completion, created, latency_seconds, "
+            "tokens, vector FROM response_cache "
+            "ORDER BY last_access DESC LIMIT ?", (self.max_entries,)
+        ).fetchall()
+        for key, scope, completion, created, latency, tokens, blob in rows[::-1]:
+            vector = np.frombuffer(blob, dtype=np.float32) if blob else None
+            self._entries[key] = CachedResponse(
+                completion, scope, created, latency, tokens, vector)
+        self._purge_expired()
+        logging.info(f"Loaded {len(self._entries)} cached responses.")
+
+    def _is_expired(self, entry: CachedResponse, now: float) -> bool:
+        return self.ttl_seconds is not None \
+            and now - entry.created > self.ttl_seconds
+
+    def _remove(self, keys: List[str]) -> None:
+        for key in keys:
+            entry = self._entries.pop(key)
+            if entry.vector is not None:
+                self._matrices.pop(entry.scope, None)
+        if self._db is not None and keys:
+            self._db.executemany(
+                "DELETE FROM response_cache WHERE key = ?",
+                [(key,) for key in keys])
+            self._db.commit()
+
+    def _purge_expired(self) -> None:
+        now = time.time()
+        expired = [key for key, entry in self._entries.items()
+                   if self._is_expired(entry, now)]
+        self.stats.expired += len(expired)
+        self._remove(expired)
+
+    def _touch(self, key: str) -> None:
+        self._entries.move_to_end(key)
+        if self._db is not None:
+            self._db.execute(
+                "UPDATE response_cache SET last_access = ? WHERE key = ?",
+                (time.time(), key))
+            self._db.commit()
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        """
+        Exact lookup
+        @param key: request key
+        @return: cached response, None if missing or expired
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if self._is_expired(entry, time.time()):
+                self.stats.expired += 1
+                self._remove([key])
+                return None
+            self._touch(key)
+            return entry
+
+    def _matrix(self, scope: str) -> tuple:
+        if scope not in self._matrices:
+            keys = [key for key, entry in self._entries.items()
+                    if entry.scope == scope and entry.vector is not None]
+            vectors = np.asarray(
+                [self._entries[key].vector for key in keys], dtype=np.float32)
+            if keys:
+                norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+                np.divide(vectors, norms, out=vectors, where=norms > 0)
+            self._matrices[scope] = (keys, vectors)
+        return self._matrices[scope]
+
+    def get_similar(
+        self,
+        scope: str,
+        vector: np.ndarray,
+        threshold: float = DEFAULT_SIMILARITY_THRESHOLD
+    ) -> Optional[CachedResponse]:
+        """
+        Semantic lookup
+        @param scope: request scope
+        @param vector: embedding of the request
+        @param threshold: min cosine similarity
+        @return: most similar cached response, None if none is similar enough
+        """
+        vector = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        if not norm:
+            return None
+        with self._lock:
+            keys, matrix = self._matrix(scope)
+            if not keys:
+                return None
+            similarities = matrix @ (vector / norm)
+            best = int(np.argmax(similarities))
+            if similarities[best] < threshold:
+                return None
+            return self.get(keys[best])
+
+    def put(self, key: str, entry: CachedResponse) -> None:
+        """
+        Store a response
+        @param key: request key
+        @param entry: response
+        """
+        with self._lock:
+            if key in self._entries:
+                self._remove([key])
+            self._entries[key] = entry
+            if entry.vector is not None:
+                self._matrices.pop(entry.scope, None)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO response_cache (key, scope, "
+                    "completion, created, latency_seconds, tokens, vector, "
+                    "last_access) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (key, entry.scope, entry.completion, entry.created,
+                     entry.latency_seconds, entry.tokens,
+                     None if entry.vector is None
+                     else np.asarray(entry.vector, dtype=np.float32).tobytes(),
+                     time.time())
+                )
+                self._db.commit()
+            if len(self._entries) > self.max_entries:
+                self._purge_expired()
+            overflow = len(self._entries) - self.max_entries
+            if overflow > 0:
+                self.stats.evictions += overflow
+                self._remove(list(self._entries)[:overflow])
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._matrices.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM response_cache")
+                self._db.commit()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def close(self) -> None:
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+
+class CachedSeq2Seq(Seq2Seq):
+    """
+    Caching layer in front of any Seq2Seq: deterministic requests
+    (temperature unset or 0) already answered are served from the cache,
+    by exact match, or, with an encoder, by semantic match.
+    Other attributes are delegated to the wrapped provider.
+    """
+
+    def __init__(
+        self,
+        seq2seq: Seq2Seq,
+        cache: ResponseCache = None,
+        encoder=None,
+        similarity_threshold: float = DEFAULT_SIMILARITY_THRESHOLD,
+        cost_per_1k_tokens: float = 0.0
+    ):
+        """
+        @param seq2seq: provider to wrap
+        @param cache: response cache, default in-memory
+        @param encoder: optional encoder with encode_batch, enables
+            the semantic tier
+        @param similarity_threshold: min cosine similarity of a semantic hit
+        @param cost_per_1k_tokens: price of the wrapped provider,
+            to report the cost saved
+        """
+        self.seq2seq = seq2seq
+        self.cache = cache if cache is not None else ResponseCache()
+        self.encoder = encoder
+        self.similarity_threshold = similarity_threshold
+        self.cost_per_1k_tokens = cost_per_1k_tokens
+
+    @property
+    def model(self) -> str:
+        for name in ('model', 'model_id', '_endpoint_url'):
+            model = getattr(self.seq2seq, name, None)
+            if model:
+                return model
+        return type(self.seq2seq).__name__
+
+    @property
+    def stats(self) -> ResponseCacheStats:
+        return self.cache.stats
+
+    def _encode(self, messages: List[dict]) -> Optional[np.ndarray]:
+        if self.encoder is None:
+            return None
+        text = '\n'.join(f"{msg['role']}: {msg['content']}"
+                         for msg in normalize_messages(messages))
+        return np.asarray(self.encoder.encode_batch([text])[0],
+                          dtype=np.float32)
+
+    def _lookup(self, messages: List[dict], kwargs: dict) -> tuple:
+        """
+        @return: (cached response or None, key, scope, vector)
+        """
+        key = cache_key(self.model, messages, kwargs)
+        scope = cache_scope(self.model, kwargs)
+        start = time.perf_counter()
+        entry = self.cache.get(key)
+        vector = None
+        if entry is not None:
+            self.stats.exact_hits += 1
+        else:
+            vector = self._encode(messages)
+            if vector is not None:
+                entry = self.cache.get_similar(
+                    scope, vector, self.similarity_threshold)
+                if entry is not None:
+                    self.stats.semantic_hits += 1
+        if entry is None:
+            self.stats.misses += 1
+        else:
+            lookup_seconds = time.perf_counter() - start
+            self.stats.saved_seconds += max(
+                0.0, entry.latency_seconds - lookup_seconds)
+            self.stats.saved_tokens += entry.tokens
+            self.stats.saved_cost += \
+                entry.tokens / 1000 * self.cost_per_1k_tokens
+        return entry, key, scope, vector
+
+    def _store(self, key: str, scope: str, vector: Optional[np.ndarray],
+               messages: List[dict], completion: str,
+               latency_seconds: float) -> None:
+        tokens = estimate_tokens(
+            [msg['content'] for msg in messages] + [completion])
+        self.cache.put(key, CachedResponse(
+            completion, scope, time.time(), latency_seconds, tokens, vector))
+
+    def chat(self, messages: List[dict], **kwargs) -> str:
+        """
+        chat, served from the cache when possible
+        @param messages: list of messages, each with keys 'role' and 'content'
+        @param kwargs: passed to the wrapped chat
+        @return: completion
+        """
+        if not is_cacheable(kwargs):
+            self.stats.bypassed += 1
+            return self.seq2seq.chat(messages, **kwargs)
+        entry, key, scope, vector = self._lookup(messages, kwargs)
+        if entry is not None:
+            return entry.completion
+
+        start = time.perf_counter()
+        completion = self.seq2seq.chat(messages, **kwargs)
+        self._store(key, scope, vector, messages, completion,
+                    time.perf_counter() - start)
+        return completion
+
+    def _iter_and_store(self, stream: ChatStream, key: str, scope: str,
+                        vector: Optional[np.ndarray], messages: List[dict]):
+        start = time.perf_counter()
+        with stream:
+            yield from stream
+        # only complete streams are cached
+        self._store(key, scope, vector, messages, stream.text,
+                    time.perf_counter() - start)
+
+    def chat_stream(self, messages: List[dict], **kwargs) -> ChatStream:
+        """
+        chat, streaming the completion; a cached completion is
+        streamed as a single delta
+        @param messages: list of messages, each with keys 'role' and 'content'
+        @param kwargs: passed to the wrapped chat_stream
+        @return: iterator over the text deltas
+        """
+        if not is_cacheable(kwargs):
+            self.stats.bypassed += 1
+            return self.seq2seq.chat_stream(messages, **kwargs)
+        # the lookup counts in the time-to-first-token
+        start = time.perf_counter()
+        entry, key, scope, vector = self._lookup(messages, kwargs)
+        if entry is not None:
+            return ChatStream([entry.completion], start=start)
+        stream = self.seq2seq.chat_stream(messages, **kwargs)
+        return ChatStream(
+            self._iter_and_store(stream, key, scope, vector, messages),
+            start=start)
+
+    def report(self) -> str:
+        """
+        Summary of the cache effectiveness
+        @return: report line
+        """
+        stats = self.stats
+        return (f"hits {stats.hits} (exact {stats.exact_hits}, semantic "
+                f"{stats.semantic_hits}), misses {stats.misses}, bypassed "
+                f"{stats.bypassed}, hit rate {stats.hit_rate:.1%}, saved "
+                f"{stats.saved_seconds:.2f}s, {stats.saved_tokens} tokens, "
+                f"cost {stats.saved_cost:.4f}")
+
+    def __getattr__(self, name: str):
+        # only called for attributes not defined on the wrapper
+        return getattr(self.seq2seq, name)
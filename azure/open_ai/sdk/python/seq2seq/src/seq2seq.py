@@ -2,6 +2,8 @@ from abc import ABC, abstractmethod
 from enum import Enum
 from typing import List
 
+from src.streaming import ChatStream
+
 
 class Seq2SeqProvider(Enum):
     MOCKUP = 'mockup'
@@ -14,17 +16,37 @@ class Seq2Seq(ABC):
     """
 
     @staticmethod
-    def new(provider: Seq2SeqProvider):
+    def new(provider: Seq2SeqProvider, cache=None):
+        """
+        Create a text generator
+        @param provider: text generation provider
+        @param cache: optional ResponseCache, wraps the generator in a
+            CachedSeq2Seq
+        @return: text generator
+        """
         match provider:
             case Seq2SeqProvider.MOCKUP:
                 from src.mockup_seq2seq import MockupSeq2Seq
-                return MockupSeq2Seq()
+                seq2seq = MockupSeq2Seq()
             case Seq2SeqProvider.AZURE_OPENAI:
                 from src.azure_openai_seq2seq import AzureOpenAISeq2Seq
-                return AzureOpenAISeq2Seq()
+                seq2seq = AzureOpenAISeq2Seq()
             case _:
                 raise ValueError(f"Invalid provider: {provider}")
+        if cache is not None:
+            from src.response_cache import CachedSeq2Seq
+            seq2seq = CachedSeq2Seq(seq2seq, cache)
+        return seq2seq
 
     @abstractmethod
     def chat(self, messages: List[dict], **kwargs) -> str:
         raise NotImplementedError
+
+    @abstractmethod
+    def chat_stream(self, messages: List[dict], **kwargs) -> ChatStream:
+        """
+        chat, streaming the completion
+        @param messages: list of messages, each with keys 'role' and 'content'
+        @return: iterator over the text deltas, as they arrive
+        """
+        raise NotImplementedError
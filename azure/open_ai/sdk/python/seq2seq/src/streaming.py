@@ -0,0 +1,144 @@
+# ref:
+# * https://html.spec.whatwg.org/multipage/server-sent-events.html#event-stream-interpretation  # noqa: E501
+# * https://platform.openai.com/docs/api-reference/chat/streaming
+
+import time
+import logging
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass
+
+# constants
+SSE_DATA_PREFIX = 'data:'
+SSE_DONE = '[DONE]'
+
+
+@dataclass
+class StreamStats:
+    time_to_first_token: float = None
+    elapsed_seconds: float = 0.0
+    tokens: int = 0
+
+    @property
+    def tokens_per_second(self) -> float:
+        """
+        Generation rate, after the first token
+        """
+        if self.time_to_first_token is None:
+            return 0.0
+        generation_seconds = self.elapsed_seconds - self.time_to_first_token
+        if generation_seconds <= 0:
+            return 0.0
+        return self.tokens / generation_seconds
+
+
+def iter_sse_data(lines: Iterable) -> Iterator[str]:
+    """
+    Payloads of the 'data' fields of a server-sent event stream,
+    until the '[DONE]' sentinel
+    @param lines: stream lines, bytes or str, without line breaks
+    @return: data payloads
+    """
+    data = []
+    for line in lines:
+        if isinstance(line, bytes):
+            line = line.decode('utf-8')
+        line = line.rstrip('\r\n')
+        if not line:
+            # blank line dispatches the event
+            if data:
+                payload = '\n'.join(data)
+                data = []
+                if payload == SSE_DONE:
+                    return
+                yield payload
+            continue
+        if line.startswith(SSE_DATA_PREFIX):
+            data.append(line[len(SSE_DATA_PREFIX):].removeprefix(' '))
+    if data and '\n'.join(data) != SSE_DONE:
+        yield '\n'.join(data)
+
+
+class ChatStream:
+    """
+    Iterator over the text deltas of a streamed chat completion,
+    timing the time-to-first-token and the token rate
+    """
+
+    def __init__(self, deltas: Iterable[str], usage: dict = None,
+                 start: float = None,
+                 on_finish: Callable[[Exception], None] = None):
+        """
+        @param deltas: text deltas, as they arrive
+        @param usage: filled by the provider while streaming;
+            'completion_tokens' overrides the number of deltas as token count
+        @param start: time.perf_counter() before the request was issued,
+            so that queueing, connecting and waiting for the headers count
+            in the time-to-first-token; default now
+        @param on_finish: called once the stream ends, with the error
+            raised while streaming, None if completed or closed
+        """
+        self._deltas = iter(deltas)
+        self._usage = usage if usage is not None else {}
+        self._chunks = []
+        self._start = start if start is not None else time.perf_counter()
+        self._done = False
+        self.on_finish = on_finish
+        self.stats = StreamStats()
+
+    def __iter__(self) -> Iterator[str]:
+        return self
+
+    def __next__(self) -> str:
+        while True:
+            try:
+                delta = next(self._deltas)
+            except StopIteration:
+                self._finish()
+                raise
+            except Exception as ex:
+                self._finish(ex)
+                raise
+            if delta:
+                break
+        if self.stats.time_to_first_token is None:
+            self.stats.time_to_first_token = time.perf_counter() - self._start
+        self.stats.tokens += 1
+        self._chunks.append(delta)
+        return delta
+
+    def _finish(self, error: Exception = None) -> None:
+        if self._done:
+            return
+        self._done = True
+        self.stats.elapsed_seconds = time.perf_counter() - self._start
+        if self._usage.get('completion_tokens'):
+            self.stats.tokens = self._usage['completion_tokens']
+        ttft = self.stats.time_to_first_token
+        logging.info(f"Completed chat stream: time-to-first-token \
+            {ttft if ttft is None else round(ttft, 3)}s, \
+            {self.stats.tokens} tokens, \
+            {self.stats.tokens_per_second:.1f} tokens/s.")
+        if self.on_finish is not None:
+            self.on_finish(error)
+
+    @property
+    def text(self) -> str:
+        """
+        Text received so far
+        """
+        return ''.join(self._chunks)
+
+    def close(self) -> None:
+        """
+        Stop streaming, releasing the underlying response
+        """
+        close = getattr(self._deltas, 'close', None)
+        if close is not None:
+            close()
+        self._finish()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
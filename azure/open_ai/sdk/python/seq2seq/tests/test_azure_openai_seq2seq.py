@@ -34,3 +34,76 @@ def test_chat(openai_config, messages):
     assert response is not None
     assert isinstance(response, str)
     assert len(response) > 0
+
+
+@pytest.fixture
+def stub_endpoint():
+    """
+    Local stub of the chat completions endpoint, streaming
+    'Hello world' as server-sent events
+    """
+    import json
+    import threading
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+            assert body['stream'] is True
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/event-stream')
+            self.end_headers()
+            chunks = [[]] + [
+                [{'index': 0, 'delta': {'content': token}, 'finish_reason': None}]
+                for token in ['Hello', ' world']
+            ]
+            for choices in chunks:
+                chunk = {'id': '1', 'object': 'chat.completion.chunk', 'created': 0,
+                         'model': body['model'], 'choices': choices}
+                self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode())
+                self.wfile.flush()
+            self.wfile.write(b"data: [DONE]\n\n")
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+
+
+def test_chat_stream(stub_endpoint):
+    from src.azure_openai_seq2seq import AzureOpenAISeq2Seq
+    seq2seq = AzureOpenAISeq2Seq(
+        azure_endpoint=stub_endpoint,
+        api_key='stub',
+        api_version='2024-05-01-preview',
+        model='stub',
+    )
+    stream = seq2seq.chat_stream(messages=[{'role': 'user', 'content': 'hi'}])
+    assert list(stream) == ['Hello', ' world']
+    assert stream.stats.tokens == 2
+    assert stream.stats.time_to_first_token is not None
+
+
+def test_chat_stream_time_to_first_token(stub_endpoint):
+    import time
+    from src.azure_openai_seq2seq import AzureOpenAISeq2Seq
+    seq2seq = AzureOpenAISeq2Seq(
+        azure_endpoint=stub_endpoint,
+        api_key='stub',
+        api_version='2024-05-01-preview',
+        model='stub',
+    )
+    create = seq2seq.openai_client.chat.completions.create
+
+    def delayed_create(**kwargs):
+        time.sleep(0.2)
+        return create(**kwargs)
+
+    seq2seq.openai_client.chat.completions.create = delayed_create
+    stream = seq2seq.chat_stream(messages=[{'role': 'user', 'content': 'hi'}])
+    assert list(stream) == ['Hello', ' world']
+    # waiting for the response headers counts in the time-to-first-token
+    assert stream.stats.time_to_first_token >= 0.2
@@ -0,0 +1,181 @@
+import time
+import threading
+
+import pytest
+
+from src.seq2seq import Seq2Seq
+from src.streaming import ChatStream
+
+MESSAGES = [{'role': 'user', 'content': 'hi'}]
+
+
+def test_importable():
+    import src.router  # noqa: F401
+    from src.router import RouterSeq2Seq  # noqa: F401
+
+
+class FakeEndpoint(Seq2Seq):
+    """Answers its name after a delay, or fails."""
+
+    def __init__(self, name: str, delay_seconds: float = 0.0,
+                 fail: bool = False):
+        self.name = name
+        self.delay_seconds = delay_seconds
+        self.fail = fail
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def chat(self, messages, **kwargs):
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.delay_seconds)
+        if self.fail:
+            raise ConnectionError(f"{self.name} is down")
+        return self.name
+
+    def chat_stream(self, messages, **kwargs):
+        return ChatStream([self.chat(messages, **kwargs)])
+
+
+def test_circuit_breaker():
+    from src.router import CircuitBreaker, CircuitState
+    breaker = CircuitBreaker(failure_threshold=2, reset_seconds=0.02)
+    breaker.record_failure()
+    assert breaker.state == CircuitState.CLOSED
+    breaker.record_failure()
+    assert breaker.state == CircuitState.OPEN
+    assert not breaker.available()
+    time.sleep(0.03)
+    assert breaker.state == CircuitState.HALF_OPEN
+    # a single probe
+    assert breaker.available()
+    breaker.acquire()
+    assert not breaker.available()
+    # a failed probe re-opens the circuit
+    breaker.record_failure()
+    assert breaker.state == CircuitState.OPEN
+    time.sleep(0.03)
+    breaker.acquire()
+    breaker.record_success()
+    assert breaker.state == CircuitState.CLOSED
+
+
+def test_failover():
+    from src.router import RouterSeq2Seq, CircuitState
+    down = FakeEndpoint('down', fail=True)
+    up = FakeEndpoint('up')
+    router = RouterSeq2Seq([down, up], failure_threshold=2, hedge_percentile=None)
+    assert [router.chat(MESSAGES) for _ in range(4)] == ['up'] * 4
+    # the circuit opened after 2 failures
+    assert down.calls == 2
+    assert router.endpoints[0].breaker.state == CircuitState.OPEN
+    report = router.report()
+    assert report[0]['failures'] == 2
+    assert report[1]['wins'] == 4
+    router.close()
+
+
+def test_all_down():
+    from src.router import RouterSeq2Seq
+    router = RouterSeq2Seq([FakeEndpoint('a', fail=True),
+                            FakeEndpoint('b', fail=True)],
+                           failure_threshold=1)
+    with pytest.raises(ConnectionError):
+        router.chat(MESSAGES)
+    with pytest.raises(RuntimeError):
+        router.chat(MESSAGES)
+    router.close()
+
+
+def test_least_outstanding():
+    from src.router import RouterSeq2Seq
+    endpoints = [FakeEndpoint(name, delay_seconds=0.05) for name in 'abc']
+    router = RouterSeq2Seq(endpoints, hedge_percentile=None)
+    threads = [threading.Thread(target=router.chat, args=(MESSAGES,))
+               for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    # concurrent requests spread over the endpoints
+    assert [endpoint.calls for endpoint in endpoints] == [1, 1, 1]
+    router.close()
+
+
+def test_ewma():
+    from src.router import RouterSeq2Seq, RoutingStrategy
+    slow = FakeEndpoint('slow', delay_seconds=0.02)
+    fast = FakeEndpoint('fast')
+    router = RouterSeq2Seq([slow, fast], strategy=RoutingStrategy.EWMA,
+                           hedge_percentile=None)
+    responses = [router.chat(MESSAGES) for _ in range(10)]
+    assert responses.count('fast') >= 8
+    assert router.endpoints[0].ewma_seconds > router.endpoints[1].ewma_seconds
+    router.close()
+
+
+def test_hedge():
+    from src.router import RouterSeq2Seq, MIN_HEDGE_SAMPLES
+    stuck = FakeEndpoint('stuck')
+    fast = FakeEndpoint('fast')
+    router = RouterSeq2Seq([stuck, fast], hedge_percentile=50)
+    for _ in range(MIN_HEDGE_SAMPLES):
+        router.chat(MESSAGES)
+    assert router.hedge_delay() < 0.01
+
+    stuck.delay_seconds = 0.5
+    # least outstanding picks 'stuck' first: tie on load, lower EWMA
+    router.endpoints[1].ewma_seconds = 1.0
+    start = time.perf_counter()
+    assert router.chat(MESSAGES) == 'fast'
+    assert time.perf_counter() - start < 0.4
+    assert router.endpoints[1].stats.hedges == 1
+    router.close()
+
+
+def test_chat_stream_failover():
+    from src.router import RouterSeq2Seq
+    router = RouterSeq2Seq([FakeEndpoint('down', fail=True),
+                            FakeEndpoint('up')])
+    assert list(router.chat_stream(MESSAGES)) == ['up']
+    router.close()
+
+
+class MidStreamFailingEndpoint(FakeEndpoint):
+    """Opens the stream, then fails after the first delta."""
+
+    def chat_stream(self, messages, **kwargs):
+        def deltas():
+            yield self.name
+            raise ConnectionError(f"{self.name} reset the stream")
+        return ChatStream(deltas())
+
+
+def test_chat_stream_mid_stream_failure():
+    from src.router import RouterSeq2Seq, CircuitState
+    router = RouterSeq2Seq([MidStreamFailingEndpoint('flaky')],
+                           failure_threshold=2)
+    for _ in range(2):
+        stream = router.chat_stream(MESSAGES)
+        assert next(stream) == 'flaky'
+        with pytest.raises(ConnectionError):
+            next(stream)
+    endpoint = router.endpoints[0]
+    assert endpoint.stats.failures == 2
+    assert endpoint.breaker.state == CircuitState.OPEN
+    with pytest.raises(RuntimeError):
+        router.chat_stream(MESSAGES)
+    router.close()
+
+
+def test_chat_stream_latency():
+    from src.router import RouterSeq2Seq
+    router = RouterSeq2Seq([FakeEndpoint('up')])
+    with router.chat_stream(MESSAGES) as stream:
+        assert list(stream) == ['up']
+    endpoint = router.endpoints[0]
+    # opening a stream is not a completion
+    assert len(endpoint.latencies) == 0
+    assert endpoint.ewma_seconds is None
+    assert endpoint.breaker.failures == 0
+    router.close()
@@ -0,0 +1,79 @@
+import pytest
+
+
+def test_importable():
+    import src.streaming  # noqa: F401
+    from src.streaming import ChatStream, iter_sse_data  # noqa: F401
+
+
+@pytest.mark.parametrize("lines, expected", [
+    ([b'data: {"a": 1}', b'', b'data: {"a": 2}', b'', b'data: [DONE]', b''],
+     ['{"a": 1}', '{"a": 2}']),
+    ([': comment', 'event: message', 'data: x', 'data: y', '', 'data: z'],
+     ['x\ny', 'z']),
+    (['data: [DONE]', '', 'data: ignored', ''], []),
+])
+def test_iter_sse_data(lines, expected):
+    from src.streaming import iter_sse_data
+    assert list(iter_sse_data(lines)) == expected
+
+
+def test_chat_stream():
+    from src.streaming import ChatStream
+    stream = ChatStream(iter(['', 'Hel', 'lo', '']))
+    assert list(stream) == ['Hel', 'lo']
+    assert stream.text == 'Hello'
+    assert stream.stats.tokens == 2
+    assert stream.stats.time_to_first_token is not None
+
+
+def test_chat_stream_usage():
+    from src.streaming import ChatStream
+    usage = {}
+
+    def deltas():
+        yield 'a b c'
+        usage['completion_tokens'] = 3
+
+    stream = ChatStream(deltas(), usage=usage)
+    list(stream)
+    assert stream.stats.tokens == 3
+
+
+def test_chat_stream_close():
+    from src.streaming import ChatStream
+    closed = []
+
+    def deltas():
+        try:
+            yield 'a'
+            yield 'b'
+        finally:
+            closed.append(True)
+
+    with ChatStream(deltas()) as stream:
+        assert next(stream) == 'a'
+    assert closed == [True]
+    assert stream.stats.elapsed_seconds > 0
+
+
+def test_chat_stream_on_finish():
+    from src.streaming import ChatStream
+    finished = []
+
+    def deltas():
+        yield 'a'
+        raise ConnectionError('reset')
+
+    stream = ChatStream(deltas(), on_finish=finished.append)
+    assert next(stream) == 'a'
+    with pytest.raises(ConnectionError):
+        next(stream)
+    stream.close()
+    # called once, with the error
+    assert len(finished) == 1
+    assert isinstance(finished[0], ConnectionError)
+
+    finished.clear()
+    list(ChatStream(iter(['a']), on_finish=finished.append))
+    assert finished == [None]
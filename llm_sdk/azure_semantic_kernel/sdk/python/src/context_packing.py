@@ -0,0 +1,221 @@
+# Context assembly for RAG prompts:
+# from a modest set of retrieved candidates, drop the near duplicates
+# (MinHash of character shingles, or cosine of the embeddings), then
+# greedily pack the best scored chunks into a token budget, and report
+# the tokens saved against stuffing every candidate in the prompt.
+# ref:
+# * https://en.wikipedia.org/wiki/MinHash
+# * https://github.com/openai/tiktoken
+
+import re
+import math
+import zlib
+import logging
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+# constants
+DEFAULT_CANDIDATES = 20  # retriever top-k
+DEFAULT_TOKEN_BUDGET = 3000  # context tokens, for the target model
+DEFAULT_TOKEN_ENCODING = 'cl100k_base'
+CHARS_PER_TOKEN = 4  # estimate when tiktoken is not installed
+DEFAULT_SEPARATOR = '\n\n'  # between chunks, as format_docs
+DEFAULT_NUM_PERMUTATIONS = 64
+DEFAULT_SHINGLE_SIZE = 5  # characters
+DEFAULT_JACCARD_THRESHOLD = 0.8
+DEFAULT_COSINE_THRESHOLD = 0.95
+MERSENNE_PRIME = (1 << 61) - 1
+
+try:
+    import tiktoken
+except ImportError:  # optional, token counts are estimated without it
+    tiktoken = None
+
+
+@dataclass
+class PackingReport:
+    candidates: int = 0
+    duplicates: int = 0
+    packed: int = 0
+    candidate_tokens: int = 0  # every candidate in the prompt
+    packed_tokens: int = 0
+    token_budget: int = 0
+
+    @property
+    def tokens_saved(self) -> int:
+        return self.candidate_tokens - self.packed_tokens
+
+    def __str__(self) -> str:
+        return (f"packed {self.packed}/{self.candidates} chunks "
+                f"({self.duplicates} duplicates), {self.packed_tokens}/"
+                f"{self.token_budget} tokens, {self.tokens_saved} saved")
+
+
+@lru_cache(maxsize=None)
+def _get_encoding(encoding_name: str):
+    """
+    Load a tiktoken encoding once
+    @param encoding_name: tiktoken encoding
+    @return: encoding, None if tiktoken or the encoding is unavailable
+    """
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.get_encoding(encoding_name)
+    except Exception as ex:
+        # e.g. the encoding file cannot be downloaded
+        logging.warning(f"Estimate token counts, tiktoken encoding \
+            '{encoding_name}' is unavailable: {ex}")
+        return None
+
+
+def count_tokens(
+    texts: List[str],
+    encoding_name: str = DEFAULT_TOKEN_ENCODING
+) -> List[int]:
+    """
+    Count the tokens of each text
+    @param texts: texts
+    @param encoding_name: tiktoken encoding
+    @return: token count per text, estimated without tiktoken
+    """
+    encoding = _get_encoding(encoding_name)
+    if encoding is None:
+        return [math.ceil(len(text) / CHARS_PER_TOKEN) for text in texts]
+    return [len(tokens) for tokens in encoding.encode_ordinary_batch(texts)]
+
+
+def minhash_signatures(
+    texts: List[str],
+    num_permutations: int = DEFAULT_NUM_PERMUTATIONS,
+    shingle_size: int = DEFAULT_SHINGLE_SIZE,
+    seed: int = 0
+) -> np.ndarray:
+    """
+    MinHash signatures of the character shingles of texts
+    @param texts: texts
+    @param num_permutations: signature length
+    @param shingle_size: characters per shingle
+    @param seed: of the hash permutations
+    @return: uint64 array, one row per text
+    """
+    rng = np.random.default_rng(seed)
+    a = rng.integers(1, 1 << 32, num_permutations, dtype=np.uint64)
+    b = rng.integers(0, 1 << 32, num_permutations, dtype=np.uint64)
+    prime = np.uint64(MERSENNE_PRIME)
+    signatures = np.full((len(texts), num_permutations), prime,
+                         dtype=np.uint64)
+    for i, text in enumerate(texts):
+        # case and whitespace insensitive
+        text = re.sub(r'\s+', ' ', text.lower()).strip()
+        shingles = {zlib.crc32(text[j:j + shingle_size].encode('utf-8'))
+                    for j in range(max(1, len(text) - shingle_size + 1))}
+        hashes = np.fromiter(shingles, dtype=np.uint64, count=len(shingles))
+        # universal hashing, a * h < 2 ** 64 with 32-bit a and h
+        permuted = (hashes[:, None] * a[None, :] % prime + b) % prime
+        signatures[i] = permuted.min(axis=0)
+    return signatures
+
+
+def minhash_similarity(signatures: np.ndarray) -> np.ndarray:
+    """
+    Estimated Jaccard similarity of every pair of texts
+    """
+    return (signatures[:, None, :] == signatures[None, :, :]).mean(axis=2)
+
+
+def cosine_similarity(embeddings: np.ndarray) -> np.ndarray:
+    """
+    Cosine similarity of every pair of embeddings
+    """
+    embeddings = np.asarray(embeddings, dtype=np.float64)
+    norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+    normalized = embeddings / np.where(norms == 0, 1.0, norms)
+    return normalized @ normalized.T
+
+
+class ContextPacker:
+    """
+    Pack retrieved chunks into a token budget, without near duplicates
+    """
+
+    def __init__(
+        self,
+        token_budget: int = DEFAULT_TOKEN_BUDGET,
+        separator: str = DEFAULT_SEPARATOR,
+        jaccard_threshold: Optional[float] = DEFAULT_JACCARD_THRESHOLD,
+        cosine_threshold: float = DEFAULT_COSINE_THRESHOLD,
+        encoding_name: str = DEFAULT_TOKEN_ENCODING
+    ):
+        """
+        @param token_budget: max tokens of the packed context
+        @param separator: between chunks
+        @param jaccard_threshold: MinHash similarity of duplicates,
+            None to keep the duplicates
+        @param cosine_threshold: embedding similarity of duplicates,
+            when the embeddings are given
+        @param encoding_name: tiktoken encoding of the target model
+        """
+        self.token_budget = token_budget
+        self.separator = separator
+        self.jaccard_threshold = jaccard_threshold
+        self.cosine_threshold = cosine_threshold
+        self.encoding_name = encoding_name
+
+    def _similarity(self, texts: List[str],
+                    embeddings: Optional[list]) -> Tuple[np.ndarray, float]:
+        if embeddings is not None:
+            return cosine_similarity(embeddings), self.cosine_threshold
+        return minhash_similarity(minhash_signatures(texts)), \
+            self.jaccard_threshold
+
+    def pack(
+        self,
+        texts: List[str],
+        scores: Optional[List[float]] = None,
+        embeddings: Optional[list] = None
+    ) -> Tuple[List[int], PackingReport]:
+        """
+        Select the chunks of the context
+        @param texts: candidate chunks
+        @param scores: relevance, higher is better, default the order
+            of the candidates
+        @param embeddings: of the candidates, cosine deduplication,
+            MinHash otherwise
+        @return: indices of the selected candidates, best first; report
+        """
+        report = PackingReport(candidates=len(texts),
+                               token_budget=self.token_budget)
+        if not texts:
+            return [], report
+        tokens = count_tokens(texts, self.encoding_name)
+        separator_tokens = count_tokens([self.separator],
+                                        self.encoding_name)[0]
+        report.candidate_tokens = sum(tokens) \
+            + separator_tokens * (len(texts) - 1)
+
+        order = range(len(texts)) if scores is None \
+            else np.argsort(-np.asarray(scores), kind='stable')
+        similarity, threshold = None, None
+        if self.jaccard_threshold is not None or embeddings is not None:
+            similarity, threshold = self._similarity(texts, embeddings)
+
+        selected = []
+        used = 0
+        for i in order:
+            if similarity is not None and selected \
+                    and similarity[i, selected].max() >= threshold:
+                report.duplicates += 1
+                continue
+            cost = tokens[i] + (separator_tokens if selected else 0)
+            # a smaller chunk further down may still fit
+            if used + cost > self.token_budget:
+                continue
+            selected.append(int(i))
+            used += cost
+        report.packed = len(selected)
+        report.packed_tokens = used
+        return selected, report
@@ -1,29 +1,39 @@
-from typing import List
+from typing import Any, List
 from numpy import ndarray
+from pydantic import PrivateAttr
+from semantic_kernel.connectors.ai.embeddings.embedding_generator_base import (
+    EmbeddingGeneratorBase
+)
 
+from mockup_embedder import DEFAULT_DIMENSIONS, MockupEmbedder
 
-class MockupEmbedding:
+# constants
+MODEL_NAME = 'mockup-embedding'
+
+
+class MockupEmbedding(EmbeddingGeneratorBase):
     """ Mockup embedding function for testing """
-    service_id: str
+    _embedder: MockupEmbedder = PrivateAttr()
 
-    def __init__(self, service_id: str = None):
-        super().__init__()
-        self.service_id = service_id
+    def __init__(self, service_id: str = None,
+                 dimensions: int = DEFAULT_DIMENSIONS):
+        super().__init__(ai_model_id=MODEL_NAME,
+                         service_id=service_id or MODEL_NAME)
+        self._embedder = MockupEmbedder(dimensions)
 
-    def embed_documents(self, documents: List[str]) -> List[List[float]]:
-        embeddings = []
-        for doc in documents:
-            embeddings.append(self.embed_query(doc))
-        return embeddings
+    def embed_documents(self, documents: List[str]) -> List[ndarray]:
+        return list(self._embedder.embed(documents))
 
     def embed_query(self, query: str) -> ndarray:
-        arr = ndarray(shape=(384,), dtype=float)
-        for i in range(384):
-            arr[i] = i * len(query)
-        return arr
+        return self._embedder.embed([query])[0]
 
-    async def generate_embeddings(self, input: List[str]) -> List[List[float]]:
-        return self.embed_documents(input)
+    async def generate_embeddings(
+        self,
+        texts: List[str],
+        settings: Any = None,
+        **kwargs: Any
+    ) -> ndarray:
+        return await self._embedder.aembed(texts)
 
     def __call__(self, input: List[str]) -> List[List[float]]:
-        return self.embed_documents(input)
+        return self._embedder(input)
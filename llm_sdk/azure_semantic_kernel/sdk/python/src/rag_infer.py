@@ -15,6 +15,7 @@ from semantic_kernel.connectors.ai.prompt_execution_settings import (
 )
 
 from mockup_embedding import MockupEmbedding
+from context_packing import ContextPacker
 
 dotenv.load_dotenv()
 
@@ -22,6 +23,8 @@ dotenv.load_dotenv()
 # constants
 CHROMA_PESIST_DIR_PATH = "./chroma_cache"
 CHROMA_COLLECTION_NAME = "<ADD_COLLECTION_NAME>"
+RETRIEVER_TOP_K = 20  # candidates, packed into the context budget
+CONTEXT_TOKEN_BUDGET = 3000  # tokens, for the target model
 
 
 kernel = Kernel()  # Initialize the kernel
@@ -63,17 +66,27 @@ async def main(
     results = await memory.search(
         collection=CHROMA_COLLECTION_NAME,
         query="What is farthest space object from here?",
-        limit=999,
+        limit=RETRIEVER_TOP_K,
         with_embeddings=True
     )
     print('=' * 16 + '\n' + 'MEMORY OUTPUT')
     print([(mem_query_result.text, mem_query_result.embedding[:5])
            for mem_query_result in results])
 
+    # drop near duplicates, then the best scored chunks within the budget
+    selected, report = ContextPacker(token_budget=CONTEXT_TOKEN_BUDGET).pack(
+        [mem_query_result.text for mem_query_result in results],
+        scores=[mem_query_result.relevance for mem_query_result in results],
+        embeddings=[mem_query_result.embedding for mem_query_result in results]
+    )
+    print('=' * 16 + '\n' + 'PACKED CONTEXT')
+    print(f"CONTEXT: {report}")
+    print([results[i].text for i in selected])
+
     results = await memory_plugin.recall(
         ask="farthest space object",
         collection=CHROMA_COLLECTION_NAME,
-        limit=999)
+        limit=RETRIEVER_TOP_K)
     print('=' * 16 + '\n' + 'MEMORY PLUGIN OUTPUT')
     print(results)
 
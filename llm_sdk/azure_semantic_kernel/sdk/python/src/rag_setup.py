@@ -3,6 +3,7 @@ import uuid
 
 import chromadb
 from mockup_embedding import MockupEmbedding
+from chroma_ingest import chunk_id, ingest
 
 
 dotenv.load_dotenv()
@@ -28,19 +29,21 @@ documents = [
     "The fruit GreyMelow in the most accid fruit in the world, " +
     "it is also the rarest. There was never any of it.",
 ]
-new_collection.add(
-    ids=["id1", "id2"],
-    documents=documents,
-    embeddings=embedding_fun.embed_documents(documents),
-    metadatas=[{
-        "is_reference": "foo",
-        "external_source_name": "bar",
-        "id": "baz",
-        "description": "qux",
-        "additional_metadata": "quux",
-        "timestamp": "corge",
-    } for _ in range(2)],
+metadata = {
+    "is_reference": "foo",
+    "external_source_name": "bar",
+    "id": "baz",
+    "description": "qux",
+    "additional_metadata": "quux",
+    "timestamp": "corge",
+}
+# embedded in batches on a thread pool, upserted in max batch size slices
+stats = ingest(
+    new_collection,
+    chunks=((chunk_id(doc), doc, dict(metadata)) for doc in documents),
+    embedding_function=embedding_fun,
 )
+print(f"INGESTED {stats.documents} docs, {stats.docs_per_second:.0f} docs/s")
 
 print("CROMADB COLLECTIONS")
 print(chroma_client.list_collections())
@@ -0,0 +1,79 @@
+# Deterministic mockup embeddings, a batch in a single NumPy pass:
+# each text is hashed to a 64-bit seed, the components of its vector are
+# derived from the seed with the splitmix64 mixer, so distinct texts get
+# distinct unit vectors, and a text always gets the same vector.
+# The framework adapters in mockup_embedding.py build on MockupEmbedder.
+# ref:
+# * https://docs.trychroma.com/guides/embeddings#custom-embedding-functions
+# * https://prng.di.unimi.it/splitmix64.c
+
+import hashlib
+from typing import List
+
+import numpy as np
+
+# constants
+DEFAULT_DIMENSIONS = 384
+GOLDEN_GAMMA = np.uint64(0x9E3779B97F4A7C15)
+MIX_1 = np.uint64(0xBF58476D1CE4E5B9)
+MIX_2 = np.uint64(0x94D049BB133111EB)
+SHIFTS = [np.uint64(shift) for shift in (30, 27, 31, 11)]
+
+
+def text_seeds(texts: List[str]) -> np.ndarray:
+    """
+    Hash each text to a 64-bit seed
+    @param texts: texts
+    @return: seeds, uint64 array
+    """
+    return np.fromiter(
+        (int.from_bytes(
+            hashlib.blake2b(text.encode('utf-8'), digest_size=8).digest(),
+            'little') for text in texts),
+        dtype=np.uint64,
+        count=len(texts)
+    )
+
+
+def mockup_embeddings(
+    texts: List[str],
+    dimensions: int = DEFAULT_DIMENSIONS
+) -> np.ndarray:
+    """
+    Embed texts in unit vectors, deterministic per text
+    @param texts: texts
+    @param dimensions: vector dimensions
+    @return: float32 array, one row per text
+    """
+    counters = np.arange(1, dimensions + 1, dtype=np.uint64) * GOLDEN_GAMMA
+    # splitmix64, uint64 arithmetic wraps around
+    z = text_seeds(texts)[:, None] + counters[None, :]
+    z = (z ^ (z >> SHIFTS[0])) * MIX_1
+    z = (z ^ (z >> SHIFTS[1])) * MIX_2
+    z ^= z >> SHIFTS[2]
+    # top 53 bits, uniform in [-1, 1)
+    vectors = (z >> SHIFTS[3]).astype(np.float64) * (2.0 ** -52) - 1.0
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors.astype(np.float32)
+
+
+class MockupEmbedder:
+    """ Mockup embeddings for testing, a Chroma embedding function """
+
+    def __init__(self, dimensions: int = DEFAULT_DIMENSIONS):
+        self.dimensions = dimensions
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        """
+        Embed a batch of texts
+        @param texts: texts
+        @return: float32 array, one row per text
+        """
+        return mockup_embeddings(list(texts), self.dimensions)
+
+    async def aembed(self, texts: List[str]) -> np.ndarray:
+        # CPU bound and fast, no need for a thread
+        return self.embed(texts)
+
+    def __call__(self, input: List[str]) -> List[List[float]]:
+        return self.embed(input).tolist()
@@ -1,25 +1,36 @@
 from typing import List, Any, Dict
-from haystack import component
+from haystack import component, Document
 
+from mockup_embedder import MockupEmbedder
 
-class MockupEmbedding():
-    """ Mockup embedding function for testing """
+# constants
+MODEL_NAME = 'mockup-embedding'
 
-    def __init__(self):
-        super().__init__()
+
+@component
+class MockupEmbedding(MockupEmbedder):
+    """ Mockup embedding function for testing, a text embedder """
 
     def embed_documents(self, documents: List[str]) -> List[List[float]]:
-        embeddings = []
-        for doc in documents:
-            embeddings.append(self.embed_query(doc))
-        return embeddings
+        return self.embed(documents).tolist()
 
     def embed_query(self, query: str) -> List[float]:
-        return [x * len(query) for x in range(384)]
-
-    def __call__(self, input: List[str]) -> List[List[float]]:
-        return self.embed_documents(input)
+        return self.embed([query])[0].tolist()
 
     @component.output_types(embedding=List[float], meta=Dict[str, Any])
     def run(self, text: str):
-        return self.__call__(["mock embedding text"])
+        return {'embedding': self.embed_query(text),
+                'meta': {'model': MODEL_NAME}}
+
+
+@component
+class MockupDocumentEmbedding(MockupEmbedder):
+    """ Mockup embedding function for testing, a document embedder """
+
+    @component.output_types(documents=List[Document], meta=Dict[str, Any])
+    def run(self, documents: List[Document]):
+        embeddings = self.embed(
+            [document.content or '' for document in documents])
+        for document, embedding in zip(documents, embeddings.tolist()):
+            document.embedding = embedding
+        return {'documents': documents, 'meta': {'model': MODEL_NAME}}
@@ -1,7 +1,9 @@
 import os
+from typing import List
+
 import dotenv
 
-from haystack import Pipeline
+from haystack import Pipeline, Document, component
 from haystack.components.generators import AzureOpenAIGenerator
 from haystack_integrations.document_stores.chroma import ChromaDocumentStore
 from haystack_integrations.components.retrievers.chroma import (
@@ -11,12 +13,32 @@ from haystack_integrations.components.retrievers.chroma import (
 from haystack.components.builders.prompt_builder import PromptBuilder
 
 from mockup_embedding import MockupEmbedding
+from context_packing import ContextPacker, PackingReport
 
 dotenv.load_dotenv()
 
 # constants
 CHROMA_PESIST_DIR_PATH = "./chroma_cache"
 CHROMA_COLLECTION_NAME = "my_collection_d9093"
+RETRIEVER_TOP_K = 20  # candidates, packed into the context budget
+CONTEXT_TOKEN_BUDGET = 3000  # tokens, for the target model
+
+
+@component
+class ContextPacking:
+    """ Drop near duplicates, then the best chunks within a token budget """
+
+    def __init__(self, token_budget: int = CONTEXT_TOKEN_BUDGET):
+        self.packer = ContextPacker(token_budget=token_budget)
+
+    @component.output_types(documents=List[Document], report=PackingReport)
+    def run(self, documents: List[Document]):
+        # the retriever ranks the documents, best first
+        selected, report = self.packer.pack(
+            [document.content or '' for document in documents])
+        print(f"CONTEXT: {report}")
+        return {'documents': [documents[i] for i in selected],
+                'report': report}
 
 
 llm = AzureOpenAIGenerator(
@@ -39,7 +61,8 @@ text_retriever = ChromaQueryTextRetriever(vectorstore)
 pipe = Pipeline()
 pipe.add_component("text_retriever", text_retriever)
 print('=' * 16 + '\n' + 'TEXT RETRIEVER OUTPUT')
-print(pipe.run({"text_retriever": {"query": 'planet', "top_k": 999}}))
+print(pipe.run({
+    "text_retriever": {"query": 'planet', "top_k": RETRIEVER_TOP_K}}))
 
 embedding_retriever = ChromaEmbeddingRetriever(vectorstore)
 pipe = Pipeline()
@@ -47,7 +70,8 @@ pipe.add_component("embedding_retriever", embedding_retriever)
 print('=' * 16 + '\n' + 'EMBEDDING RETRIEVER OUTPUT')
 query_embedding = embedding_func.embed_query("What is farthest space object?")
 print(pipe.run({
-    "embedding_retriever": {"query_embedding": query_embedding, "top_k": 999}}
+    "embedding_retriever": {
+        "query_embedding": query_embedding, "top_k": RETRIEVER_TOP_K}}
 ))
 
 # Generate response
@@ -56,9 +80,12 @@ embedding_retriever2 = ChromaEmbeddingRetriever(vectorstore)
 
 rag_pipeline = Pipeline()
 rag_pipeline.add_component("embedding_retriever", embedding_retriever2)
+rag_pipeline.add_component("context_packing", ContextPacking())
 rag_pipeline.add_component("prompt_builder", prompt_builder)
 rag_pipeline.add_component("llm", llm)
-rag_pipeline.connect("embedding_retriever", "prompt_builder.context")
+rag_pipeline.connect("embedding_retriever.documents",
+                     "context_packing.documents")
+rag_pipeline.connect("context_packing.documents", "prompt_builder.context")
 rag_pipeline.connect("prompt_builder", "llm")
 
 question = "What is farthest space object from here?"
@@ -66,7 +93,7 @@ results = rag_pipeline.run(
     {
         "embedding_retriever": {
             "query_embedding": query_embedding,
-            "top_k": 999
+            "top_k": RETRIEVER_TOP_K
         },
         "prompt_builder": {"question": question},
     }
@@ -0,0 +1,84 @@
+# Chunks a synthetic corpus of paragraphs, lines and long unbroken
+# tokens with langchain RecursiveCharacterTextSplitter and with
+# chunking.Chunker, checks the chunks are identical, and compares
+# throughput.
+#
+# usage (from llm_sdk/langchain/sdk/python):
+#   python -m benchmarks.bench_chunking --documents 2000 --words 3000
+
+import sys
+import time
+import random
+import logging
+import argparse
+from typing import List
+
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+sys.path.insert(0, 'src')  # script-style imports of the src modules
+from chunking import Chunker  # noqa: E402
+
+WORDS = ['the', 'planet', 'BlueHeaven', 'is', 'crazy', 'blue', 'and',
+         'incredibly', 'far', 'fruit', 'GreyMelow', 'rarest', 'acid']
+
+
+def make_corpus(documents: int, words: int, seed: int = 0) -> List[str]:
+    rng = random.Random(seed)
+    corpus = []
+    for _ in range(documents):
+        parts = []
+        for _ in range(words):
+            parts.append(rng.choice(WORDS))
+            roll = rng.random()
+            if roll < 0.01:
+                parts.append('\n\n')
+            elif roll < 0.03:
+                parts.append('.\n')
+            elif roll < 0.035:
+                # unbroken token, split per character
+                parts.append(' ' + 'x' * rng.randint(800, 1200) + ' ')
+            else:
+                parts.append(' ')
+        corpus.append(''.join(parts))
+    return corpus
+
+
+def timed(split, corpus: List[str]) -> tuple:
+    start = time.perf_counter()
+    chunks = [split(text) for text in corpus]
+    return chunks, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--documents', type=int, default=2000)
+    parser.add_argument('--words', type=int, default=3000)
+    parser.add_argument('--chunk-size', type=int, default=800)
+    parser.add_argument('--chunk-overlap', type=int, default=200)
+    args = parser.parse_args()
+    # langchain warns on every chunk longer than chunk_size
+    logging.disable(logging.WARNING)
+
+    corpus = make_corpus(args.documents, args.words)
+    megabytes = sum(len(text) for text in corpus) / 1e6
+    print(f"{args.documents} documents, {megabytes:.1f} MB")
+
+    splitter = RecursiveCharacterTextSplitter(
+        chunk_size=args.chunk_size, chunk_overlap=args.chunk_overlap)
+    chunker = Chunker(
+        chunk_size=args.chunk_size, chunk_overlap=args.chunk_overlap)
+
+    expected, baseline = timed(splitter.split_text, corpus)
+    chunks, seconds = timed(chunker.split_text, corpus)
+    assert chunks == expected, 'chunks differ from the langchain splitter'
+
+    print(f"{'':<32} {'seconds':>8} {'MB/s':>7} {'chunks':>8}")
+    for name, elapsed in [('RecursiveCharacterTextSplitter', baseline),
+                          ('Chunker', seconds)]:
+        print(f"{name:<32} {elapsed:>8.2f} {megabytes / elapsed:>7.1f} "
+              f"{sum(map(len, chunks)):>8}")
+    print(f"speed-up x{baseline / seconds:.1f}, identical chunks")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+# Ingests synthetic chunks into a local Chroma PersistentClient, one
+# embed-then-write batch after the other, and with chroma_ingest.ingest
+# (embedding pool, upserts pipelined with embedding), and compares
+# docs/s, then re-runs the ingest over the same ids, upserting and
+# skipping the stored ids. --embed-latency-ms adds a per-call delay,
+# as a remote embedding endpoint would.
+#
+# usage (from llm_sdk/langchain/sdk/python):
+#   python -m benchmarks.bench_ingest --documents 20000 --embed-latency-ms 50
+
+import sys
+import time
+import argparse
+import tempfile
+from typing import List
+
+import chromadb
+
+sys.path.insert(0, 'src')  # script-style imports of the src modules
+from chroma_ingest import chunk_id, ingest, iter_batches  # noqa: E402
+from mockup_embedding import MockupEmbedding  # noqa: E402
+
+
+class SlowEmbedding(MockupEmbedding):
+    """ Mockup embedding with a fixed latency per call """
+
+    def __init__(self, latency_seconds: float):
+        super().__init__()
+        self.latency_seconds = latency_seconds
+
+    def __call__(self, input: List[str]) -> List[List[float]]:
+        time.sleep(self.latency_seconds)
+        return super().__call__(input)
+
+
+def sequential(collection, chunks, embedding_function, batch_size) -> float:
+    start = time.perf_counter()
+    for batch in iter_batches(chunks, batch_size):
+        documents = [document for _, document, _ in batch]
+        collection.upsert(
+            ids=[id_ for id_, _, _ in batch],
+            documents=documents,
+            embeddings=embedding_function(documents),
+        )
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--documents', type=int, default=20000)
+    parser.add_argument('--batch-size', type=int, default=256)
+    parser.add_argument('--max-workers', type=int, default=4)
+    parser.add_argument('--embed-latency-ms', type=float, default=50.0)
+    args = parser.parse_args()
+
+    documents = [f"chunk {i}: the planet BlueHeaven is crazy blue " * 8
+                 for i in range(args.documents)]
+    chunks = [(chunk_id(document), document, None) for document in documents]
+    embedding_function = SlowEmbedding(args.embed_latency_ms / 1000)
+
+    with tempfile.TemporaryDirectory() as path:
+        client = chromadb.PersistentClient(path=path)
+        print(f"{args.documents} documents, max batch size "
+              f"{client.get_max_batch_size()}")
+        print(f"{'':<12} {'seconds':>8} {'docs/s':>8}")
+
+        collection = client.create_collection('sequential')
+        seconds = sequential(collection, chunks, embedding_function,
+                             args.batch_size)
+        print(f"{'sequential':<12} {seconds:>8.2f} "
+              f"{args.documents / seconds:>8.0f}")
+
+        collection = client.create_collection('pipelined')
+        for run, skip_existing in [('pipelined', False), ('re-run', False),
+                                   ('re-run skip', True)]:
+            stats = ingest(collection, iter(chunks), embedding_function,
+                           embed_batch_size=args.batch_size,
+                           max_workers=args.max_workers,
+                           skip_existing=skip_existing)
+            print(f"{run:<12} {stats.seconds:>8.2f} "
+                  f"{args.documents / stats.seconds:>8.0f}  (embed "
+                  f"{stats.embed_seconds:.2f}s, write "
+                  f"{stats.write_seconds:.2f}s, {stats.writes} writes, "
+                  f"{stats.skipped} skipped)")
+        # upsert: the re-run overwrote the same ids
+        assert collection.count() == args.documents
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,173 @@
+# Bulk ingestion into a Chroma collection:
+# chunks are embedded in batches on a thread pool, and written with
+# upsert in slices of at most the client max batch size, while the
+# next batches are embedded. Ids derived from the content make re-runs
+# overwrite instead of duplicating, or skip the chunks already stored:
+# Chroma updates existing ids about 10x slower than it adds new ones.
+# ref:
+# * https://docs.trychroma.com/reference/python/collection#upsert
+
+import time
+import hashlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from itertools import islice
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
+
+# constants
+DEFAULT_EMBED_BATCH_SIZE = 256  # texts per embedding call
+DEFAULT_WRITE_BATCH_SIZE = 2048  # records per upsert, capped by the client
+DEFAULT_MAX_WORKERS = 4
+IN_FLIGHT_PER_WORKER = 2  # embedded batches waiting to be written
+
+Chunk = Tuple[str, str, Optional[dict]]  # id, document, metadata
+
+
+@dataclass
+class IngestStats:
+    documents: int = 0  # records written
+    skipped: int = 0  # ids already stored, with skip_existing
+    writes: int = 0
+    embed_seconds: float = 0.0  # summed over the workers
+    write_seconds: float = 0.0
+    seconds: float = 0.0
+
+    @property
+    def docs_per_second(self) -> float:
+        return self.documents / self.seconds if self.seconds else 0.0
+
+
+def chunk_id(document: str, source: str = '') -> str:
+    """
+    Id stable across runs
+    @param document: chunk text
+    @param source: e.g. the file of the chunk, tells equal chunks apart
+    @return: hex digest
+    """
+    digest = hashlib.sha256(source.encode('utf-8'))
+    digest.update(b'\0')
+    digest.update(document.encode('utf-8'))
+    return digest.hexdigest()[:32]
+
+
+def max_batch_size(collection, default: int = DEFAULT_WRITE_BATCH_SIZE) -> int:
+    """
+    Max records per write of the client of a collection
+    @param collection: chroma collection
+    @param default: if the client does not tell
+    """
+    client = getattr(collection, '_client', None)
+    if client is not None and hasattr(client, 'get_max_batch_size'):
+        return client.get_max_batch_size()
+    return getattr(client, 'max_batch_size', default)
+
+
+def iter_batches(items: Iterable, size: int) -> Iterator[list]:
+    iterator = iter(items)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def _new_chunks(collection, batch: List[Chunk]) -> List[Chunk]:
+    # include nothing: only the ids are read
+    existing = set(collection.get(
+        ids=list({id_ for id_, _, _ in batch}), include=[])['ids'])
+    return [chunk for chunk in batch if chunk[0] not in existing]
+
+
+def _embed(
+    embedding_function: Callable[[List[str]], List[List[float]]],
+    batch: List[Chunk]
+) -> Tuple[List[Chunk], list, float]:
+    start = time.perf_counter()
+    embeddings = embedding_function([document for _, document, _ in batch])
+    return batch, embeddings, time.perf_counter() - start
+
+
+def _upsert(collection, batch: List[Chunk], embeddings: list) -> int:
+    """
+    Upsert a batch, ids must be unique per write: the last chunk of an
+    id wins
+    @return: number of records written
+    """
+    unique = {}
+    for chunk, embedding in zip(batch, embeddings):
+        unique[chunk[0]] = (chunk, embedding)
+    batch = [chunk for chunk, _ in unique.values()]
+    metadatas = [metadata for _, _, metadata in batch]
+    collection.upsert(
+        ids=[id_ for id_, _, _ in batch],
+        documents=[document for _, document, _ in batch],
+        embeddings=[embedding for _, embedding in unique.values()],
+        metadatas=None if all(m is None for m in metadatas) else metadatas,
+    )
+    return len(batch)
+
+
+def ingest(
+    collection,
+    chunks: Iterable[Chunk],
+    embedding_function: Callable[[List[str]], List[List[float]]],
+    embed_batch_size: int = DEFAULT_EMBED_BATCH_SIZE,
+    write_batch_size: int = DEFAULT_WRITE_BATCH_SIZE,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    skip_existing: bool = False
+) -> IngestStats:
+    """
+    Embed and upsert a stream of chunks
+    @param collection: chroma collection
+    @param chunks: (id, document, metadata), metadata may be None
+    @param embedding_function: texts -> embeddings
+    @param embed_batch_size: texts per embedding call
+    @param write_batch_size: records per upsert, at most the client max
+    @param max_workers: embedding threads
+    @param skip_existing: neither embed nor write the chunks whose id is
+        already in the collection, for content-derived ids (chunk_id);
+        their metadata is not updated
+    @return: stats
+    """
+    start = time.perf_counter()
+    stats = IngestStats()
+    write_batch_size = min(write_batch_size, max_batch_size(collection))
+    embed_batch_size = min(embed_batch_size, write_batch_size)
+    max_in_flight = max_workers * IN_FLIGHT_PER_WORKER
+
+    pending = deque()  # embedding futures, in submission order
+    buffer, buffer_embeddings = [], []
+
+    def write(records: List[Chunk], embeddings: list) -> None:
+        write_start = time.perf_counter()
+        stats.documents += _upsert(collection, records, embeddings)
+        stats.write_seconds += time.perf_counter() - write_start
+        stats.writes += 1
+
+    def collect(block: bool) -> None:
+        # write as soon as the oldest batch is embedded, together with the
+        # batches embedded since; the pool embeds the next ones meanwhile
+        while pending and (block or pending[0].done()):
+            batch, embeddings, seconds = pending.popleft().result()
+            stats.embed_seconds += seconds
+            buffer.extend(batch)
+            buffer_embeddings.extend(embeddings)
+            block = False
+        while buffer:
+            write(buffer[:write_batch_size],
+                  buffer_embeddings[:write_batch_size])
+            del buffer[:write_batch_size], buffer_embeddings[:write_batch_size]
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for batch in iter_batches(chunks, embed_batch_size):
+            if skip_existing:
+                new_batch = _new_chunks(collection, batch)
+                stats.skipped += len(batch) - len(new_batch)
+                if not new_batch:
+                    continue
+                batch = new_batch
+            pending.append(executor.submit(_embed, embedding_function, batch))
+            collect(block=len(pending) >= max_in_flight)
+        while pending:
+            collect(block=True)
+
+    stats.seconds = time.perf_counter() - start
+    return stats
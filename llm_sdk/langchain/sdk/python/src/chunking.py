@@ -0,0 +1,319 @@
+# Text chunking, without framework dependencies:
+# * RECURSIVE: same chunks as langchain RecursiveCharacterTextSplitter
+# * SENTENCE: recursive, on paragraph then sentence boundaries
+# * TOKEN: recursive, with chunk sizes in tiktoken tokens, same chunks as
+#   RecursiveCharacterTextSplitter.from_tiktoken_encoder
+# Pieces are (start, end) offsets into the text, a chunk is sliced once.
+# ref:
+# * https://python.langchain.com/docs/how_to/recursive_text_splitter/
+# * https://github.com/openai/tiktoken
+
+import copy
+import math
+import logging
+from enum import Enum
+from functools import lru_cache
+from typing import Callable, Iterable, Iterator, List, Union
+
+# constants
+DEFAULT_CHUNK_SIZE = 800
+DEFAULT_CHUNK_OVERLAP = 200
+DEFAULT_TOKEN_ENCODING = 'cl100k_base'
+CHARS_PER_TOKEN = 4  # estimate when tiktoken is not installed
+RECURSIVE_SEPARATORS = ['\n\n', '\n', ' ', '']
+SENTENCE_SEPARATORS = ['\n\n', '\n', '. ', '? ', '! ', '; ', ', ', ' ', '']
+
+try:
+    import tiktoken
+except ImportError:  # optional, token counts are estimated without it
+    tiktoken = None
+
+
+class ChunkingMode(Enum):
+    RECURSIVE = 'recursive'
+    SENTENCE = 'sentence'
+    TOKEN = 'token'
+
+
+@lru_cache(maxsize=None)
+def _get_encoding(encoding_name: str):
+    """
+    Load a tiktoken encoding once
+    @param encoding_name: tiktoken encoding
+    @return: encoding, None if tiktoken or the encoding is unavailable
+    """
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.get_encoding(encoding_name)
+    except Exception as ex:
+        # e.g. the encoding file cannot be downloaded
+        logging.warning(f"Estimate token counts, tiktoken encoding \
+            '{encoding_name}' is unavailable: {ex}")
+        return None
+
+
+class Chunker:
+    """
+    Recursive text chunker, splits on the first separator found in a text,
+    merges the pieces up to chunk_size with chunk_overlap, and splits the
+    pieces too long with the next separators
+    """
+
+    def __init__(
+        self,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        chunk_overlap: int = DEFAULT_CHUNK_OVERLAP,
+        mode: ChunkingMode = ChunkingMode.RECURSIVE,
+        separators: List[str] = None,
+        keep_separator: Union[bool, str] = True,
+        strip_whitespace: bool = True,
+        encoding_name: str = DEFAULT_TOKEN_ENCODING,
+        length_function: Callable[[str], int] = None
+    ):
+        """
+        @param chunk_size: max length of a chunk, in characters,
+            in tokens in TOKEN mode
+        @param chunk_overlap: max length shared by consecutive chunks
+        @param mode: chunking mode
+        @param separators: separators, by priority, default per mode
+        @param keep_separator: True or 'start' to keep the separators at
+            the start of the pieces, 'end' at their end, False to drop them
+        @param strip_whitespace: strip the chunks
+        @param encoding_name: tiktoken encoding, TOKEN mode
+        @param length_function: custom length, overrides the mode
+        """
+        if chunk_overlap > chunk_size:
+            raise ValueError(f"chunk_overlap {chunk_overlap} is larger than \
+                chunk_size {chunk_size}")
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+        self.mode = mode
+        self.strip_whitespace = strip_whitespace
+        self.keep_separator = keep_separator
+        match mode:
+            case ChunkingMode.RECURSIVE | ChunkingMode.TOKEN:
+                self.separators = separators or RECURSIVE_SEPARATORS
+            case ChunkingMode.SENTENCE:
+                self.separators = separators or SENTENCE_SEPARATORS
+                # the punctuation ends the sentence
+                if keep_separator is True:
+                    self.keep_separator = 'end'
+            case _:
+                raise ValueError(f"Unsupported chunking mode: {mode}")
+        self._lengths = None  # None: the character count of the span
+        if length_function is not None:
+            self._lengths = lambda texts: [length_function(t) for t in texts]
+        elif mode == ChunkingMode.TOKEN:
+            self._lengths = self._token_lengths(encoding_name)
+
+    @staticmethod
+    def _token_lengths(encoding_name: str) -> Callable[[List[str]], List[int]]:
+        encoding = _get_encoding(encoding_name)
+        if encoding is None:
+            return lambda texts: [math.ceil(len(t) / CHARS_PER_TOKEN)
+                                  for t in texts]
+        return lambda texts: [
+            len(tokens) for tokens in encoding.encode_ordinary_batch(texts)]
+
+    def split_text(self, text: str) -> List[str]:
+        """
+        Split a text in chunks
+        @param text: text
+        @return: chunks
+        """
+        chunks = []
+        self._split(text, 0, len(text), self.separators, chunks)
+        return chunks
+
+    def iter_split_texts(self, texts: Iterable[str]) -> Iterator[List[str]]:
+        """
+        Split texts in chunks, lazily
+        @param texts: texts
+        @return: chunks per text
+        """
+        for text in texts:
+            yield self.split_text(text)
+
+    def split_texts(self, texts: Iterable[str]) -> List[List[str]]:
+        """
+        Split texts in chunks
+        @param texts: texts
+        @return: chunks per text
+        """
+        return list(self.iter_split_texts(texts))
+
+    def split_documents(self, documents: Iterable) -> List:
+        """
+        Split documents with page_content and metadata,
+        e.g. langchain Document
+        @param documents: documents
+        @return: one document of the same type per chunk
+        """
+        chunked = []
+        for document in documents:
+            for chunk in self.split_text(document.page_content):
+                chunked.append(type(document)(
+                    page_content=chunk,
+                    metadata=copy.deepcopy(document.metadata)
+                ))
+        return chunked
+
+    def _spans(self, text: str, start: int, end: int,
+               separator: str) -> tuple:
+        """
+        Split text[start:end] on a separator
+        @return: start offsets, end offsets of the non-empty pieces
+        """
+        if not separator:
+            return range(start, end), range(start + 1, end + 1)
+        width = len(separator)
+        # offsets of the separators
+        cuts = []
+        find = text.find
+        position = find(separator, start, end)
+        while position != -1:
+            cuts.append(position)
+            position = find(separator, position + width, end)
+        if self.keep_separator == 'end':
+            starts = [start] + [cut + width for cut in cuts]
+            ends = [cut + width for cut in cuts] + [end]
+        elif self.keep_separator:
+            starts = [start] + cuts
+            ends = cuts + [end]
+        else:
+            starts = [start] + [cut + width for cut in cuts]
+            ends = cuts + [end]
+            pieces = [(s, e) for s, e in zip(starts, ends) if s < e]
+            return [s for s, _ in pieces], [e for _, e in pieces]
+        # kept separators: only the first or last piece can be empty
+        if starts[0] == ends[0]:
+            del starts[0], ends[0]
+        elif starts[-1] == ends[-1]:
+            del starts[-1], ends[-1]
+        return starts, ends
+
+    def _split(self, text: str, start: int, end: int,
+               separators: List[str], chunks: List[str]) -> None:
+        separator = separators[-1]
+        next_separators = []
+        for i, candidate in enumerate(separators):
+            if candidate == '':
+                separator = candidate
+                break
+            if text.find(candidate, start, end) != -1:
+                separator = candidate
+                next_separators = separators[i + 1:]
+                break
+
+        if separator == '' and self._lengths is None and self.chunk_size > 1:
+            self._split_characters(text, start, end, chunks)
+            return
+
+        starts, ends = self._spans(text, start, end, separator)
+        if self._lengths is None:
+            lengths = [e - s for s, e in zip(starts, ends)]
+        else:
+            lengths = self._lengths([text[s:e] for s, e in zip(starts, ends)])
+
+        merge_separator = '' if self.keep_separator else separator
+        first = 0  # first of the pieces to merge
+        for i, length in enumerate(lengths):
+            if length < self.chunk_size:
+                continue
+            if first < i:
+                self._merge(text, starts, ends, lengths, first, i,
+                            merge_separator, chunks)
+            if next_separators:
+                self._split(text, starts[i], ends[i], next_separators, chunks)
+            else:
+                chunks.append(text[starts[i]:ends[i]])
+            first = i + 1
+        if first < len(lengths):
+            self._merge(text, starts, ends, lengths, first, len(lengths),
+                        merge_separator, chunks)
+
+    def _split_characters(self, text: str, start: int, end: int,
+                          chunks: List[str]) -> None:
+        """
+        Merge of single characters: windows of chunk_size characters,
+        overlapping by chunk_overlap, as _merge would
+        """
+        step = self.chunk_size - min(self.chunk_overlap, self.chunk_size - 1)
+        low = start
+        while True:
+            high = min(low + self.chunk_size, end)
+            chunk = text[low:high]
+            if self.strip_whitespace:
+                chunk = chunk.strip()
+            if chunk:
+                chunks.append(chunk)
+            if high == end:
+                return
+            low += step
+
+    def _merge(self, text: str, starts: List[int], ends: List[int],
+               lengths: List[int], first: int, last: int,
+               separator: str, chunks: List[str]) -> None:
+        """
+        Merge the pieces first to last into chunks, the current chunk is
+        the window of pieces low to i
+        """
+        separator_length = 0
+        if separator:
+            separator_length = len(separator) if self._lengths is None \
+                else self._lengths([separator])[0]
+        chunk_size = self.chunk_size
+        chunk_overlap = self.chunk_overlap
+        low = first
+        total = 0
+        for i in range(first, last):
+            length = lengths[i]
+            if total + length + (separator_length if i > low else 0) \
+                    > chunk_size and i > low:
+                self._join(text, starts, ends, low, i, separator, chunks)
+                # drop pieces from the start, down to the overlap
+                while total > chunk_overlap or (
+                    total + length + (separator_length if i > low else 0)
+                    > chunk_size and total > 0
+                ):
+                    total -= lengths[low] + \
+                        (separator_length if i - low > 1 else 0)
+                    low += 1
+            total += length + (separator_length if i > low else 0)
+        self._join(text, starts, ends, low, last, separator, chunks)
+
+    def _join(self, text: str, starts: List[int], ends: List[int],
+              low: int, high: int, separator: str,
+              chunks: List[str]) -> None:
+        if low >= high:
+            return
+        if separator:
+            chunk = separator.join(
+                text[starts[i]:ends[i]] for i in range(low, high))
+        else:
+            # the pieces are contiguous
+            chunk = text[starts[low]:ends[high - 1]]
+        if self.strip_whitespace:
+            chunk = chunk.strip()
+        if chunk:
+            chunks.append(chunk)
+
+
+def chunk_texts(
+    texts: Iterable[str],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    chunk_overlap: int = DEFAULT_CHUNK_OVERLAP,
+    mode: ChunkingMode = ChunkingMode.RECURSIVE,
+    **kwargs
+) -> List[List[str]]:
+    """
+    Split texts in chunks
+    @param texts: texts
+    @param chunk_size: max length of a chunk
+    @param chunk_overlap: max length shared by consecutive chunks
+    @param mode: chunking mode
+    @return: chunks per text
+    """
+    chunker = Chunker(chunk_size, chunk_overlap, mode=mode, **kwargs)
+    return chunker.split_texts(texts)
@@ -10,7 +10,6 @@
 # from azure.core.credentials import AzureKeyCredential
 
 from langchain.document_loaders import (
-  DirectoryLoader,
   PyPDFLoader,
   CSVLoader,
   Docx2txtLoader,
@@ -22,10 +21,13 @@ from langchain.document_loaders import (
   JSONLoader,
 #   DocumentIntelligenceLoader,
 )
-from langchain.text_splitter import RecursiveCharacterTextSplitter 
+
+from loader_engine import LoaderEngine
 
 # constants
 directory = '/PATH/TO/FILES'
+# re-runs only parse the files changed since the last run
+manifest_path = '/PATH/TO/FILES/.load_manifest.jsonl'
 
 file_type_mappings = {
     '*.txt': [TextLoader],
@@ -46,43 +48,22 @@ file_type_mappings = {
 #   credential=AzureKeyCredential('7TXIGdso9twGT8R0wSTZ39U1CKIZh4qLyOHFV1bhJd3yFGgom3maJQQJ99AKACYeBjFXJ3w3AAALACOGVihF')
 # )
 
-# iterate over the file type mappings
-for glob_pattern, [list_of_loader_cls] in file_type_mappings.items():
-    docs = []
-    loaded = False
-
-    # iterate over the loader classes
-    for loader_cls in list_of_loader_cls:
-        try:        
-            loader_kwargs = None
-            
-            if loader_cls == JSONLoader:
-                loader_kwargs = {'jq_schema': '.', 'text_content': False}
-            
-            # elif loader_cls == DocumentIntelligenceLoader:
-            #     loader_kwargs = {'client': docintel_client, 'model': 'prebuilt-document'}
+loader_kwargs = {
+    JSONLoader: {'jq_schema': '.', 'text_content': False},
+    # DocumentIntelligenceLoader: {'client': docintel_client, 'model': 'prebuilt-document'},
+}
 
-            # load the documents with given pattern/extension
-            loader_dir = DirectoryLoader(
-                path=directory, 
-                glob=glob_pattern, 
-                loader_cls=loader_cls, 
-                loader_kwargs=loader_kwargs
-            )
-            documents = loader_dir.load_and_split()
-            
-            # chunking strategy
-            text_splitter = RecursiveCharacterTextSplitter(
-                chunk_size=800, 
-                chunk_overlap=200
-            )
-            # for different glob pattern it will split and add texts
-            docs += text_splitter.split_documents(documents)
-            loaded = True
-        except Exception as e:
-            print(e)
-        
-        if loaded:
-            break
+if __name__ == '__main__':
+    # files are parsed and chunked in a process pool, chunks are streamed
+    engine = LoaderEngine(
+        file_type_mappings=file_type_mappings,
+        loader_kwargs=loader_kwargs,
+        manifest_path=manifest_path,
+        chunk_size=800,
+        chunk_overlap=200
+    )
+    for doc in engine.iter_chunks(directory):
+        print(doc)
 
-    print(docs)
\ No newline at end of file
+    # files/s and MB/s per loader class
+    print(engine.report())
@@ -0,0 +1,285 @@
+# Parallel, incremental document loading:
+# files are parsed and split in a process pool, chunks are streamed
+# as each file completes, and a manifest of (path, mtime, size, sha256)
+# lets a re-run parse only the files that changed.
+import os
+import json
+import time
+import hashlib
+import logging
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from langchain_core.documents import Document
+
+from chunking import Chunker
+
+# constants
+DEFAULT_CHUNK_SIZE = 800
+DEFAULT_CHUNK_OVERLAP = 200
+HASH_CHUNK_BYTES = 1 << 20
+IN_FLIGHT_PER_WORKER = 4  # bounds the chunks held in memory
+
+
+@dataclass
+class LoaderStats:
+    files: int = 0
+    failed: int = 0
+    bytes: int = 0
+    chunks: int = 0
+    seconds: float = 0.0  # worker time, summed across processes
+    # (start, end) wall clock of each file, to measure elapsed time
+    intervals: List[Tuple[float, float]] = field(default_factory=list)
+
+    @property
+    def wall_seconds(self) -> float:
+        """
+        Elapsed time while at least one file of the loader was in work
+        """
+        total = 0.0
+        current_start = current_end = None
+        for start, end in sorted(self.intervals):
+            if current_end is None or start > current_end:
+                if current_end is not None:
+                    total += current_end - current_start
+                current_start, current_end = start, end
+            else:
+                current_end = max(current_end, end)
+        if current_end is not None:
+            total += current_end - current_start
+        return total
+
+    @property
+    def files_per_second(self) -> float:
+        seconds = self.wall_seconds
+        return self.files / seconds if seconds else 0.0
+
+    @property
+    def mb_per_second(self) -> float:
+        seconds = self.wall_seconds
+        return self.bytes / 1e6 / seconds if seconds else 0.0
+
+
+def file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_BYTES), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+@lru_cache(maxsize=None)
+def _get_chunker(chunk_size: int, chunk_overlap: int) -> Chunker:
+    # one chunker per worker process, chunks as RecursiveCharacterTextSplitter
+    return Chunker(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+
+
+def _load_file(
+    path: str,
+    loaders: List[Tuple[type, Optional[dict]]],
+    known_sha256: Optional[str],
+    chunk_size: int,
+    chunk_overlap: int
+) -> dict:
+    """
+    Load and split one file, in a worker process
+    @param path: file path
+    @param loaders: (loader class, loader kwargs), tried in order
+    @param known_sha256: hash in the manifest, the file is not parsed
+        again if its content is unchanged
+    @param chunk_size: max characters per chunk
+    @param chunk_overlap: characters shared by consecutive chunks
+    @return: outcome, with keys sha256, loader, chunks, error,
+        seconds (worker time), started and ended (wall clock)
+    """
+    started = time.time()
+    start = time.perf_counter()
+    sha256 = file_sha256(path)
+    outcome = {'sha256': sha256, 'loader': None, 'chunks': None, 'error': None}
+    if sha256 != known_sha256:
+        for loader_cls, loader_kwargs in loaders:
+            outcome['loader'] = loader_cls.__name__
+            try:
+                documents = loader_cls(path, **(loader_kwargs or {})).load()
+                outcome['chunks'] = _get_chunker(
+                    chunk_size, chunk_overlap).split_documents(documents)
+                outcome['error'] = None
+                break
+            except Exception as e:
+                outcome['error'] = f"{type(e).__name__}: {e}"
+    outcome['seconds'] = time.perf_counter() - start
+    outcome['started'], outcome['ended'] = started, time.time()
+    return outcome
+
+
+class Manifest:
+    """
+    Append-only JSON lines of (path, mtime, size, sha256) of the loaded
+    files; the last line of a path wins
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.entries: Dict[str, dict] = {}
+        self._lines = 0
+        if os.path.exists(path):
+            with open(path) as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue  # torn last line of an interrupted run
+                    self.entries[entry['path']] = entry
+                    self._lines += 1
+
+    def is_unchanged(self, path: str, stat: os.stat_result) -> bool:
+        """
+        Cheap check, without reading the file
+        """
+        entry = self.entries.get(path)
+        return entry is not None and entry['mtime'] == stat.st_mtime \
+            and entry['size'] == stat.st_size
+
+    def add(self, path: str, stat: os.stat_result, sha256: str) -> None:
+        entry = {'path': path, 'mtime': stat.st_mtime,
+                 'size': stat.st_size, 'sha256': sha256}
+        with open(self.path, 'a') as f:
+            f.write(json.dumps(entry) + '\n')
+        self.entries[path] = entry
+        self._lines += 1
+
+    def compact(self) -> None:
+        """
+        Rewrite with one line per path
+        """
+        if self._lines == len(self.entries):
+            return
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            for entry in self.entries.values():
+                f.write(json.dumps(entry) + '\n')
+        os.replace(tmp_path, self.path)
+        self._lines = len(self.entries)
+
+
+class LoaderEngine:
+    """
+    Load the files of a directory with per-pattern loader classes,
+    in a process pool, streaming the chunks
+    """
+
+    def __init__(
+        self,
+        file_type_mappings: Dict[str, List[type]],
+        loader_kwargs: Dict[type, dict] = None,
+        manifest_path: str = None,
+        max_workers: int = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        chunk_overlap: int = DEFAULT_CHUNK_OVERLAP
+    ):
+        """
+        @param file_type_mappings: glob pattern -> loader classes,
+            tried in order until one succeeds
+        @param loader_kwargs: loader class -> kwargs of the loader
+        @param manifest_path: optional manifest, re-runs skip unchanged files
+        @param max_workers: worker processes, default the CPU count
+        @param chunk_size: max characters per chunk
+        @param chunk_overlap: characters shared by consecutive chunks
+        """
+        self.file_type_mappings = file_type_mappings
+        self.loader_kwargs = loader_kwargs or {}
+        self.manifest = Manifest(manifest_path) if manifest_path else None
+        self.max_workers = max_workers or os.cpu_count()
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+        self.stats: Dict[str, LoaderStats] = {}
+        self.skipped = 0
+        self.wall_seconds = 0.0
+
+    def _iter_tasks(self, directory: str) -> Iterator[tuple]:
+        for glob_pattern, loader_classes in self.file_type_mappings.items():
+            loaders = [(loader_cls, self.loader_kwargs.get(loader_cls))
+                       for loader_cls in loader_classes]
+            for path in sorted(Path(directory).glob(glob_pattern)):
+                if not path.is_file():
+                    continue
+                path = str(path)
+                stat = os.stat(path)
+                known_sha256 = None
+                if self.manifest is not None:
+                    if self.manifest.is_unchanged(path, stat):
+                        self.skipped += 1
+                        continue
+                    known_sha256 = self.manifest.entries.get(
+                        path, {}).get('sha256')
+                yield path, stat, loaders, known_sha256
+
+    def iter_chunks(self, directory: str) -> Iterator[Document]:
+        """
+        Load and split the new or changed files of a directory
+        @param directory: directory of the files
+        @return: chunks, file by file as they complete
+        """
+        start = time.perf_counter()
+        tasks = self._iter_tasks(directory)
+        pending = {}
+        max_in_flight = self.max_workers * IN_FLIGHT_PER_WORKER
+        with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+            while True:
+                for path, stat, loaders, known_sha256 in tasks:
+                    future = executor.submit(
+                        _load_file, path, loaders, known_sha256,
+                        self.chunk_size, self.chunk_overlap)
+                    pending[future] = (path, stat)
+                    if len(pending) >= max_in_flight:
+                        break
+                if not pending:
+                    break
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    path, stat = pending.pop(future)
+                    yield from self._complete(path, stat, future.result())
+        if self.manifest is not None:
+            self.manifest.compact()
+        self.wall_seconds = time.perf_counter() - start
+
+    def _complete(self, path: str, stat: os.stat_result,
+                  outcome: dict) -> Iterator[Document]:
+        if outcome['loader'] is None:
+            # content unchanged, only the mtime moved
+            self.skipped += 1
+        else:
+            stats = self.stats.setdefault(outcome['loader'], LoaderStats())
+            stats.seconds += outcome['seconds']
+            stats.intervals.append((outcome['started'], outcome['ended']))
+            if outcome['error'] is not None:
+                logging.warning(f"Failed to load {path}: {outcome['error']}")
+                stats.failed += 1
+                return
+            stats.files += 1
+            stats.bytes += stat.st_size
+            stats.chunks += len(outcome['chunks'])
+            yield from outcome['chunks']
+        # recorded once the chunks are consumed
+        if self.manifest is not None:
+            self.manifest.add(path, stat, outcome['sha256'])
+
+    def report(self) -> str:
+        """
+        Files/s and MB/s per loader class, over the wall time the loader
+        had files in work (not the worker time summed across processes)
+        """
+        lines = [f"{'loader':<30} {'files':>7} {'failed':>6} {'chunks':>7} "
+                 f"{'files/s':>8} {'MB/s':>7}"]
+        for name, stats in sorted(self.stats.items()):
+            lines.append(
+                f"{name:<30} {stats.files:>7} {stats.failed:>6} "
+                f"{stats.chunks:>7} {stats.files_per_second:>8.1f} "
+                f"{stats.mb_per_second:>7.2f}")
+        files = sum(stats.files for stats in self.stats.values())
+        lines.append(f"{files} files loaded, {self.skipped} unchanged, "
+                     f"in {self.wall_seconds:.1f}s")
+        return '\n'.join(lines)
@@ -1,21 +1,22 @@
 from typing import List
 from langchain.embeddings.base import Embeddings
 
+from mockup_embedder import MockupEmbedder
 
-class MockupEmbedding(Embeddings):
-    """ Mockup embedding function for testing """
 
-    def __init__(self):
-        super().__init__()
+class MockupEmbedding(MockupEmbedder, Embeddings):
+    """ Mockup embedding function for testing """
 
     def embed_documents(self, documents: List[str]) -> List[List[float]]:
-        embeddings = []
-        for doc in documents:
-            embeddings.append(self.embed_query(doc))
-        return embeddings
+        return self.embed(documents).tolist()
 
     def embed_query(self, query: str) -> List[float]:
-        return [x * len(query) for x in range(384)]
+        return self.embed([query])[0].tolist()
+
+    async def aembed_documents(
+        self, documents: List[str]
+    ) -> List[List[float]]:
+        return (await self.aembed(documents)).tolist()
 
-    def __call__(self, input: List[str]) -> List[List[float]]:
-        return self.embed_documents(input)
+    async def aembed_query(self, query: str) -> List[float]:
+        return (await self.aembed([query]))[0].tolist()
@@ -17,12 +17,15 @@ from langchain_core.runnables import (
 from langchain_openai import AzureChatOpenAI
 
 from mockup_embedding import MockupEmbedding
+from context_packing import ContextPacker
 
 dotenv.load_dotenv()
 
 # constants
 CHROMA_PESIST_DIR_PATH = "./chroma_cache"
 CHROMA_COLLECTION_NAME = "<ADD_COLLECTION_NAME>"
+RETRIEVER_TOP_K = 20  # candidates, packed into the context budget
+CONTEXT_TOKEN_BUDGET = 3000  # tokens, for the target model
 
 
 # Create the LLM instance
@@ -43,7 +46,7 @@ vectorstore = Chroma(
 )
 
 # Query and retrieve data
-retriever = vectorstore.as_retriever(k=999)
+retriever = vectorstore.as_retriever(search_kwargs={'k': RETRIEVER_TOP_K})
 prompt_template = hub.pull("rlm/rag-prompt")
 
 print('=' * 16 + '\n' + 'PROMPT TEMPLATE')
@@ -54,6 +57,22 @@ def format_docs(docs):
     return "\n\n".join(doc.page_content for doc in docs)
 
 
+# drop near duplicates, then the best scored chunks within the budget
+context_packer = ContextPacker(token_budget=CONTEXT_TOKEN_BUDGET)
+
+
+def retrieve_context(question):
+    docs_and_scores = vectorstore.similarity_search_with_relevance_scores(
+        question, k=RETRIEVER_TOP_K)
+    docs = [doc for doc, _ in docs_and_scores]
+    selected, report = context_packer.pack(
+        [doc.page_content for doc in docs],
+        scores=[score for _, score in docs_and_scores]
+    )
+    print(f"CONTEXT: {report}")
+    return format_docs([docs[i] for i in selected])
+
+
 print('=' * 16 + '\n' + 'RETRIEVER OUTPUT')
 print(retriever.invoke("What is farthest space object from here?"))
 
@@ -61,7 +80,7 @@ print(retriever.invoke("What is farthest space object from here?"))
 # Generate response
 rag_chain = (
     # {"context": RunnableLambda(retriever) | format_docs, "question": RunnablePassthrough()}
-    {"context": retriever | format_docs, "question": RunnablePassthrough()}
+    {"context": RunnableLambda(retrieve_context), "question": RunnablePassthrough()}
     | prompt_template
     | llm
 )
@@ -3,6 +3,7 @@ import uuid
 
 import chromadb
 from mockup_embedding import MockupEmbedding
+from chroma_ingest import chunk_id, ingest
 
 
 dotenv.load_dotenv()
@@ -13,23 +14,28 @@ CHROMA_PESIST_DIR_PATH = "./chroma_cache"
 CHROMA_COLLECTION_NAME = f"my_collection_{uuid.uuid4().hex[:5]}"
 
 
+embedding_fun = MockupEmbedding()
 chroma_client = chromadb.PersistentClient(path=CHROMA_PESIST_DIR_PATH)
 new_collection = chroma_client.create_collection(
     name=CHROMA_COLLECTION_NAME,
-    embedding_function=MockupEmbedding()
+    embedding_function=embedding_fun
 )
 # IF embedding_function is None, THEN download all-MiniLM-L6-v2 (79.3MB)
 # and cache it in ~/.cache/chroma/onnx_models
 
-new_collection.add(
-    documents=[
-        "The planet BlueHeaven is 999 billion light-years away from Earth, " +
-        "it is crazy blue and incredibly far. We haven't found it yet.",
-        "The fruit GreyMelow in the most accid fruit in the world, " +
-        "it is also the rarest. There was never any of it.",
-    ],
-    ids=["id1", "id2"]
+documents = [
+    "The planet BlueHeaven is 999 billion light-years away from Earth, " +
+    "it is crazy blue and incredibly far. We haven't found it yet.",
+    "The fruit GreyMelow in the most accid fruit in the world, " +
+    "it is also the rarest. There was never any of it.",
+]
+# embedded in batches on a thread pool, upserted in max batch size slices
+stats = ingest(
+    new_collection,
+    chunks=((chunk_id(doc), doc, None) for doc in documents),
+    embedding_function=embedding_fun,
 )
+print(f"INGESTED {stats.documents} docs, {stats.docs_per_second:.0f} docs/s")
 
 print("CROMADB COLLECTIONS")
 print(chroma_client.list_collections())
@@ -0,0 +1,111 @@
+import uuid
+
+import pytest
+
+
+def test_importable():
+    import chroma_ingest  # noqa: F401
+    from chroma_ingest import ingest  # noqa: F401
+
+
+@pytest.fixture
+def collection():
+    chromadb = pytest.importorskip('chromadb')
+    client = chromadb.EphemeralClient()
+    # the ephemeral clients of a process share their collections
+    name = f"test-{uuid.uuid4().hex}"
+    yield client.create_collection(name)
+    client.delete_collection(name)
+
+
+@pytest.fixture
+def embedder():
+    from mockup_embedder import MockupEmbedder
+    return MockupEmbedder(dimensions=8)
+
+
+def _chunks(n: int, source: str = '', metadata: dict = None) -> list:
+    from chroma_ingest import chunk_id
+    documents = [f"chunk {i}" for i in range(n)]
+    return [(chunk_id(document, source), document, metadata)
+            for document in documents]
+
+
+def test_chunk_id():
+    from chroma_ingest import chunk_id
+    assert chunk_id('foo') == chunk_id('foo')
+    assert chunk_id('foo', 'a.txt') != chunk_id('foo', 'b.txt')
+    assert len(chunk_id('foo')) == 32
+
+
+def test_max_batch_size(collection):
+    from chroma_ingest import max_batch_size
+    assert max_batch_size(collection) == \
+        collection._client.get_max_batch_size()
+    assert max_batch_size(object(), default=7) == 7
+
+
+def test_ingest_slices_to_max_batch_size(collection, embedder, monkeypatch):
+    import chroma_ingest
+    sizes = []
+    upsert = chroma_ingest._upsert
+
+    def recording_upsert(collection, batch, embeddings):
+        sizes.append(len(batch))
+        return upsert(collection, batch, embeddings)
+
+    monkeypatch.setattr(chroma_ingest, 'max_batch_size', lambda c: 10)
+    monkeypatch.setattr(chroma_ingest, '_upsert', recording_upsert)
+    stats = chroma_ingest.ingest(
+        collection, iter(_chunks(95)), embedder,
+        embed_batch_size=32, max_workers=2)
+    assert max(sizes) <= 10
+    assert sum(sizes) == 95
+    assert (stats.documents, stats.writes) == (95, len(sizes))
+    assert collection.count() == 95
+    stored = collection.get(ids=[_chunks(95)[42][0]],
+                            include=['documents', 'embeddings'])
+    assert stored['documents'] == ['chunk 42']
+    assert list(stored['embeddings'][0]) == pytest.approx(
+        embedder(['chunk 42'])[0])
+
+
+def test_ingest_upserts_on_rerun(collection, embedder):
+    from chroma_ingest import ingest
+    ingest(collection, _chunks(20, metadata={'run': 1}), embedder,
+           embed_batch_size=8)
+    stats = ingest(collection, _chunks(30, metadata={'run': 2}), embedder,
+                   embed_batch_size=8)
+    assert stats.documents == 30
+    assert collection.count() == 30
+    metadatas = collection.get(include=['metadatas'])['metadatas']
+    assert {metadata['run'] for metadata in metadatas} == {2}
+
+
+def test_ingest_skip_existing(collection, embedder):
+    from chroma_ingest import ingest
+    calls = []
+
+    def counting_embedder(texts):
+        calls.append(len(texts))
+        return embedder(texts)
+
+    ingest(collection, _chunks(20), embedder, embed_batch_size=8)
+    stats = ingest(collection, _chunks(30), counting_embedder,
+                   embed_batch_size=8, skip_existing=True)
+    # only the new chunks are embedded and written
+    assert sum(calls) == 10
+    assert (stats.documents, stats.skipped) == (10, 20)
+    assert collection.count() == 30
+
+
+def test_ingest_duplicate_ids(collection, embedder):
+    from chroma_ingest import ingest
+    chunks = _chunks(5) + _chunks(5, metadata={'last': True})
+    # one write: chroma rejects duplicate ids within a write
+    stats = ingest(collection, chunks, embedder, embed_batch_size=10)
+    # the last chunk of an id wins, duplicates are not counted
+    assert stats.documents == 5
+    assert collection.count() == 5
+    metadatas = collection.get(include=['metadatas'])['metadatas']
+    assert all(metadata == {'last': True} for metadata in metadatas)
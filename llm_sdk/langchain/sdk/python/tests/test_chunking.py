@@ -0,0 +1,106 @@
+import math
+import random
+import logging
+
+import pytest
+
+
+SENTENCES = 'The planet BlueHeaven is blue. Is it far? It is! ' \
+    'GreyMelow, the rarest fruit; acid and sweet.\n\n'
+
+
+def test_importable():
+    import chunking  # noqa: F401
+    from chunking import Chunker  # noqa: F401
+
+
+def _random_text(rng: random.Random) -> str:
+    tokens = ['a', 'bb', 'ccc', 'dddddddddd', 'x' * rng.randint(1, 60),
+              ' ', ' ', '  ', '\n', '\n\n', '\n\n\n', '. ']
+    return ''.join(rng.choice(tokens) for _ in range(rng.randint(0, 80)))
+
+
+@pytest.fixture
+def splitter_cls():
+    text_splitters = pytest.importorskip('langchain_text_splitters')
+    # langchain warns on every chunk longer than chunk_size
+    logging.disable(logging.WARNING)
+    yield text_splitters.RecursiveCharacterTextSplitter
+    logging.disable(logging.NOTSET)
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_recursive_same_as_langchain(splitter_cls, seed):
+    from chunking import Chunker
+    rng = random.Random(seed)
+    for _ in range(1000):
+        chunk_size = rng.randint(1, 40)
+        kwargs = {
+            'chunk_size': chunk_size,
+            'chunk_overlap': rng.randint(0, chunk_size),
+            'keep_separator': rng.choice([True, False, 'start', 'end']),
+            'strip_whitespace': rng.choice([True, False]),
+        }
+        text = _random_text(rng)
+        assert Chunker(**kwargs).split_text(text) == \
+            splitter_cls(**kwargs).split_text(text), (kwargs, text)
+
+
+def test_split_documents():
+    from langchain_core.documents import Document
+    from chunking import Chunker
+    metadata = {'source': 'foo.txt', 'tags': ['a']}
+    documents = [Document(page_content=SENTENCES * 3, metadata=metadata)]
+    chunks = Chunker(chunk_size=60, chunk_overlap=0).split_documents(
+        documents)
+    assert len(chunks) > 1
+    assert all(isinstance(chunk, Document) for chunk in chunks)
+    assert chunks[0].metadata == metadata
+    assert chunks[0].metadata['tags'] is not metadata['tags']
+
+
+def test_sentence_mode(splitter_cls):
+    from chunking import Chunker, ChunkingMode, SENTENCE_SEPARATORS
+    chunker = Chunker(chunk_size=40, chunk_overlap=0,
+                      mode=ChunkingMode.SENTENCE)
+    chunks = chunker.split_text(SENTENCES)
+    # split on sentence ends before words
+    assert chunks == [
+        'The planet BlueHeaven is blue.',
+        'Is it far?',
+        'It is!',
+        'GreyMelow, the rarest fruit;',
+        'acid and sweet.',
+    ]
+    # the punctuation is kept at the end of the pieces
+    splitter = splitter_cls(chunk_size=40, chunk_overlap=0,
+                            separators=SENTENCE_SEPARATORS,
+                            keep_separator='end')
+    text = SENTENCES * 5
+    assert chunker.split_text(text) == splitter.split_text(text)
+
+
+def test_token_mode_without_tiktoken(splitter_cls, monkeypatch):
+    import chunking
+    from chunking import Chunker, ChunkingMode, CHARS_PER_TOKEN
+    monkeypatch.setattr(chunking, 'tiktoken', None)
+    chunking._get_encoding.cache_clear()
+    try:
+        chunker = Chunker(chunk_size=10, chunk_overlap=2,
+                          mode=ChunkingMode.TOKEN)
+        text = SENTENCES * 5
+        chunks = chunker.split_text(text)
+    finally:
+        chunking._get_encoding.cache_clear()
+    # token counts estimated from the character count
+    assert all(len(chunk) <= 10 * CHARS_PER_TOKEN for chunk in chunks)
+    splitter = splitter_cls(
+        chunk_size=10, chunk_overlap=2,
+        length_function=lambda t: math.ceil(len(t) / CHARS_PER_TOKEN))
+    assert chunks == splitter.split_text(text)
+
+
+def test_invalid_overlap():
+    from chunking import Chunker
+    with pytest.raises(ValueError):
+        Chunker(chunk_size=10, chunk_overlap=11)
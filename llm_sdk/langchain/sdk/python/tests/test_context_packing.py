@@ -0,0 +1,103 @@
+import random
+
+import pytest
+
+
+SENTENCE = 'The planet BlueHeaven is 999 billion light-years away, ' \
+    'it is crazy blue and incredibly far.'
+
+
+def test_importable():
+    import context_packing  # noqa: F401
+    from context_packing import ContextPacker  # noqa: F401
+
+
+@pytest.fixture(autouse=True)
+def estimated_tokens(monkeypatch):
+    # token counts of ceil(characters / 4), with or without tiktoken
+    import context_packing
+    monkeypatch.setattr(context_packing, 'tiktoken', None)
+    context_packing._get_encoding.cache_clear()
+    yield
+    context_packing._get_encoding.cache_clear()
+
+
+def test_count_tokens():
+    from context_packing import count_tokens
+    assert count_tokens(['', 'abcd', 'abcde', '\n\n']) == [0, 1, 2, 1]
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_pack_within_budget(seed):
+    from context_packing import ContextPacker, count_tokens
+    rng = random.Random(seed)
+    texts = [f"chunk {i} " + 'x' * rng.randint(0, 400) for i in range(20)]
+    scores = [rng.random() for _ in texts]
+    for token_budget in [0, 1, 30, 100, 500, 10000]:
+        packer = ContextPacker(token_budget=token_budget,
+                               jaccard_threshold=None)
+        selected, report = packer.pack(texts, scores=scores)
+        context = packer.separator.join(texts[i] for i in selected)
+        assert count_tokens([context])[0] <= token_budget
+        assert report.packed_tokens <= token_budget
+        assert report.packed == len(selected)
+        # best first
+        assert [scores[i] for i in selected] == \
+            sorted((scores[i] for i in selected), reverse=True)
+
+
+def test_pack_fills_leftover_budget():
+    from context_packing import ContextPacker
+    texts = ['a' * 40, 'b' * 40, 'c' * 8]  # 10, 10 and 2 tokens
+    packer = ContextPacker(token_budget=14)
+    selected, report = packer.pack(texts)
+    # 10 + (1 + 10) does not fit, 10 + (1 + 2) does
+    assert selected == [0, 2]
+    assert report.packed_tokens == 13
+
+
+def test_pack_minhash_duplicates():
+    from context_packing import ContextPacker
+    texts = [
+        SENTENCE,
+        'The fruit GreyMelow is the most acid fruit in the world.',
+        # same text, other case and whitespace
+        '  the PLANET blueheaven is 999 billion\nlight-years away,  '
+        'it is CRAZY blue and incredibly   far. ',
+    ]
+    selected, report = ContextPacker().pack(texts)
+    assert selected == [0, 1]
+    assert report.duplicates == 1
+
+    selected, report = ContextPacker(jaccard_threshold=None).pack(texts)
+    assert selected == [0, 1, 2]
+    assert report.duplicates == 0
+
+
+def test_pack_cosine_duplicates():
+    from context_packing import ContextPacker
+    texts = ['foo', 'bar', 'baz']
+    embeddings = [[1.0, 0.0], [0.0, 1.0], [0.999, 0.01]]
+    selected, report = ContextPacker().pack(
+        texts, scores=[0.5, 0.1, 0.9], embeddings=embeddings)
+    # the best scored of the duplicates is kept
+    assert selected == [2, 1]
+    assert report.duplicates == 1
+
+
+def test_pack_tokens_saved():
+    from context_packing import ContextPacker
+    texts = ['a' * 40, 'b' * 40, 'c' * 40]  # 10 tokens each
+    selected, report = ContextPacker(token_budget=21).pack(texts)
+    assert selected == [0, 1]
+    # 3 chunks and 2 separators against 2 chunks and 1 separator
+    assert (report.candidate_tokens, report.packed_tokens) == (32, 21)
+    assert report.tokens_saved == 11
+    assert '11 saved' in str(report)
+
+
+def test_pack_empty():
+    from context_packing import ContextPacker
+    selected, report = ContextPacker().pack([])
+    assert selected == []
+    assert report.tokens_saved == 0
@@ -0,0 +1,132 @@
+import os
+import json
+
+import pytest
+from langchain_core.documents import Document
+
+
+class StubLoader:
+    """ Loads the text of a file, fails on files containing 'fail' """
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def load(self):
+        with open(self.path) as f:
+            text = f.read()
+        if 'fail' in text:
+            raise ValueError('cannot parse')
+        return [Document(page_content=text, metadata={'source': self.path})]
+
+
+def test_importable():
+    import loader_engine  # noqa: F401
+    from loader_engine import LoaderEngine  # noqa: F401
+
+
+@pytest.fixture
+def directory(tmp_path):
+    directory = tmp_path / 'files'
+    directory.mkdir()
+    for i in range(4):
+        (directory / f"doc_{i}.txt").write_text(f"document {i}")
+    return directory
+
+
+def _engine(tmp_path, **kwargs):
+    from loader_engine import LoaderEngine
+    return LoaderEngine(
+        file_type_mappings={'*.txt': [StubLoader]},
+        manifest_path=str(tmp_path / 'manifest.jsonl'),
+        max_workers=2,
+        **kwargs
+    )
+
+
+def _contents(chunks):
+    return sorted(chunk.page_content for chunk in chunks)
+
+
+def test_iter_chunks(tmp_path, directory):
+    engine = _engine(tmp_path)
+    chunks = list(engine.iter_chunks(str(directory)))
+    assert _contents(chunks) == [f"document {i}" for i in range(4)]
+    stats = engine.stats['StubLoader']
+    assert (stats.files, stats.failed, stats.chunks) == (4, 0, 4)
+    assert 0 < stats.wall_seconds <= stats.seconds + 1e-3
+    assert 'StubLoader' in engine.report()
+
+
+def test_iter_chunks_skips_unchanged(tmp_path, directory):
+    list(_engine(tmp_path).iter_chunks(str(directory)))
+    engine = _engine(tmp_path)
+    assert list(engine.iter_chunks(str(directory))) == []
+    assert engine.skipped == 4
+    assert engine.stats == {}
+
+
+def test_iter_chunks_hashes_when_only_mtime_moved(tmp_path, directory):
+    list(_engine(tmp_path).iter_chunks(str(directory)))
+    path = directory / 'doc_0.txt'
+    stat = os.stat(path)
+    os.utime(path, (stat.st_atime, stat.st_mtime + 10))
+
+    engine = _engine(tmp_path)
+    assert list(engine.iter_chunks(str(directory))) == []
+    # hashed, not parsed
+    assert engine.skipped == 4
+    assert engine.stats == {}
+    assert engine.manifest.entries[str(path)]['mtime'] == stat.st_mtime + 10
+
+    # content changed: parsed again
+    path.write_text('document 0, edited')
+    engine = _engine(tmp_path)
+    chunks = list(engine.iter_chunks(str(directory)))
+    assert _contents(chunks) == ['document 0, edited']
+    assert engine.skipped == 3
+
+
+def test_iter_chunks_retries_failed(tmp_path, directory, caplog):
+    (directory / 'doc_1.txt').write_text('fail')
+    engine = _engine(tmp_path)
+    chunks = list(engine.iter_chunks(str(directory)))
+    assert len(chunks) == 3
+    assert engine.stats['StubLoader'].failed == 1
+    assert 'doc_1.txt' in caplog.text
+    assert str(directory / 'doc_1.txt') not in engine.manifest.entries
+
+    (directory / 'doc_1.txt').write_text('document 1')
+    engine = _engine(tmp_path)
+    chunks = list(engine.iter_chunks(str(directory)))
+    assert _contents(chunks) == ['document 1']
+    assert engine.skipped == 3
+
+
+def test_manifest_compact(tmp_path, directory):
+    from loader_engine import Manifest
+    path = str(tmp_path / 'manifest.jsonl')
+    manifest = Manifest(path)
+    file = str(directory / 'doc_0.txt')
+    stat = os.stat(file)
+    manifest.add(file, stat, 'a')
+    manifest.add(file, stat, 'b')
+    with open(path, 'a') as f:
+        f.write('{"path": "torn')
+    manifest = Manifest(path)
+    assert manifest.entries[file]['sha256'] == 'b'
+
+    manifest.compact()
+    with open(path) as f:
+        lines = [json.loads(line) for line in f]
+    assert [line['sha256'] for line in lines] == ['b']
+    assert Manifest(path).is_unchanged(file, stat)
+
+
+def test_loader_stats_wall_seconds():
+    from loader_engine import LoaderStats
+    stats = LoaderStats(files=4, seconds=4.0,
+                        intervals=[(0.0, 1.0), (0.5, 1.5), (2.0, 3.0),
+                                   (2.0, 2.5)])
+    # overlapping files are counted once
+    assert stats.wall_seconds == pytest.approx(2.5)
+    assert stats.files_per_second == pytest.approx(1.6)
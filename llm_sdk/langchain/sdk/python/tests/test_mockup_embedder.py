@@ -0,0 +1,66 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+
+TEXTS = ['foo', 'bar', 'baz', 'the planet BlueHeaven is crazy blue']
+
+
+def test_importable():
+    import mockup_embedder  # noqa: F401
+    from mockup_embedder import MockupEmbedder  # noqa: F401
+
+
+def test_mockup_embeddings_distinct():
+    from mockup_embedder import mockup_embeddings
+    # same length, distinct texts
+    vectors = mockup_embeddings(['foo', 'bar', 'baz', 'fob'])
+    assert vectors.shape == (4, 384)
+    assert vectors.dtype == np.float32
+    assert len({row.tobytes() for row in vectors}) == 4
+    # nearly orthogonal in high dimensions
+    similarities = vectors @ vectors.T
+    assert np.abs(similarities[~np.eye(4, dtype=bool)]).max() < 0.3
+
+
+def test_mockup_embeddings_deterministic():
+    from mockup_embedder import mockup_embeddings
+    np.testing.assert_array_equal(
+        mockup_embeddings(TEXTS), mockup_embeddings(TEXTS))
+    vectors = mockup_embeddings(['foo', 'foo'])
+    np.testing.assert_array_equal(vectors[0], vectors[1])
+
+
+@pytest.mark.parametrize("dimensions", [1, 8, 384, 1536])
+def test_mockup_embeddings_unit_norm(dimensions):
+    from mockup_embedder import mockup_embeddings
+    vectors = mockup_embeddings(TEXTS + [''], dimensions)
+    assert vectors.shape == (5, dimensions)
+    np.testing.assert_allclose(
+        np.linalg.norm(vectors, axis=1), 1.0, rtol=1e-6)
+
+
+def test_mockup_embeddings_batch_equals_single():
+    from mockup_embedder import mockup_embeddings
+    batch = mockup_embeddings(TEXTS)
+    for text, row in zip(TEXTS, batch):
+        np.testing.assert_array_equal(mockup_embeddings([text])[0], row)
+
+
+def test_mockup_embeddings_empty():
+    from mockup_embedder import mockup_embeddings
+    assert mockup_embeddings([], 8).shape == (0, 8)
+
+
+def test_mockup_embedder():
+    from mockup_embedder import MockupEmbedder, mockup_embeddings
+    embedder = MockupEmbedder(dimensions=16)
+    expected = mockup_embeddings(TEXTS, 16)
+    np.testing.assert_array_equal(embedder.embed(iter(TEXTS)), expected)
+    np.testing.assert_array_equal(
+        asyncio.run(embedder.aembed(TEXTS)), expected)
+    # Chroma embedding function
+    vectors = embedder(input=TEXTS)
+    assert isinstance(vectors, list) and isinstance(vectors[0][0], float)
+    assert vectors == expected.tolist()
@@ -1,30 +1,49 @@
 from typing import List
 from llama_index.core.embeddings import BaseEmbedding
+from pydantic import PrivateAttr
+
+from mockup_embedder import DEFAULT_DIMENSIONS, MockupEmbedder
+
+# constants
+MAX_EMBED_BATCH_SIZE = 2048  # upper bound of BaseEmbedding.embed_batch_size
 
 
 class MockupEmbedding(BaseEmbedding):
     """ Mockup embedding function for testing """
+    _embedder: MockupEmbedder = PrivateAttr()
+
+    def __init__(self, dimensions: int = DEFAULT_DIMENSIONS, **kwargs):
+        # batches of 10 texts by default, one NumPy pass embeds them all
+        kwargs.setdefault('embed_batch_size', MAX_EMBED_BATCH_SIZE)
+        super().__init__(model_name='mockup-embedding', **kwargs)
+        self._embedder = MockupEmbedder(dimensions)
 
-    def __init__(self):
-        super().__init__()
+    @classmethod
+    def class_name(cls) -> str:
+        return 'MockupEmbedding'
 
     async def _aget_query_embedding(self, query: str) -> List[float]:
-        return self._get_query_embedding(query)
+        return (await self._embedder.aembed([query]))[0].tolist()
 
     async def _aget_text_embedding(self, text: str) -> List[float]:
-        return self._get_text_embedding(text)
+        return (await self._embedder.aembed([text]))[0].tolist()
+
+    async def _aget_text_embeddings(
+        self, texts: List[str]
+    ) -> List[List[float]]:
+        return (await self._embedder.aembed(texts)).tolist()
 
     def _get_query_embedding(self, query: str) -> List[float]:
-        return self._get_text_embedding(query)
+        return self._embedder.embed([query])[0].tolist()
 
     def _get_text_embedding(self, text: str) -> List[float]:
-        return [1.0 * x * len(text) for x in range(384)]
+        return self._embedder.embed([text])[0].tolist()
+
+    def _get_text_embeddings(self, texts: List[str]) -> List[List[float]]:
+        return self._embedder.embed(texts).tolist()
 
     def embed_documents(self, documents: List[str]) -> List[List[float]]:
-        embeddings = []
-        for doc in documents:
-            embeddings.append(self._get_text_embedding(doc))
-        return embeddings
+        return self._get_text_embeddings(documents)
 
     def __call__(self, input: List[str]) -> List[List[float]]:
-        return self.embed_documents(input)
+        return self._embedder(input)
@@ -0,0 +1,27 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+
+def test_importable():
+    import mockup_embedding  # noqa: F401
+    from mockup_embedding import MockupEmbedding  # noqa: F401
+
+
+def test_mockup_embedding():
+    from mockup_embedding import MockupEmbedding
+    from mockup_embedder import mockup_embeddings
+    embedding = MockupEmbedding(dimensions=32)
+    documents = ['foo', 'bar', 'baz']
+    expected = mockup_embeddings(documents, 32).tolist()
+
+    vectors = embedding.embed_documents(documents)
+    assert vectors == expected
+    assert isinstance(vectors[0][0], float)
+    assert embedding.query_embedding('bar') == expected[1]
+    assert asyncio.run(embedding.aembed_documents(documents)) == expected
+    assert asyncio.run(embedding.aquery_embedding('bar')) == expected[1]
+    assert np.linalg.norm(vectors, axis=1) == pytest.approx(1.0)
+    # Chroma embedding function
+    assert embedding(input=documents) == expected